@@ -1,5 +1,45 @@
 """SICAR - Tool designed for students, researchers, data scientists or anyone who would like to have access to SICAR files."""
 
-from SICAR.sicar import Sicar
-from SICAR.state import State
-from SICAR.polygon import Polygon
+import importlib
+
+_EXPORTS = {
+    "Sicar": "SICAR.sicar",
+    "AsyncSicar": "SICAR.async_sicar",
+    "State": "SICAR.state",
+    "Polygon": "SICAR.polygon",
+    "ReleaseDateCache": "SICAR.cache",
+}
+"""Public names and the module defining each one, imported on first access."""
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """
+    Import a public name on first access (PEP 562), so `import SICAR` does not load httpx, OpenCV or the OCR drivers.
+
+    Parameters:
+        name (str): The attribute being accessed.
+
+    Returns:
+        Any: The class exported under `name`.
+
+    Raises:
+        AttributeError: If `name` is not exported by the package.
+    """
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """
+    List the module attributes, including the exports not imported yet.
+
+    Returns:
+        list: The attribute names.
+    """
+    return sorted(set(globals()) | set(__all__))
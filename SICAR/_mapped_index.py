@@ -0,0 +1,272 @@
+"""
+Mapped Index Module.
+
+This private module holds the file handling shared by the persistent indexes of a downloaded polygon,
+`SpatialIndex` and `AttributeIndex`: the header, the memory mapping, the atomic build and the detection of a new
+release of the source.
+
+Every index file starts with the same header, followed by the format-specific data and JSON metadata:
+
+    magic (8s), version (I), parameter (I), items (Q), count (Q), offset (Q), metadata offset (Q), metadata length (Q)
+
+where the meaning of `parameter`, `items`, `count` and `offset` depends on the index.
+
+Classes:
+    MappedIndex: Base class of a memory-mapped index file.
+
+Functions:
+    write_index: Write an index file atomically.
+    write_meta: Write the metadata and the header of an index file.
+    describe_source: Describe the source of an index, to detect when it is replaced by a new release.
+    open_or_build: Open an index, building it when missing, invalid or outdated.
+"""
+
+import os
+import json
+import mmap
+import struct
+import tempfile
+from pathlib import Path
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Dict, Iterator
+
+from SICAR.exceptions import InvalidIndexException
+
+HEADER = struct.Struct("<8sIIQQQQQ")
+"""File header: magic, version, parameter, items, count, offset, metadata offset and metadata length."""
+
+
+class MappedIndex(ABC):
+    """
+    Base class of a memory-mapped index file.
+
+    Opening an index maps the file, checks the header and reads the metadata, then `_map` builds the views of
+    the format-specific data without reading it.
+
+    Attributes:
+        path (Path): The index file.
+        meta (Dict): The metadata of the index, including the `source` it was built from.
+        _MAGIC (bytes): The first bytes of the index files of the subclass.
+        _VERSION (int): The version of the file format of the subclass, bumped on incompatible changes.
+    """
+
+    _MAGIC = b""
+    _VERSION = 0
+
+    def __init__(self, path: Path | str):
+        """
+        Initialize an instance of the MappedIndex class by mapping an index file.
+
+        Parameters:
+            path (Path | str): The index file.
+
+        Returns:
+            None
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            InvalidIndexException: If the file is not an index of this kind and version or is truncated.
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._load()
+        except (ValueError, struct.error, json.JSONDecodeError) as error:
+            self.close()
+            raise InvalidIndexException(self.path) from error
+        except BaseException:
+            self.close()
+            raise
+
+    def _load(self):
+        """
+        Read the header and metadata and map the data of the index.
+
+        Returns:
+            None
+
+        Raises:
+            InvalidIndexException: If the file is not an index of this kind and version.
+            ValueError: If the file is truncated.
+        """
+        magic, version, parameter, items, count, offset, start, length = (
+            HEADER.unpack_from(self._mmap)
+        )
+
+        if magic != self._MAGIC or version != self._VERSION:
+            raise InvalidIndexException(self.path)
+
+        self.meta = json.loads(self._mmap[start : start + length])
+        self._map(parameter, items, count, offset)
+
+    @abstractmethod
+    def _map(self, parameter: int, items: int, count: int, offset: int):
+        """
+        Map the format-specific data of the index.
+
+        Parameters:
+            parameter (int): The 32-bit parameter of the header.
+            items (int): The number of indexed items.
+            count (int): The size of the index structure, such as the number of nodes or buckets.
+            offset (int): The position of the index structure in the file.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the file is truncated.
+        """
+
+    def _unmap(self):
+        """
+        Drop the views of the mapped file, so it can be closed.
+
+        Returns:
+            None
+        """
+
+    def close(self):
+        """
+        Unmap and close the index file.
+
+        Returns:
+            None
+        """
+        self._unmap()
+
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+
+        self._file.close()
+
+    def __enter__(self) -> "MappedIndex":
+        """
+        Enter the runtime context of the index.
+
+        Returns:
+            MappedIndex: The index itself.
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Close the index when leaving the runtime context.
+
+        Parameters:
+            *args: The exception details, if any.
+
+        Returns:
+            None
+        """
+        self.close()
+
+
+@contextmanager
+def write_index(path: Path) -> Iterator[BinaryIO]:
+    """
+    Write an index file atomically.
+
+    Parameters:
+        path (Path): The index file.
+
+    Returns:
+        Iterator[BinaryIO]: A temporary file in the same folder, positioned after room for the header. It is moved
+        into place when the context exits without an error, and removed otherwise, so readers never see a partial
+        index.
+    """
+    descriptor, temporary = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(bytes(HEADER.size))
+            yield file
+
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+
+def write_meta(
+    file: BinaryIO,
+    magic: bytes,
+    version: int,
+    meta: Dict,
+    parameter: int,
+    items: int,
+    count: int,
+    offset: int,
+):
+    """
+    Write the metadata at the end of an index file and its header at the beginning.
+
+    Parameters:
+        file (BinaryIO): The file opened by `write_index`, positioned after the index data.
+        magic (bytes): The first bytes of the index files.
+        version (int): The version of the file format.
+        meta (Dict): The metadata, serialized as JSON.
+        parameter (int): The 32-bit parameter of the header.
+        items (int): The number of indexed items.
+        count (int): The size of the index structure.
+        offset (int): The position of the index structure in the file.
+
+    Returns:
+        None
+    """
+    meta = json.dumps(meta).encode()
+    start = file.tell()
+    file.write(meta)
+    file.seek(0)
+    file.write(
+        HEADER.pack(magic, version, parameter, items, count, offset, start, len(meta))
+    )
+
+
+def describe_source(source: Path, **options) -> Dict:
+    """
+    Describe the source of an index, to detect when it is replaced by a new release.
+
+    Parameters:
+        source (Path): The `.zip` file.
+        **options: The options the index was built with, such as the requested layer.
+
+    Returns:
+        Dict: The size and modification time of the file and the options.
+    """
+    stat = source.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, **options}
+
+
+def open_or_build(
+    index: type[MappedIndex], path: Path, source: Dict, build: Callable
+) -> MappedIndex:
+    """
+    Open an index, building it when missing, invalid or outdated.
+
+    Parameters:
+        index (type[MappedIndex]): The class of the index.
+        path (Path): The index file.
+        source (Dict): The current description of the source, from `describe_source`.
+        build (Callable): Called without arguments to build and open a new index.
+
+    Returns:
+        MappedIndex: The index, opened.
+
+    Note:
+        An index is rebuilt when its file is invalid or when its source description differs from `source`.
+    """
+    try:
+        opened = index(path)
+    except (FileNotFoundError, InvalidIndexException):
+        return build()
+
+    if opened.meta["source"] == source:
+        return opened
+
+    opened.close()
+    return build()
@@ -0,0 +1,920 @@
+"""
+Asynchronous SICAR Class Module.
+
+This module defines an asyncio-native version of the Sicar class, built on `httpx.AsyncClient`.
+
+Classes:
+    AsyncSicar: Class representing the Sicar system with asynchronous, concurrent downloads.
+"""
+
+import io
+import time
+import copy
+import contextlib
+import random
+import asyncio
+import itertools
+import httpx
+from PIL import Image, UnidentifiedImageError
+from typing import AsyncIterator, ContextManager, Dict
+from pathlib import Path
+from urllib.parse import urlencode
+
+from SICAR.base import BaseSicar
+from SICAR.drivers import Captcha, Tesseract, OcrExecutor
+from SICAR.state import State
+from SICAR.polygon import Polygon
+from SICAR.partial import PartialDownload
+from SICAR.sinks import Sink, as_sink
+from SICAR.cache import ReleaseDateCache
+from SICAR.retry import Failure, RetryPolicy, TokenBucket
+from SICAR.metrics import Metrics
+from SICAR.events import (
+    Events,
+    AttemptStarted,
+    CaptchaSolved,
+    AttemptFailed,
+    UpToDate,
+)
+from SICAR.manifest import Manifest
+from SICAR.shapefile import Feature, read_features
+from SICAR.spatial_index import SpatialIndex, open_index
+from SICAR.attribute_index import AttributeIndex, open_attribute_index
+from SICAR.release_dates import to_dates
+from SICAR.exceptions import (
+    UrlNotOkException,
+    FailedToDownloadCaptchaException,
+    FailedToDownloadPolygonException,
+    FailedToGetReleaseDateException,
+)
+
+
+@contextlib.asynccontextmanager
+async def _in_thread(manager: ContextManager) -> AsyncIterator:
+    """
+    Enter and exit a context manager in a worker thread, so its file I/O does not block the event loop.
+
+    Parameters:
+        manager (ContextManager): The context manager, such as the writer returned by `Sink.open`.
+
+    Returns:
+        AsyncIterator: The value returned by the context manager's `__enter__`.
+    """
+    value = await asyncio.to_thread(manager.__enter__)
+
+    try:
+        yield value
+    except BaseException as error:
+        if not await asyncio.to_thread(
+            manager.__exit__, type(error), error, error.__traceback__
+        ):
+            raise
+    else:
+        await asyncio.to_thread(manager.__exit__, None, None, None)
+
+
+class AsyncSicar(BaseSicar):
+    """
+    Class representing the Sicar system with asynchronous, concurrent downloads.
+
+    AsyncSicar shares its configuration with `Sicar` through `BaseSicar` and offers the same methods, except
+    `session_pool`, as coroutines: downloads, release dates and synchronization run on the event loop, and reading,
+    indexing or converting a downloaded polygon runs in a worker thread. Each state download runs on its own
+    session, so captchas from concurrent downloads never share cookies, and the number of simultaneous downloads is
+    bounded by `concurrency`.
+
+    Attributes:
+        _driver (Captcha): The driver used for handling captchas. Default is Tesseract.
+        _semaphore (asyncio.Semaphore): Limits how many states are downloaded at the same time.
+    """
+
+    def __init__(
+        self,
+        driver: Captcha = Tesseract,
+        headers: Dict = None,
+        concurrency: int = 4,
+        release_dates: ReleaseDateCache = None,
+        limits: httpx.Limits = None,
+        http2: bool = False,
+        retry: RetryPolicy = None,
+        limiter: TokenBucket = None,
+        metrics: Metrics = None,
+        listeners: list = None,
+        base_url: str = None,
+    ):
+        """
+        Initialize an instance of the AsyncSicar class.
+
+        Parameters:
+            driver (Captcha): The driver class used for handling captchas, or a driver instance such as an `OcrExecutor`. Default is Tesseract.
+            headers (Dict): Additional headers for HTTP requests. Default is None.
+            concurrency (int): The maximum number of states downloaded at the same time. Default is 4.
+            release_dates (ReleaseDateCache): A cache for `get_release_dates`. Default is None (always request the page).
+            limits (httpx.Limits): Connection pool limits and keep-alive expiry of each session. Default is None, which uses `_LIMITS`.
+            http2 (bool): Whether to negotiate HTTP/2. Requires the `http2` extra. Default is False.
+            retry (RetryPolicy): The policy deciding the delay between download attempts. Default is None, which uses `RetryPolicy()`.
+            limiter (TokenBucket): A rate limiter taken before every request, which can be shared between instances. Default is None (no limit).
+            metrics (Metrics): The registry recording latencies and rates, which can be shared between instances. Default is None, which creates one.
+            listeners (list): Callables receiving the download events. Default is None, which shows a `tqdm` progress bar. Pass an empty list for no output.
+            base_url (str): The base URL of the SICAR system, e.g. the `base_url` of a `MockSicarServer`. Default is None, which uses `Url._BASE`.
+
+        Returns:
+            None
+
+        Note:
+            Cookies are not requested here since the constructor cannot await. Use the instance as an
+            asynchronous context manager (`async with AsyncSicar() as car:`) or await `_initialize_cookies`.
+        """
+        self._configure(
+            driver,
+            headers,
+            release_dates,
+            limits,
+            http2,
+            retry,
+            limiter,
+            metrics,
+            listeners,
+            base_url,
+        )
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> "AsyncSicar":
+        """
+        Initialize the session cookies when entering the context.
+
+        Returns:
+            AsyncSicar: This instance.
+        """
+        await self._initialize_cookies()
+        return self
+
+    async def __aexit__(self, *args):
+        """
+        Close the session when leaving the context.
+
+        Returns:
+            None
+        """
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close the underlying HTTP session.
+
+        Returns:
+            None
+        """
+        await self._session.aclose()
+
+    def _new_session(self, headers: Dict = None) -> httpx.AsyncClient:
+        """
+        Build a new asynchronous HTTP client configured for the SICAR system.
+
+        Parameters:
+            headers (Dict): Additional headers for the session. Default is None, which uses `_HEADERS`.
+
+        Returns:
+            httpx.AsyncClient: The configured HTTP client.
+        """
+        session = httpx.AsyncClient(
+            verify=self._ssl_context(),
+            limits=self._limits,
+            http2=self._http2,
+            event_hooks={"request": [self._connections.ahook]},
+        )
+        session.headers.update(headers if isinstance(headers, dict) else self._HEADERS)
+        return session
+
+    async def _initialize_cookies(self):
+        """
+        Initialize cookies by making the initial request and accepting any redirections.
+
+        Returns:
+            None
+        """
+        await self._get(self._INDEX)
+
+    async def _worker(self) -> "AsyncSicar":
+        """
+        Create a copy of this instance with its own session and cookies.
+
+        Returns:
+            AsyncSicar: A copy sharing the driver and the concurrency limit, but not the session.
+        """
+        worker = copy.copy(self)
+        worker._create_session(headers=self._headers)
+        await worker._initialize_cookies()
+        return worker
+
+    async def _throttle(self):
+        """
+        Wait for the rate limiter, if there is one, without blocking the event loop.
+
+        Returns:
+            None
+        """
+        if self._limiter:
+            wait = self._limiter.reserve()
+
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    async def _get(self, url: str, *args, **kwargs):
+        """
+        Send a GET request to the specified URL using the session.
+
+        Parameters:
+            url (str): The URL to send the GET request to.
+            *args: Variable-length positional arguments.
+            **kwargs: Variable-length keyword arguments.
+
+        Returns:
+            httpx.Response: The response from the GET request.
+
+        Raises:
+            UrlNotOkException: If the response from the GET request is not OK (status code is not 200).
+        """
+        await self._throttle()
+        response = await self._session.get(url=url, *args, **kwargs)
+
+        if response.status_code not in [
+            httpx.codes.OK,
+            httpx.codes.FOUND,
+            httpx.codes.NOT_MODIFIED,
+        ]:
+            raise UrlNotOkException(url, response.status_code)
+
+        return response
+
+    async def _download_captcha(self) -> Image:
+        """
+        Download a captcha image from the SICAR system.
+
+        Returns:
+            Image: The captcha image.
+
+        Raises:
+            FailedToDownloadCaptchaException: If the captcha image fails to download.
+        """
+        url = f"{self._RECAPTCHA}?{urlencode({'id': int(random.random() * 1000000)})}"
+        response = await self._get(url)
+
+        if response.status_code != httpx.codes.OK:
+            raise FailedToDownloadCaptchaException()
+
+        try:
+            captcha = Image.open(io.BytesIO(response.content))
+        except UnidentifiedImageError as error:
+            raise FailedToDownloadCaptchaException() from error
+
+        return captcha
+
+    async def _solve_captcha(self, captcha: Image) -> str:
+        """
+        Run the captcha driver outside the event loop so OCR does not block other transfers.
+
+        Parameters:
+            captcha (Image): The captcha image.
+
+        Returns:
+            str: The captcha value recognized by the driver.
+
+        Note:
+            An `OcrExecutor` driver solves the captcha in its process pool, any other driver runs in a worker thread.
+        """
+        if isinstance(self._driver, OcrExecutor):
+            return await asyncio.wrap_future(self._driver.submit(captcha))
+
+        return await asyncio.to_thread(self._driver.get_captcha, captcha)
+
+    async def _download_polygon(
+        self,
+        state: State,
+        polygon: Polygon,
+        captcha: str,
+        folder: str,
+        chunk_size: int = 1024 * 1024,
+        events: Events = None,
+        sink: Sink = None,
+    ) -> Path:
+        """
+        Download polygon for the specified state.
+
+        Parameters:
+            state (State): The state for which to download the files.
+            polygon (Polygon): The polygon to download.
+            captcha (str): The captcha value for verification.
+            folder (str): The folder path where the polygon will be saved.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+            events (Events, optional): The listeners receiving the progress events. Defaults to the instance listeners.
+            sink (Sink, optional): The destination of the polygon. Defaults to a `PartialDownload` in `folder`.
+
+        Returns:
+            Path: The path to the downloaded polygon, or the result of `sink.finish()` when a sink is given.
+
+        Raises:
+            FailedToDownloadPolygonException: If the polygon download fails.
+
+        Note:
+            Interrupted downloads are resumed from their `.part` file, as in `Sicar._download_polygon`.
+            The response is read on the event loop, while the `.part` file, its metadata and the sink are written
+            and verified in a worker thread. The pieces received from the socket are gathered up to `chunk_size`
+            bytes before each write, so a file is written in a few thread hops instead of one per network read. The
+            bytes gathered when the transfer fails are still written, so the next attempt resumes after them.
+        """
+        query = urlencode(
+            {"idEstado": state.value, "tipoBase": polygon.value, "ReCaptcha": captcha}
+        )
+        url = f"{self._DOWNLOAD_BASE}?{query}"
+        download = (
+            PartialDownload(self._polygon_path(folder, state, polygon))
+            if sink is None
+            else sink
+        )
+        headers = await asyncio.to_thread(download.headers)
+        await self._throttle()
+
+        try:
+            async with self._session.stream("GET", url, headers=headers) as response:
+                if response.status_code not in [
+                    httpx.codes.OK,
+                    httpx.codes.PARTIAL_CONTENT,
+                ]:
+                    raise FailedToDownloadPolygonException(
+                        response.status_code
+                    ) from UrlNotOkException(url, response.status_code)
+
+                content_length = int(response.headers.get("Content-Length", 0))
+
+                content_type = response.headers.get("Content-Type", "")
+
+                if content_length == 0 or not content_type.startswith(
+                    "application/zip"
+                ):
+                    raise FailedToDownloadPolygonException(
+                        response.status_code, content_type
+                    )
+
+                labels = self._labels(state)
+                self.metrics.inc("sicar_captcha_accepted_total", **labels)
+                events = self._events if events is None else events
+
+                writer = await asyncio.to_thread(
+                    download.open, response, buffer_size=chunk_size
+                )
+
+                async with _in_thread(writer) as fd:
+                    digest = await asyncio.to_thread(download.digest)
+                    progress = events.progress(
+                        state, polygon, download.total, download.total - content_length
+                    )
+                    start, offset = time.perf_counter(), progress.received
+
+                    def write(chunks: list[bytes]):
+                        data = b"".join(chunks)
+                        fd.write(data)
+                        digest.update(data)
+
+                    pending, size = [], 0
+
+                    try:
+                        async for chunk in response.aiter_bytes():
+                            pending.append(chunk)
+                            size += len(chunk)
+                            progress.update(len(chunk))
+
+                            if size >= chunk_size:
+                                chunks, pending, size = pending, [], 0
+                                await asyncio.to_thread(write, chunks)
+                    finally:
+                        if pending:
+                            await asyncio.to_thread(write, pending)
+
+                        self.metrics.inc(
+                            "sicar_download_bytes_total",
+                            progress.received - offset,
+                            **labels,
+                        )
+                        self.metrics.inc(
+                            "sicar_download_seconds_total",
+                            time.perf_counter() - start,
+                            **labels,
+                        )
+
+                progress.close()
+        except httpx.HTTPError as error:
+            raise FailedToDownloadPolygonException() from error
+
+        if progress.received != download.total:
+            raise FailedToDownloadPolygonException()
+
+        download.sha256 = digest.hexdigest()
+
+        return await asyncio.to_thread(download.finish)
+
+    async def download_state(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        tries: int = 25,
+        debug: bool = False,
+        chunk_size: int = 1024 * 1024,
+        sink=None,
+    ) -> Path | bool:
+        """
+        Download the polygon for the specified state.
+
+        Parameters:
+            state (State | str): The state for which to download the files. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon to download the files. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder path where the downloaded data will be saved. Defaults to "temp".
+            tries (int, optional): The number of attempts to download the data. Defaults to 25.
+            debug (bool, optional): Whether to print debug information through a `PrintListener`. Defaults to False.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+            sink (Sink | BinaryIO | Callable, optional): Where to send the polygon instead of `folder`, as in `Sicar.download_state`. Sinks are called from a worker thread. Defaults to None.
+
+        Returns:
+            Path | bool: The path to the downloaded data if successful, or False if download fails. With a sink, the file object for streams and True for callables.
+
+        Note:
+            Progress is reported to the listeners with the same events as `Sicar.download_state`.
+            The download waits for a free slot of the concurrency limit and then runs on a dedicated session,
+            so the captcha sequence of one state is never mixed with another state's.
+        """
+        state = self._parse_state(state)
+        polygon = self._parse_polygon(polygon)
+
+        if sink is None:
+            Path(folder).mkdir(parents=True, exist_ok=True)
+        else:
+            sink = as_sink(sink)
+
+        async with self._semaphore:
+            worker = await self._worker()
+            try:
+                return await worker._download_state(
+                    state,
+                    polygon,
+                    folder,
+                    tries,
+                    self._debug_events(debug),
+                    chunk_size,
+                    sink,
+                )
+            finally:
+                await worker.aclose()
+
+    async def _download_state(
+        self,
+        state: State,
+        polygon: Polygon,
+        folder: Path | str,
+        tries: int,
+        events: Events,
+        chunk_size: int,
+        sink: Sink = None,
+    ) -> Path | bool:
+        """
+        Run the captcha and download attempts for a state on this instance's session.
+
+        Parameters:
+            state (State): The state for which to download the files.
+            polygon (Polygon): The polygon to download.
+            folder (Path | str): The folder path where the downloaded data will be saved.
+            tries (int): The number of attempts to download the data.
+            events (Events): The listeners receiving the download events.
+            chunk_size (int): The size in bytes of the pieces written to disk.
+            sink (Sink, optional): The destination of the polygon. Defaults to None (`folder`).
+
+        Returns:
+            Path | bool: The path to the downloaded data if successful, or False if download fails.
+        """
+        captcha = ""
+        labels = self._labels(state)
+        previous, failures, attempts = None, 0, 0
+
+        while attempts < tries:
+            attempts += 1
+            events.emit(AttemptStarted(state, polygon, attempts, tries))
+            try:
+                with self.metrics.timer("sicar_captcha_download_seconds", **labels):
+                    image = await self._download_captcha()
+
+                with self.metrics.timer("sicar_ocr_seconds", **labels):
+                    captcha = await self._solve_captcha(image)
+
+                self.metrics.inc(
+                    "sicar_ocr_output_length_total", length=len(captcha), **labels
+                )
+                events.emit(
+                    CaptchaSolved(
+                        state, polygon, attempts, tries, captcha, len(captcha) == 5
+                    )
+                )
+
+                if len(captcha) == 5:
+                    self.metrics.inc("sicar_captcha_submitted_total", **labels)
+                    path = await self._download_polygon(
+                        state=state,
+                        polygon=polygon,
+                        captcha=captcha,
+                        folder=folder,
+                        chunk_size=chunk_size,
+                        events=events,
+                        sink=sink,
+                    )
+                    self._record_success(events, state, polygon, path, attempts)
+                    return path
+
+                failure, error = Failure.INVALID_CAPTCHA, None
+            except io.UnsupportedOperation as exception:
+                self._record_failure(events, state, polygon, attempts, exception)
+                return False
+            except (
+                UrlNotOkException,
+                FailedToDownloadCaptchaException,
+                FailedToDownloadPolygonException,
+                httpx.HTTPError,
+            ) as exception:
+                failure, error = self._retry.classify(exception), exception
+
+            events.emit(AttemptFailed(state, polygon, attempts, tries, failure, error))
+            failures = failures + 1 if failure == previous else 1
+            previous = failure
+
+            if attempts < tries:
+                await asyncio.sleep(self._retry.delay(failure, failures))
+
+        self._record_failure(events, state, polygon, attempts)
+        return False
+
+    async def download_country(
+        self,
+        polygon: Polygon | str,
+        folder: Path | str = Path("brazil"),
+        tries: int = 25,
+        debug: bool = False,
+        chunk_size: int = 1024 * 1024,
+    ) -> Dict:
+        """
+        Download polygon for the entire country, running up to `concurrency` states at the same time.
+
+        Parameters:
+            polygon (Polygon | str): The polygon to download the files. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder path where the downloaded files will be saved. Defaults to 'brazil'.
+            tries (int, optional): The number of download attempts allowed per state. Defaults to 25.
+            debug (bool, optional): Whether to enable debug mode with additional print statements. Defaults to False.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+
+        Returns:
+            Dict: A dictionary with a `State` as key and the result of `download_state` as value.
+        """
+        return await self._download_states(
+            list(State), polygon, folder, tries, debug, chunk_size
+        )
+
+    async def _download_states(
+        self,
+        states: list[State],
+        polygon: Polygon | str,
+        folder: Path | str,
+        tries: int,
+        debug: bool,
+        chunk_size: int,
+    ) -> Dict:
+        """
+        Download polygon for a list of states, running up to `concurrency` states at the same time.
+
+        Parameters:
+            states (list[State]): The states to download.
+            polygon (Polygon | str): The polygon to download the files.
+            folder (Path | str): The folder path where the downloaded files will be saved.
+            tries (int): The number of download attempts allowed per state.
+            debug (bool): Whether to enable debug mode with additional print statements.
+            chunk_size (int): The size in bytes of the pieces written to disk.
+
+        Returns:
+            Dict: A dictionary with each state as key and the result of `download_state` as value.
+
+        Note:
+            As in `Sicar._download_states`, an unexpected error raised by the download of one state is reported
+            as a `DownloadFailed` event with the error, and that state is recorded as False.
+        """
+        polygon = self._parse_polygon(polygon)
+        events = self._debug_events(debug)
+
+        async def settle(state: State) -> Path | bool:
+            try:
+                return await self.download_state(
+                    state=state,
+                    polygon=polygon,
+                    folder=folder,
+                    tries=tries,
+                    debug=debug,
+                    chunk_size=chunk_size,
+                )
+            except Exception as error:
+                self._record_failure(events, state, polygon, 0, error)
+                return False
+
+        results = await asyncio.gather(*(settle(state) for state in states))
+
+        return dict(zip(states, results))
+
+    async def sync_state(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        tries: int = 25,
+        debug: bool = False,
+        chunk_size: int = 1024 * 1024,
+    ) -> Path | bool:
+        """
+        Download the polygon for the specified state only if a new release was published.
+
+        Parameters:
+            state (State | str): The state for which to download the files. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon to download the files. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder path where the downloaded data will be saved. Defaults to "temp".
+            tries (int, optional): The number of attempts to download the data. Defaults to 25.
+            debug (bool, optional): Whether to print debug information. Defaults to False.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+
+        Returns:
+            Path | bool: The path to the up-to-date data, or False if the download fails.
+
+        Note:
+            The folder's `Manifest` is used as in `Sicar.sync_state`. It is read and written in a worker thread,
+            since recording a download hashes the whole file.
+        """
+        state = self._parse_state(state)
+        polygon = self._parse_polygon(polygon)
+
+        release_date = (await self.get_release_dates()).get(state)
+        manifest = await asyncio.to_thread(Manifest, folder)
+        path = manifest.current(state, polygon, release_date)
+
+        if path:
+            self._debug_events(debug).emit(UpToDate(state, polygon, path))
+            return path
+
+        path = await self.download_state(
+            state=state,
+            polygon=polygon,
+            folder=folder,
+            tries=tries,
+            debug=debug,
+            chunk_size=chunk_size,
+        )
+
+        if path:
+            await asyncio.to_thread(manifest.record, state, polygon, release_date, path)
+
+        return path
+
+    async def sync_country(
+        self,
+        polygon: Polygon | str,
+        folder: Path | str = Path("brazil"),
+        tries: int = 25,
+        debug: bool = False,
+        chunk_size: int = 1024 * 1024,
+    ) -> Dict:
+        """
+        Download polygon for every state whose release date changed since the last synchronization.
+
+        Parameters:
+            polygon (Polygon | str): The polygon to download the files. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder path where the downloaded files will be saved. Defaults to 'brazil'.
+            tries (int, optional): The number of download attempts allowed per state. Defaults to 25.
+            debug (bool, optional): Whether to enable debug mode with additional print statements. Defaults to False.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+
+        Returns:
+            Dict: A dictionary with each state as key and the path to its up-to-date data as value.
+                If a download fails for a state the corresponding value will be False.
+
+        Note:
+            Stale states are found as in `Sicar.sync_country` and downloaded up to `concurrency` at the same time.
+        """
+        polygon = self._parse_polygon(polygon)
+
+        release_dates = await self.get_release_dates()
+        manifest = await asyncio.to_thread(Manifest, folder)
+
+        result = {
+            state: manifest.current(state, polygon, release_dates.get(state))
+            for state in State
+        }
+        stale = [state for state, path in result.items() if path is None]
+        events = self._debug_events(debug)
+
+        for state, path in result.items():
+            if path:
+                events.emit(UpToDate(state, polygon, path))
+
+        downloaded = await self._download_states(
+            stale, polygon, folder, tries, debug, chunk_size
+        )
+
+        for state, path in downloaded.items():
+            if path:
+                await asyncio.to_thread(
+                    manifest.record, state, polygon, release_dates.get(state), path
+                )
+
+        result.update(downloaded)
+        return result
+
+    async def read_features(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        layer: str = None,
+        batch_size: int = 1024,
+    ) -> AsyncIterator[Feature]:
+        """
+        Iterate over the features of a downloaded polygon without extracting its zip file.
+
+        Parameters:
+            state (State | str): The state of the polygon. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder where the polygon was downloaded. Defaults to "temp".
+            layer (str, optional): The layer to read when the archive has more than one. Defaults to the first.
+            batch_size (int, optional): The number of features decoded at a time in a worker thread. Defaults to 1024.
+
+        Returns:
+            AsyncIterator[Feature]: The features, as in `Sicar.read_features`. Use it with `async for`.
+
+        Raises:
+            InvalidShapefileException: If the downloaded file does not hold a valid shapefile.
+        """
+        path = self._polygon_path(
+            folder, self._parse_state(state), self._parse_polygon(polygon)
+        )
+        features = read_features(path, layer)
+
+        try:
+            while batch := await asyncio.to_thread(
+                list, itertools.islice(features, batch_size)
+            ):
+                for feature in batch:
+                    yield feature
+        finally:
+            features.close()
+
+    async def spatial_index(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        layer: str = None,
+    ) -> SpatialIndex:
+        """
+        Open the spatial index of a downloaded polygon in a worker thread, building it on first use or after a new release.
+
+        Parameters:
+            state (State | str): The state of the polygon. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder where the polygon was downloaded. Defaults to "temp".
+            layer (str, optional): The layer to index when the archive has more than one. Defaults to the first.
+
+        Returns:
+            SpatialIndex: The memory-mapped index, as in `Sicar.spatial_index`. Close it when done.
+
+        Raises:
+            InvalidShapefileException: If the index must be built and the downloaded file does not hold a valid shapefile.
+        """
+        path = self._polygon_path(
+            folder, self._parse_state(state), self._parse_polygon(polygon)
+        )
+        return await asyncio.to_thread(open_index, path, layer=layer)
+
+    async def attribute_index(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        column: str = "cod_imovel",
+        layer: str = None,
+    ) -> AttributeIndex:
+        """
+        Open the index of a downloaded polygon by the value of a column in a worker thread, building it on first use or after a new release.
+
+        Parameters:
+            state (State | str): The state of the polygon. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder where the polygon was downloaded. Defaults to "temp".
+            column (str, optional): The indexed column. Defaults to `cod_imovel`, the property code.
+            layer (str, optional): The layer to index when the archive has more than one. Defaults to the first.
+
+        Returns:
+            AttributeIndex: The memory-mapped index, as in `Sicar.attribute_index`. Close it when done.
+
+        Raises:
+            InvalidShapefileException: If the index must be built and the downloaded file does not hold a valid shapefile or has no such column.
+        """
+        path = self._polygon_path(
+            folder, self._parse_state(state), self._parse_polygon(polygon)
+        )
+        return await asyncio.to_thread(open_attribute_index, path, column, layer=layer)
+
+    async def to_geoparquet(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        destination: Path | str = None,
+        row_group_size: int = 65536,
+    ) -> list[Path]:
+        """
+        Convert a downloaded polygon into a GeoParquet dataset in a worker thread.
+
+        Parameters:
+            state (State | str): The state of the polygon. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder where the polygon was downloaded. Defaults to "temp".
+            destination (Path | str, optional): The root folder of the dataset. Defaults to `<folder>/<polygon>`.
+            row_group_size (int, optional): The maximum number of rows of a row group. Defaults to 65536.
+
+        Returns:
+            list[Path]: The files written, as in `Sicar.to_geoparquet`.
+
+        Raises:
+            ImportError: If pyarrow is not installed. Install the `geoparquet` extra.
+            InvalidShapefileException: If the downloaded file does not hold a valid shapefile.
+        """
+        from SICAR.geoparquet import to_geoparquet
+
+        state = self._parse_state(state)
+        polygon = self._parse_polygon(polygon)
+
+        return await asyncio.to_thread(
+            to_geoparquet,
+            self._polygon_path(folder, state, polygon),
+            Path(folder) / polygon.value if destination is None else destination,
+            state=state,
+            row_group_size=row_group_size,
+        )
+
+    async def get_release_dates(self, as_date: bool = False) -> Dict:
+        """
+        Get release date for each state in SICAR system.
+
+        Parameters:
+            as_date (bool, optional): Whether to return the release dates as `datetime.date` values. Defaults to False.
+
+        Returns:
+            Dict: A dict containing state sign as keys and release date as string in dd/mm/yyyy format, or as `datetime.date` if `as_date` is True.
+
+        Raises:
+            FailedToGetReleaseDateException: If the page with release date fails to load.
+
+        Note:
+            A `ReleaseDateCache` is used as in `Sicar.get_release_dates`.
+        """
+        release_dates = await self._fetch_release_dates()
+        return to_dates(release_dates) if as_date else release_dates
+
+    async def _fetch_release_dates(self) -> Dict:
+        """
+        Request and parse the release dates, going through the release date cache if there is one.
+
+        Returns:
+            Dict: A dict containing state sign as keys and release date as string in dd/mm/yyyy format.
+
+        Raises:
+            FailedToGetReleaseDateException: If the page with release date fails to load.
+        """
+        cache = self._release_dates
+
+        if cache is None:
+            try:
+                response = await self._get(f"{self._RELEASE_DATE}")
+                return self._parse_release_dates(response.content)
+            except UrlNotOkException as error:
+                raise FailedToGetReleaseDateException() from error
+
+        release_dates = cache.get()
+
+        if release_dates is not None:
+            return release_dates
+
+        try:
+            response = await self._get(f"{self._RELEASE_DATE}", headers=cache.headers())
+
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                release_dates = cache.revalidate()
+
+                if release_dates is not None:
+                    return release_dates
+
+                response = await self._get(f"{self._RELEASE_DATE}")
+        except UrlNotOkException as error:
+            raise FailedToGetReleaseDateException() from error
+
+        return cache.store(self._parse_release_dates(response.content), response)
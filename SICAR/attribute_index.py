@@ -0,0 +1,315 @@
+"""
+Attribute Index Module.
+
+This module builds a persistent index of a polygon downloaded by `Sicar.download_state` by the value of one column,
+`cod_imovel` by default, so the records of a property are found in constant time without scanning the attribute
+table inside the `.zip` file.
+
+The index file holds an uncompressed copy of the `.dbf` records and a hash table from each value to its records.
+It is memory-mapped when opened, so a lookup reads one bucket of the table and the records it points to, and the
+geometries are never read.
+
+Classes:
+    AttributeIndex: Memory-mapped hash index of the attribute table of a downloaded polygon.
+
+Functions:
+    attribute_index_path: Get the default path of the attribute index of a downloaded polygon.
+    build_attribute_index: Build the attribute index of a downloaded polygon.
+    open_attribute_index: Open the attribute index of a downloaded polygon, building it when missing or outdated.
+"""
+
+import hashlib
+from array import array
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from SICAR.exceptions import InvalidShapefileException
+from SICAR.shapefile import Field, ShapefileReader, parse_record
+from SICAR._mapped_index import (
+    HEADER,
+    MappedIndex,
+    describe_source,
+    open_or_build,
+    write_index,
+    write_meta,
+)
+
+
+def _hash(key: bytes) -> int:
+    """
+    Hash a value of the indexed column.
+
+    Parameters:
+        key (bytes): The raw value, without padding.
+
+    Returns:
+        int: A 64-bit hash, stable across processes.
+    """
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class AttributeIndex(MappedIndex):
+    """
+    Memory-mapped hash index of the attribute table of a downloaded polygon.
+
+    The records are grouped in buckets by the hash of their value, with about one record per bucket. A lookup
+    compares the hashes of one bucket and then the raw value of the matching records, so its cost does not depend
+    on the number of records.
+
+    In the header, the parameter is the record length, the items are the records and the count is the number of
+    buckets of the hash table.
+
+    Attributes:
+        path (Path): The index file.
+        column (str): The indexed column.
+        meta (Dict): The layer, column, fields, encoding and source file of the index.
+        fields (List[Field]): The columns of the attribute table.
+    """
+
+    _MAGIC = b"SICARKEY"
+    """First bytes of an attribute index file."""
+
+    _VERSION = 1
+    """Version of the attribute index file format, bumped on incompatible changes."""
+
+    def _map(self, record_length: int, items: int, buckets: int, table: int):
+        """
+        Map the hash table.
+
+        Parameters:
+            record_length (int): The length of a `.dbf` record.
+            items (int): The number of records.
+            buckets (int): The number of buckets of the hash table.
+            table (int): The position of the hash table in the file.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the file is truncated.
+        """
+        self._record_length = record_length
+        self._items = items
+        self.column = self.meta["column"]
+        self.fields = [Field(*field) for field in self.meta["fields"]]
+        self._key = slice(*self.meta["key"])
+        self._mask = buckets - 1
+        self._hashes = np.frombuffer(self._mmap, "<u8", self._items, table)
+        self._starts = np.frombuffer(
+            self._mmap, "<u4", buckets + 1, table + 8 * self._items
+        )
+        self._records = np.frombuffer(
+            self._mmap, "<u4", self._items, table + 8 * self._items + 4 * (buckets + 1)
+        )
+
+    def __len__(self) -> int:
+        """
+        Count the indexed records.
+
+        Returns:
+            int: The number of records of the attribute table, excluding deleted ones.
+        """
+        return self._items
+
+    def _find(self, value) -> List[bytes]:
+        """
+        Find the raw records holding a value.
+
+        Parameters:
+            value (Any): The value, compared as text with the padding of the column removed.
+
+        Returns:
+            List[bytes]: The matching `.dbf` records, in the order of the layer.
+        """
+        key = str(value).encode(self.meta["encoding"])
+        digest = _hash(key)
+        start, end = self._starts[
+            digest & self._mask : (digest & self._mask) + 2
+        ].tolist()
+        found = []
+
+        for item in self._records[start:end][
+            self._hashes[start:end] == digest
+        ].tolist():
+            offset = HEADER.size + item * self._record_length
+            record = self._mmap[offset : offset + self._record_length]
+            if record[self._key].strip(b" \0") == key:
+                found.append(record)
+
+        return found
+
+    def lookup(self, value) -> List[Dict]:
+        """
+        Get the attributes of the records holding a value, such as the records of a property code.
+
+        Parameters:
+            value (Any): The value, compared as text with the padding of the column removed.
+
+        Returns:
+            List[Dict]: The attributes of each matching record, in the order of the layer, or an empty list.
+        """
+        return [
+            parse_record(self.fields, record, self.meta["encoding"])
+            for record in self._find(value)
+        ]
+
+    def __contains__(self, value) -> bool:
+        """
+        Check whether any record holds a value.
+
+        Parameters:
+            value (Any): The value, compared as text with the padding of the column removed.
+
+        Returns:
+            bool: True if at least one record matches.
+        """
+        return bool(self._find(value))
+
+    def _unmap(self):
+        """
+        Drop the views of the hash table, so the file can be closed.
+
+        Returns:
+            None
+        """
+        self._hashes = self._starts = self._records = None
+
+
+def attribute_index_path(
+    source: Path | str, column: str = "cod_imovel", layer: str = None
+) -> Path:
+    """
+    Get the default path of the attribute index of a downloaded polygon.
+
+    Parameters:
+        source (Path | str): The `.zip` file downloaded by `Sicar.download_state`.
+        column (str, optional): The indexed column. Defaults to `cod_imovel`.
+        layer (str, optional): The indexed layer when the archive has more than one.
+
+    Returns:
+        Path: `<source stem>.<column>.idx`, or `<source stem>.<layer>.<column>.idx`, next to the source.
+    """
+    source = Path(source)
+    name = source.stem if layer is None else f"{source.stem}.{layer}"
+    return source.with_name(f"{name}.{column}.idx")
+
+
+def build_attribute_index(
+    source: Path | str,
+    column: str = "cod_imovel",
+    path: Path | str = None,
+    layer: str = None,
+) -> AttributeIndex:
+    """
+    Build the attribute index of a downloaded polygon.
+
+    Parameters:
+        source (Path | str): The `.zip` file downloaded by `Sicar.download_state`.
+        column (str, optional): The column to index. Defaults to `cod_imovel`.
+        path (Path | str, optional): The index file. Defaults to `attribute_index_path(source, column, layer)`.
+        layer (str, optional): The layer to index when the archive has more than one. Defaults to the first.
+
+    Returns:
+        AttributeIndex: The new index, opened.
+
+    Raises:
+        InvalidShapefileException: If the downloaded file does not hold a valid shapefile or has no such column.
+
+    Note:
+        The records are streamed from the zip file into the index, so only the 12-byte hash and position of each
+        record are kept in memory. The index is written to a temporary file and moved into place, so readers never
+        see a partial index.
+    """
+    source = Path(source)
+    path = attribute_index_path(source, column, layer) if path is None else Path(path)
+    described = describe_source(source, column=column, layer=layer)
+
+    with write_index(path) as file, ShapefileReader(source, layer) as reader:
+        offset = 1
+
+        for field in reader.fields:
+            if field.name == column:
+                break
+            offset += field.length
+        else:
+            raise InvalidShapefileException(f"No column '{column}'")
+
+        key = slice(offset, offset + field.length)
+        hashes = array("Q")
+
+        for _, record, _ in reader.records():
+            hashes.append(_hash(record[key].strip(b" \0")))
+            file.write(record)
+
+        items = len(hashes)
+        buckets = 1 << max(items - 1, 0).bit_length()
+        digests = np.frombuffer(hashes, dtype="<u8")
+        order = np.argsort(digests & np.uint64(buckets - 1), kind="stable")
+        starts = np.searchsorted(
+            digests[order] & np.uint64(buckets - 1), np.arange(buckets + 1)
+        )
+
+        file.write(bytes(-file.tell() % 8))
+        table = file.tell()
+        file.write(digests[order].astype("<u8").tobytes())
+        file.write(starts.astype("<u4").tobytes())
+        file.write(order.astype("<u4").tobytes())
+
+        write_meta(
+            file,
+            AttributeIndex._MAGIC,
+            AttributeIndex._VERSION,
+            {
+                "layer": reader.layer,
+                "column": column,
+                "key": [key.start, key.stop],
+                "fields": reader.fields,
+                "encoding": reader.encoding,
+                "source": described,
+            },
+            reader.record_length,
+            items,
+            buckets,
+            table,
+        )
+
+    return AttributeIndex(path)
+
+
+def open_attribute_index(
+    source: Path | str,
+    column: str = "cod_imovel",
+    path: Path | str = None,
+    layer: str = None,
+) -> AttributeIndex:
+    """
+    Open the attribute index of a downloaded polygon, building it when missing or outdated.
+
+    Parameters:
+        source (Path | str): The `.zip` file downloaded by `Sicar.download_state`.
+        column (str, optional): The column to index. Defaults to `cod_imovel`.
+        path (Path | str, optional): The index file. Defaults to `attribute_index_path(source, column, layer)`.
+        layer (str, optional): The layer to index when the archive has more than one. Defaults to the first.
+
+    Returns:
+        AttributeIndex: The index, opened.
+
+    Raises:
+        InvalidShapefileException: If the index must be built and the downloaded file does not hold a valid
+            shapefile or has no such column.
+
+    Note:
+        An index is rebuilt when its file is invalid or when the size or modification time of the source changed,
+        for instance after `sync_state` downloaded a new release.
+    """
+    source = Path(source)
+    path = attribute_index_path(source, column, layer) if path is None else Path(path)
+
+    return open_or_build(
+        AttributeIndex,
+        path,
+        describe_source(source, column=column, layer=layer),
+        lambda: build_attribute_index(source, column, path, layer),
+    )
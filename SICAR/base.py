@@ -0,0 +1,322 @@
+"""
+Base SICAR Class Module.
+
+This module defines the parts shared by the synchronous and the asynchronous clients of the Sicar system: their
+configuration, the parsing of states, polygons and release dates, the metric labels and the reporting of results.
+
+Classes:
+    BaseSicar: Base class of `Sicar` and `AsyncSicar`.
+"""
+
+import os
+import ssl
+import functools
+import httpx
+from abc import ABC, abstractmethod
+from typing import Dict
+from pathlib import Path
+import warnings
+
+warnings.filterwarnings(
+    "ignore", category=DeprecationWarning, message="ssl.PROTOCOL_TLSv1_2 is deprecated"
+)
+
+from SICAR.drivers import Captcha, OcrExecutor
+from SICAR.state import State
+from SICAR.url import Url
+from SICAR.polygon import Polygon
+from SICAR.cache import ReleaseDateCache
+from SICAR.connections import ConnectionStats
+from SICAR.retry import RetryPolicy, TokenBucket
+from SICAR.metrics import Metrics
+from SICAR.events import (
+    Events,
+    PrintListener,
+    TqdmListener,
+    DownloadFinished,
+    DownloadFailed,
+)
+from SICAR.release_dates import scan_release_dates, soup_release_dates
+from SICAR.exceptions import PolygonNotValidException, StateCodeNotValidException
+
+
+class BaseSicar(Url, ABC):
+    """
+    Base class of `Sicar` and `AsyncSicar`.
+
+    It holds the configuration and the helpers that do not depend on how requests are sent. Subclasses provide the
+    HTTP client with `_new_session` and the methods doing I/O, either blocking or as coroutines.
+
+    Attributes:
+        _driver (Captcha): The driver used for handling captchas.
+        _release_dates (ReleaseDateCache | None): The cache used by `get_release_dates`, if any.
+        metrics (Metrics): The registry of captcha, OCR and download metrics, shared with workers.
+        _events (Events): The listeners receiving download events, shared with workers.
+        _HEADERS (Dict): Default headers sent with every HTTP request.
+        _LIMITS (httpx.Limits): Default connection pool limits of each session.
+    """
+
+    _HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    }
+
+    _LIMITS = httpx.Limits(
+        max_connections=10, max_keepalive_connections=10, keepalive_expiry=30.0
+    )
+
+    def _configure(
+        self,
+        driver: Captcha,
+        headers: Dict,
+        release_dates: ReleaseDateCache,
+        limits: httpx.Limits,
+        http2: bool,
+        retry: RetryPolicy,
+        limiter: TokenBucket,
+        metrics: Metrics,
+        listeners: list,
+        base_url: str,
+    ):
+        """
+        Set the attributes shared by `Sicar` and `AsyncSicar` and create the session, without requesting cookies.
+
+        Parameters:
+            driver (Captcha): The driver class used for handling captchas, or a driver instance.
+            headers (Dict): Additional headers for HTTP requests.
+            release_dates (ReleaseDateCache): A cache for `get_release_dates`, or None.
+            limits (httpx.Limits): Connection pool limits of each session, or None for `_LIMITS`.
+            http2 (bool): Whether to negotiate HTTP/2.
+            retry (RetryPolicy): The policy deciding the delay between download attempts, or None for `RetryPolicy()`.
+            limiter (TokenBucket): A rate limiter taken before every request, or None.
+            metrics (Metrics): The registry recording latencies and rates, or None to create one.
+            listeners (list): Callables receiving the download events, or None for a `tqdm` progress bar.
+            base_url (str): The base URL of the SICAR system, or None for `Url._BASE`.
+
+        Returns:
+            None
+        """
+        self._driver = driver if isinstance(driver, Captcha) else driver()
+        self._headers = headers
+        self._release_dates = release_dates
+        self._limits = limits or self._LIMITS
+        self._http2 = http2
+        self._connections = ConnectionStats()
+        self._retry = retry or RetryPolicy()
+        self._limiter = limiter
+        self.metrics = metrics or Metrics()
+        self._events = Events([TqdmListener()] if listeners is None else listeners)
+        if base_url:
+            self._set_base(base_url)
+        self._create_session(headers=headers)
+
+    @staticmethod
+    def _parse_state(state: State | str) -> State:
+        """
+        Convert a state abbreviation into a `State` enum value.
+
+        Parameters:
+            state (State | str): The state as a `State` enum value or a string representing the state's abbreviation.
+
+        Returns:
+            State: The matching `State` enum value.
+
+        Raises:
+            StateCodeNotValidException: If the state abbreviation is not valid.
+        """
+        if isinstance(state, str) and not isinstance(state, State):
+            try:
+                return State(state.upper())
+            except ValueError as error:
+                raise StateCodeNotValidException(state) from error
+        return state
+
+    @staticmethod
+    def _parse_polygon(polygon: Polygon | str) -> Polygon:
+        """
+        Convert a polygon name into a `Polygon` enum value.
+
+        Parameters:
+            polygon (Polygon | str): The polygon as a `Polygon` enum value or a string representing the polygon's name.
+
+        Returns:
+            Polygon: The matching `Polygon` enum value.
+
+        Raises:
+            PolygonNotValidException: If the polygon name is not valid.
+        """
+        if isinstance(polygon, str) and not isinstance(polygon, Polygon):
+            try:
+                return Polygon(polygon.upper())
+            except ValueError as error:
+                raise PolygonNotValidException(polygon) from error
+        return polygon
+
+    def _parse_release_dates(self, response: bytes) -> Dict:
+        """
+        Parse raw html getting states and release date.
+
+        Parameters:
+            response (bytes): The request content as byte string containing html page from SICAR with release dates per state
+
+        Returns:
+            Dict: A dict containing state sign as keys and parsed update date as value.
+
+        Note:
+            The page is scanned with `scan_release_dates`. If the scanner finds no state, for instance after a
+            change in the page layout, it is parsed again with BeautifulSoup.
+        """
+        return scan_release_dates(response) or soup_release_dates(response)
+
+    def _create_session(self, headers: Dict = None):
+        """
+        Create a new session for making HTTP requests.
+
+        Parameters:
+            headers (Dict): Additional headers for the session. Default is None.
+
+        Note:
+            The SSL certificate verification is disabled by default using `verify=context`. This allows connections to servers
+            with self-signed or invalid certificates. Disabling SSL certificate verification can expose your application to
+            security risks, such as man-in-the-middle attacks. If the server has a valid SSL certificate issued by a trusted
+            certificate authority, you can remove the `verify=context` parameter to enable SSL certificate verification by
+            default.
+
+        Returns:
+            None
+        """
+        self._session = self._new_session(headers=headers)
+
+    @staticmethod
+    @functools.cache
+    def _ssl_context() -> ssl.SSLContext:
+        """
+        Build the SSL context used to connect to the SICAR system.
+
+        Returns:
+            ssl.SSLContext: A TLSv1.2 context restricted to the ciphers accepted by the server.
+
+        Note:
+            The context is built once and shared by every session, including worker sessions, instead of being
+            rebuilt for each new connection pool.
+        """
+        context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+        context.set_ciphers("RSA+AESGCM:RSA+AES:!aNULL:!MD5:!DSS")
+        return context
+
+    @abstractmethod
+    def _new_session(self, headers: Dict = None):
+        """
+        Build a new HTTP client configured for the SICAR system.
+
+        Parameters:
+            headers (Dict): Additional headers for the session. Default is None, which uses `_HEADERS`.
+
+        Returns:
+            httpx.Client | httpx.AsyncClient: The configured HTTP client.
+        """
+
+    def connection_stats(self) -> Dict:
+        """
+        Get the number of requests sent and connections opened by this instance and its workers.
+
+        Returns:
+            Dict: The `requests`, `connections` and `tls_handshakes` counters. With keep-alive, `connections`
+            stays well below `requests`.
+        """
+        return self._connections.snapshot()
+
+    def _labels(self, state: State) -> Dict:
+        """
+        Build the metric labels of a state downloaded with this instance's driver.
+
+        Parameters:
+            state (State): The state being downloaded.
+
+        Returns:
+            Dict: The `driver` and `state` labels. With an `OcrExecutor`, the driver is the class it runs, so
+            drivers can be compared whether or not they run in a process pool.
+        """
+        driver = (
+            self._driver.driver
+            if isinstance(self._driver, OcrExecutor)
+            else type(self._driver)
+        )
+        return {"driver": driver.__name__, "state": state.value}
+
+    def _debug_events(self, debug: bool) -> Events:
+        """
+        Get the listeners of a download, adding a `PrintListener` in debug mode.
+
+        Parameters:
+            debug (bool): Whether to print debug information.
+
+        Returns:
+            Events: The listeners receiving the download events.
+        """
+        return self._events.with_listener(PrintListener()) if debug else self._events
+
+    @staticmethod
+    def _polygon_path(folder: Path | str, state: State, polygon: Polygon) -> Path:
+        """
+        Build the path where a polygon of a state is saved.
+
+        Parameters:
+            folder (Path | str): The folder path where the polygon will be saved.
+            state (State): The state of the polygon.
+            polygon (Polygon): The polygon.
+
+        Returns:
+            Path: The path `<folder>/<state>_<polygon>.zip`.
+        """
+        return Path(os.path.join(folder, f"{state.value}_{polygon.value}")).with_suffix(
+            ".zip"
+        )
+
+    def _record_success(
+        self, events: Events, state: State, polygon: Polygon, path: Path, attempts: int
+    ):
+        """
+        Report a successful download to the metrics and the listeners.
+
+        Parameters:
+            events (Events): The listeners of the download.
+            state (State): The state downloaded.
+            polygon (Polygon): The polygon downloaded.
+            path (Path): The downloaded file.
+            attempts (int): The number of attempts the download needed.
+
+        Returns:
+            None
+        """
+        labels = self._labels(state)
+        self.metrics.observe("sicar_attempts_per_success", attempts, **labels)
+        self.metrics.inc("sicar_downloads_total", result="success", **labels)
+        events.emit(DownloadFinished(state, polygon, path, attempts))
+
+    def _record_failure(
+        self,
+        events: Events,
+        state: State,
+        polygon: Polygon,
+        attempts: int,
+        error: Exception = None,
+    ):
+        """
+        Report a download whose attempts all failed to the metrics and the listeners.
+
+        Parameters:
+            events (Events): The listeners of the download.
+            state (State): The state that failed.
+            polygon (Polygon): The polygon that failed.
+            attempts (int): The number of attempts made.
+            error (Exception, optional): The unexpected error that stopped the download. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.metrics.inc(
+            "sicar_downloads_total", result="failure", **self._labels(state)
+        )
+        events.emit(DownloadFailed(state, polygon, attempts, error))
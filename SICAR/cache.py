@@ -0,0 +1,184 @@
+"""
+Release Date Cache Module.
+
+This module provides a cache for the release dates published by SICAR, so frequent calls to
+`get_release_dates` cost one conditional request or none.
+
+Classes:
+    ReleaseDateCache: Time-to-live cache of release dates, kept in memory and optionally on disk.
+"""
+
+import os
+import json
+import time
+import httpx
+import tempfile
+from typing import Dict
+from pathlib import Path
+
+from SICAR.state import State
+
+
+class ReleaseDateCache:
+    """
+    Time-to-live cache of release dates, kept in memory and optionally on disk.
+
+    While an entry is younger than `ttl` seconds it is returned without any request. Once it expires, the
+    `ETag` and `Last-Modified` validators of the cached response are sent back as `If-None-Match` and
+    `If-Modified-Since`, so an unchanged page is answered with `304 Not Modified` and no body.
+
+    When `path` is given, the entry is shared through a JSON file, so many processes polling the release dates
+    reuse each other's responses.
+
+    Attributes:
+        ttl (float): Seconds during which cached release dates are returned without a request.
+        path (Path | None): The JSON file shared between processes, if any.
+    """
+
+    def __init__(self, ttl: float = 300, path: Path | str = None):
+        """
+        Initialize an instance of the ReleaseDateCache class.
+
+        Parameters:
+            ttl (float): Seconds during which cached release dates are returned without a request. Default is 300.
+            path (Path | str): A JSON file to share the cache between processes. Default is None (memory only).
+
+        Returns:
+            None
+        """
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self._entry = None
+
+    def _load(self) -> Dict | None:
+        """
+        Get the most recent entry, from memory or from the shared file.
+
+        Returns:
+            Dict | None: The entry with `dates`, `fetched_at`, `etag` and `last_modified` keys, or None.
+        """
+        if self.path:
+            try:
+                entry = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                entry = None
+
+            if entry and (
+                self._entry is None or entry["fetched_at"] > self._entry["fetched_at"]
+            ):
+                self._entry = entry
+
+        return self._entry
+
+    def _save(self, entry: Dict):
+        """
+        Keep an entry in memory and write it atomically to the shared file.
+
+        Each write goes through its own temporary file in the same folder, so threads and processes saving at the
+        same time never write to the same file.
+
+        Parameters:
+            entry (Dict): The entry to keep.
+
+        Returns:
+            None
+        """
+        self._entry = entry
+
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(
+                prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent
+            )
+
+            try:
+                with os.fdopen(descriptor, "w") as file:
+                    file.write(json.dumps(entry))
+
+                os.replace(temporary, self.path)
+            except BaseException:
+                Path(temporary).unlink(missing_ok=True)
+                raise
+
+    @staticmethod
+    def _dates(entry: Dict) -> Dict:
+        """
+        Convert the stored release dates back to a dict keyed by `State`.
+
+        Parameters:
+            entry (Dict): The cache entry.
+
+        Returns:
+            Dict: A dict containing state sign as keys and release date as value.
+        """
+        return {State(state): date for state, date in entry["dates"].items()}
+
+    def get(self) -> Dict | None:
+        """
+        Get the cached release dates if they have not expired.
+
+        Returns:
+            Dict | None: The release dates, or None if there is no fresh entry.
+        """
+        entry = self._load()
+
+        if entry is None or time.time() - entry["fetched_at"] >= self.ttl:
+            return None
+
+        return self._dates(entry)
+
+    def headers(self) -> Dict:
+        """
+        Build the conditional request headers for the cached response.
+
+        Returns:
+            Dict: `If-None-Match` and/or `If-Modified-Since` headers, or an empty dict without a cached response.
+        """
+        entry = self._load()
+        headers = {}
+
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        return headers
+
+    def store(self, dates: Dict, response: httpx.Response) -> Dict:
+        """
+        Store freshly parsed release dates with the validators of their response.
+
+        Parameters:
+            dates (Dict): The release dates parsed from the response.
+            response (httpx.Response): The response the release dates were parsed from.
+
+        Returns:
+            Dict: The stored release dates.
+        """
+        self._save(
+            {
+                "dates": {state.value: date for state, date in dates.items()},
+                "fetched_at": time.time(),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        )
+        return dates
+
+    def revalidate(self) -> Dict:
+        """
+        Mark the cached release dates as fresh after a `304 Not Modified` response.
+
+        Returns:
+            Dict | None: The cached release dates, or None if there is no entry to revalidate, for instance when
+            the shared file was removed after the conditional request was sent. The release dates must then be
+            requested again without validators.
+        """
+        entry = self._load()
+
+        if entry is None:
+            return None
+
+        entry = dict(entry, fetched_at=time.time())
+        self._save(entry)
+        return self._dates(entry)
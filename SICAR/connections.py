@@ -0,0 +1,127 @@
+"""
+Connection Statistics Module.
+
+This module counts the requests sent and the connections opened by the HTTP sessions of a Sicar instance, so
+connection reuse can be checked.
+
+Classes:
+    ConnectionStats: Counters fed by an httpx request hook and the httpcore `trace` extension.
+"""
+
+import threading
+import httpx
+from typing import Dict
+
+
+class ConnectionStats:
+    """
+    Counters fed by an httpx request hook and the httpcore `trace` extension.
+
+    `hook` (or `ahook` for asynchronous clients) is installed as a `request` event hook. It counts the request
+    and attaches a `trace` callback, which httpcore calls on each step of the connection. A new TCP connection
+    and a TLS handshake only show up when the pool could not reuse an idle connection, so `requests` growing
+    faster than `connections` confirms keep-alive is working.
+
+    Attributes:
+        requests (int): The number of requests sent.
+        connections (int): The number of TCP connections opened.
+        tls_handshakes (int): The number of TLS handshakes completed.
+    """
+
+    _EVENTS = {
+        "connection.connect_tcp.complete": "connections",
+        "connection.start_tls.complete": "tls_handshakes",
+    }
+    """Trace events counted, mapped to the counter they increment."""
+
+    def __init__(self):
+        """
+        Initialize an instance of the ConnectionStats class with every counter at zero.
+
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+
+    def _increment(self, counter: str):
+        """
+        Increment a counter.
+
+        Parameters:
+            counter (str): The name of the counter.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def trace(self, event: str, info: Dict):
+        """
+        Receive a trace event from httpcore.
+
+        Parameters:
+            event (str): The name of the event, such as `connection.connect_tcp.complete`.
+            info (Dict): The event details.
+
+        Returns:
+            None
+        """
+        if event in self._EVENTS:
+            self._increment(self._EVENTS[event])
+
+    async def atrace(self, event: str, info: Dict):
+        """
+        Receive a trace event from the asynchronous httpcore pool.
+
+        Parameters:
+            event (str): The name of the event, such as `connection.connect_tcp.complete`.
+            info (Dict): The event details.
+
+        Returns:
+            None
+        """
+        self.trace(event, info)
+
+    def hook(self, request: httpx.Request):
+        """
+        Count a request and attach the `trace` extension to it.
+
+        Parameters:
+            request (httpx.Request): The request about to be sent.
+
+        Returns:
+            None
+        """
+        self._increment("requests")
+        request.extensions["trace"] = self.trace
+
+    async def ahook(self, request: httpx.Request):
+        """
+        Count a request of an asynchronous client and attach the `trace` extension to it.
+
+        Parameters:
+            request (httpx.Request): The request about to be sent.
+
+        Returns:
+            None
+        """
+        self._increment("requests")
+        request.extensions["trace"] = self.atrace
+
+    def snapshot(self) -> Dict:
+        """
+        Get the current value of the counters.
+
+        Returns:
+            Dict: The `requests`, `connections` and `tls_handshakes` counters.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections": self.connections,
+                "tls_handshakes": self.tls_handshakes,
+            }
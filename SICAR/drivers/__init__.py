@@ -1,9 +1,78 @@
 """Drivers."""
 
-from SICAR.drivers.captcha import Captcha
-from SICAR.drivers.tesseract import Tesseract
+import importlib
+import importlib.util
 
-try:
-    from SICAR.drivers.paddle import Paddle
-except ImportError:
-    pass
+_EXPORTS = {
+    "Captcha": "SICAR.drivers.captcha",
+    "Tesseract": "SICAR.drivers.tesseract",
+    "TesseractAPI": "SICAR.drivers.tesseract_api",
+    "OcrExecutor": "SICAR.drivers.executor",
+    "Paddle": "SICAR.drivers.paddle",
+}
+"""Drivers and the module defining each one, imported on first access."""
+
+_EXTRAS = {
+    "Paddle": ("paddleocr", "paddle"),
+}
+"""Drivers that need an optional dependency: the module it provides and the extra that installs it."""
+
+
+def _available(name: str) -> bool:
+    """
+    Check whether the optional dependency of a driver is installed, without importing it.
+
+    Parameters:
+        name (str): The driver.
+
+    Returns:
+        bool: False if the driver needs a module that cannot be found, True otherwise.
+    """
+    if name not in _EXTRAS:
+        return True
+
+    return importlib.util.find_spec(_EXTRAS[name][0]) is not None
+
+
+__all__ = [name for name in _EXPORTS if _available(name)]
+
+
+def __getattr__(name: str):
+    """
+    Import a driver on first access (PEP 562), so unused OCR engines such as PaddleOCR are never loaded.
+
+    Parameters:
+        name (str): The attribute being accessed.
+
+    Returns:
+        Any: The driver class exported under `name`.
+
+    Raises:
+        AttributeError: If `name` is not exported by the package, or if the driver's optional dependencies are not
+            installed, e.g. `Paddle` without the `paddle` extra, so `hasattr` reports the driver as missing.
+    """
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        module = importlib.import_module(_EXPORTS[name])
+    except ImportError as error:
+        extra = _EXTRAS.get(name, (None, "all"))[1]
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}: {error}, "
+            f"install it with `pip install SICAR[{extra}]`"
+        ) from error
+
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """
+    List the module attributes, including the drivers not imported yet whose dependencies are installed.
+
+    Returns:
+        list: The attribute names.
+    """
+    return sorted(set(globals()) | set(__all__))
@@ -8,9 +8,7 @@ Classes:
 """
 
 from abc import ABC, abstractmethod
-import tempfile
 from PIL import Image
-import matplotlib.image as mpimg
 import numpy as np
 import cv2
 
@@ -24,9 +22,16 @@ class Captcha(ABC):
     Methods:
         get_captcha(captcha) -> str:
             Abstract method to get the Captcha value.
+        get_captcha_batch(captchas) -> list[str]:
+            Get the Captcha values of many captchas at once.
 
+    Attributes:
+        _JPEG_QUALITY (int): JPEG quality used to re-encode the captcha before OCR.
     """
 
+    _JPEG_QUALITY = 75
+    """JPEG quality used to re-encode the captcha, the OCR preprocessing is tuned to its compression artifacts."""
+
     @abstractmethod
     def get_captcha(self, captcha: Image) -> str:
         """
@@ -40,35 +45,63 @@ class Captcha(ABC):
 
         """
 
-    def _png_to_jpg(self, captcha: Image) -> np.ndarray:
+    def get_captcha_batch(self, captchas: list[Image.Image]) -> list[str]:
         """
-        Convert a PNG image to a JPEG image represented as a NumPy array.
+        Get the Captcha values of many captchas at once.
 
         Parameters:
-            captcha (Image): The PNG image to convert.
+            captchas (list[Image]): The captcha images to process.
 
         Returns:
-            np.ndarray: The converted JPEG image represented as a NumPy array.
+            list[str]: The processed Captcha values, in the same order as the images.
 
         Note:
-            This method saves the input PNG image to a temporary file with a ".png" suffix. It then converts the PNG image
-            to a JPEG image using matplotlib's `imsave` function, with the grayscale colormap. The resulting JPEG image is
-            saved to another temporary file with a ".jpg" suffix.
+            The default implementation calls `get_captcha` for each image. Drivers able to recognize many images
+            in a single inference call should override it.
+        """
+        return [self.get_captcha(captcha) for captcha in captchas]
+
+    def _png_to_jpg(self, captcha: Image.Image | bytes) -> np.ndarray:
+        """
+        Convert a PNG image to a JPEG image represented as a NumPy array.
+
+        Parameters:
+            captcha (Image | bytes): The PNG image to convert, either decoded or as the raw bytes downloaded from SICAR.
+
+        Returns:
+            np.ndarray: The converted JPEG image represented as a NumPy array in BGR order.
 
-            The saved JPEG image is then loaded using OpenCV's `imread` function, and the image data is returned as a NumPy
-            array.
+        Note:
+            The conversion runs in memory. The image is decoded into a BGRA array, flattened on a white background
+            and re-encoded as JPEG with OpenCV. The JPEG round trip is kept on purpose: the thresholding in
+            `_improve_image` depends on its artifacts, so the result matches the former file-based conversion.
+            The JPEG is decoded in color and converted to grayscale by `_process_captcha`, since decoding it
+            straight to grayscale gives slightly different pixels.
+            Drivers receive the `PIL.Image` returned by `Sicar._download_captcha`, which is decoded lazily, so the
+            PNG is decoded once either way. Raw bytes are accepted for callers holding the downloaded body.
         """
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as png:
-            with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as jpg:
-                captcha.save(png.name)
-                mpimg.imsave(
-                    jpg.name,
-                    mpimg.imread(png.name, 0),
-                    cmap="gray",
-                    vmin=0,
-                    vmax=255,
-                )
-                return cv2.imread(jpg.name, -1)
+        if isinstance(captcha, (bytes, bytearray)):
+            image = cv2.imdecode(np.frombuffer(captcha, np.uint8), cv2.IMREAD_UNCHANGED)
+            if image is None:
+                raise ValueError("Captcha bytes are not a valid image")
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGRA)
+            elif image.shape[2] == 3:
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+        else:
+            image = cv2.cvtColor(
+                np.asarray(captcha.convert("RGBA")), cv2.COLOR_RGBA2BGRA
+            )
+
+        alpha = image[..., 3:].astype(np.uint16)
+        image = ((image[..., :3] * alpha + 255 * (255 - alpha) + 127) // 255).astype(
+            np.uint8
+        )
+
+        _, jpg = cv2.imencode(
+            ".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self._JPEG_QUALITY]
+        )
+        return cv2.imdecode(jpg, cv2.IMREAD_COLOR)
 
     def _improve_image(self, image: np.ndarray):
         """
@@ -91,12 +124,12 @@ class Captcha(ABC):
         image = cv2.erode(image, np.ones((2, 1), np.uint8), iterations=2)
         return image
 
-    def _process_captcha(self, captcha: Image):
+    def _process_captcha(self, captcha: Image.Image | bytes):
         """
         Process the captcha image to enhance its quality for OCR.
 
         Parameters:
-            captcha (Image): The captcha image.
+            captcha (Image | bytes): The captcha image, either decoded or as raw bytes.
 
         Returns:
             np.ndarray: The processed image as a NumPy array.
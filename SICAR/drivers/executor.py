@@ -0,0 +1,166 @@
+"""
+OCR Executor Module.
+
+This module provides a Captcha driver that solves captchas in a pool of worker processes.
+Image processing and OCR are CPU-bound and hold the GIL, so running them in processes lets the captcha stage
+scale with the number of cores.
+
+Classes:
+    OcrExecutor: Captcha driver running another driver in a `ProcessPoolExecutor`.
+"""
+
+import os
+import math
+from concurrent.futures import Future, ProcessPoolExecutor
+from PIL import Image
+
+from SICAR.drivers.captcha import Captcha
+
+_driver = None
+"""The driver instance loaded once in each worker process."""
+
+
+def _initialize(driver: type[Captcha]):
+    """
+    Load the driver in a worker process.
+
+    Parameters:
+        driver (type[Captcha]): The driver class to instantiate.
+
+    Returns:
+        None
+    """
+    global _driver
+    _driver = driver()
+
+
+def _solve(captcha: Image.Image) -> str:
+    """
+    Solve a captcha with the driver of the worker process.
+
+    Parameters:
+        captcha (Image): The captcha image.
+
+    Returns:
+        str: The captcha value recognized by the driver.
+    """
+    return _driver.get_captcha(captcha)
+
+
+def _solve_batch(captchas: list[Image.Image]) -> list[str]:
+    """
+    Solve many captchas with the driver of the worker process.
+
+    Parameters:
+        captchas (list[Image]): The captcha images.
+
+    Returns:
+        list[str]: The captcha values recognized by the driver.
+    """
+    return _driver.get_captcha_batch(captchas)
+
+
+class OcrExecutor(Captcha):
+    """
+    Captcha driver running another driver in a `ProcessPoolExecutor`.
+
+    Each worker process instantiates the wrapped driver once, so models such as PaddleOCR or a Tesseract engine
+    are loaded a single time per process. `submit` returns a `Future` to collect answers asynchronously, while
+    `get_captcha` and `get_captcha_batch` keep the regular driver interface so the executor can be passed to
+    `Sicar` as its driver instance.
+
+    Attributes:
+        driver (type[Captcha]): The driver class run by the worker processes, which names the `driver` label of
+            the metrics.
+        _workers (int): The number of worker processes.
+        _pool (ProcessPoolExecutor): The pool running the wrapped driver.
+    """
+
+    def __init__(self, driver: type[Captcha], workers: int = None):
+        """
+        Initialize an instance of the OcrExecutor class.
+
+        Parameters:
+            driver (type[Captcha]): The driver class loaded in each worker process.
+            workers (int): The number of worker processes. Default is None, which uses the number of CPUs.
+
+        Returns:
+            None
+        """
+        self.driver = driver
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=_initialize, initargs=(driver,)
+        )
+        self._workers = workers or os.cpu_count() or 1
+
+    def __enter__(self) -> "OcrExecutor":
+        """
+        Return this instance when entering the context.
+
+        Returns:
+            OcrExecutor: This instance.
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Shut down the worker processes when leaving the context.
+
+        Returns:
+            None
+        """
+        self.shutdown()
+
+    def shutdown(self):
+        """
+        Shut down the worker processes.
+
+        Returns:
+            None
+        """
+        self._pool.shutdown()
+
+    def submit(self, captcha: Image.Image) -> Future:
+        """
+        Submit a captcha to the pool.
+
+        Parameters:
+            captcha (Image): The captcha image.
+
+        Returns:
+            Future: A future resolving to the captcha value.
+        """
+        return self._pool.submit(_solve, captcha)
+
+    def get_captcha(self, captcha: Image.Image) -> str:
+        """
+        Solve a captcha in a worker process and wait for the answer.
+
+        Parameters:
+            captcha (Image): The captcha image.
+
+        Returns:
+            str: The captcha value recognized by the driver.
+        """
+        return self.submit(captcha).result()
+
+    def get_captcha_batch(self, captchas: list[Image.Image]) -> list[str]:
+        """
+        Solve many captchas, spreading them over the worker processes.
+
+        Parameters:
+            captchas (list[Image]): The captcha images.
+
+        Returns:
+            list[str]: The captcha values, in the same order as the images.
+
+        Note:
+            The images are split into one contiguous chunk per worker and each chunk is solved with the wrapped
+            driver's `get_captcha_batch`, so drivers with batched inference keep that benefit.
+        """
+        size = max(math.ceil(len(captchas) / self._workers), 1)
+        futures = [
+            self._pool.submit(_solve_batch, captchas[index : index + size])
+            for index in range(0, len(captchas), size)
+        ]
+        return [captcha for future in futures for captcha in future.result()]
@@ -14,6 +14,7 @@ Classes:
 from paddleocr import PaddleOCR
 import itertools
 import re
+import cv2
 from PIL import Image
 
 from SICAR.drivers.captcha import Captcha
@@ -67,3 +68,34 @@ class Paddle(Captcha):
                 )
             )[0][0],
         )
+
+    def get_captcha_batch(self, captchas: list[Image.Image]) -> list[str]:
+        """
+        Extract text from many captcha images in a single PaddleOCR call.
+
+        Parameters:
+            captchas (list[Image]): The captcha images.
+
+        Returns:
+            list[str]: The extracted text from each captcha, in the same order as the images.
+
+        Note:
+            The processed images are converted to three channels and passed to PaddleOCR as one list, so the text
+            recognizer runs them in batches instead of paying the inference overhead once per captcha.
+        """
+        if not captchas:
+            return []
+
+        return [
+            re.sub("[^A-Za-z0-9]+", "", text)
+            for text, _ in itertools.chain.from_iterable(
+                self.ocr.ocr(
+                    [
+                        cv2.cvtColor(self._process_captcha(captcha), cv2.COLOR_GRAY2BGR)
+                        for captcha in captchas
+                    ],
+                    det=False,
+                    cls=False,
+                )
+            )
+        ]
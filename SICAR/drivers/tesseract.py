@@ -28,7 +28,18 @@ class Tesseract(Captcha):
         This driver requires the pytesseract library and Tesseract OCR to be installed.
     """
 
-    _custom_l_psm_config = r"-l eng --psm 7 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    _language = "eng"
+    """Tesseract language used to recognize captchas."""
+
+    _psm = 7
+    """Tesseract page segmentation mode, 7 treats the image as a single text line."""
+
+    _whitelist = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    """Characters Tesseract is allowed to recognize."""
+
+    _custom_l_psm_config = (
+        f"-l {_language} --psm {_psm} -c tessedit_char_whitelist={_whitelist}"
+    )
     """
     Tesseract OCR configuration string for customizing the recognition process.
 
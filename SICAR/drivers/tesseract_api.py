@@ -0,0 +1,84 @@
+"""
+Tesseract API Driver Module.
+
+This module provides an implementation of the Captcha driver that keeps Tesseract loaded in process.
+The TesseractAPI driver uses the tesserocr binding, so the `eng` traineddata is loaded once per thread instead
+of starting a `tesseract` process for every captcha.
+
+Note:
+    This driver uses the tesserocr library when it is installed and falls back to pytesseract otherwise.
+
+Classes:
+    TesseractAPI: Implementation of the Captcha driver using a persistent Tesseract API handle.
+"""
+
+import re
+import threading
+from PIL import Image
+
+from SICAR.drivers.tesseract import Tesseract
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+class TesseractAPI(Tesseract):
+    """
+    Implementation of the Captcha driver using a persistent Tesseract API handle.
+
+    Each thread gets its own `tesserocr.PyTessBaseAPI`, configured with the same language, page segmentation
+    mode and whitelist as the Tesseract driver, and reuses it for every captcha.
+
+    Note:
+        When tesserocr is not installed, the driver behaves exactly like the Tesseract driver.
+    """
+
+    def __init__(self):
+        """
+        Initialize the per-thread storage of Tesseract API handles.
+
+        Returns:
+            None
+        """
+        self._local = threading.local()
+
+    def _api(self):
+        """
+        Get the Tesseract API handle of the current thread, creating it on first use.
+
+        Returns:
+            tesserocr.PyTessBaseAPI: The API handle with the captcha configuration loaded.
+        """
+        api = getattr(self._local, "api", None)
+
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=self._language, psm=self._psm)
+            api.SetVariable("tessedit_char_whitelist", self._whitelist)
+            self._local.api = api
+
+        return api
+
+    def get_captcha(self, captcha: Image) -> str:
+        """
+        Extract text from the provided captcha image.
+
+        Parameters:
+            captcha (Image): The captcha image.
+
+        Returns:
+            str: The extracted text from the captcha.
+
+        Note:
+            This method processes the captcha image, improves its quality, and runs it through the thread's
+            Tesseract API handle. The extracted text is then cleaned using regular expressions to remove
+            non-alphanumeric characters.
+        """
+        if tesserocr is None:
+            return super().get_captcha(captcha)
+
+        api = self._api()
+        api.SetImage(Image.fromarray(self._process_captcha(captcha)))
+
+        return re.sub("[^A-Za-z0-9]+", "", api.GetUTF8Text())
@@ -0,0 +1,436 @@
+"""
+Download Events Module.
+
+This module defines the events emitted while downloading polygons and the listeners receiving them, so
+progress and debug output are optional and pluggable instead of hard-wired `print` and `tqdm` calls.
+
+Classes:
+    AttemptStarted: An attempt to download a polygon started.
+    CaptchaSolved: The driver returned a captcha value.
+    AttemptFailed: An attempt failed and another one may follow.
+    DownloadStarted: The server accepted the captcha and started sending the polygon.
+    BytesReceived: Progress of a polygon download, emitted at most once per interval.
+    DownloadFinished: A polygon was downloaded.
+    DownloadFailed: Every attempt to download a polygon failed.
+    UpToDate: A synchronized polygon did not change since its last download.
+    Events: The listeners of a Sicar instance.
+    Progress: Throttled reporter of the bytes received by one download.
+    PrintListener: Listener printing attempts and failures, used by `debug=True`.
+    TqdmListener: Listener showing a `tqdm` progress bar per download.
+"""
+
+import time
+import threading
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from SICAR.state import State
+from SICAR.polygon import Polygon
+from SICAR.retry import Failure
+
+
+class AttemptStarted(NamedTuple):
+    """
+    An attempt to download a polygon started.
+
+    Attributes:
+        state (State): The state being downloaded.
+        polygon (Polygon): The polygon being downloaded.
+        attempt (int): The number of the attempt, starting at 1.
+        tries (int): The number of attempts allowed.
+    """
+
+    state: State
+    polygon: Polygon
+    attempt: int
+    tries: int
+
+
+class CaptchaSolved(NamedTuple):
+    """
+    The driver returned a captcha value.
+
+    Attributes:
+        state (State): The state being downloaded.
+        polygon (Polygon): The polygon being downloaded.
+        attempt (int): The number of the attempt, starting at 1.
+        tries (int): The number of attempts allowed.
+        captcha (str): The captcha value.
+        valid (bool): Whether the value has the captcha length and is submitted.
+    """
+
+    state: State
+    polygon: Polygon
+    attempt: int
+    tries: int
+    captcha: str
+    valid: bool
+
+
+class AttemptFailed(NamedTuple):
+    """
+    An attempt failed and another one may follow.
+
+    Attributes:
+        state (State): The state being downloaded.
+        polygon (Polygon): The polygon being downloaded.
+        attempt (int): The number of the attempt, starting at 1.
+        tries (int): The number of attempts allowed.
+        failure (Failure): The kind of failure.
+        error (Exception | None): The exception raised by the attempt, or None for an invalid captcha.
+    """
+
+    state: State
+    polygon: Polygon
+    attempt: int
+    tries: int
+    failure: Failure
+    error: Exception | None
+
+
+class DownloadStarted(NamedTuple):
+    """
+    The server accepted the captcha and started sending the polygon.
+
+    Attributes:
+        state (State): The state being downloaded.
+        polygon (Polygon): The polygon being downloaded.
+        total (int): The size of the polygon in bytes.
+        offset (int): The bytes already received by a previous attempt.
+    """
+
+    state: State
+    polygon: Polygon
+    total: int
+    offset: int
+
+
+class BytesReceived(NamedTuple):
+    """
+    Progress of a polygon download, emitted at most once per interval.
+
+    Attributes:
+        state (State): The state being downloaded.
+        polygon (Polygon): The polygon being downloaded.
+        received (int): The bytes received so far, including the offset.
+        total (int): The size of the polygon in bytes.
+    """
+
+    state: State
+    polygon: Polygon
+    received: int
+    total: int
+
+
+class DownloadFinished(NamedTuple):
+    """
+    A polygon was downloaded.
+
+    Attributes:
+        state (State): The state downloaded.
+        polygon (Polygon): The polygon downloaded.
+        path (Path): The downloaded file, or the result of the sink when `download_state` was given one.
+        attempts (int): The number of attempts needed.
+    """
+
+    state: State
+    polygon: Polygon
+    path: Path
+    attempts: int
+
+
+class DownloadFailed(NamedTuple):
+    """
+    Every attempt to download a polygon failed.
+
+    Attributes:
+        state (State): The state that failed.
+        polygon (Polygon): The polygon that failed.
+        attempts (int): The number of attempts made, or 0 when the download stopped on an unexpected error.
+        error (Exception | None): The unexpected error that stopped the download, or None when every attempt failed.
+    """
+
+    state: State
+    polygon: Polygon
+    attempts: int
+    error: Exception | None = None
+
+
+class UpToDate(NamedTuple):
+    """
+    A synchronized polygon did not change since its last download.
+
+    Attributes:
+        state (State): The state checked.
+        polygon (Polygon): The polygon checked.
+        path (Path): The existing file.
+    """
+
+    state: State
+    polygon: Polygon
+    path: Path
+
+
+class Events:
+    """
+    The listeners of a Sicar instance.
+
+    A listener is any callable receiving an event. Listeners are called synchronously in the thread, or event
+    loop, running the download, so they should return quickly and be thread-safe when downloads run in parallel.
+
+    Attributes:
+        listeners (tuple): The callables receiving each event.
+        interval (float): Minimum seconds between two `BytesReceived` events of the same download.
+    """
+
+    def __init__(self, listeners: list[Callable] = (), interval: float = 0.5):
+        """
+        Initialize an instance of the Events class.
+
+        Parameters:
+            listeners (list[Callable]): The callables receiving each event. Default is none.
+            interval (float): Minimum seconds between two `BytesReceived` events of the same download. Default is 0.5.
+
+        Returns:
+            None
+        """
+        self.listeners = tuple(listeners)
+        self.interval = interval
+
+    def __bool__(self) -> bool:
+        """
+        Check whether there is any listener.
+
+        Returns:
+            bool: True if at least one listener is registered.
+        """
+        return bool(self.listeners)
+
+    def with_listener(self, listener: Callable) -> "Events":
+        """
+        Build a copy with one more listener.
+
+        Parameters:
+            listener (Callable): The listener to add.
+
+        Returns:
+            Events: A new instance, leaving this one unchanged.
+        """
+        return Events(self.listeners + (listener,), self.interval)
+
+    def emit(self, event: NamedTuple):
+        """
+        Send an event to every listener.
+
+        Parameters:
+            event (NamedTuple): The event.
+
+        Returns:
+            None
+        """
+        for listener in self.listeners:
+            listener(event)
+
+    def progress(
+        self, state: State, polygon: Polygon, total: int, offset: int
+    ) -> "Progress":
+        """
+        Emit `DownloadStarted` and build the progress reporter of a download.
+
+        Parameters:
+            state (State): The state being downloaded.
+            polygon (Polygon): The polygon being downloaded.
+            total (int): The size of the polygon in bytes.
+            offset (int): The bytes already received by a previous attempt.
+
+        Returns:
+            Progress: The reporter to update with each chunk received.
+        """
+        self.emit(DownloadStarted(state, polygon, total, offset))
+        return Progress(self, state, polygon, total, offset)
+
+
+class Progress:
+    """
+    Throttled reporter of the bytes received by one download.
+
+    `update` is called for every chunk but only emits a `BytesReceived` event once per `interval`, and `close`
+    emits the final count. Without listeners, updates only add to a counter.
+
+    Attributes:
+        received (int): The bytes received so far, including the offset.
+    """
+
+    def __init__(
+        self, events: Events, state: State, polygon: Polygon, total: int, offset: int
+    ):
+        """
+        Initialize an instance of the Progress class.
+
+        Parameters:
+            events (Events): The listeners to report to.
+            state (State): The state being downloaded.
+            polygon (Polygon): The polygon being downloaded.
+            total (int): The size of the polygon in bytes.
+            offset (int): The bytes already received by a previous attempt.
+
+        Returns:
+            None
+        """
+        self._events = events
+        self._state = state
+        self._polygon = polygon
+        self._total = total
+        self._next = time.monotonic() + events.interval
+        self.received = offset
+
+    def update(self, size: int):
+        """
+        Count a received chunk, emitting `BytesReceived` if the interval elapsed.
+
+        Parameters:
+            size (int): The size of the chunk in bytes.
+
+        Returns:
+            None
+        """
+        self.received += size
+
+        if not self._events:
+            return
+
+        now = time.monotonic()
+
+        if now >= self._next:
+            self._next = now + self._events.interval
+            self._emit()
+
+    def close(self):
+        """
+        Emit the final `BytesReceived` event.
+
+        Returns:
+            None
+        """
+        if self._events:
+            self._emit()
+
+    def _emit(self):
+        """
+        Emit a `BytesReceived` event with the current count.
+
+        Returns:
+            None
+        """
+        self._events.emit(
+            BytesReceived(self._state, self._polygon, self.received, self._total)
+        )
+
+
+class PrintListener:
+    """Listener printing attempts and failures, used by `debug=True`."""
+
+    def __call__(self, event: NamedTuple):
+        """
+        Print a debug line for the events of interest.
+
+        Parameters:
+            event (NamedTuple): The event.
+
+        Returns:
+            None
+        """
+        info = f"'{event.polygon.value}' for '{event.state.value}'"
+
+        if isinstance(event, CaptchaSolved):
+            remaining = event.tries - event.attempt + 1
+            if event.valid:
+                print(
+                    f"[{remaining:02d}] - Requesting {info} with captcha '{event.captcha}'"
+                )
+            else:
+                print(
+                    f"[{remaining:02d}] - Invalid captcha '{event.captcha}' to request {info}"
+                )
+        elif isinstance(event, AttemptFailed) and event.error is not None:
+            remaining = event.tries - event.attempt + 1
+            print(f"[{remaining:02d}] - {event.error} When requesting {info}")
+        elif isinstance(event, DownloadFailed) and event.error is not None:
+            print(f"Stopped requesting {info}: {event.error!r}")
+        elif isinstance(event, UpToDate):
+            print(f"{info} is up to date")
+
+
+class TqdmListener:
+    """
+    Listener showing a `tqdm` progress bar per download.
+
+    A bar is opened by `DownloadStarted`, moved by `BytesReceived` and closed once every byte is received or
+    the attempt fails.
+
+    Attributes:
+        _bars (Dict): The open bars by state and polygon.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize an instance of the TqdmListener class.
+
+        Parameters:
+            **kwargs: Extra arguments for each `tqdm` bar, such as `leave` or `position`.
+
+        Returns:
+            None
+        """
+        from tqdm import tqdm
+
+        self._tqdm = tqdm
+        self._kwargs = kwargs
+        self._bars = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: NamedTuple):
+        """
+        Update the progress bars.
+
+        Parameters:
+            event (NamedTuple): The event.
+
+        Returns:
+            None
+        """
+        key = (event.state, event.polygon)
+
+        with self._lock:
+            if isinstance(event, DownloadStarted):
+                self._close(key)
+                self._bars[key] = self._tqdm(
+                    total=event.total,
+                    initial=event.offset,
+                    unit="iB",
+                    unit_scale=True,
+                    desc=f"Downloading polygon '{event.polygon.value}' for state '{event.state.value}'",
+                    **self._kwargs,
+                )
+            elif isinstance(event, BytesReceived) and key in self._bars:
+                bar = self._bars[key]
+                bar.update(event.received - bar.n)
+                if event.received >= event.total:
+                    self._close(key)
+            elif isinstance(event, (AttemptFailed, DownloadFailed)):
+                self._close(key)
+
+    def _close(self, key: tuple):
+        """
+        Close the bar of a download, if it is open.
+
+        Parameters:
+            key (tuple): The state and polygon of the download.
+
+        Returns:
+            None
+        """
+        bar = self._bars.pop(key, None)
+
+        if bar is not None:
+            bar.close()
@@ -9,8 +9,13 @@ Classes:
     FailedToDownloadCaptchaException: Exception raised when downloading a captcha fails.
     FailedToDownloadPolygonException: Exception raised when downloading a polygon fails.
     FailedToGetReleaseDateException: Exception raised when downloading release date fails.
+    InvalidShapefileException: Exception raised when a downloaded file does not hold a valid shapefile.
+    InvalidIndexException: Exception raised when a file is not an index of the current format.
+    NoSessionAvailableException: Exception raised when no session of a pool is released in time.
 """
 
+from pathlib import Path
+
 
 class UrlNotOkException(Exception):
     """
@@ -18,19 +23,22 @@ class UrlNotOkException(Exception):
 
     Attributes:
         url (str): The problematic URL.
+        status_code (int | None): The status code of the response, if there was one.
     """
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, status_code: int = None):
         """
         Initialize an instance of UrlNotOkException.
 
         Parameters:
             url (str): The problematic URL.
+            status_code (int): The status code of the response. Default is None.
 
         Returns:
             None
         """
         self.url = url
+        self.status_code = status_code
         super().__init__(f"Oh no! Failed to access {self.url}!")
 
 
@@ -95,18 +103,27 @@ class FailedToDownloadCaptchaException(Exception):
 
 
 class FailedToDownloadPolygonException(Exception):
-    """Exception raised when downloading a polygon fails."""
+    """
+    Exception raised when downloading a polygon fails.
 
-    def __init__(self):
+    Attributes:
+        status_code (int | None): The status code of the response, if there was one.
+        content_type (str | None): The content type of the response, if it was not a zip file.
+    """
+
+    def __init__(self, status_code: int = None, content_type: str = None):
         """
         Initialize an instance of FailedToDownloadPolygonException.
 
         Parameters:
-            None
+            status_code (int): The status code of the response. Default is None.
+            content_type (str): The content type of the response. Default is None.
 
         Returns:
             None
         """
+        self.status_code = status_code
+        self.content_type = content_type
         super().__init__("Failed to download polygon!")
 
 
@@ -124,3 +141,69 @@ class FailedToGetReleaseDateException(Exception):
             None
         """
         super().__init__("Failed to get release date!")
+
+
+class InvalidShapefileException(Exception):
+    """
+    Exception raised when a downloaded file does not hold a valid shapefile.
+
+    Attributes:
+        reason (str): What is wrong with the file.
+    """
+
+    def __init__(self, reason: str):
+        """
+        Initialize an instance of InvalidShapefileException.
+
+        Parameters:
+            reason (str): What is wrong with the file.
+
+        Returns:
+            None
+        """
+        self.reason = reason
+        super().__init__(f"Invalid shapefile: {self.reason}!")
+
+
+class InvalidIndexException(Exception):
+    """
+    Exception raised when a file is not an index of the current format.
+
+    Attributes:
+        path (Path): The index file.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize an instance of InvalidIndexException.
+
+        Parameters:
+            path (Path): The index file.
+
+        Returns:
+            None
+        """
+        self.path = path
+        super().__init__(f"Invalid index: {self.path}!")
+
+
+class NoSessionAvailableException(Exception):
+    """
+    Exception raised when every session of a pool stays leased for longer than the timeout.
+
+    Attributes:
+        timeout (float): The seconds waited for a session.
+    """
+
+    def __init__(self, timeout: float):
+        """
+        Initialize an instance of NoSessionAvailableException.
+
+        Parameters:
+            timeout (float): The seconds waited for a session.
+
+        Returns:
+            None
+        """
+        self.timeout = timeout
+        super().__init__(f"No session available after {self.timeout} seconds!")
@@ -0,0 +1,423 @@
+"""
+GeoParquet Conversion Module.
+
+This module converts a polygon downloaded by `Sicar.download_state` into a GeoParquet dataset partitioned by state
+and municipality, so analytics can read only the columns and municipalities they need.
+
+Note:
+    This module requires the pyarrow library, installed with the `geoparquet` extra.
+
+Classes:
+    GeoParquetWriter: Writer of a Hive-partitioned GeoParquet dataset with bounded row groups and open files.
+
+Functions:
+    to_wkb: Encode a GeoJSON geometry as Well-Known Binary.
+    to_geoparquet: Convert a downloaded polygon into a GeoParquet dataset.
+"""
+
+import json
+import shutil
+import struct
+from pathlib import Path
+from collections import OrderedDict
+from urllib.parse import quote
+from typing import Dict, List
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from SICAR.state import State
+from SICAR.shapefile import Field, ShapefileReader
+
+SIRGAS_2000 = {
+    "$schema": "https://proj.org/schemas/v0.7/projjson.schema.json",
+    "type": "GeographicCRS",
+    "name": "SIRGAS 2000",
+    "datum": {
+        "type": "GeodeticReferenceFrame",
+        "name": "Sistema de Referencia Geocentrico para las AmericaS 2000",
+        "ellipsoid": {
+            "name": "GRS 1980",
+            "semi_major_axis": 6378137,
+            "inverse_flattening": 298.257222101,
+        },
+    },
+    "coordinate_system": {
+        "subtype": "ellipsoidal",
+        "axis": [
+            {
+                "name": "Geodetic longitude",
+                "abbreviation": "Lon",
+                "direction": "east",
+                "unit": "degree",
+            },
+            {
+                "name": "Geodetic latitude",
+                "abbreviation": "Lat",
+                "direction": "north",
+                "unit": "degree",
+            },
+        ],
+    },
+    "id": {"authority": "EPSG", "code": 4674},
+}
+"""PROJJSON of SIRGAS 2000 with longitude first, the reference system of SICAR files."""
+
+_WKB_TYPES = {
+    "Point": 1,
+    "LineString": 2,
+    "Polygon": 3,
+    "MultiPoint": 4,
+    "MultiLineString": 5,
+    "MultiPolygon": 6,
+}
+"""WKB geometry type codes by GeoJSON type."""
+
+_GEOMETRY_TYPES = {
+    1: ["Point"],
+    3: ["LineString", "MultiLineString"],
+    5: ["Polygon", "MultiPolygon"],
+    8: ["MultiPoint"],
+}
+"""GeoParquet geometry types by shape type, ignoring Z and M variants."""
+
+_HIVE_DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+"""Directory name of a null partition value, as written by Hive and Spark."""
+
+
+def _wkb_points(points: List) -> bytes:
+    """
+    Encode a sequence of points.
+
+    Parameters:
+        points (List): The (x, y) coordinates.
+
+    Returns:
+        bytes: The number of points followed by their coordinates.
+    """
+    return struct.pack(
+        f"<I{2 * len(points)}d",
+        len(points),
+        *[value for point in points for value in point],
+    )
+
+
+def _wkb_body(kind: str, coordinates) -> bytes:
+    """
+    Encode the coordinates of a geometry.
+
+    Parameters:
+        kind (str): The GeoJSON type.
+        coordinates (Any): The GeoJSON coordinates.
+
+    Returns:
+        bytes: The geometry without its byte order and type header.
+    """
+    if kind == "Point":
+        return struct.pack("<2d", *coordinates)
+    if kind == "LineString":
+        return _wkb_points(coordinates)
+    if kind == "Polygon":
+        return struct.pack("<I", len(coordinates)) + b"".join(
+            _wkb_points(ring) for ring in coordinates
+        )
+
+    member = kind[len("Multi") :]
+    return struct.pack("<I", len(coordinates)) + b"".join(
+        struct.pack("<BI", 1, _WKB_TYPES[member]) + _wkb_body(member, part)
+        for part in coordinates
+    )
+
+
+def to_wkb(geometry: Dict | None) -> bytes | None:
+    """
+    Encode a GeoJSON geometry as Well-Known Binary.
+
+    Parameters:
+        geometry (Dict | None): A geometry read by `SICAR.shapefile`.
+
+    Returns:
+        bytes | None: The little-endian WKB, or None for a null geometry.
+    """
+    if geometry is None:
+        return None
+
+    return struct.pack("<BI", 1, _WKB_TYPES[geometry["type"]]) + _wkb_body(
+        geometry["type"], geometry["coordinates"]
+    )
+
+
+def _arrow_type(field: Field, categorical: bool) -> pa.DataType:
+    """
+    Get the Arrow type of a column of the attribute table.
+
+    Parameters:
+        field (Field): The column.
+        categorical (bool): Whether text values are dictionary-encoded.
+
+    Returns:
+        pa.DataType: The type of the column.
+
+    Note:
+        Numbers of a column without decimals are `int64`, the same rule `read_features` uses to decode them.
+    """
+    if field.type in "NF":
+        return pa.float64() if field.decimals else pa.int64()
+    if field.type == "D":
+        return pa.date32()
+    if field.type == "L":
+        return pa.bool_()
+    if categorical:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+class GeoParquetWriter:
+    """
+    Writer of a Hive-partitioned GeoParquet dataset with bounded row groups and open files.
+
+    Rows are buffered per partition and written as a row group once `row_group_size` rows are buffered. When more
+    than `max_buffered_rows` rows are buffered, the largest buffer is written early, and when more than
+    `max_open_files` files are open, the least recently used one is closed; later rows of that partition go to a
+    new `part-<n>.parquet` file. Memory use is thus bounded whatever the order of the rows.
+
+    Attributes:
+        destination (Path): The root folder of the dataset.
+        schema (pa.Schema): The schema of the files, with the GeoParquet `geo` metadata.
+        row_group_size (int): The maximum number of rows of a row group.
+        files (List[Path]): The files written.
+    """
+
+    def __init__(
+        self,
+        destination: Path | str,
+        schema: pa.Schema,
+        row_group_size: int = 65536,
+        max_open_files: int = 64,
+        max_buffered_rows: int = 262144,
+    ):
+        """
+        Initialize an instance of the GeoParquetWriter class.
+
+        Parameters:
+            destination (Path | str): The root folder of the dataset.
+            schema (pa.Schema): The schema of the files, without partition columns.
+            row_group_size (int): The maximum number of rows of a row group. Default is 65536.
+            max_open_files (int): The maximum number of files open at the same time. Default is 64.
+            max_buffered_rows (int): The maximum number of rows buffered in memory. Default is 262144.
+
+        Returns:
+            None
+        """
+        self.destination = Path(destination)
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.max_open_files = max_open_files
+        self.max_buffered_rows = max_buffered_rows
+        self.files = []
+        self._buffers = {}
+        self._buffered = 0
+        self._writers = OrderedDict()
+        self._parts = {}
+
+    def _directory(self, partition: tuple) -> Path:
+        """
+        Build the folder of a partition.
+
+        Parameters:
+            partition (tuple): The (name, value) pairs of the partition.
+
+        Returns:
+            Path: The folder, with values URI-encoded as expected by `pyarrow.dataset`.
+        """
+        directory = self.destination
+
+        for name, value in partition:
+            value = _HIVE_DEFAULT_PARTITION if value in (None, "") else str(value)
+            directory /= f"{name}={quote(value, safe='')}"
+
+        return directory
+
+    def write(self, partition: tuple, row: Dict):
+        """
+        Add a row to a partition.
+
+        Parameters:
+            partition (tuple): The (name, value) pairs of the partition.
+            row (Dict): The values by column name.
+
+        Returns:
+            None
+        """
+        buffer = self._buffers.setdefault(
+            partition, {name: [] for name in self.schema.names}
+        )
+
+        for name, values in buffer.items():
+            values.append(row[name])
+
+        self._buffered += 1
+
+        if len(buffer["geometry"]) >= self.row_group_size:
+            self._flush(partition)
+        elif self._buffered > self.max_buffered_rows:
+            self._flush(
+                max(self._buffers, key=lambda key: len(self._buffers[key]["geometry"]))
+            )
+
+    def _writer(self, partition: tuple) -> pq.ParquetWriter:
+        """
+        Get the open file of a partition, opening a new part if needed.
+
+        Parameters:
+            partition (tuple): The (name, value) pairs of the partition.
+
+        Returns:
+            pq.ParquetWriter: The writer of the partition.
+        """
+        if partition in self._writers:
+            self._writers.move_to_end(partition)
+            return self._writers[partition]
+
+        if len(self._writers) >= self.max_open_files:
+            self._writers.popitem(last=False)[1].close()
+
+        part = self._parts.get(partition, 0)
+        self._parts[partition] = part + 1
+        path = self._directory(partition) / f"part-{part}.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.files.append(path)
+
+        writer = pq.ParquetWriter(
+            path,
+            self.schema,
+            use_dictionary=[
+                field.name
+                for field in self.schema
+                if pa.types.is_dictionary(field.type)
+            ],
+            compression="zstd",
+        )
+        self._writers[partition] = writer
+        return writer
+
+    def _flush(self, partition: tuple):
+        """
+        Write the buffered rows of a partition as a row group.
+
+        Parameters:
+            partition (tuple): The (name, value) pairs of the partition.
+
+        Returns:
+            None
+        """
+        buffer = self._buffers.pop(partition)
+        table = pa.table(buffer, schema=self.schema)
+        self._buffered -= table.num_rows
+        self._writer(partition).write_table(table, row_group_size=self.row_group_size)
+
+    def close(self) -> List[Path]:
+        """
+        Write the remaining rows and close every file.
+
+        Returns:
+            List[Path]: The files written.
+        """
+        for partition in list(self._buffers):
+            self._flush(partition)
+
+        while self._writers:
+            self._writers.popitem()[1].close()
+
+        return self.files
+
+
+def to_geoparquet(
+    path: Path | str,
+    destination: Path | str,
+    state: State = None,
+    layer: str = None,
+    row_group_size: int = 65536,
+    categorical: List[str] = None,
+    max_open_files: int = 64,
+) -> List[Path]:
+    """
+    Convert a downloaded polygon into a GeoParquet dataset.
+
+    Parameters:
+        path (Path | str): The `.zip` file downloaded by `Sicar.download_state`.
+        destination (Path | str): The root folder of the dataset. The files are written to
+            `<destination>/state=<state>/municipio=<municipio>/part-<n>.parquet`.
+        state (State, optional): The state of the file. Defaults to the `cod_estado` attribute of each feature.
+        layer (str, optional): The layer to read when the archive has more than one. Defaults to the first.
+        row_group_size (int, optional): The maximum number of rows of a row group. Defaults to 65536.
+        categorical (List[str], optional): The text columns to dictionary-encode. Defaults to every text column
+            except `cod_imovel`, whose values are unique.
+        max_open_files (int, optional): The maximum number of files open at the same time. Defaults to 64.
+
+    Returns:
+        List[Path]: The files written.
+
+    Raises:
+        InvalidShapefileException: If the downloaded file does not hold a valid shapefile.
+
+    Note:
+        The features are streamed from the zip file, so memory use is bounded by the row groups buffered. Files
+        previously written for the same state are removed first. The partition columns are not stored in the
+        files; `pyarrow.dataset.dataset(destination, partitioning="hive")` reads them back from the folder names.
+        Geometries are WKB-encoded in SIRGAS 2000 (EPSG:4674), the reference system of SICAR files.
+    """
+    destination = Path(destination)
+
+    with ShapefileReader(path, layer) as reader:
+        names = {field.name for field in reader.fields}
+        municipality = "municipio" if "municipio" in names else None
+
+        if categorical is None:
+            categorical = [
+                field.name
+                for field in reader.fields
+                if field.type == "C" and field.name != "cod_imovel"
+            ]
+
+        fields = [
+            pa.field(field.name, _arrow_type(field, field.name in categorical))
+            for field in reader.fields
+            if field.name not in ("cod_estado", municipality)
+        ]
+        geo = {
+            "version": "1.1.0",
+            "primary_column": "geometry",
+            "columns": {
+                "geometry": {
+                    "encoding": "WKB",
+                    "geometry_types": _GEOMETRY_TYPES.get(reader.shape_type % 10, []),
+                    "crs": SIRGAS_2000,
+                }
+            },
+        }
+        schema = pa.schema(
+            fields + [pa.field("geometry", pa.binary())],
+            metadata={"geo": json.dumps(geo)},
+        )
+
+        if state is not None:
+            shutil.rmtree(destination / f"state={state.value}", ignore_errors=True)
+
+        writer = GeoParquetWriter(
+            destination, schema, row_group_size, max_open_files, 4 * row_group_size
+        )
+
+        for feature in reader:
+            properties = feature.properties
+            partition = (
+                ("state", state.value if state else properties.get("cod_estado")),
+            )
+            if municipality:
+                partition += (("municipio", properties[municipality]),)
+
+            writer.write(
+                partition, {**properties, "geometry": to_wkb(feature.geometry)}
+            )
+
+        return writer.close()
@@ -0,0 +1,205 @@
+"""
+Download Manifest Module.
+
+This module keeps a record of the polygons downloaded to a folder, so unchanged states can be skipped when
+the folder is synchronized again.
+
+Classes:
+    Manifest: JSON record of the release date, size and hash of each downloaded polygon.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from typing import Dict
+from pathlib import Path
+from datetime import datetime, timezone
+
+from SICAR.state import State
+from SICAR.polygon import Polygon
+
+
+class Manifest:
+    """
+    JSON record of the release date, size and hash of each downloaded polygon.
+
+    The manifest is stored as `manifest.json` in the download folder, with one entry per state and polygon:
+
+        {"MG": {"APPS": {"release_date": "05/06/2025", "file": "MG_APPS.zip", "size": 1024,
+                         "sha256": "...", "downloaded_at": "2025-06-06T03:00:00+00:00"}}}
+
+    Several instances may share a folder, for instance concurrent `AsyncSicar.sync_state` calls. Each recording
+    reads the file again and merges its entry under a lock shared by every instance of the same file, so no entry
+    is lost.
+
+    Attributes:
+        path (Path): The path of the manifest file.
+    """
+
+    _FILENAME = "manifest.json"
+    """Name of the manifest file inside the download folder."""
+
+    _LOCKS = {}
+    """Lock of each manifest file, shared by every instance writing to it."""
+
+    _LOCKS_GUARD = threading.Lock()
+    """Lock guarding `_LOCKS`."""
+
+    def __init__(self, folder: Path | str):
+        """
+        Initialize an instance of the Manifest class, loading the existing file if there is one.
+
+        Parameters:
+            folder (Path | str): The download folder holding the manifest.
+
+        Returns:
+            None
+        """
+        self.path = Path(folder) / self._FILENAME
+
+        with self._LOCKS_GUARD:
+            self._lock = self._LOCKS.setdefault(self.path.resolve(), threading.Lock())
+
+        self._entries = self._load()
+
+    def _load(self) -> Dict:
+        """
+        Read the manifest file.
+
+        Returns:
+            Dict: The entries of the file, or an empty dict if it is missing or unreadable.
+        """
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, state: State, polygon: Polygon) -> Dict | None:
+        """
+        Get the entry of a downloaded polygon.
+
+        Parameters:
+            state (State): The state of the polygon.
+            polygon (Polygon): The polygon.
+
+        Returns:
+            Dict | None: The recorded entry, or None if the polygon was never downloaded.
+        """
+        return self._entries.get(state.value, {}).get(polygon.value)
+
+    def current(self, state: State, polygon: Polygon, release_date: str) -> Path | None:
+        """
+        Get the local file of a polygon if it is up to date with a release date.
+
+        Parameters:
+            state (State): The state of the polygon.
+            polygon (Polygon): The polygon.
+            release_date (str): The release date currently published by SICAR.
+
+        Returns:
+            Path | None: The path of the downloaded file if it matches the release date and is still on disk
+            with the recorded size, otherwise None.
+        """
+        entry = self.get(state, polygon)
+
+        if not release_date or not entry or entry["release_date"] != release_date:
+            return None
+
+        path = self.path.parent / entry["file"]
+
+        if not path.is_file() or path.stat().st_size != entry["size"]:
+            return None
+
+        return path
+
+    @staticmethod
+    def _sha256(path: Path) -> str:
+        """
+        Get the SHA-256 of a file.
+
+        Parameters:
+            path (Path): The file to hash.
+
+        Returns:
+            str: The hexadecimal digest.
+
+        Note:
+            The digest computed while downloading, stored in `<name>.zip.sha256` by `PartialDownload`, is used
+            unless the file was modified after it, so a download is not read again to be recorded.
+        """
+        checksum = path.with_name(f"{path.name}.sha256")
+
+        try:
+            if checksum.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+                return checksum.read_text().split()[0]
+        except (OSError, IndexError):
+            pass
+
+        digest = hashlib.sha256()
+
+        with open(path, "rb") as fd:
+            for block in iter(lambda: fd.read(1024 * 1024), b""):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def record(
+        self, state: State, polygon: Polygon, release_date: str, path: Path
+    ) -> Dict:
+        """
+        Record a successful download and save the manifest.
+
+        Parameters:
+            state (State): The state of the polygon.
+            polygon (Polygon): The polygon.
+            release_date (str): The release date of the downloaded data.
+            path (Path): The downloaded file.
+
+        Returns:
+            Dict: The recorded entry.
+
+        Note:
+            The file is read again before the entry is added, so the entries recorded meanwhile by other instances
+            on the same folder are kept.
+        """
+        path = Path(path)
+        entry = {
+            "release_date": release_date,
+            "file": os.path.relpath(path, self.path.parent),
+            "size": path.stat().st_size,
+            "sha256": self._sha256(path),
+            "downloaded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+
+        with self._lock:
+            self._entries = self._load()
+            self._entries.setdefault(state.value, {})[polygon.value] = entry
+            self._save()
+
+        return entry
+
+    def _save(self):
+        """
+        Write the manifest atomically, so an interrupted write never leaves a truncated file.
+
+        Each write goes through its own temporary file in the same folder, so processes saving at the same time
+        never write to the same file.
+
+        Returns:
+            None
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(
+            prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent
+        )
+
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                file.write(json.dumps(self._entries, indent=2, sort_keys=True))
+
+            os.replace(temporary, self.path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
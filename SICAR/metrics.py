@@ -0,0 +1,234 @@
+"""
+Metrics Module.
+
+This module records where time goes in a download: captcha download and OCR latency, OCR output lengths,
+captchas accepted by the server, download throughput and attempts per success, labelled by driver and state.
+
+Classes:
+    Metrics: Thread-safe registry of counters and histograms with a snapshot API and Prometheus text output.
+"""
+
+import time
+import threading
+from typing import Dict
+from contextlib import contextmanager
+
+_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Upper bounds in seconds of the latency histogram buckets."""
+
+_ATTEMPT_BUCKETS = (1, 2, 3, 5, 10, 15, 25, 50)
+"""Upper bounds of the attempts per success histogram buckets."""
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters and histograms with a snapshot API and Prometheus text output.
+
+    The metrics recorded by `Sicar`, all labelled with `driver` and `state`, are:
+
+        sicar_captcha_download_seconds    histogram  Time to download a captcha image.
+        sicar_ocr_seconds                 histogram  Time to solve a captcha with the driver.
+        sicar_ocr_output_length_total     counter    OCR results by `length`; only length 5 is submitted.
+        sicar_captcha_submitted_total     counter    Captchas submitted with a download request.
+        sicar_captcha_accepted_total      counter    Submitted captchas answered with the zip file.
+        sicar_download_bytes_total        counter    Bytes of polygon received.
+        sicar_download_seconds_total      counter    Time spent receiving polygons.
+        sicar_attempts_per_success        histogram  Attempts needed by each successful download.
+        sicar_downloads_total             counter    Finished downloads by `result` (success or failure).
+
+    The server acceptance rate is `accepted / submitted` and the throughput is `bytes / seconds`.
+
+    Attributes:
+        _counters (Dict): Counter values by metric name and labels.
+        _histograms (Dict): Histogram bucket counts, count and sum by metric name and labels.
+    """
+
+    _HELP = {
+        "sicar_captcha_download_seconds": "Time to download a captcha image.",
+        "sicar_ocr_seconds": "Time to solve a captcha with the driver.",
+        "sicar_ocr_output_length_total": "OCR results by length.",
+        "sicar_captcha_submitted_total": "Captchas submitted with a download request.",
+        "sicar_captcha_accepted_total": "Submitted captchas answered with the zip file.",
+        "sicar_download_bytes_total": "Bytes of polygon received.",
+        "sicar_download_seconds_total": "Time spent receiving polygons.",
+        "sicar_attempts_per_success": "Attempts needed by each successful download.",
+        "sicar_downloads_total": "Finished downloads by result.",
+    }
+    """Description of each known metric, used in the Prometheus output."""
+
+    _BUCKETS = {"sicar_attempts_per_success": _ATTEMPT_BUCKETS}
+    """Histogram buckets by metric name. Other histograms use latency buckets."""
+
+    def __init__(self):
+        """
+        Initialize an empty instance of the Metrics class.
+
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict) -> tuple:
+        """
+        Build the registry key of a metric.
+
+        Parameters:
+            name (str): The metric name.
+            labels (Dict): The metric labels.
+
+        Returns:
+            tuple: The name and the sorted labels, with values converted to strings.
+        """
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """
+        Increment a counter.
+
+        Parameters:
+            name (str): The metric name.
+            value (float): The increment. Default is 1.
+            **labels: The metric labels.
+
+        Returns:
+            None
+        """
+        key = self._key(name, labels)
+
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """
+        Record a value in a histogram.
+
+        Parameters:
+            name (str): The metric name.
+            value (float): The observed value.
+            **labels: The metric labels.
+
+        Returns:
+            None
+        """
+        key = self._key(name, labels)
+        buckets = self._BUCKETS.get(name, _LATENCY_BUCKETS)
+
+        with self._lock:
+            histogram = self._histograms.setdefault(
+                key, {"buckets": [0] * len(buckets), "count": 0, "sum": 0.0}
+            )
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["count"] += 1
+            histogram["sum"] += value
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+        Record the duration of a block in a histogram, whether it succeeds or raises.
+
+        Parameters:
+            name (str): The metric name.
+            **labels: The metric labels.
+
+        Returns:
+            Iterator[None]: A context manager timing its block.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict:
+        """
+        Get a copy of every metric.
+
+        Returns:
+            Dict: A list of samples by metric name. Counter samples have `labels` and `value`; histogram samples
+            have `labels`, `count`, `sum` and cumulative `buckets` by upper bound, ending with `+Inf`.
+        """
+        snapshot = {}
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                snapshot.setdefault(name, []).append(
+                    {"labels": dict(labels), "value": value}
+                )
+
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                bounds = self._BUCKETS.get(name, _LATENCY_BUCKETS)
+                buckets = {
+                    str(bound): count
+                    for bound, count in zip(bounds, histogram["buckets"])
+                }
+                buckets["+Inf"] = histogram["count"]
+                snapshot.setdefault(name, []).append(
+                    {
+                        "labels": dict(labels),
+                        "count": histogram["count"],
+                        "sum": histogram["sum"],
+                        "buckets": buckets,
+                    }
+                )
+
+        return snapshot
+
+    @staticmethod
+    def _format_labels(labels: Dict) -> str:
+        """
+        Format labels for the Prometheus text format.
+
+        Parameters:
+            labels (Dict): The labels.
+
+        Returns:
+            str: The labels between braces, or an empty string without labels.
+        """
+        if not labels:
+            return ""
+
+        escaped = (
+            (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for key, value in labels.items()
+        )
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+    def prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, ready to be served on a `/metrics` endpoint or written for the node exporter.
+        """
+        lines = []
+
+        for name, samples in sorted(self.snapshot().items()):
+            histogram = "buckets" in samples[0]
+
+            if name in self._HELP:
+                lines.append(f"# HELP {name} {self._HELP[name]}")
+            lines.append(f"# TYPE {name} {'histogram' if histogram else 'counter'}")
+
+            for sample in samples:
+                labels = sample["labels"]
+
+                if not histogram:
+                    lines.append(
+                        f"{name}{self._format_labels(labels)} {sample['value']}"
+                    )
+                    continue
+
+                for bound, count in sample["buckets"].items():
+                    bucket = self._format_labels({**labels, "le": bound})
+                    lines.append(f"{name}_bucket{bucket} {count}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {sample['sum']}")
+                lines.append(
+                    f"{name}_count{self._format_labels(labels)} {sample['count']}"
+                )
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,632 @@
+"""
+Mock SICAR Server Module.
+
+This module provides a local stand-in for the SICAR system, so downloads can be tested and benchmarked offline and
+reproducibly. It implements the four resources used by `Sicar`:
+
+- `imoveis/index` issues the session cookie.
+- `municipios/ReCaptcha` generates a captcha image and keeps its answer in the session.
+- `estados/downloadBase` checks the captcha and serves a ZIP file, with configurable latency, bandwidth, `Range`
+  support and injected faults.
+- `estados/downloads` lists the release date of each state.
+
+The server only needs the standard library and Pillow. Point a `Sicar` instance to it with
+`Sicar(base_url=server.base_url, driver=AnswerKey())`.
+
+Classes:
+    Fault: Faults injected in polygon downloads.
+    AnswerKey: Captcha driver reading the answer embedded by the mock server in each image.
+    MockSicarServer: Local HTTP server implementing the resources of the SICAR system used by `Sicar`.
+
+Functions:
+    zip_payload: Build a valid ZIP file of about a given size.
+"""
+
+import io
+import re
+import json
+import time
+import random
+import string
+import socket
+import sys
+import hashlib
+import secrets
+import zipfile
+import threading
+from enum import Enum
+from collections import Counter
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable, Dict, Iterable
+
+from PIL import Image, ImageDraw
+from PIL.PngImagePlugin import PngInfo
+
+from SICAR.drivers.captcha import Captcha
+from SICAR.polygon import Polygon
+from SICAR.state import State
+
+
+class Fault(str, Enum):
+    """
+    Faults injected in polygon downloads.
+
+    Attributes:
+        SERVER_ERROR: Answer `503 Service Unavailable` with an html page, as the server does when it is overloaded.
+        DISCONNECT: Close the connection after half of the file, so the client can resume it.
+        CORRUPT: Send the whole file with one byte changed, so its CRC check fails.
+    """
+
+    SERVER_ERROR = "SERVER_ERROR"
+    DISCONNECT = "DISCONNECT"
+    CORRUPT = "CORRUPT"
+
+
+def zip_payload(size: int = 1024 * 1024, seed: int = 0) -> bytes:
+    """
+    Build a valid ZIP file of about a given size.
+
+    Parameters:
+        size (int, optional): The size in bytes of the stored member. Defaults to 1 MiB.
+        seed (int, optional): The seed of the random member content. Defaults to 0.
+
+    Returns:
+        bytes: A ZIP file holding one uncompressed member of `size` random bytes, so the file is slightly larger
+        than `size` and its CRC can be checked.
+    """
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("polygon.bin", random.Random(seed).randbytes(size))
+
+    return buffer.getvalue()
+
+
+class AnswerKey(Captcha):
+    """
+    Captcha driver reading the answer embedded by the mock server in each image.
+
+    Images generated by `MockSicarServer` carry their answer in a PNG text chunk, so captchas are solved without
+    OCR. A `miss_rate` simulates the invalid results of a real OCR engine.
+
+    Attributes:
+        miss_rate (float): The fraction of captchas answered with 4 characters, which `Sicar` discards.
+    """
+
+    def __init__(self, miss_rate: float = 0.0, seed: int = None):
+        """
+        Initialize an instance of the AnswerKey class.
+
+        Parameters:
+            miss_rate (float): The fraction of captchas answered with an invalid result. Default is 0.
+            seed (int): The seed deciding which captchas are missed. Default is None.
+
+        Returns:
+            None
+        """
+        self.miss_rate = miss_rate
+        self._random = random.Random(seed)
+
+    def get_captcha(self, captcha: Image.Image) -> str:
+        """
+        Get the answer of a captcha generated by the mock server.
+
+        Parameters:
+            captcha (Image): The captcha image.
+
+        Returns:
+            str: The embedded answer, truncated to 4 characters for a simulated miss, or an empty string for images
+            without an answer.
+        """
+        answer = captcha.info.get("captcha", "")
+        return answer[:4] if self._random.random() < self.miss_rate else answer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Request handler dispatching the SICAR resources to the `MockSicarServer` of its server.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args):
+        """
+        Silence the access log.
+
+        Parameters:
+            format (str): The message format.
+            *args: The message arguments.
+
+        Returns:
+            None
+        """
+
+    def do_GET(self):
+        """
+        Answer a GET request after the configured latency.
+
+        Returns:
+            None
+        """
+        mock = self.server.mock
+        url = urlsplit(self.path)
+        route = mock._ROUTES.get(url.path.removeprefix(mock._PREFIX))
+
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        if route is None:
+            self.respond(404, b"Not found", "text/plain")
+            return
+
+        mock._count(route)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        getattr(mock, f"_{route}")(self, query)
+
+    def session(self) -> str | None:
+        """
+        Get the session id sent in the request cookies.
+
+        Returns:
+            str | None: The value of the `JSESSIONID` cookie, if any.
+        """
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return cookie["JSESSIONID"].value if "JSESSIONID" in cookie else None
+
+    def respond(
+        self, status: int, body: bytes, content_type: str, headers: Dict = None
+    ):
+        """
+        Send a whole response.
+
+        Parameters:
+            status (int): The status code.
+            body (bytes): The body.
+            content_type (str): The `Content-Type` header.
+            headers (Dict, optional): Additional headers. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    """
+    Threaded HTTP server ignoring the connections reset by clients, such as a download abandoned midway.
+    """
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        """
+        Report an error raised while handling a request, unless the client closed the connection.
+
+        Parameters:
+            request (socket.socket): The client connection.
+            client_address (tuple): The client address.
+
+        Returns:
+            None
+        """
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class MockSicarServer:
+    """
+    Local HTTP server implementing the resources of the SICAR system used by `Sicar`.
+
+    The server runs in a background thread, one thread per connection, and keeps connections alive. Sessions,
+    captcha answers and release dates are kept in memory. Every setting is a plain attribute that tests can change
+    while the server runs.
+
+    Captchas behave as on the real system: a session holds only its latest captcha, and a captcha is consumed by
+    the first download request using it, whether the answer is right or not. A wrong answer gets a short JSON
+    message instead of a ZIP file.
+
+    Attributes:
+        host (str): The address the server listens on.
+        port (int): The port the server listens on, chosen by the system when 0 is given.
+        payload (bytes | Callable): The ZIP file served for every polygon, or a callable `(State, Polygon) -> bytes`.
+        release_dates (Dict[State, str]): The release date of each state, in dd/mm/yyyy format.
+        latency (float): Seconds waited before answering each request.
+        bandwidth (float | None): The maximum bytes per second of each download, or None for no limit.
+        ranges (bool): Whether `Range` requests are answered with `206 Partial Content`.
+        faults (list[Fault | None]): Faults injected in the next accepted downloads, consumed one per download.
+        fault_rate (float): The probability of injecting a random fault in a download once `faults` is empty.
+        session_lifetime (float | None): Seconds after which a session expires, or None for no expiry.
+        requests (Counter): The number of requests of each resource: `index`, `captcha`, `download` and `release_dates`.
+    """
+
+    _PREFIX = "/publico"
+    """Path of the base URL."""
+
+    _ROUTES = {
+        "/imoveis/index": "index",
+        "/municipios/ReCaptcha": "captcha",
+        "/estados/downloadBase": "download",
+        "/estados/downloads": "release_dates",
+    }
+    """Handler of each resource, by path."""
+
+    _ALPHABET = string.ascii_letters + string.digits
+    """Characters of the captcha answers."""
+
+    _RANGE = re.compile(r"bytes=(\d+)-")
+    """Value of a `Range` header requesting the end of a file."""
+
+    _CHUNK = 64 * 1024
+    """Size in bytes of the pieces written to the socket."""
+
+    def __init__(
+        self,
+        payload: bytes | Callable = None,
+        release_dates: Dict = None,
+        latency: float = 0.0,
+        bandwidth: float = None,
+        ranges: bool = True,
+        faults: Iterable[Fault] = (),
+        fault_rate: float = 0.0,
+        session_lifetime: float = None,
+        seed: int = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize an instance of the MockSicarServer class. The server starts with `start` or when entering its context.
+
+        Parameters:
+            payload (bytes | Callable): The ZIP file served for every polygon, or a callable `(State, Polygon) -> bytes`. Default is None, which serves `zip_payload()`.
+            release_dates (Dict): The release date of each state, in dd/mm/yyyy format. Default is None, which publishes every state on 01/01/2025.
+            latency (float): Seconds waited before answering each request. Default is 0.
+            bandwidth (float): The maximum bytes per second of each download. Default is None (no limit).
+            ranges (bool): Whether `Range` requests are honoured. Default is True.
+            faults (Iterable[Fault]): Faults injected in the next accepted downloads, in order. `None` items let a download through. Default is none.
+            fault_rate (float): The probability of a random fault in each download once `faults` is exhausted. Default is 0.
+            session_lifetime (float): Seconds after which a session expires and its requests are refused with `403 Forbidden`. Default is None (no expiry).
+            seed (int): The seed of the captcha answers and random faults. Default is None.
+            host (str): The address to listen on. Default is `127.0.0.1`.
+            port (int): The port to listen on. Default is 0, which picks a free port.
+
+        Returns:
+            None
+        """
+        self.payload = zip_payload() if payload is None else payload
+        self.release_dates = (
+            {state: "01/01/2025" for state in State}
+            if release_dates is None
+            else release_dates
+        )
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.ranges = ranges
+        self.faults = list(faults)
+        self.fault_rate = fault_rate
+        self.session_lifetime = session_lifetime
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        """
+        Get the base URL to pass to `Sicar(base_url=...)`.
+
+        Returns:
+            str: `http://<host>:<port>/publico`.
+        """
+        return f"http://{self.host}:{self.port}{self._PREFIX}"
+
+    def start(self) -> "MockSicarServer":
+        """
+        Start serving in a background thread.
+
+        Returns:
+            MockSicarServer: This instance.
+        """
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and close the listening socket.
+
+        Returns:
+            None
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "MockSicarServer":
+        """
+        Start the server when entering the context.
+
+        Returns:
+            MockSicarServer: This instance.
+        """
+        return self.start()
+
+    def __exit__(self, *args):
+        """
+        Stop the server when leaving the context.
+
+        Parameters:
+            *args: The exception details, if any.
+
+        Returns:
+            None
+        """
+        self.stop()
+
+    def expire_sessions(self):
+        """
+        Forget every session, as the real server does after a restart.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._sessions.clear()
+
+    def _count(self, route: str):
+        """
+        Count a request of a resource.
+
+        Parameters:
+            route (str): The name of the resource.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.requests[route] += 1
+
+    def _session(self, session_id: str | None) -> Dict | None:
+        """
+        Get a live session.
+
+        Parameters:
+            session_id (str | None): The session id sent by the client.
+
+        Returns:
+            Dict | None: The session state, or None if it does not exist or expired.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+
+            if session and self.session_lifetime is not None:
+                if time.monotonic() - session["created_at"] > self.session_lifetime:
+                    del self._sessions[session_id]
+                    return None
+
+            return session
+
+    def _index(self, handler: _Handler, query: Dict):
+        """
+        Answer the index page, issuing a session cookie when the request has no live session.
+
+        Parameters:
+            handler (_Handler): The request handler.
+            query (Dict): The query parameters.
+
+        Returns:
+            None
+        """
+        headers = {}
+
+        if self._session(handler.session()) is None:
+            session_id = secrets.token_hex(16)
+            with self._lock:
+                self._sessions[session_id] = {
+                    "created_at": time.monotonic(),
+                    "captcha": None,
+                }
+            headers["Set-Cookie"] = f"JSESSIONID={session_id}; Path={self._PREFIX}"
+
+        handler.respond(200, b"<html><body>SICAR</body></html>", "text/html", headers)
+
+    def _captcha(self, handler: _Handler, query: Dict):
+        """
+        Generate a captcha image and keep its answer in the session.
+
+        Parameters:
+            handler (_Handler): The request handler.
+            query (Dict): The query parameters.
+
+        Returns:
+            None
+
+        Note:
+            The answer is drawn on the image and stored in its `captcha` PNG text chunk, read by `AnswerKey`.
+        """
+        session = self._session(handler.session())
+
+        if session is None:
+            handler.respond(403, b"Forbidden", "text/plain")
+            return
+
+        with self._lock:
+            answer = "".join(self._random.choices(self._ALPHABET, k=5))
+            session["captcha"] = answer
+
+        image = Image.new("RGB", (100, 40), "white")
+        ImageDraw.Draw(image).text((20, 14), answer, fill="black")
+        info = PngInfo()
+        info.add_text("captcha", answer)
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG", pnginfo=info)
+
+        handler.respond(200, buffer.getvalue(), "image/png")
+
+    def _next_fault(self) -> Fault | None:
+        """
+        Take the fault to inject in an accepted download.
+
+        Returns:
+            Fault | None: The next item of `faults`, or a random fault with probability `fault_rate`.
+        """
+        with self._lock:
+            if self.faults:
+                return self.faults.pop(0)
+
+            if self._random.random() < self.fault_rate:
+                return self._random.choice(list(Fault))
+
+        return None
+
+    def _download(self, handler: _Handler, query: Dict):
+        """
+        Check the captcha and serve the ZIP file of a polygon.
+
+        Parameters:
+            handler (_Handler): The request handler.
+            query (Dict): The `idEstado`, `tipoBase` and `ReCaptcha` query parameters.
+
+        Returns:
+            None
+        """
+        session = self._session(handler.session())
+
+        if session is None:
+            handler.respond(403, b"Forbidden", "text/plain")
+            return
+
+        with self._lock:
+            captcha, session["captcha"] = session["captcha"], None
+
+        if captcha is None or query.get("ReCaptcha") != captcha:
+            body = json.dumps({"mensagem": "Captcha inválido"}).encode()
+            handler.respond(200, body, "application/json;charset=UTF-8")
+            return
+
+        try:
+            state = State(query.get("idEstado"))
+            polygon = Polygon(query.get("tipoBase"))
+        except ValueError:
+            handler.respond(404, b"Not found", "text/plain")
+            return
+
+        fault = self._next_fault()
+
+        if fault == Fault.SERVER_ERROR:
+            handler.respond(503, b"<html>Service Unavailable</html>", "text/html")
+            return
+
+        payload = (
+            self.payload(state, polygon) if callable(self.payload) else self.payload
+        )
+        etag = f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+        start, status = 0, 200
+        match = self._RANGE.fullmatch(handler.headers.get("Range", ""))
+
+        if (
+            self.ranges
+            and match
+            and int(match.group(1)) < len(payload)
+            and handler.headers.get("If-Range", etag) == etag
+        ):
+            start, status = int(match.group(1)), 206
+
+        if fault == Fault.CORRUPT:
+            middle = len(payload) // 2
+            payload = (
+                payload[:middle]
+                + bytes([payload[middle] ^ 0xFF])
+                + payload[middle + 1 :]
+            )
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/zip")
+        handler.send_header("Content-Length", str(len(payload) - start))
+        handler.send_header("ETag", etag)
+        handler.send_header(
+            "Content-Disposition",
+            f'attachment; filename="{state.value}_{polygon.value}.zip"',
+        )
+        if status == 206:
+            handler.send_header(
+                "Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}"
+            )
+        handler.end_headers()
+
+        end = (start + len(payload)) // 2 if fault == Fault.DISCONNECT else len(payload)
+        self._send(handler, memoryview(payload)[start:end])
+
+        if fault == Fault.DISCONNECT:
+            handler.wfile.flush()
+            handler.connection.shutdown(socket.SHUT_RDWR)
+            handler.close_connection = True
+
+    def _send(self, handler: _Handler, body: memoryview):
+        """
+        Write a body in pieces, pacing them to the bandwidth limit.
+
+        Parameters:
+            handler (_Handler): The request handler.
+            body (memoryview): The bytes to send.
+
+        Returns:
+            None
+        """
+        started = time.monotonic()
+
+        for offset in range(0, len(body), self._CHUNK):
+            piece = body[offset : offset + self._CHUNK]
+            handler.wfile.write(piece)
+
+            if self.bandwidth:
+                ahead = (offset + len(piece)) / self.bandwidth - (
+                    time.monotonic() - started
+                )
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    def _release_dates(self, handler: _Handler, query: Dict):
+        """
+        Answer the page listing the release date of each state, honouring `If-None-Match`.
+
+        Parameters:
+            handler (_Handler): The request handler.
+            query (Dict): The query parameters.
+
+        Returns:
+            None
+        """
+        body = "".join(
+            '<div class="listagem-estados">'
+            f'<div class="data-disponibilizacao"><i>{date}</i></div>'
+            '<button type="button" class="btn-abrir-modal-download-base-poligono" '
+            f'data-estado="{State(state).value}"></button>'
+            "</div>"
+            for state, date in self.release_dates.items()
+        ).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+        if handler.headers.get("If-None-Match") == etag:
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        handler.respond(200, body, "text/html;charset=UTF-8", {"ETag": etag})
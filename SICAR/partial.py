@@ -0,0 +1,267 @@
+"""
+Partial Download Module.
+
+This module keeps track of polygon downloads that were interrupted, so they can be resumed with HTTP Range
+requests instead of starting over.
+
+Classes:
+    PartialDownload: A polygon download written to a `.part` file until it is complete.
+"""
+
+import io
+import os
+import re
+import json
+import httpx
+import hashlib
+from typing import Dict
+from pathlib import Path
+from contextlib import contextmanager
+
+from SICAR.sinks import Sink, verify_zip
+from SICAR.exceptions import FailedToDownloadPolygonException
+
+
+class PartialDownload(Sink):
+    """
+    A polygon download written to a `.part` file until it is complete. This is the default sink of `Sicar`.
+
+    The bytes received so far are kept in `<name>.zip.part`, whose size is the offset to resume from. The total
+    size and the `ETag`/`Last-Modified` validator of the response that started the download are stored once in
+    `<name>.zip.part.json`, so a resumed request only continues the same file.
+
+    While writing, the `.part` file is preallocated to the total size with `posix_fallocate`, so the filesystem
+    reserves contiguous space once instead of growing the file on every write. It is truncated to the bytes
+    actually written when the writer is closed. A `.part` file left preallocated by a crash has an unknown
+    offset and is not resumed.
+
+    Before the `.part` file is moved to its final path, its zip central directory and member CRCs are checked, and
+    the SHA-256 computed while streaming is written to `<name>.zip.sha256` in the `sha256sum` format, so
+    identical downloads can be found without hashing them again.
+
+    Attributes:
+        path (Path): The final path of the download.
+        part (Path): The file receiving the bytes.
+        meta (Path): The file holding the total size and validator of the download.
+        checksum (Path): The file receiving the SHA-256 of the complete download.
+        total (int): The total size of the download, known once the response is accepted.
+    """
+
+    _CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+    """Pattern of a `Content-Range` header with a known complete length."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize an instance of the PartialDownload class.
+
+        Parameters:
+            path (Path): The final path of the download.
+
+        Returns:
+            None
+        """
+        self.path = Path(path)
+        self.part = self.path.with_name(f"{self.path.name}.part")
+        self.meta = self.path.with_name(f"{self.path.name}.part.json")
+        self.checksum = self.path.with_name(f"{self.path.name}.sha256")
+        self.total = 0
+        self._resumed = 0
+
+    def _save_meta(self, meta: Dict):
+        """
+        Write the metadata of the download.
+
+        Parameters:
+            meta (Dict): The metadata to store.
+
+        Returns:
+            None
+        """
+        self.meta.write_text(json.dumps(meta))
+
+    def _load_meta(self) -> Dict:
+        """
+        Read the metadata of the interrupted download.
+
+        Returns:
+            Dict: The stored metadata, or an empty dict if there is none or it is unreadable.
+        """
+        try:
+            return json.loads(self.meta.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    @property
+    def offset(self) -> int:
+        """
+        Number of bytes already received.
+
+        Returns:
+            int: The size of the `.part` file, or 0 when there is nothing to resume.
+        """
+        meta = self._load_meta()
+
+        if not meta or meta.get("preallocated") or not self.part.exists():
+            return 0
+        return self.part.stat().st_size
+
+    def headers(self) -> Dict:
+        """
+        Build the headers requesting the missing bytes.
+
+        Returns:
+            Dict: `Range` and `If-Range` headers when there is something to resume, otherwise an empty dict.
+        """
+        offset = self.offset
+
+        if offset == 0:
+            return {}
+
+        headers = {"Range": f"bytes={offset}-"}
+        validator = self._load_meta().get("validator")
+
+        if validator:
+            headers["If-Range"] = validator
+
+        return headers
+
+    def open(self, response: httpx.Response, buffer_size: int = io.DEFAULT_BUFFER_SIZE):
+        """
+        Open the `.part` file according to the server response.
+
+        Parameters:
+            response (httpx.Response): The response to the download request.
+            buffer_size (int, optional): The size of the write buffer. Defaults to `io.DEFAULT_BUFFER_SIZE`.
+
+        Returns:
+            ContextManager[BufferedWriter]: The `.part` file positioned after the received bytes on
+            `206 Partial Content`, or truncated on `200 OK`. Writes smaller than `buffer_size` are coalesced in
+            the file's buffer, so the file is written in `buffer_size` pieces.
+
+        Raises:
+            FailedToDownloadPolygonException: If the response does not continue the interrupted download.
+
+        Note:
+            A `200 OK` means the server ignored the range, or the file changed since the download started, so the
+            download restarts from the beginning.
+        """
+        if response.status_code == httpx.codes.PARTIAL_CONTENT:
+            match = self._CONTENT_RANGE.fullmatch(
+                response.headers.get("Content-Range", "")
+            )
+            offset = self.offset
+
+            if not match or int(match.group(1)) != offset:
+                raise FailedToDownloadPolygonException()
+
+            self.total = int(match.group(3))
+            self._resumed = offset
+            meta = self._load_meta()
+            fd = open(self.part, "r+b", buffering=buffer_size)
+            fd.seek(offset)
+        else:
+            self.total = int(response.headers.get("Content-Length", 0))
+            meta = {
+                "total": self.total,
+                "validator": response.headers.get("ETag")
+                or response.headers.get("Last-Modified"),
+            }
+            self._save_meta(meta)
+            self._resumed = 0
+            fd = open(self.part, "wb", buffering=buffer_size)
+
+        return self._writer(fd, meta)
+
+    def digest(self):
+        """
+        Start the SHA-256 of the download with the bytes resumed from the `.part` file.
+
+        Returns:
+            hashlib._Hash: A hash of the bytes kept from the interrupted download, empty when it restarted.
+        """
+        digest = hashlib.sha256()
+
+        with open(self.part, "rb") as fd:
+            remaining = self._resumed
+            while remaining:
+                block = fd.read(min(remaining, 1024 * 1024))
+                digest.update(block)
+                remaining -= len(block)
+
+        return digest
+
+    def _preallocate(self, fd, meta: Dict) -> bool:
+        """
+        Reserve the space of the whole download for the `.part` file.
+
+        Parameters:
+            fd (BufferedWriter): The open `.part` file.
+            meta (Dict): The metadata of the download, marked as preallocated before the file grows.
+
+        Returns:
+            bool: True if the file was preallocated, False if the platform or the filesystem does not support it.
+        """
+        if not hasattr(os, "posix_fallocate") or fd.tell() >= self.total:
+            return False
+
+        self._save_meta({**meta, "preallocated": True})
+
+        try:
+            os.posix_fallocate(fd.fileno(), 0, self.total)
+        except OSError:
+            self._save_meta(meta)
+            return False
+
+        return True
+
+    @contextmanager
+    def _writer(self, fd, meta: Dict):
+        """
+        Preallocate the `.part` file and truncate it to the written bytes when closed.
+
+        Parameters:
+            fd (BufferedWriter): The open `.part` file, positioned at the download offset.
+            meta (Dict): The metadata of the download.
+
+        Returns:
+            Iterator[BufferedWriter]: The `.part` file.
+        """
+        with fd:
+            preallocated = self._preallocate(fd, meta)
+            try:
+                yield fd
+            finally:
+                fd.truncate(fd.tell())
+                if preallocated:
+                    self._save_meta(meta)
+
+    def finish(self) -> Path:
+        """
+        Verify the complete `.part` file and move it to its final path.
+
+        Returns:
+            Path: The final path of the download.
+
+        Raises:
+            FailedToDownloadPolygonException: If fewer bytes than expected were received, in which case the `.part`
+            file is kept so the next attempt resumes from it, or if the file is not a valid zip file, in which case
+            it is removed so the next attempt starts over.
+        """
+        if self.part.stat().st_size != self.total:
+            raise FailedToDownloadPolygonException()
+
+        try:
+            verify_zip(self.part)
+        except FailedToDownloadPolygonException:
+            self.part.unlink()
+            self.meta.unlink(missing_ok=True)
+            raise
+
+        self.checksum.unlink(missing_ok=True)
+        os.replace(self.part, self.path)
+
+        if self.sha256:
+            self.checksum.write_text(f"{self.sha256}  {self.path.name}\n")
+
+        self.meta.unlink(missing_ok=True)
+        return self.path
@@ -0,0 +1,324 @@
+"""
+Session Pool Module.
+
+This module provides a pool of `Sicar` worker sessions, so one process can run many downloads at the same time.
+The SICAR server keeps the captcha of a session with its cookies, so two downloads sharing a session would overwrite
+each other's captcha. Each session of the pool has its own cookies and is leased to one download at a time.
+
+Classes:
+    PooledSession: A worker session of the pool with its usage statistics.
+    SessionPool: Thread-safe pool leasing worker sessions, created lazily and recycled when their cookies expire.
+"""
+
+import time
+import queue
+import threading
+import contextlib
+import httpx
+from pathlib import Path
+from typing import Dict, Iterator
+
+from SICAR.exceptions import UrlNotOkException, NoSessionAvailableException
+
+
+class PooledSession:
+    """
+    A worker session of the pool with its usage statistics.
+
+    Attributes:
+        sicar (Sicar): The worker, with its own `httpx.Client` and cookies.
+        created_at (float): The `time.monotonic()` value when the cookies were initialized.
+        used_at (float): The `time.monotonic()` value when the session was last released.
+        uses (int): The number of leases returned so far.
+    """
+
+    def __init__(self, sicar):
+        """
+        Initialize an instance of the PooledSession class.
+
+        Parameters:
+            sicar (Sicar): The worker owning the session.
+
+        Returns:
+            None
+        """
+        self.sicar = sicar
+        self.created_at = self.used_at = time.monotonic()
+        self.uses = 0
+
+
+class SessionPool:
+    """
+    Thread-safe pool leasing worker sessions, created lazily and recycled when their cookies expire.
+
+    At most `size` sessions exist at any time. A session is created, with its own cookies, the first time a lease
+    needs it, so a pool that is never used sends no request. Sessions are handed out by `acquire` or `lease` and
+    run the whole captcha and download sequence of one state before they are given back. The most recently
+    released session is leased first, so new sessions are only created while every existing one is busy.
+
+    Before a session is leased again it is checked: a session idle for longer than `max_idle`, holding an expired
+    cookie, or used `max_uses` times is closed and replaced by a new one. A session whose lease ended with an error
+    is replaced as well, since its connection or its server-side state may be broken. The server may also expire a
+    session before any of these checks notice, and then answers its requests with `403 Forbidden`: `download_state`
+    replaces the session of every download that fails, so the next one starts with fresh cookies.
+
+    Attributes:
+        size (int): The maximum number of sessions.
+        _sicar (Sicar): The instance used to create worker sessions.
+        _max_idle (float): Seconds without use after which the cookies are considered expired by the server.
+        _max_uses (int | None): The number of leases after which a session is recycled, or None for no limit.
+        _idle (queue.LifoQueue): Sessions ready to be leased. `None` entries stand for sessions not created yet.
+        _leased (Dict[int, PooledSession]): Leased sessions, by the `id` of their worker.
+    """
+
+    _MAX_IDLE = 600.0
+    """Default number of seconds a session stays valid on the server without requests."""
+
+    def __init__(
+        self,
+        sicar,
+        size: int = 4,
+        max_idle: float = _MAX_IDLE,
+        max_uses: int = None,
+    ):
+        """
+        Initialize an instance of the SessionPool class.
+
+        Parameters:
+            sicar (Sicar): The instance used to create worker sessions. Its driver, listeners, metrics and rate limiter are shared with the workers.
+            size (int): The maximum number of sessions. Default is 4.
+            max_idle (float): Seconds without use after which a session is recycled. Default is 600.
+            max_uses (int): The number of leases after which a session is recycled. Default is None (no limit).
+
+        Returns:
+            None
+        """
+        self.size = size
+        self._sicar = sicar
+        self._max_idle = max_idle
+        self._max_uses = max_uses
+        self._idle = queue.LifoQueue()
+        self._leased = {}
+        self._lock = threading.Lock()
+
+        for _ in range(size):
+            self._idle.put(None)
+
+    def __enter__(self) -> "SessionPool":
+        """
+        Enter the runtime context of the pool.
+
+        Returns:
+            SessionPool: This instance.
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Close the sessions when leaving the runtime context.
+
+        Parameters:
+            *args: The exception details, if any.
+
+        Returns:
+            None
+        """
+        self.close()
+
+    def _expired(self, session: PooledSession) -> str | None:
+        """
+        Check whether an idle session must be recycled before it is leased again.
+
+        Parameters:
+            session (PooledSession): The session to check.
+
+        Returns:
+            str | None: `idle` if the session was not used for `max_idle` seconds, `cookies` if one of its cookies
+            expired, `uses` if it reached `max_uses`, or None if it can be leased.
+        """
+        if time.monotonic() - session.used_at > self._max_idle:
+            return "idle"
+
+        if any(cookie.is_expired() for cookie in session.sicar._session.cookies.jar):
+            return "cookies"
+
+        if self._max_uses is not None and session.uses >= self._max_uses:
+            return "uses"
+
+        return None
+
+    def _discard(self, session: PooledSession, reason: str):
+        """
+        Close a session and count it as recycled.
+
+        Parameters:
+            session (PooledSession): The session to close.
+            reason (str): Why it is recycled, used as the `reason` label of `sicar_sessions_recycled_total`.
+
+        Returns:
+            None
+        """
+        session.sicar._session.close()
+        self._sicar.metrics.inc("sicar_sessions_recycled_total", reason=reason)
+
+    def acquire(self, timeout: float = None):
+        """
+        Lease a session, creating it or replacing an unhealthy one when needed.
+
+        Parameters:
+            timeout (float): Seconds to wait for a session when all of them are leased. Default is None (wait forever).
+
+        Returns:
+            Sicar: A worker with its own session and cookies. Give it back with `release`.
+
+        Raises:
+            NoSessionAvailableException: If no session is released within the timeout.
+            UrlNotOkException: If the cookies of a new session could not be initialized.
+            httpx.HTTPError: If the cookies of a new session could not be initialized.
+        """
+        try:
+            session = self._idle.get(timeout=timeout)
+        except queue.Empty as error:
+            raise NoSessionAvailableException(timeout) from error
+
+        reason = None if session is None else self._expired(session)
+
+        if reason:
+            self._discard(session, reason)
+            session = None
+
+        if session is None:
+            try:
+                session = PooledSession(self._sicar._worker())
+            except BaseException:
+                self._idle.put(None)
+                raise
+
+            self._sicar.metrics.inc("sicar_sessions_created_total")
+
+        with self._lock:
+            self._leased[id(session.sicar)] = session
+
+        return session.sicar
+
+    def release(self, sicar, healthy: bool = True):
+        """
+        Give a leased session back to the pool.
+
+        Parameters:
+            sicar (Sicar): The worker returned by `acquire`.
+            healthy (bool): Whether the session can be reused. Default is True. Pass False after a connection error, so the session is replaced.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            session = self._leased.pop(id(sicar))
+
+        if not healthy:
+            self._discard(session, "error")
+            self._idle.put(None)
+            return
+
+        session.uses += 1
+        session.used_at = time.monotonic()
+        self._idle.put(session)
+
+    @contextlib.contextmanager
+    def lease(self, timeout: float = None) -> Iterator:
+        """
+        Lease a session for the duration of a block.
+
+        Parameters:
+            timeout (float): Seconds to wait for a session when all of them are leased. Default is None (wait forever).
+
+        Returns:
+            Iterator[Sicar]: A worker with its own session and cookies, released when the block exits.
+
+        Raises:
+            NoSessionAvailableException: If no session is released within the timeout.
+
+        Note:
+            A block that raises `httpx.HTTPError` or `UrlNotOkException` releases the session as unhealthy, so it is
+            replaced before the next lease.
+        """
+        sicar = self.acquire(timeout)
+        healthy = True
+
+        try:
+            yield sicar
+        except (httpx.HTTPError, UrlNotOkException):
+            healthy = False
+            raise
+        finally:
+            self.release(sicar, healthy)
+
+    def download_state(self, *args, timeout: float = None, **kwargs) -> Path | bool:
+        """
+        Download a polygon for a state with a leased session.
+
+        Parameters:
+            *args: The positional arguments of `Sicar.download_state`.
+            timeout (float): Seconds to wait for a session when all of them are leased. Default is None (wait forever).
+            **kwargs: The keyword arguments of `Sicar.download_state`.
+
+        Returns:
+            Path | bool: The result of `Sicar.download_state`, the path of the downloaded file or False.
+
+        Raises:
+            NoSessionAvailableException: If no session is released within the timeout.
+
+        Note:
+            The download retries its failed attempts on the same session, which does not help once the server has
+            expired it. A session whose download returns False or raises is therefore released as unhealthy and
+            replaced before the next lease.
+        """
+        sicar = self.acquire(timeout)
+        path = False
+
+        try:
+            path = sicar.download_state(*args, **kwargs)
+            return path
+        finally:
+            self.release(sicar, healthy=path is not False)
+
+    def stats(self) -> Dict:
+        """
+        Get the number of sessions in each situation.
+
+        Returns:
+            Dict: The number of `leased` sessions, of `idle` sessions already created, and of `free` slots where a session will be created on demand.
+        """
+        with self._lock:
+            leased = len(self._leased)
+            waiting = list(self._idle.queue)
+
+        free = sum(session is None for session in waiting)
+        return {"leased": leased, "idle": len(waiting) - free, "free": free}
+
+    def close(self):
+        """
+        Close the idle sessions, leaving free slots in their place.
+
+        Returns:
+            None
+
+        Note:
+            The pool can still be used afterwards and creates new sessions on demand. Sessions leased at that time
+            are not affected and go back to the pool when they are released.
+        """
+        closed = 0
+
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+            if session is not None:
+                session.sicar._session.close()
+
+            closed += 1
+
+        for _ in range(closed):
+            self._idle.put(None)
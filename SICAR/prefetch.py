@@ -0,0 +1,277 @@
+"""
+Captcha Prefetch Module.
+
+This module provides a producer/consumer pipeline that downloads and solves captchas ahead of time,
+so a polygon download can start as soon as the previous attempt fails.
+
+Classes:
+    Candidate: A solved captcha ready to be submitted, bound to the session that generated it.
+    CaptchaPrefetcher: Background stage keeping a bounded queue of solved captchas.
+"""
+
+import time
+import queue
+import threading
+import httpx
+from typing import NamedTuple
+
+from SICAR.state import State
+from SICAR.exceptions import UrlNotOkException, FailedToDownloadCaptchaException
+
+
+class Candidate(NamedTuple):
+    """
+    A solved captcha ready to be submitted.
+
+    The SICAR server keeps the captcha in the session, so each candidate carries the `Sicar` worker whose
+    session generated it and must be submitted through that worker.
+
+    Attributes:
+        sicar (Sicar): The worker owning the session the captcha belongs to.
+        captcha (str): The 5-character captcha value recognized by the driver.
+        created_at (float): The `time.monotonic()` value when the captcha was downloaded.
+    """
+
+    sicar: object
+    captcha: str
+    created_at: float
+
+
+class CaptchaPrefetcher:
+    """
+    Background stage keeping a bounded queue of solved captchas.
+
+    A producer thread downloads captchas and solves them with the driver while the consumer is busy downloading
+    polygons. Since a session only holds its latest captcha, the prefetcher owns `size` worker sessions and
+    fetches at most one captcha per session. A session becomes available again once its candidate is released
+    or found expired. Captchas fetched together are solved in one `get_captcha_batch` call.
+
+    Attributes:
+        _sicar (Sicar): The instance used to create worker sessions.
+        _lifetime (float): Seconds after which a captcha is considered expired by the server.
+        _candidates (queue.Queue): Solved captchas waiting to be submitted, or the error that stopped the producer.
+        _idle (queue.Queue): Worker sessions ready to fetch a new captcha.
+    """
+
+    _LIFETIME = 60.0
+    """Default number of seconds a captcha stays valid in the session."""
+
+    def __init__(
+        self, sicar, size: int = 2, lifetime: float = _LIFETIME, state: State = None
+    ):
+        """
+        Initialize an instance of the CaptchaPrefetcher class.
+
+        Parameters:
+            sicar (Sicar): The instance used to create worker sessions.
+            size (int): The maximum number of solved captchas kept ready. Default is 2.
+            lifetime (float): Seconds after which a captcha is considered expired. Default is 60.
+            state (State): The state the captchas are used for, to label the metrics. Default is None (no state label).
+
+        Returns:
+            None
+        """
+        self._sicar = sicar
+        self._labels = {"driver": type(sicar._driver).__name__}
+        if state:
+            self._labels["state"] = state.value
+        self._lifetime = lifetime
+        self._candidates = queue.Queue()
+        self._idle = queue.Queue()
+        self._workers = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+
+        for _ in range(size):
+            self._idle.put(None)
+
+    def __enter__(self) -> "CaptchaPrefetcher":
+        """
+        Start the producer thread when entering the context.
+
+        Returns:
+            CaptchaPrefetcher: This instance.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """
+        Stop the producer thread when leaving the context.
+
+        Returns:
+            None
+        """
+        self.stop()
+
+    def start(self):
+        """
+        Start the producer thread.
+
+        Returns:
+            None
+        """
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the producer thread and close the worker sessions.
+
+        Returns:
+            None
+        """
+        self._stop.set()
+        self._thread.join()
+
+        for worker in self._workers:
+            worker._session.close()
+
+    def _expired(self, candidate: Candidate) -> bool:
+        """
+        Check whether a candidate outlived the captcha lifetime.
+
+        Parameters:
+            candidate (Candidate): The candidate to check.
+
+        Returns:
+            bool: True if the captcha has expired.
+        """
+        return time.monotonic() - candidate.created_at > self._lifetime
+
+    def _take_idle(self) -> list:
+        """
+        Wait briefly for an idle session and take every other session that is idle too.
+
+        Returns:
+            list: The idle workers, possibly empty. `None` entries stand for sessions not created yet.
+        """
+        try:
+            workers = [self._idle.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        while True:
+            try:
+                workers.append(self._idle.get_nowait())
+            except queue.Empty:
+                return workers
+
+    def _produce(self):
+        """
+        Download and solve captchas on idle sessions until stopped.
+
+        Returns:
+            None
+
+        Note:
+            Captchas of all idle sessions are downloaded first and then solved together with the driver's
+            `get_captcha_batch`. Only 5-character results are queued. Invalid results and failed downloads put the
+            session back in the idle queue, so the next captcha is fetched right away.
+            The OCR latency recorded for each captcha is the duration of the batch divided by its size.
+            Any other error, such as a failing driver, stops the producer and is queued in place of a candidate,
+            so `get` fails right away instead of waiting for its timeout.
+        """
+        try:
+            while not self._stop.is_set():
+                self._produce_once()
+        except Exception as error:
+            self._candidates.put(error)
+
+    def _produce_once(self):
+        """
+        Download and solve captchas on the sessions idle right now.
+
+        Returns:
+            None
+        """
+        fetched = []
+        failed = False
+
+        for worker in self._take_idle():
+            try:
+                if worker is None:
+                    worker = self._sicar._worker()
+                    self._workers.append(worker)
+
+                with self._sicar.metrics.timer(
+                    "sicar_captcha_download_seconds", **self._labels
+                ):
+                    image = worker._download_captcha()
+
+                fetched.append((worker, time.monotonic(), image))
+            except (
+                UrlNotOkException,
+                FailedToDownloadCaptchaException,
+                httpx.HTTPError,
+            ):
+                self._idle.put(worker)
+                failed = True
+
+        if fetched:
+            start = time.perf_counter()
+            captchas = self._sicar._driver.get_captcha_batch(
+                [image for _, _, image in fetched]
+            )
+            elapsed = (time.perf_counter() - start) / len(fetched)
+
+            for (worker, created_at, _), captcha in zip(fetched, captchas):
+                self._sicar.metrics.observe(
+                    "sicar_ocr_seconds", elapsed, **self._labels
+                )
+                self._sicar.metrics.inc(
+                    "sicar_ocr_output_length_total",
+                    length=len(captcha),
+                    **self._labels,
+                )
+                if len(captcha) == 5:
+                    self._candidates.put(Candidate(worker, captcha, created_at))
+                else:
+                    self._idle.put(worker)
+
+        if failed:
+            self._stop.wait(1)
+
+    def get(self, timeout: float = None) -> Candidate:
+        """
+        Take the next solved captcha, dropping the expired ones.
+
+        Parameters:
+            timeout (float): Seconds to wait for a candidate. Default is None, which uses the captcha lifetime.
+
+        Returns:
+            Candidate: A captcha that has not expired yet.
+
+        Raises:
+            FailedToDownloadCaptchaException: If no captcha is solved within the timeout, or if the producer
+                stopped on an error, which is then the cause of the exception.
+        """
+        deadline = time.monotonic() + (self._lifetime if timeout is None else timeout)
+
+        while True:
+            try:
+                candidate = self._candidates.get(
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+            except queue.Empty as error:
+                raise FailedToDownloadCaptchaException() from error
+
+            if isinstance(candidate, Exception):
+                self._candidates.put(candidate)
+                raise FailedToDownloadCaptchaException() from candidate
+
+            if not self._expired(candidate):
+                return candidate
+
+            self.release(candidate)
+
+    def release(self, candidate: Candidate):
+        """
+        Give the session of a used candidate back to the producer.
+
+        Parameters:
+            candidate (Candidate): The candidate that was submitted or discarded.
+
+        Returns:
+            None
+        """
+        self._idle.put(candidate.sicar)
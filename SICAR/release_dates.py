@@ -0,0 +1,180 @@
+"""
+Release Date Parser Module.
+
+This module parses the SICAR page listing the release date of each state.
+
+Functions:
+    scan_release_dates: Parse the page with a single pass of regular expressions over the raw bytes.
+    soup_release_dates: Parse the page with BeautifulSoup.
+    to_dates: Convert release dates from dd/mm/yyyy strings to `datetime.date` values.
+"""
+
+import re
+import html
+from typing import Dict
+from datetime import datetime
+
+from SICAR.state import State
+
+_BLOCK = re.compile(
+    rb"""<div\b[^>]*?\bclass\s*=\s*["'][^"']*(?<![\w-])listagem-estados(?![\w-])"""
+)
+"""Opening tag of a state block."""
+
+_BUTTON = re.compile(rb"<button\b([^>]*)>")
+"""Opening tag of a button, capturing its attributes."""
+
+_DIV = re.compile(rb"<div\b([^>]*)>")
+"""Opening tag of a div, capturing its attributes."""
+
+_ATTRIBUTE = re.compile(rb"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+"""An attribute with a quoted value."""
+
+_TAG = re.compile(rb"<[^>]*>")
+"""Any tag, removed to get the text of an element."""
+
+_STATES = {state.value: state for state in State}
+"""States by abbreviation."""
+
+
+def _attributes(tag: bytes) -> Dict:
+    """
+    Parse the attributes of a tag.
+
+    Parameters:
+        tag (bytes): The attributes part of an opening tag.
+
+    Returns:
+        Dict: The attribute values by name, decoded and unescaped. The first occurrence of a name wins.
+    """
+    attributes = {}
+
+    for name, double, single in _ATTRIBUTE.findall(tag):
+        value = html.unescape((double or single).decode("utf-8"))
+        attributes.setdefault(name.decode("ascii").lower(), value)
+
+    return attributes
+
+
+def _has_class(attributes: Dict, name: str) -> bool:
+    """
+    Check if a tag has a class.
+
+    Parameters:
+        attributes (Dict): The attributes of the tag.
+        name (str): The class name.
+
+    Returns:
+        bool: True if `name` is one of the classes of the tag.
+    """
+    return name in attributes.get("class", "").split()
+
+
+def _text(content: bytes) -> str:
+    """
+    Get the text of an element, as `get_text(strip=True)` in BeautifulSoup.
+
+    Parameters:
+        content (bytes): The content of the element.
+
+    Returns:
+        str: The stripped text fragments of the content, joined without separator.
+    """
+    return "".join(
+        html.unescape(fragment.decode("utf-8")).strip()
+        for fragment in _TAG.split(content)
+    )
+
+
+def scan_release_dates(response: bytes) -> Dict:
+    """
+    Parse the page with a single pass of regular expressions over the raw bytes.
+
+    Parameters:
+        response (bytes): The html page from SICAR with release dates per state.
+
+    Returns:
+        Dict: A dict containing state sign as keys and release date as value, the same as `soup_release_dates`.
+
+    Note:
+        Each state block spans from its `listagem-estados` div to the next one, and the release date div must
+        not contain other divs. Both hold for the SICAR page, which lists the states one after another.
+    """
+    state_dates = {}
+    starts = [match.start() for match in _BLOCK.finditer(response)]
+
+    for start, end in zip(starts, starts[1:] + [len(response)]):
+        block = response[start:end]
+
+        state = None
+        for match in _BUTTON.finditer(block):
+            attributes = _attributes(match.group(1))
+            if _has_class(attributes, "btn-abrir-modal-download-base-poligono"):
+                state = attributes.get("data-estado")
+                break
+
+        release_date = None
+        for match in _DIV.finditer(block):
+            if _has_class(_attributes(match.group(1)), "data-disponibilizacao"):
+                release_date = _text(
+                    block[match.end() : block.find(b"</div", match.end())]
+                )
+                break
+
+        if state in _STATES and release_date:
+            state_dates[_STATES[state]] = release_date
+
+    return state_dates
+
+
+def soup_release_dates(response: bytes) -> Dict:
+    """
+    Parse the page with BeautifulSoup.
+
+    Parameters:
+        response (bytes): The html page from SICAR with release dates per state.
+
+    Returns:
+        Dict: A dict containing state sign as keys and release date as value.
+
+    Note:
+        BeautifulSoup is only imported here, since it is only needed when the scanner finds no state.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(response.decode("utf-8"), "html.parser")
+
+    state_dates = {}
+
+    for state_block in soup.find_all("div", class_="listagem-estados"):
+        button_tag = state_block.find(
+            "button", class_="btn-abrir-modal-download-base-poligono"
+        )
+        state = button_tag.get("data-estado") if button_tag else None
+
+        date_tag = state_block.find("div", class_="data-disponibilizacao")
+        release_date = date_tag.get_text(strip=True) if date_tag else None
+
+        if state in _STATES and release_date:
+            state_dates[_STATES[state]] = release_date
+
+    return state_dates
+
+
+def to_dates(release_dates: Dict) -> Dict:
+    """
+    Convert release dates from dd/mm/yyyy strings to `datetime.date` values.
+
+    Parameters:
+        release_dates (Dict): A dict containing state sign as keys and release date as string.
+
+    Returns:
+        Dict: A dict containing state sign as keys and release date as `datetime.date`.
+
+    Raises:
+        ValueError: If a release date is not in dd/mm/yyyy format.
+    """
+    return {
+        state: datetime.strptime(release_date, "%d/%m/%Y").date()
+        for state, release_date in release_dates.items()
+    }
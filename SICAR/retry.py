@@ -0,0 +1,168 @@
+"""
+Retry Policy Module.
+
+This module decides how long `download_state` waits between attempts, and limits the rate of requests sent
+to the SICAR system.
+
+Classes:
+    Failure: Kinds of failed attempts.
+    RetryPolicy: Delay before the next attempt according to the kind of failure.
+    TokenBucket: Thread-safe token bucket shared by workers to bound their request rate.
+"""
+
+import time
+import random
+import threading
+import httpx
+from enum import Enum
+
+from SICAR.exceptions import UrlNotOkException, FailedToDownloadPolygonException
+
+
+class Failure(str, Enum):
+    """
+    Kinds of failed attempts.
+
+    Attributes:
+        INVALID_CAPTCHA: The OCR result does not have the captcha length, nothing was sent to the server.
+        SERVER: The server answered with a 5xx status, an html page instead of a zip file, or the connection failed.
+        OTHER: Any other failure, such as a captcha that could not be read as an image.
+    """
+
+    INVALID_CAPTCHA = "invalid_captcha"
+    SERVER = "server"
+    OTHER = "other"
+
+
+class RetryPolicy:
+    """
+    Delay before the next attempt according to the kind of failure.
+
+    - An invalid OCR result is retried immediately, since the server was not involved.
+    - Server failures back off exponentially with full jitter: a random delay between 0 and
+      `min(cap, base * 2 ** (failures - 1))`, where `failures` counts consecutive server failures.
+    - Other failures wait a random delay between 0 and 2 seconds, as before.
+
+    Subclasses can override `classify` and `delay` to plug in a different policy.
+
+    Attributes:
+        base (float): The backoff delay in seconds after the first server failure.
+        cap (float): The maximum backoff delay in seconds.
+    """
+
+    def __init__(self, base: float = 1.0, cap: float = 60.0):
+        """
+        Initialize an instance of the RetryPolicy class.
+
+        Parameters:
+            base (float): The backoff delay in seconds after the first server failure. Default is 1.
+            cap (float): The maximum backoff delay in seconds. Default is 60.
+
+        Returns:
+            None
+        """
+        self.base = base
+        self.cap = cap
+
+    def classify(self, error: Exception) -> Failure:
+        """
+        Get the kind of failure of an attempt that raised an exception.
+
+        Parameters:
+            error (Exception): The exception raised by the attempt.
+
+        Returns:
+            Failure: `Failure.SERVER` for 5xx responses, html pages and transport errors, otherwise `Failure.OTHER`.
+        """
+        if isinstance(error, (UrlNotOkException, FailedToDownloadPolygonException)):
+            if error.status_code and error.status_code >= 500:
+                return Failure.SERVER
+
+        if isinstance(error, FailedToDownloadPolygonException):
+            if (error.content_type or "").startswith("text/html"):
+                return Failure.SERVER
+
+        if isinstance(error, httpx.TransportError) or isinstance(
+            error.__cause__, httpx.TransportError
+        ):
+            return Failure.SERVER
+
+        return Failure.OTHER
+
+    def delay(self, failure: Failure, failures: int) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Parameters:
+            failure (Failure): The kind of failure of the last attempt.
+            failures (int): The number of consecutive failures of that kind, including the last one.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        if failure == Failure.INVALID_CAPTCHA:
+            return 0.0
+
+        if failure == Failure.SERVER:
+            return random.uniform(0, min(self.cap, self.base * 2 ** (failures - 1)))
+
+        return random.random() + random.random()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by workers to bound their request rate.
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens per second. Each request takes one token;
+    when the bucket is empty the request waits until its token is available. Sharing one bucket between Sicar
+    instances, threads or asyncio tasks keeps their combined rate under `rate`.
+
+    Attributes:
+        rate (float): Tokens added per second, i.e. the sustained request rate.
+        burst (int): Maximum number of tokens, i.e. requests that can be sent at once after being idle.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize an instance of the TokenBucket class, starting full.
+
+        Parameters:
+            rate (float): Tokens added per second.
+            burst (int): Maximum number of tokens. Default is 1.
+
+        Returns:
+            None
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, borrowing it from the future if the bucket is empty.
+
+        Returns:
+            float: The time in seconds to wait before using the token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        """
+        Take a token, sleeping until it is available.
+
+        Returns:
+            None
+        """
+        wait = self.reserve()
+
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,522 @@
+"""
+Shapefile Reader Module.
+
+This module reads the features of a polygon downloaded by `Sicar.download_state` straight from its `.zip` file.
+The `.shp` and `.dbf` members are decompressed as streams, one record at a time, so memory use does not grow with
+the size of the state and nothing is extracted to disk.
+
+Classes:
+    Field: A column of the attribute table.
+    Feature: A geometry and its attributes.
+    ShapefileReader: Streaming reader of a shapefile inside a zip archive.
+
+Functions:
+    shape_bbox: Read the bounding box of a `.shp` record without parsing its coordinates.
+    parse_record: Decode a record of the attribute table.
+    parse_shape: Parse the content of a `.shp` record into a GeoJSON geometry.
+    read_features: Iterate over the features of a downloaded polygon.
+"""
+
+import codecs
+import struct
+import zipfile
+from pathlib import Path, PurePosixPath
+from datetime import date
+from typing import Dict, Iterator, List, NamedTuple
+
+from SICAR.exceptions import InvalidShapefileException
+
+_SHP_HEADER = struct.Struct(">i20xi")
+"""Big-endian part of the main file header: file code and file length in 16-bit words."""
+
+_SHP_LAYER = struct.Struct("<2i4d32x")
+"""Little-endian part of the main file header: version, shape type, bounding box and Z/M ranges."""
+
+_RECORD_HEADER = struct.Struct(">ii")
+"""Record header: record number and content length in 16-bit words."""
+
+_DBF_HEADER = struct.Struct("<B3xIHH20x")
+"""Table header: version, number of records, header length and record length."""
+
+_DBF_FIELD = struct.Struct("<11sc4xBB14x")
+"""Field descriptor: name, type, length and decimal count."""
+
+_POINT_TYPES = {1, 11, 21}
+"""Point shape types, plain and with Z or M values."""
+
+_MULTIPOINT_TYPES = {8, 18, 28}
+"""MultiPoint shape types, plain and with Z or M values."""
+
+_POLYLINE_TYPES = {3, 13, 23}
+"""PolyLine shape types, plain and with Z or M values."""
+
+_POLYGON_TYPES = {5, 15, 25}
+"""Polygon shape types, plain and with Z or M values."""
+
+
+class Field(NamedTuple):
+    """
+    A column of the attribute table.
+
+    Attributes:
+        name (str): The column name.
+        type (str): The dBase type: C (text), N or F (number), D (date), L (logical) or another code kept as text.
+        length (int): The width of the column in bytes.
+        decimals (int): The number of decimal places of numbers.
+    """
+
+    name: str
+    type: str
+    length: int
+    decimals: int
+
+
+class Feature(NamedTuple):
+    """
+    A geometry and its attributes.
+
+    Attributes:
+        geometry (Dict | None): A GeoJSON geometry (`Point`, `MultiPoint`, `LineString`, `MultiLineString`,
+            `Polygon` or `MultiPolygon`), or None for a null shape. Z and M values are dropped.
+        properties (Dict): The attributes by column name.
+    """
+
+    geometry: Dict | None
+    properties: Dict
+
+    @property
+    def __geo_interface__(self) -> Dict:
+        """
+        Get the feature as a GeoJSON dict, understood by shapely and geopandas.
+
+        Returns:
+            Dict: A GeoJSON `Feature`.
+        """
+        return {
+            "type": "Feature",
+            "geometry": self.geometry,
+            "properties": self.properties,
+        }
+
+
+def _ring_area(ring: List) -> float:
+    """
+    Compute the signed area of a ring with the shoelace formula.
+
+    Parameters:
+        ring (List): The ring coordinates.
+
+    Returns:
+        float: The area, negative for clockwise rings.
+    """
+    return sum(
+        x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1])
+    )
+
+
+def shape_bbox(content: bytes) -> tuple | None:
+    """
+    Read the bounding box of a `.shp` record without parsing its coordinates.
+
+    Parameters:
+        content (bytes): The record content, starting with the shape type.
+
+    Returns:
+        tuple | None: The box as (xmin, ymin, xmax, ymax), or None for a null shape.
+    """
+    (shape_type,) = struct.unpack_from("<i", content)
+
+    if shape_type == 0:
+        return None
+
+    if shape_type in _POINT_TYPES:
+        x, y = struct.unpack_from("<2d", content, 4)
+        return x, y, x, y
+
+    return struct.unpack_from("<4d", content, 4)
+
+
+def _parse_value(field: Field, raw: bytes, encoding: str):
+    """
+    Decode the value of a column.
+
+    Parameters:
+        field (Field): The column.
+        raw (bytes): The raw value, padded with spaces.
+        encoding (str): The encoding of text values.
+
+    Returns:
+        Any: A `str` for text, an `int` or `float` for numbers, a `datetime.date` for dates, a `bool` for
+        logicals, or None for blank numbers, dates and logicals.
+
+    Note:
+        Numbers of a column without decimals are always `int`, matching the `int64` type the column gets in
+        GeoParquet: a value written as `12.0` reads as `12`, and a fraction is truncated.
+    """
+    if field.type in "NF":
+        value = raw.strip(b" \0*")
+        if not value:
+            return None
+        if field.decimals:
+            return float(value)
+        return int(value) if value.lstrip(b"+-").isdigit() else int(float(value))
+
+    if field.type == "D":
+        value = raw.strip()
+        if not value.strip(b"0"):
+            return None
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+
+    if field.type == "L":
+        value = raw.strip().upper()
+        return None if value in (b"", b"?") else value in (b"T", b"Y")
+
+    return raw.decode(encoding, errors="replace").rstrip(" \0")
+
+
+def parse_record(fields: List[Field], record: bytes, encoding: str) -> Dict:
+    """
+    Decode a record of the attribute table.
+
+    Parameters:
+        fields (List[Field]): The columns of the table.
+        record (bytes): The record, starting with its deletion flag.
+        encoding (str): The encoding of text values.
+
+    Returns:
+        Dict: The attributes by column name.
+    """
+    properties, offset = {}, 1
+
+    for field in fields:
+        properties[field.name] = _parse_value(
+            field, record[offset : offset + field.length], encoding
+        )
+        offset += field.length
+
+    return properties
+
+
+def parse_shape(content: bytes) -> Dict | None:
+    """
+    Parse the content of a `.shp` record into a GeoJSON geometry.
+
+    Parameters:
+        content (bytes): The record content, starting with the shape type.
+
+    Returns:
+        Dict | None: The geometry, or None for a null shape.
+
+    Raises:
+        InvalidShapefileException: If the shape type is not supported.
+
+    Note:
+        Shapefile polygons list outer rings clockwise and holes counter-clockwise. Each hole is assigned to the
+        outer ring preceding it, which is how SICAR and most writers order them.
+    """
+    (shape_type,) = struct.unpack_from("<i", content)
+
+    if shape_type == 0:
+        return None
+
+    if shape_type in _POINT_TYPES:
+        return {"type": "Point", "coordinates": struct.unpack_from("<2d", content, 4)}
+
+    if shape_type in _MULTIPOINT_TYPES:
+        (count,) = struct.unpack_from("<i", content, 36)
+        values = struct.unpack_from(f"<{2 * count}d", content, 40)
+        return {
+            "type": "MultiPoint",
+            "coordinates": list(zip(values[::2], values[1::2])),
+        }
+
+    if shape_type not in _POLYLINE_TYPES | _POLYGON_TYPES:
+        raise InvalidShapefileException(f"Unsupported shape type {shape_type}")
+
+    parts_count, points_count = struct.unpack_from("<2i", content, 36)
+    parts = struct.unpack_from(f"<{parts_count}i", content, 44) + (points_count,)
+    values = struct.unpack_from(f"<{2 * points_count}d", content, 44 + 4 * parts_count)
+    points = list(zip(values[::2], values[1::2]))
+    lines = [points[start:end] for start, end in zip(parts, parts[1:])]
+
+    if shape_type in _POLYLINE_TYPES:
+        if len(lines) == 1:
+            return {"type": "LineString", "coordinates": lines[0]}
+        return {"type": "MultiLineString", "coordinates": lines}
+
+    polygons = []
+    for ring in lines:
+        if _ring_area(ring) <= 0 or not polygons:
+            polygons.append([ring])
+        else:
+            polygons[-1].append(ring)
+
+    if len(polygons) == 1:
+        return {"type": "Polygon", "coordinates": polygons[0]}
+    return {"type": "MultiPolygon", "coordinates": polygons}
+
+
+class ShapefileReader:
+    """
+    Streaming reader of a shapefile inside a zip archive.
+
+    The reader opens the `.shp` and `.dbf` members of one layer and decodes a record of each per feature. The
+    `.shx` index is not needed to read the features in order. Use it as a context manager, or call `close`.
+
+    Attributes:
+        layer (str): The name of the layer, i.e. the member name without extension.
+        shape_type (int): The shape type of the layer, such as 5 for polygons.
+        bbox (tuple): The bounding box of the layer as (xmin, ymin, xmax, ymax).
+        fields (List[Field]): The columns of the attribute table.
+        encoding (str): The encoding of the text attributes, read from the `.cpg` member. Defaults to UTF-8.
+        length (int): The number of records, including deleted ones.
+        record_length (int): The size of a `.dbf` record in bytes.
+    """
+
+    def __init__(self, path: Path | str, layer: str = None):
+        """
+        Initialize an instance of the ShapefileReader class and read the headers of the layer.
+
+        Parameters:
+            path (Path | str): The `.zip` file downloaded by `Sicar.download_state`.
+            layer (str, optional): The layer to read when the archive has more than one. Defaults to the first.
+
+        Returns:
+            None
+
+        Raises:
+            InvalidShapefileException: If the archive has no such layer or its headers are invalid.
+        """
+        self._zip = zipfile.ZipFile(path)
+
+        try:
+            members = self._members(layer)
+            self.layer = PurePosixPath(members["shp"]).stem
+            self.encoding = "utf-8"
+
+            if "cpg" in members:
+                self.encoding = self._encoding(self._zip.read(members["cpg"]))
+
+            self._shp = self._zip.open(members["shp"])
+            self._dbf = self._zip.open(members["dbf"])
+            self._read_shp_header()
+            self._read_dbf_header()
+        except BaseException:
+            self.close()
+            raise
+
+    def _members(self, layer: str = None) -> Dict:
+        """
+        Find the members of a layer.
+
+        Parameters:
+            layer (str, optional): The name of the layer. Defaults to the first layer of the archive.
+
+        Returns:
+            Dict: The member names by lowercase extension.
+
+        Raises:
+            InvalidShapefileException: If the layer is missing or has no `.shp` or `.dbf` member.
+        """
+        layers = {}
+
+        for name in self._zip.namelist():
+            member = PurePosixPath(name)
+            stem = str(member.with_suffix(""))
+            layers.setdefault(stem, {})[member.suffix[1:].lower()] = name
+
+        candidates = [
+            stem
+            for stem, members in layers.items()
+            if "shp" in members
+            and (layer is None or layer in (stem, PurePosixPath(stem).name))
+        ]
+
+        if not candidates:
+            raise InvalidShapefileException(f"No shapefile layer {layer or ''}".strip())
+
+        members = layers[candidates[0]]
+
+        if "dbf" not in members:
+            raise InvalidShapefileException(f"Layer {candidates[0]} has no .dbf file")
+
+        return members
+
+    @staticmethod
+    def _encoding(cpg: bytes) -> str:
+        """
+        Get the codec named by a `.cpg` member.
+
+        Parameters:
+            cpg (bytes): The content of the member, such as `UTF-8` or `1252`.
+
+        Returns:
+            str: The codec name, or UTF-8 if it is unknown.
+        """
+        name = cpg.decode("ascii", errors="ignore").strip()
+
+        if name.isdigit():
+            name = f"cp{name}"
+
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            return "utf-8"
+
+    def _read_shp_header(self):
+        """
+        Read the header of the `.shp` member.
+
+        Returns:
+            None
+
+        Raises:
+            InvalidShapefileException: If the member is not a shapefile.
+        """
+        header = self._shp.read(_SHP_HEADER.size + _SHP_LAYER.size)
+
+        if len(header) != _SHP_HEADER.size + _SHP_LAYER.size:
+            raise InvalidShapefileException("Truncated .shp header")
+
+        code, _ = _SHP_HEADER.unpack_from(header)
+        _, self.shape_type, *bbox = _SHP_LAYER.unpack_from(header, _SHP_HEADER.size)
+        self.bbox = tuple(bbox)
+
+        if code != 9994:
+            raise InvalidShapefileException("Not a .shp file")
+
+    def _read_dbf_header(self):
+        """
+        Read the header and the field descriptors of the `.dbf` member.
+
+        Returns:
+            None
+
+        Raises:
+            InvalidShapefileException: If the header is truncated.
+        """
+        header = self._dbf.read(_DBF_HEADER.size)
+
+        if len(header) != _DBF_HEADER.size:
+            raise InvalidShapefileException("Truncated .dbf header")
+
+        _, self.length, header_length, self.record_length = _DBF_HEADER.unpack(header)
+        descriptors = self._dbf.read(header_length - _DBF_HEADER.size)
+        self.fields = []
+
+        for offset in range(0, len(descriptors) - 1, _DBF_FIELD.size):
+            if descriptors[offset] == 0x0D:
+                break
+            name, kind, length, decimals = _DBF_FIELD.unpack_from(descriptors, offset)
+            self.fields.append(
+                Field(
+                    name.split(b"\0", 1)[0].decode("ascii"),
+                    kind.decode("ascii"),
+                    length,
+                    decimals,
+                )
+            )
+
+    def properties(self, record: bytes) -> Dict:
+        """
+        Decode a record of the attribute table.
+
+        Parameters:
+            record (bytes): The record, starting with its deletion flag.
+
+        Returns:
+            Dict: The attributes by column name.
+        """
+        return parse_record(self.fields, record, self.encoding)
+
+    def records(self) -> Iterator[tuple]:
+        """
+        Read the raw records in order, skipping records marked as deleted.
+
+        Returns:
+            Iterator[tuple]: The position of each record in the layer, its `.dbf` record and its `.shp` content.
+
+        Raises:
+            InvalidShapefileException: If a record is truncated.
+        """
+        for position in range(self.length):
+            header = self._shp.read(_RECORD_HEADER.size)
+            record = self._dbf.read(self.record_length)
+
+            if len(header) != _RECORD_HEADER.size or len(record) != self.record_length:
+                raise InvalidShapefileException("Truncated record")
+
+            _, words = _RECORD_HEADER.unpack(header)
+            content = self._shp.read(2 * words)
+
+            if len(content) != 2 * words:
+                raise InvalidShapefileException("Truncated record")
+
+            if record[:1] != b"*":
+                yield position, record, content
+
+    def __iter__(self) -> Iterator[Feature]:
+        """
+        Read the features in order, skipping records marked as deleted.
+
+        Returns:
+            Iterator[Feature]: The features.
+
+        Raises:
+            InvalidShapefileException: If a record is truncated.
+        """
+        for _, record, content in self.records():
+            yield Feature(parse_shape(content), self.properties(record))
+
+    def close(self):
+        """
+        Close the archive and its members.
+
+        Returns:
+            None
+        """
+        for member in ("_shp", "_dbf"):
+            if hasattr(self, member):
+                getattr(self, member).close()
+        self._zip.close()
+
+    def __enter__(self) -> "ShapefileReader":
+        """
+        Enter the context.
+
+        Returns:
+            ShapefileReader: This reader.
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Close the reader when leaving the context.
+
+        Returns:
+            None
+        """
+        self.close()
+
+
+def read_features(path: Path | str, layer: str = None) -> Iterator[Feature]:
+    """
+    Iterate over the features of a downloaded polygon.
+
+    Parameters:
+        path (Path | str): The `.zip` file downloaded by `Sicar.download_state`.
+        layer (str, optional): The layer to read when the archive has more than one. Defaults to the first.
+
+    Returns:
+        Iterator[Feature]: The features, decoded one at a time. The archive is closed once they are exhausted or
+        the generator is closed.
+
+    Raises:
+        InvalidShapefileException: If the archive does not hold a valid shapefile.
+
+    Example:
+        >>> for feature in read_features("temp/PA_AREA_IMOVEL.zip"):
+        ...     print(feature.properties["cod_imovel"], feature.geometry["type"])
+    """
+    with ShapefileReader(path, layer) as reader:
+        yield from reader
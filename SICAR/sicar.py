@@ -9,140 +9,185 @@ Classes:
 
 import io
 import os
-import ssl
+import copy
+import functools
 import time
 import random
 import httpx
 from PIL import Image, UnidentifiedImageError
-from bs4 import BeautifulSoup
-from tqdm import tqdm
-from typing import Dict
+from typing import Dict, Iterator
 from pathlib import Path
 from urllib.parse import urlencode
-import warnings
-
-warnings.filterwarnings(
-    "ignore", category=DeprecationWarning, message="ssl.PROTOCOL_TLSv1_2 is deprecated"
-)
+from concurrent.futures import ThreadPoolExecutor
 
+from SICAR.base import BaseSicar
 from SICAR.drivers import Captcha, Tesseract
 from SICAR.state import State
-from SICAR.url import Url
 from SICAR.polygon import Polygon
+from SICAR.prefetch import CaptchaPrefetcher
+from SICAR.pool import SessionPool
+from SICAR.partial import PartialDownload
+from SICAR.sinks import Sink, as_sink
+from SICAR.manifest import Manifest
+from SICAR.cache import ReleaseDateCache
+from SICAR.retry import Failure, RetryPolicy, TokenBucket
+from SICAR.metrics import Metrics
+from SICAR.events import (
+    Events,
+    AttemptStarted,
+    CaptchaSolved,
+    AttemptFailed,
+    UpToDate,
+)
+from SICAR.release_dates import to_dates
+from SICAR.shapefile import Feature, read_features
+from SICAR.spatial_index import SpatialIndex, open_index
+from SICAR.attribute_index import AttributeIndex, open_attribute_index
 from SICAR.exceptions import (
     UrlNotOkException,
-    PolygonNotValidException,
-    StateCodeNotValidException,
     FailedToDownloadCaptchaException,
     FailedToDownloadPolygonException,
     FailedToGetReleaseDateException,
 )
 
 
-class Sicar(Url):
+class Sicar(BaseSicar):
     """
     Class representing the Sicar system.
 
     Sicar is a system for managing environmental rural properties in Brazil.
 
-    It inherits from the Url class to provide access to URLs related to the Sicar system.
+    It inherits from the BaseSicar class, and through it from the Url class to provide access to URLs related to
+    the Sicar system. Every request is sent with a blocking `httpx.Client`.
 
     Attributes:
         _driver (Captcha): The driver used for handling captchas. Default is Tesseract.
+        _release_dates (ReleaseDateCache | None): The cache used by `get_release_dates`, if any.
+        metrics (Metrics): The registry of captcha, OCR and download metrics, shared with workers.
+        _events (Events): The listeners receiving download events, shared with workers.
     """
 
     def __init__(
         self,
         driver: Captcha = Tesseract,
         headers: Dict = None,
+        release_dates: ReleaseDateCache = None,
+        limits: httpx.Limits = None,
+        http2: bool = False,
+        retry: RetryPolicy = None,
+        limiter: TokenBucket = None,
+        metrics: Metrics = None,
+        listeners: list = None,
+        base_url: str = None,
     ):
         """
         Initialize an instance of the Sicar class.
 
         Parameters:
-            driver (Captcha): The driver used for handling captchas. Default is Tesseract.
+            driver (Captcha): The driver class used for handling captchas, or a driver instance such as an `OcrExecutor`. Default is Tesseract.
             headers (Dict): Additional headers for HTTP requests. Default is None.
+            release_dates (ReleaseDateCache): A cache for `get_release_dates`. Default is None (always request the page).
+            limits (httpx.Limits): Connection pool limits and keep-alive expiry of each session. Default is None, which uses `_LIMITS`.
+            http2 (bool): Whether to negotiate HTTP/2. Requires the `http2` extra. Default is False.
+            retry (RetryPolicy): The policy deciding the delay between download attempts. Default is None, which uses `RetryPolicy()`.
+            limiter (TokenBucket): A rate limiter taken before every request, which can be shared between instances. Default is None (no limit).
+            metrics (Metrics): The registry recording latencies and rates, which can be shared between instances. Default is None, which creates one.
+            listeners (list): Callables receiving the download events. Default is None, which shows a `tqdm` progress bar. Pass an empty list for no output.
+            base_url (str): The base URL of the SICAR system, e.g. the `base_url` of a `MockSicarServer`. Default is None, which uses `Url._BASE`.
 
         Returns:
             None
         """
-        self._driver = driver()
-        self._create_session(headers=headers)
+        self._configure(
+            driver,
+            headers,
+            release_dates,
+            limits,
+            http2,
+            retry,
+            limiter,
+            metrics,
+            listeners,
+            base_url,
+        )
         self._initialize_cookies()
 
-    def _parse_release_dates(self, response: bytes) -> Dict:
+    def _new_session(self, headers: Dict = None) -> httpx.Client:
         """
-        Parse raw html getting states and release date.
+        Build a new HTTP client configured for the SICAR system.
 
         Parameters:
-            response (bytes): The request content as byte string containing html page from SICAR with release dates per state
+            headers (Dict): Additional headers for the session. Default is None, which uses `_HEADERS`.
 
         Returns:
-            Dict: A dict containing state sign as keys and parsed update date as value.
-        """
-        html_content = response.decode("utf-8")
-
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        state_dates = {}
-
-        for state_block in soup.find_all("div", class_="listagem-estados"):
-            button_tag = state_block.find(
-                "button", class_="btn-abrir-modal-download-base-poligono"
-            )
-            state = button_tag.get("data-estado") if button_tag else None
+            httpx.Client: The configured HTTP client.
 
-            date_tag = state_block.find("div", class_="data-disponibilizacao")
-            date = date_tag.get_text(strip=True) if date_tag else None
+        Note:
+            Connections are kept alive and reused within the limits of `_limits`. Every request is counted in
+            `connection_stats`.
+        """
+        session = httpx.Client(
+            verify=self._ssl_context(),
+            limits=self._limits,
+            http2=self._http2,
+            event_hooks={"request": [self._connections.hook]},
+        )
+        session.headers.update(headers if isinstance(headers, dict) else self._HEADERS)
+        return session
 
-            if state in iter(State) and date:
-                state_dates[State(state)] = date
+    def _initialize_cookies(self):
+        """
+        Initialize cookies by making the initial request and accepting any redirections.
 
-        return state_dates
+        This method is intended to be called in the constructor to set up the session cookies.
 
-    def _create_session(self, headers: Dict = None):
+        Returns:
+            None
         """
-        Create a new session for making HTTP requests.
-
-        Parameters:
-            headers (Dict): Additional headers for the session. Default is None.
+        self._get(self._INDEX)
 
-        Note:
-            The SSL certificate verification is disabled by default using `verify=context`. This allows connections to servers
-            with self-signed or invalid certificates. Disabling SSL certificate verification can expose your application to
-            security risks, such as man-in-the-middle attacks. If the server has a valid SSL certificate issued by a trusted
-            certificate authority, you can remove the `verify=context` parameter to enable SSL certificate verification by
-            default.
+    def _worker(self) -> "Sicar":
+        """
+        Create a copy of this instance with its own session and cookies.
 
         Returns:
-            None
+            Sicar: A copy sharing the driver, but not the session.
         """
+        worker = copy.copy(self)
+        worker._create_session(headers=self._headers)
+        worker._initialize_cookies()
+        return worker
+
+    def session_pool(
+        self, size: int = 4, max_idle: float = 600.0, max_uses: int = None
+    ) -> SessionPool:
+        """
+        Create a pool of worker sessions to run several downloads at the same time.
 
-        context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-        context.set_ciphers("RSA+AESGCM:RSA+AES:!aNULL:!MD5:!DSS")
+        Parameters:
+            size (int, optional): The maximum number of sessions. Defaults to 4.
+            max_idle (float, optional): Seconds without use after which a session is recycled. Defaults to 600.
+            max_uses (int, optional): The number of downloads after which a session is recycled. Defaults to None (no limit).
 
-        self._session = httpx.Client(verify=context)
-        self._session.headers.update(
-            headers
-            if isinstance(headers, dict)
-            else {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Connection": "close",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-            }
-        )
+        Returns:
+            SessionPool: The pool. Sessions are created on first lease, each with its own cookies. Close it when done.
 
-    def _initialize_cookies(self):
+        Note:
+            A session holds a single captcha, so one `Sicar` instance must not run two downloads at once. Run each
+            download on its own session instead, with `pool.download_state(...)` or
+            `with pool.lease() as worker: worker.download_state(...)`.
         """
-        Initialize cookies by making the initial request and accepting any redirections.
+        return SessionPool(self, size=size, max_idle=max_idle, max_uses=max_uses)
 
-        This method is intended to be called in the constructor to set up the session cookies.
+    def _throttle(self):
+        """
+        Wait for the rate limiter, if there is one, before sending a request.
 
         Returns:
             None
         """
-        self._get(self._INDEX)
+        if self._limiter:
+            self._limiter.acquire()
 
     def _get(self, url: str, *args, **kwargs):
         """
@@ -159,10 +204,15 @@ class Sicar(Url):
         Raises:
             UrlNotOkException: If the response from the GET request is not OK (status code is not 200).
         """
+        self._throttle()
         response = self._session.get(url=url, *args, **kwargs)
 
-        if response.status_code not in [httpx.codes.OK, httpx.codes.FOUND]:
-            raise UrlNotOkException(url)
+        if response.status_code not in [
+            httpx.codes.OK,
+            httpx.codes.FOUND,
+            httpx.codes.NOT_MODIFIED,
+        ]:
+            raise UrlNotOkException(url, response.status_code)
 
         return response
 
@@ -195,7 +245,9 @@ class Sicar(Url):
         polygon: Polygon,
         captcha: str,
         folder: str,
-        chunk_size: int = 1024,
+        chunk_size: int = 1024 * 1024,
+        events: Events = None,
+        sink: Sink = None,
     ) -> Path:
         """
         Download polygon for the specified state.
@@ -205,52 +257,101 @@ class Sicar(Url):
             polygon (Polygon | str): The polygon to download.
             captcha (str): The captcha value for verification.
             folder (str): The folder path where the polygon will be saved.
-            chunk_size (int, optional): The size of each chunk to download. Defaults to 1024.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+            events (Events, optional): The listeners receiving the progress events. Defaults to the instance listeners.
+            sink (Sink, optional): The destination of the polygon. Defaults to a `PartialDownload` in `folder`.
 
         Returns:
-            Path: The path to the downloaded polygon.
+            Path: The path to the downloaded polygon, or the result of `sink.finish()` when a sink is given.
 
         Raises:
             FailedToDownloadPolygonException: If the polygon download fails.
 
         Note:
             This method performs the polygon download by making a GET request to the polygon URL with the specified
-            state code and captcha. The response is then streamed and saved to a file in chunks. A progress bar is displayed
-            during the download. The downloaded file path is returned.
+            state code and captcha. The response is then streamed to a `.part` file, reporting throttled
+            `BytesReceived` events. The pieces received from the socket are coalesced in a write buffer of
+            `chunk_size` bytes instead of being rechunked by httpx, which would copy every byte once more, and the
+            file is preallocated to its final size. When a previous attempt was interrupted, only the missing bytes are
+            requested with an HTTP Range request; if the server answers with the whole file, the download restarts.
+            The `.part` file is renamed to the final path once complete and the downloaded file path is returned.
         """
 
         query = urlencode(
             {"idEstado": state.value, "tipoBase": polygon.value, "ReCaptcha": captcha}
         )
+        url = f"{self._DOWNLOAD_BASE}?{query}"
+        download = (
+            PartialDownload(self._polygon_path(folder, state, polygon))
+            if sink is None
+            else sink
+        )
+        self._throttle()
 
-        with self._session.stream("GET", f"{self._DOWNLOAD_BASE}?{query}") as response:
-            try:
-                if response.status_code != httpx.codes.OK:
-                    raise UrlNotOkException(f"{self._DOWNLOAD_BASE}?{query}")
-            except UrlNotOkException as error:
-                raise FailedToDownloadPolygonException() from error
-
-            content_length = int(response.headers.get("Content-Length", 0))
-
-            content_type = response.headers.get("Content-Type", "")
-
-            if content_length == 0 or not content_type.startswith("application/zip"):
-                raise FailedToDownloadPolygonException()
-            path = Path(
-                os.path.join(folder, f"{state.value}_{polygon.value}")
-            ).with_suffix(".zip")
-
-            with open(path, "wb") as fd:
-                with tqdm(
-                    total=content_length,
-                    unit="iB",
-                    unit_scale=True,
-                    desc=f"Downloading polygon '{polygon.value}' for state '{state.value}'",
-                ) as progress_bar:
-                    for chunk in response.iter_bytes():
-                        fd.write(chunk)
-                        progress_bar.update(len(chunk))
-        return path
+        try:
+            with self._session.stream(
+                "GET", url, headers=download.headers()
+            ) as response:
+                try:
+                    if response.status_code not in [
+                        httpx.codes.OK,
+                        httpx.codes.PARTIAL_CONTENT,
+                    ]:
+                        raise UrlNotOkException(url, response.status_code)
+                except UrlNotOkException as error:
+                    raise FailedToDownloadPolygonException(
+                        response.status_code
+                    ) from error
+
+                content_length = int(response.headers.get("Content-Length", 0))
+
+                content_type = response.headers.get("Content-Type", "")
+
+                if content_length == 0 or not content_type.startswith(
+                    "application/zip"
+                ):
+                    raise FailedToDownloadPolygonException(
+                        response.status_code, content_type
+                    )
+
+                labels = self._labels(state)
+                self.metrics.inc("sicar_captcha_accepted_total", **labels)
+                events = self._events if events is None else events
+
+                with download.open(response, buffer_size=chunk_size) as fd:
+                    digest = download.digest()
+                    progress = events.progress(
+                        state, polygon, download.total, download.total - content_length
+                    )
+                    start, offset = time.perf_counter(), progress.received
+
+                    try:
+                        for chunk in response.iter_bytes():
+                            fd.write(chunk)
+                            digest.update(chunk)
+                            progress.update(len(chunk))
+                    finally:
+                        self.metrics.inc(
+                            "sicar_download_bytes_total",
+                            progress.received - offset,
+                            **labels,
+                        )
+                        self.metrics.inc(
+                            "sicar_download_seconds_total",
+                            time.perf_counter() - start,
+                            **labels,
+                        )
+
+                progress.close()
+        except httpx.HTTPError as error:
+            raise FailedToDownloadPolygonException() from error
+
+        if progress.received != download.total:
+            raise FailedToDownloadPolygonException()
+
+        download.sha256 = digest.hexdigest()
+
+        return download.finish()
 
     def download_state(
         self,
@@ -259,7 +360,10 @@ class Sicar(Url):
         folder: Path | str = Path("temp"),
         tries: int = 25,
         debug: bool = False,
-        chunk_size: int = 1024,
+        chunk_size: int = 1024 * 1024,
+        prefetch: int = 0,
+        sink=None,
+        captcha_lifetime: float = CaptchaPrefetcher._LIFETIME,
     ) -> Path | bool:
         """
         Download the polygon or other output format for the specified state.
@@ -269,65 +373,182 @@ class Sicar(Url):
             polygon (Polygon | str): The polygon to download the files. It can be either a `Polygon` enum value or a string representing the polygon's.
             folder (Path | str, optional): The folder path where the downloaded data will be saved. Defaults to "temp".
             tries (int, optional): The number of attempts to download the data. Defaults to 25.
-            debug (bool, optional): Whether to print debug information. Defaults to False.
-            chunk_size (int, optional): The size of each chunk to download. Defaults to 1024.
+            debug (bool, optional): Whether to print debug information through a `PrintListener`. Defaults to False.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+            prefetch (int, optional): The number of captchas solved ahead of time in background. Defaults to 0 (disabled).
+            sink (Sink | BinaryIO | Callable, optional): Where to send the polygon instead of `folder`: a `Sink`, a writable binary file object such as an `io.BytesIO`, or a callable receiving chunks of `chunk_size` bytes. Defaults to None.
+            captcha_lifetime (float, optional): With `prefetch`, the seconds a prefetched captcha is considered valid, which is also the longest wait for one. Defaults to 60.
 
         Returns:
-            Path | bool: The path to the downloaded data if successful, or False if download fails.
+            Path | bool: The path to the downloaded data if successful, or False if download fails. With a sink, the file object for streams and True for callables.
 
         Note:
             This method attempts to download the polygon for the specified state.
             It tries multiple times, using a captcha for verification. The downloaded data is saved to the specified folder.
             The method returns the path to the downloaded data if successful, or False if the download fails after the specified number of tries.
+            With `prefetch`, a `CaptchaPrefetcher` solves captchas while polygons are downloading, and a new attempt starts
+            as soon as the previous one fails, unless the server is failing.
+            The delay between attempts is decided by the `RetryPolicy`: none after an invalid OCR result, an exponential
+            backoff when the server is failing. There is no delay after the last attempt.
+            Progress is reported to the listeners as events: `AttemptStarted`, `CaptchaSolved`, `AttemptFailed`,
+            `DownloadStarted`, `BytesReceived`, then `DownloadFinished` or `DownloadFailed`.
+            A sink that cannot take back the bytes of a failed attempt, such as a callable, stops the download: False
+            is returned and the `io.UnsupportedOperation` is reported in the `DownloadFailed` event.
         """
-        if isinstance(state, str):
-            try:
-                state = State(state.upper())
-            except ValueError as error:
-                raise StateCodeNotValidException(state) from error
+        state = self._parse_state(state)
+        polygon = self._parse_polygon(polygon)
 
-        if isinstance(polygon, str):
-            try:
-                polygon = Polygon(polygon.upper())
-            except ValueError as error:
-                raise PolygonNotValidException(polygon) from error
+        if sink is None:
+            Path(folder).mkdir(parents=True, exist_ok=True)
+        else:
+            sink = as_sink(sink)
 
-        Path(folder).mkdir(parents=True, exist_ok=True)
+        events = self._debug_events(debug)
+
+        if prefetch > 0:
+            with CaptchaPrefetcher(
+                self, size=prefetch, lifetime=captcha_lifetime, state=state
+            ) as prefetcher:
+                return self._download_state_prefetched(
+                    prefetcher, state, polygon, folder, tries, events, chunk_size, sink
+                )
 
         captcha = ""
-        info = f"'{polygon.value}' for '{state.value}'"
+        labels = self._labels(state)
+        previous, failures, attempts = None, 0, 0
 
-        while tries > 0:
+        while attempts < tries:
+            attempts += 1
+            events.emit(AttemptStarted(state, polygon, attempts, tries))
             try:
-                captcha = self._driver.get_captcha(self._download_captcha())
+                with self.metrics.timer("sicar_captcha_download_seconds", **labels):
+                    image = self._download_captcha()
+
+                with self.metrics.timer("sicar_ocr_seconds", **labels):
+                    captcha = self._driver.get_captcha(image)
+
+                self.metrics.inc(
+                    "sicar_ocr_output_length_total", length=len(captcha), **labels
+                )
+                events.emit(
+                    CaptchaSolved(
+                        state, polygon, attempts, tries, captcha, len(captcha) == 5
+                    )
+                )
 
                 if len(captcha) == 5:
-                    if debug:
-                        print(
-                            f"[{tries:02d}] - Requesting {info} with captcha '{captcha}'"
-                        )
-
-                    return self._download_polygon(
+                    self.metrics.inc("sicar_captcha_submitted_total", **labels)
+                    path = self._download_polygon(
                         state=state,
                         polygon=polygon,
                         captcha=captcha,
                         folder=folder,
                         chunk_size=chunk_size,
+                        events=events,
+                        sink=sink,
+                    )
+                    self._record_success(events, state, polygon, path, attempts)
+                    return path
+
+                failure, error = Failure.INVALID_CAPTCHA, None
+            except io.UnsupportedOperation as exception:
+                self._record_failure(events, state, polygon, attempts, exception)
+                return False
+            except (
+                UrlNotOkException,
+                FailedToDownloadCaptchaException,
+                FailedToDownloadPolygonException,
+                httpx.HTTPError,
+            ) as exception:
+                failure, error = self._retry.classify(exception), exception
+
+            events.emit(AttemptFailed(state, polygon, attempts, tries, failure, error))
+            failures = failures + 1 if failure == previous else 1
+            previous = failure
+
+            if attempts < tries:
+                time.sleep(self._retry.delay(failure, failures))
+
+        self._record_failure(events, state, polygon, attempts)
+        return False
+
+    def _download_state_prefetched(
+        self,
+        prefetcher: CaptchaPrefetcher,
+        state: State,
+        polygon: Polygon,
+        folder: Path | str,
+        tries: int,
+        events: Events,
+        chunk_size: int,
+        sink: Sink = None,
+    ) -> Path | bool:
+        """
+        Run the download attempts for a state using captchas solved by a prefetcher.
+
+        Parameters:
+            prefetcher (CaptchaPrefetcher): The running prefetcher providing solved captchas.
+            state (State): The state for which to download the files.
+            polygon (Polygon): The polygon to download.
+            folder (Path | str): The folder path where the downloaded data will be saved.
+            tries (int): The number of attempts to download the data.
+            events (Events): The listeners receiving the download events.
+            chunk_size (int): The size in bytes of the pieces written to disk.
+            sink (Sink, optional): The destination of the polygon. Defaults to None (`folder`).
+
+        Returns:
+            Path | bool: The path to the downloaded data if successful, or False if download fails.
+        """
+        previous, failures, attempts = None, 0, 0
+
+        while attempts < tries:
+            attempts += 1
+            events.emit(AttemptStarted(state, polygon, attempts, tries))
+            try:
+                candidate = prefetcher.get()
+                events.emit(
+                    CaptchaSolved(
+                        state, polygon, attempts, tries, candidate.captcha, True
                     )
-                elif debug:
-                    print(
-                        f"[{tries:02d}] - Invalid captcha '{captcha}' to request {info}"
+                )
+
+                self.metrics.inc("sicar_captcha_submitted_total", **self._labels(state))
+                try:
+                    path = candidate.sicar._download_polygon(
+                        state=state,
+                        polygon=polygon,
+                        captcha=candidate.captcha,
+                        folder=folder,
+                        chunk_size=chunk_size,
+                        events=events,
+                        sink=sink,
                     )
+                finally:
+                    prefetcher.release(candidate)
+
+                self._record_success(events, state, polygon, path, attempts)
+                return path
+            except io.UnsupportedOperation as error:
+                self._record_failure(events, state, polygon, attempts, error)
+                return False
             except (
+                UrlNotOkException,
                 FailedToDownloadCaptchaException,
                 FailedToDownloadPolygonException,
+                httpx.HTTPError,
             ) as error:
-                if debug:
-                    print(f"[{tries:02d}] - {error} When requesting {info}")
-            finally:
-                tries -= 1
-                time.sleep(random.random() + random.random())
+                failure = self._retry.classify(error)
+                events.emit(
+                    AttemptFailed(state, polygon, attempts, tries, failure, error)
+                )
+
+            failures = failures + 1 if failure == previous else 1
+            previous = failure
+
+            if attempts < tries and failure == Failure.SERVER:
+                time.sleep(self._retry.delay(failure, failures))
 
+        self._record_failure(events, state, polygon, attempts)
         return False
 
     def download_country(
@@ -336,8 +557,9 @@ class Sicar(Url):
         folder: Path | str = Path("brazil"),
         tries: int = 25,
         debug: bool = False,
-        chunk_size: int = 1024,
-    ):
+        chunk_size: int = 1024 * 1024,
+        workers: int = 1,
+    ) -> Dict:
         """
         Download polygon for the entire country.
 
@@ -346,39 +568,380 @@ class Sicar(Url):
             folder (Path | str, optional): The folder path where the downloaded files will be saved. Defaults to 'brazil'.
             tries (int, optional): The number of download attempts allowed per state. Defaults to 25.
             debug (bool, optional): Whether to enable debug mode with additional print statements. Defaults to False.
-            chunk_size (int, optional): The size of each chunk to download. Defaults to 1024.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+            workers (int, optional): The number of states downloaded at the same time. Defaults to 1.
 
         Returns:
             Dict: A dictionary containing the results of the download operation.
-                The keys are the state abbreviations, and the values are dictionaries representing the results of downloading each state.
-                Each state's dictionary follows the same structure as the result of the `download_state` method.
+                The keys are the states, and the values are the results of the `download_state` method for each state.
                 If a download fails for a state the corresponding value will be False.
+
+        Note:
+            With more than one worker, states are spread over a thread pool. Each state is downloaded through a
+            session leased from a `SessionPool`, with separate cookies, so captchas of concurrent downloads never
+            collide. The captcha driver is shared between threads.
         """
-        result = {}
         for state in State:
             Path(os.path.join(folder, f"{state}")).mkdir(parents=True, exist_ok=True)
 
-            result[str(state)] = self.download_state(
-                state=state,
-                polygon=polygon,
-                folder=folder,
-                tries=tries,
-                debug=debug,
-                chunk_size=chunk_size,
-            )
+        return self._download_states(
+            list(State), polygon, folder, tries, debug, chunk_size, workers
+        )
+
+    def _download_states(
+        self,
+        states: list[State],
+        polygon: Polygon | str,
+        folder: Path | str,
+        tries: int,
+        debug: bool,
+        chunk_size: int,
+        workers: int,
+    ) -> Dict:
+        """
+        Download a polygon for several states, optionally spread over a thread pool.
+
+        Parameters:
+            states (list[State]): The states to download.
+            polygon (Polygon | str): The polygon to download.
+            folder (Path | str): The folder path where the downloaded files will be saved.
+            tries (int): The number of download attempts allowed per state.
+            debug (bool): Whether to enable debug mode with additional print statements.
+            chunk_size (int): The size in bytes of the pieces written to disk.
+            workers (int): The number of states downloaded at the same time.
+
+        Returns:
+            Dict: A dictionary with each state as key and the result of `download_state` as value.
+
+        Note:
+            An unexpected error raised by the download of one state is reported as a `DownloadFailed` event with
+            the error, and that state is recorded as False. The other states are not affected. With more than one
+            worker, a session whose download failed is replaced before the next state, in case the server expired it.
+        """
+        polygon = self._parse_polygon(polygon)
+        events = self._debug_events(debug)
+
+        def settle(state: State, download) -> Path | bool:
+            try:
+                return download()
+            except Exception as error:
+                self._record_failure(events, state, polygon, 0, error)
+                return False
+
+        options = {
+            "polygon": polygon,
+            "folder": folder,
+            "tries": tries,
+            "debug": debug,
+            "chunk_size": chunk_size,
+        }
+
+        if workers <= 1:
+            return {
+                state: settle(
+                    state,
+                    functools.partial(self.download_state, state=state, **options),
+                )
+                for state in states
+            }
+
+        with (
+            self.session_pool(size=workers) as pool,
+            ThreadPoolExecutor(max_workers=workers) as executor,
+        ):
+            futures = {
+                state: executor.submit(pool.download_state, state=state, **options)
+                for state in states
+            }
+
+        return {
+            state: settle(state, future.result) for state, future in futures.items()
+        }
+
+    def read_features(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        layer: str = None,
+    ) -> Iterator[Feature]:
+        """
+        Iterate over the features of a downloaded polygon without extracting its zip file.
+
+        Parameters:
+            state (State | str): The state of the polygon. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder where the polygon was downloaded. Defaults to "temp".
+            layer (str, optional): The layer to read when the archive has more than one. Defaults to the first.
+
+        Returns:
+            Iterator[Feature]: The features, decoded one record at a time by `SICAR.shapefile.read_features`.
+
+        Raises:
+            InvalidShapefileException: If the downloaded file does not hold a valid shapefile.
+        """
+        path = self._polygon_path(
+            folder, self._parse_state(state), self._parse_polygon(polygon)
+        )
+        return read_features(path, layer)
+
+    def spatial_index(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        layer: str = None,
+    ) -> SpatialIndex:
+        """
+        Open the spatial index of a downloaded polygon, building it on first use or after a new release.
+
+        Parameters:
+            state (State | str): The state of the polygon. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder where the polygon was downloaded. Defaults to "temp".
+            layer (str, optional): The layer to index when the archive has more than one. Defaults to the first.
+
+        Returns:
+            SpatialIndex: The memory-mapped index, see `SICAR.spatial_index.open_index`. Close it when done.
+
+        Raises:
+            InvalidShapefileException: If the index must be built and the downloaded file does not hold a valid shapefile.
+        """
+        path = self._polygon_path(
+            folder, self._parse_state(state), self._parse_polygon(polygon)
+        )
+        return open_index(path, layer=layer)
+
+    def attribute_index(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        column: str = "cod_imovel",
+        layer: str = None,
+    ) -> AttributeIndex:
+        """
+        Open the index of a downloaded polygon by the value of a column, building it on first use or after a new release.
+
+        Parameters:
+            state (State | str): The state of the polygon. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder where the polygon was downloaded. Defaults to "temp".
+            column (str, optional): The indexed column. Defaults to `cod_imovel`, the property code.
+            layer (str, optional): The layer to index when the archive has more than one. Defaults to the first.
+
+        Returns:
+            AttributeIndex: The memory-mapped index, see `SICAR.attribute_index.open_attribute_index`. Close it when done.
+
+        Raises:
+            InvalidShapefileException: If the index must be built and the downloaded file does not hold a valid shapefile or has no such column.
+        """
+        path = self._polygon_path(
+            folder, self._parse_state(state), self._parse_polygon(polygon)
+        )
+        return open_attribute_index(path, column, layer=layer)
+
+    def to_geoparquet(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        destination: Path | str = None,
+        row_group_size: int = 65536,
+    ) -> list[Path]:
+        """
+        Convert a downloaded polygon into a GeoParquet dataset partitioned by state and municipality.
+
+        Parameters:
+            state (State | str): The state of the polygon. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder where the polygon was downloaded. Defaults to "temp".
+            destination (Path | str, optional): The root folder of the dataset. Defaults to `<folder>/<polygon>`, so each polygon is a dataset of every converted state.
+            row_group_size (int, optional): The maximum number of rows of a row group. Defaults to 65536.
+
+        Returns:
+            list[Path]: The files written, see `SICAR.geoparquet.to_geoparquet`.
+
+        Raises:
+            ImportError: If pyarrow is not installed. Install the `geoparquet` extra.
+            InvalidShapefileException: If the downloaded file does not hold a valid shapefile.
+        """
+        from SICAR.geoparquet import to_geoparquet
+
+        state = self._parse_state(state)
+        polygon = self._parse_polygon(polygon)
+
+        return to_geoparquet(
+            self._polygon_path(folder, state, polygon),
+            Path(folder) / polygon.value if destination is None else destination,
+            state=state,
+            row_group_size=row_group_size,
+        )
+
+    def sync_state(
+        self,
+        state: State | str,
+        polygon: Polygon | str,
+        folder: Path | str = Path("temp"),
+        tries: int = 25,
+        debug: bool = False,
+        chunk_size: int = 1024 * 1024,
+    ) -> Path | bool:
+        """
+        Download the polygon for the specified state only if a new release was published.
+
+        Parameters:
+            state (State | str): The state for which to download the files. It can be either a `State` enum value or a string representing the state's abbreviation.
+            polygon (Polygon | str): The polygon to download the files. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder path where the downloaded data will be saved. Defaults to "temp".
+            tries (int, optional): The number of attempts to download the data. Defaults to 25.
+            debug (bool, optional): Whether to print debug information. Defaults to False.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+
+        Returns:
+            Path | bool: The path to the up-to-date data, or False if the download fails.
+
+        Note:
+            The release date, size and hash of each download are recorded in the folder's `Manifest`. When the
+            release date published by SICAR matches the recorded one and the file is still on disk, the existing
+            file is returned without downloading it again.
+        """
+        state = self._parse_state(state)
+        polygon = self._parse_polygon(polygon)
+
+        release_date = self.get_release_dates().get(state)
+        manifest = Manifest(folder)
+        path = manifest.current(state, polygon, release_date)
+
+        if path:
+            self._debug_events(debug).emit(UpToDate(state, polygon, path))
+            return path
+
+        path = self.download_state(
+            state=state,
+            polygon=polygon,
+            folder=folder,
+            tries=tries,
+            debug=debug,
+            chunk_size=chunk_size,
+        )
+
+        if path:
+            manifest.record(state, polygon, release_date, path)
+
+        return path
+
+    def sync_country(
+        self,
+        polygon: Polygon | str,
+        folder: Path | str = Path("brazil"),
+        tries: int = 25,
+        debug: bool = False,
+        chunk_size: int = 1024 * 1024,
+        workers: int = 1,
+    ) -> Dict:
+        """
+        Download polygon for every state whose release date changed since the last synchronization.
+
+        Parameters:
+            polygon (Polygon | str): The polygon to download the files. It can be either a `Polygon` enum value or a string representing the polygon's.
+            folder (Path | str, optional): The folder path where the downloaded files will be saved. Defaults to 'brazil'.
+            tries (int, optional): The number of download attempts allowed per state. Defaults to 25.
+            debug (bool, optional): Whether to enable debug mode with additional print statements. Defaults to False.
+            chunk_size (int, optional): The size in bytes of the pieces written to disk. Defaults to 1 MiB.
+            workers (int, optional): The number of states downloaded at the same time. Defaults to 1.
+
+        Returns:
+            Dict: A dictionary with each state as key and the path to its up-to-date data as value.
+                If a download fails for a state the corresponding value will be False.
+
+        Note:
+            Release dates are fetched once and compared with the folder's `Manifest`. Only the states with a new
+            release, or whose file is missing, are downloaded and recorded.
+        """
+        polygon = self._parse_polygon(polygon)
+
+        release_dates = self.get_release_dates()
+        manifest = Manifest(folder)
+
+        result = {
+            state: manifest.current(state, polygon, release_dates.get(state))
+            for state in State
+        }
+        stale = [state for state, path in result.items() if path is None]
+        events = self._debug_events(debug)
+
+        for state, path in result.items():
+            if path:
+                events.emit(UpToDate(state, polygon, path))
+
+        downloaded = self._download_states(
+            stale, polygon, folder, tries, debug, chunk_size, workers
+        )
+
+        for state, path in downloaded.items():
+            if path:
+                manifest.record(state, polygon, release_dates.get(state), path)
+
+        result.update(downloaded)
+        return result
 
-    def get_release_dates(self) -> Dict:
+    def get_release_dates(self, as_date: bool = False) -> Dict:
         """
         Get release date for each state in SICAR system.
 
+        Parameters:
+            as_date (bool, optional): Whether to return the release dates as `datetime.date` values. Defaults to False.
+
+        Returns:
+            Dict: A dict containing state sign as keys and release date as string in dd/mm/yyyy format, or as `datetime.date` if `as_date` is True.
+
+        Raises:
+            FailedToGetReleaseDateException: If the page with release date fails to load.
+
+        Note:
+            With a `ReleaseDateCache`, fresh cached dates are returned without a request, and expired ones are
+            revalidated with a conditional request that the server answers with `304 Not Modified` if the page
+            did not change.
+        """
+        release_dates = self._fetch_release_dates()
+        return to_dates(release_dates) if as_date else release_dates
+
+    def _fetch_release_dates(self) -> Dict:
+        """
+        Request and parse the release dates, going through the release date cache if there is one.
+
         Returns:
             Dict: A dict containing state sign as keys and release date as string in dd/mm/yyyy format.
 
         Raises:
             FailedToGetReleaseDateException: If the page with release date fails to load.
         """
+        cache = self._release_dates
+
+        if cache is None:
+            try:
+                response = self._get(f"{self._RELEASE_DATE}")
+                return self._parse_release_dates(response.content)
+            except UrlNotOkException as error:
+                raise FailedToGetReleaseDateException() from error
+
+        release_dates = cache.get()
+
+        if release_dates is not None:
+            return release_dates
+
         try:
-            response = self._get(f"{self._RELEASE_DATE}")
-            return self._parse_release_dates(response.content)
+            response = self._get(f"{self._RELEASE_DATE}", headers=cache.headers())
+
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                release_dates = cache.revalidate()
+
+                if release_dates is not None:
+                    return release_dates
+
+                response = self._get(f"{self._RELEASE_DATE}")
         except UrlNotOkException as error:
             raise FailedToGetReleaseDateException() from error
+
+        return cache.store(self._parse_release_dates(response.content), response)
@@ -0,0 +1,430 @@
+"""
+Download Sinks Module.
+
+This module defines where the bytes of a polygon download go. By default `Sicar` writes them to a `.part` file in
+the download folder (`PartialDownload`); a sink sends them somewhere else, such as a file object, an in-memory
+buffer or a callback uploading each chunk, without touching the local disk.
+
+Classes:
+    Sink: Destination of a polygon download.
+    StreamSink: Sink writing to a writable binary file object.
+    CallbackSink: Sink passing each chunk to a callable.
+
+Functions:
+    as_sink: Build the sink of a `download_state` target.
+    verify_zip: Check the central directory and the CRC of every member of a downloaded zip file.
+"""
+
+import io
+import zlib
+import httpx
+import hashlib
+import zipfile
+from typing import Callable, Dict
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from SICAR.exceptions import FailedToDownloadPolygonException
+
+
+class _RawWriter(io.RawIOBase):
+    """Raw stream calling a function with each block flushed by a `BufferedWriter`."""
+
+    def __init__(self, write: Callable):
+        """
+        Initialize an instance of the _RawWriter class.
+
+        Parameters:
+            write (Callable): The function receiving each block as a `memoryview`.
+
+        Returns:
+            None
+        """
+        self._write = write
+
+    def writable(self) -> bool:
+        """
+        Report the stream as writable.
+
+        Returns:
+            bool: Always True.
+        """
+        return True
+
+    def write(self, block) -> int:
+        """
+        Pass a block to the write function.
+
+        Parameters:
+            block (memoryview): The block to write, only valid during the call.
+
+        Returns:
+            int: The size of the block, which is always written entirely.
+        """
+        self._write(block)
+        return len(block)
+
+
+class Sink(ABC):
+    """
+    Destination of a polygon download.
+
+    `_download_polygon` asks the sink for the request `headers`, then opens it with the accepted response, writes
+    every chunk received to the opened writer and calls `finish` once the response is over. The same sink is used
+    by every attempt of a `download_state` call, so `open` is called again when an attempt fails.
+
+    While writing, `_download_polygon` hashes the chunks into the `digest` of the sink and checks that exactly
+    `total` bytes were received before setting `sha256` and calling `finish`.
+
+    Attributes:
+        total (int): The total size of the download, known once the response is accepted.
+        sha256 (str | None): The hexadecimal SHA-256 of the complete download, set before `finish` is called.
+    """
+
+    total = 0
+    sha256 = None
+
+    def headers(self) -> Dict:
+        """
+        Build the headers of the download request.
+
+        Returns:
+            Dict: Extra request headers, such as a `Range` to resume from. Default is none.
+        """
+        return {}
+
+    def digest(self):
+        """
+        Start the SHA-256 of the download once the sink is open.
+
+        Returns:
+            hashlib._Hash: A hash of the bytes kept from a previous attempt, to update with the bytes received.
+            Default is an empty hash.
+        """
+        return hashlib.sha256()
+
+    @abstractmethod
+    def open(self, response: httpx.Response, buffer_size: int = io.DEFAULT_BUFFER_SIZE):
+        """
+        Prepare the sink to receive the body of a response.
+
+        Parameters:
+            response (httpx.Response): The accepted response to the download request.
+            buffer_size (int, optional): The size of the write buffer. Defaults to `io.DEFAULT_BUFFER_SIZE`.
+
+        Returns:
+            ContextManager[BufferedWriter]: The writer receiving the body.
+        """
+
+    @abstractmethod
+    def finish(self):
+        """
+        Complete the download once the body was written.
+
+        Returns:
+            Any: The value returned by `download_state` for this sink.
+
+        Raises:
+            FailedToDownloadPolygonException: If the download is incomplete.
+        """
+
+
+class _BufferedSink(Sink):
+    """
+    Sink coalescing the received chunks in a write buffer before passing them to `_write`.
+
+    An attempt that fails after writing some bytes is undone by `_rewind` before the next one, or the download
+    stops with `io.UnsupportedOperation` when the sink cannot take the bytes back.
+
+    Attributes:
+        written (int): The bytes written by the current attempt.
+    """
+
+    def __init__(self):
+        """
+        Initialize an instance of the _BufferedSink class.
+
+        Returns:
+            None
+        """
+        self.total = 0
+        self.written = 0
+
+    def _rewind(self):
+        """
+        Drop the bytes written by a failed attempt.
+
+        Returns:
+            None
+
+        Raises:
+            io.UnsupportedOperation: If the sink cannot drop them.
+        """
+        raise io.UnsupportedOperation(
+            f"{type(self).__name__} cannot restart a download after receiving bytes"
+        )
+
+    @abstractmethod
+    def _write(self, block: memoryview):
+        """
+        Send a block to the destination.
+
+        Parameters:
+            block (memoryview): The block, only valid during the call.
+
+        Returns:
+            None
+        """
+
+    def _count(self, block: memoryview):
+        """
+        Count and send a block to the destination.
+
+        Parameters:
+            block (memoryview): The block, only valid during the call.
+
+        Returns:
+            None
+        """
+        self._write(block)
+        self.written += len(block)
+
+    def open(self, response: httpx.Response, buffer_size: int = io.DEFAULT_BUFFER_SIZE):
+        """
+        Prepare the sink to receive the body of a response, undoing a previous attempt.
+
+        Parameters:
+            response (httpx.Response): The accepted response to the download request.
+            buffer_size (int, optional): The size of the write buffer. Defaults to `io.DEFAULT_BUFFER_SIZE`.
+
+        Returns:
+            ContextManager[BufferedWriter]: The writer receiving the body, flushed when closed.
+
+        Raises:
+            io.UnsupportedOperation: If a previous attempt wrote bytes that cannot be dropped.
+        """
+        if self.written:
+            self._rewind()
+            self.written = 0
+
+        self.total = int(response.headers.get("Content-Length", 0))
+        return self._writer(buffer_size)
+
+    @contextmanager
+    def _writer(self, buffer_size: int):
+        """
+        Open the write buffer of an attempt.
+
+        Parameters:
+            buffer_size (int): The size of the write buffer.
+
+        Returns:
+            Iterator[BufferedWriter]: The writer, flushed when closed even if the attempt fails.
+        """
+        with io.BufferedWriter(_RawWriter(self._count), buffer_size) as writer:
+            yield writer
+
+    def _check(self):
+        """
+        Check that the whole download was written.
+
+        Returns:
+            None
+
+        Raises:
+            FailedToDownloadPolygonException: If fewer bytes than expected were received.
+        """
+        if self.written != self.total:
+            raise FailedToDownloadPolygonException()
+
+
+class StreamSink(_BufferedSink):
+    """
+    Sink writing to a writable binary file object, such as an open file, a socket file or an `io.BytesIO`.
+
+    A failed attempt is undone by seeking back to the initial position and truncating, so the stream must be
+    seekable for the download to be retried after receiving bytes. Any object with a `write` method is accepted:
+    one without `seekable` or `tell`, such as a pipe wrapper, is treated as not seekable, and `flush` is only
+    called when it exists.
+
+    Attributes:
+        stream (BinaryIO): The file object receiving the download.
+    """
+
+    def __init__(self, stream):
+        """
+        Initialize an instance of the StreamSink class.
+
+        Parameters:
+            stream (BinaryIO): The writable binary file object. It is not closed by the sink.
+
+        Returns:
+            None
+        """
+        super().__init__()
+        self.stream = stream
+        seekable = getattr(stream, "seekable", lambda: False)()
+        self._start = stream.tell() if seekable and hasattr(stream, "tell") else None
+
+    def _rewind(self):
+        """
+        Seek back to the initial position and truncate the stream.
+
+        Returns:
+            None
+
+        Raises:
+            io.UnsupportedOperation: If the stream is not seekable.
+        """
+        if self._start is None:
+            super()._rewind()
+
+        self.stream.seek(self._start)
+        self.stream.truncate()
+
+    def _write(self, block: memoryview):
+        """
+        Write a block to the stream.
+
+        Parameters:
+            block (memoryview): The block, only valid during the call.
+
+        Returns:
+            None
+        """
+        self.stream.write(block)
+
+    def finish(self):
+        """
+        Check the download and flush the stream.
+
+        Returns:
+            BinaryIO: The stream.
+
+        Raises:
+            FailedToDownloadPolygonException: If fewer bytes than expected were received, or if the stream is
+            readable and does not hold a valid zip file.
+        """
+        self._check()
+
+        if hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+        if self._start is not None and getattr(self.stream, "readable", bool)():
+            end = self.stream.tell()
+            try:
+                verify_zip(self.stream)
+            finally:
+                self.stream.seek(end)
+
+        return self.stream
+
+
+class CallbackSink(_BufferedSink):
+    """
+    Sink passing each chunk to a callable, for instance to upload it as a part of a multipart upload.
+
+    Chunks are `bytes` of `chunk_size` bytes, except the last one and writes larger than the buffer. The bytes
+    already passed cannot be taken back, so a download failing after receiving bytes is not retried.
+
+    Only the size of the download is checked. The zip is not verified, since its chunks are handed over as they
+    arrive, so the receiver should compare `sha256` with its own hash of the chunks, or verify the result itself.
+
+    Attributes:
+        callback (Callable): The callable receiving each chunk.
+    """
+
+    def __init__(self, callback: Callable):
+        """
+        Initialize an instance of the CallbackSink class.
+
+        Parameters:
+            callback (Callable): The callable receiving each chunk as `bytes`.
+
+        Returns:
+            None
+        """
+        super().__init__()
+        self.callback = callback
+
+    def _write(self, block: memoryview):
+        """
+        Pass a copy of a block to the callback.
+
+        Parameters:
+            block (memoryview): The block, only valid during the call.
+
+        Returns:
+            None
+        """
+        self.callback(bytes(block))
+
+    def finish(self) -> bool:
+        """
+        Check the size of the download.
+
+        Returns:
+            bool: True.
+
+        Raises:
+            FailedToDownloadPolygonException: If fewer bytes than expected were received.
+
+        Note:
+            Unlike `StreamSink.finish` and `PartialDownload.finish`, the zip is not verified.
+        """
+        self._check()
+        return True
+
+
+def verify_zip(file):
+    """
+    Check the central directory and the CRC of every member of a downloaded zip file.
+
+    Parameters:
+        file (Path | BinaryIO): The zip file, or a readable and seekable file object holding it.
+
+    Returns:
+        None
+
+    Raises:
+        FailedToDownloadPolygonException: If the file is not a zip file, its central directory is damaged, or a
+        member does not decompress to its recorded CRC.
+
+    Note:
+        Every member is decompressed once, so a body corrupted in transit is rejected before it reaches the
+        download folder instead of failing later in a reader.
+    """
+    try:
+        with zipfile.ZipFile(file) as archive:
+            corrupt = archive.testzip()
+    except (zipfile.BadZipFile, zlib.error, EOFError) as error:
+        raise FailedToDownloadPolygonException() from error
+
+    if corrupt is not None:
+        raise FailedToDownloadPolygonException()
+
+
+def as_sink(target) -> Sink:
+    """
+    Build the sink of a `download_state` target.
+
+    Parameters:
+        target (Sink | BinaryIO | Callable): A sink, a writable binary file object or a callable receiving chunks.
+
+    Returns:
+        Sink: The target itself if it is a sink, a `StreamSink` for objects with a `write` method, otherwise a
+        `CallbackSink`.
+
+    Raises:
+        TypeError: If the target is none of them.
+    """
+    if isinstance(target, Sink):
+        return target
+
+    if hasattr(target, "write"):
+        return StreamSink(target)
+
+    if callable(target):
+        return CallbackSink(target)
+
+    raise TypeError(f"Cannot write a download to {type(target).__name__}")
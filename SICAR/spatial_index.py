@@ -0,0 +1,570 @@
+"""
+Spatial Index Module.
+
+This module builds a persistent spatial index of a polygon downloaded by `Sicar.download_state`, so the features
+containing a coordinate or intersecting a box are found in milliseconds without reading the whole state.
+
+The index is a packed Hilbert R-tree: the features are sorted along a Hilbert curve by the center of their bounding
+box and grouped `node_size` at a time into nodes, which are grouped again until a single root remains. It is written
+once next to the `.zip` file together with a copy of the raw records, and memory-mapped when opened, so a query only
+reads the nodes it visits and decodes the features it returns.
+
+Classes:
+    SpatialIndex: Memory-mapped packed Hilbert R-tree over the features of a downloaded polygon.
+
+Functions:
+    index_path: Get the default path of the index of a downloaded polygon.
+    build_index: Build the spatial index of a downloaded polygon.
+    open_index: Open the spatial index of a downloaded polygon, building it when missing or outdated.
+"""
+
+import struct
+import bisect
+from array import array
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from SICAR.shapefile import (
+    Feature,
+    Field,
+    ShapefileReader,
+    parse_record,
+    parse_shape,
+    shape_bbox,
+)
+from SICAR._mapped_index import (
+    MappedIndex,
+    describe_source,
+    open_or_build,
+    write_index,
+    write_meta,
+)
+
+_HILBERT_MAX = (1 << 16) - 1
+"""Largest coordinate of the Hilbert curve grid."""
+
+
+def _hilbert(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Compute the position of grid cells along a Hilbert curve.
+
+    Parameters:
+        x (np.ndarray): The `uint32` columns of the cells, from 0 to 65535.
+        y (np.ndarray): The `uint32` rows of the cells, from 0 to 65535.
+
+    Returns:
+        np.ndarray: The `uint32` distances along the curve.
+
+    Note:
+        This is the branchless algorithm of "Fast Hilbert curve generation, sorting, and range queries" by
+        rawrunprotected, also used by the flatbush library, vectorized over every cell.
+    """
+    a = x ^ y
+    b = 0xFFFF ^ a
+    c = 0xFFFF ^ (x | y)
+    d = x & (y ^ 0xFFFF)
+
+    A = a | (b >> 1)
+    B = (a >> 1) ^ a
+    C = ((c >> 1) ^ (b & (d >> 1))) ^ c
+    D = ((a & (c >> 1)) ^ (d >> 1)) ^ d
+
+    for shift in (2, 4):
+        a, b, c, d = A, B, C, D
+        A = (a & (a >> shift)) ^ (b & (b >> shift))
+        B = (a & (b >> shift)) ^ (b & ((a ^ b) >> shift))
+        C = C ^ (a & (c >> shift)) ^ (b & (d >> shift))
+        D = D ^ (b & (c >> shift)) ^ ((a ^ b) & (d >> shift))
+
+    a, b, c, d = A, B, C, D
+    C = C ^ (a & (c >> 8)) ^ (b & (d >> 8))
+    D = D ^ (b & (c >> 8)) ^ ((a ^ b) & (d >> 8))
+
+    a = C ^ (C >> 1)
+    b = D ^ (D >> 1)
+
+    i0 = x ^ y
+    i1 = b | (0xFFFF ^ (i0 | a))
+
+    return (_interleave(i1) << 1) | _interleave(i0)
+
+
+def _interleave(value: np.ndarray) -> np.ndarray:
+    """
+    Spread the 16 bits of each value to the even bits of a 32-bit value.
+
+    Parameters:
+        value (np.ndarray): The `uint32` values, below 65536.
+
+    Returns:
+        np.ndarray: The values with a zero bit inserted above each bit.
+    """
+    value = (value | (value << 8)) & 0x00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F
+    value = (value | (value << 2)) & 0x33333333
+    return (value | (value << 1)) & 0x55555555
+
+
+def _level_bounds(items: int, node_size: int) -> List[int]:
+    """
+    Compute where each level of the tree ends.
+
+    Parameters:
+        items (int): The number of indexed features.
+        node_size (int): The maximum number of children of a node.
+
+    Returns:
+        List[int]: The end of each level in the node array, from the leaves to the root.
+    """
+    bounds, count = [items], items
+
+    while count > 1:
+        count = -(-count // node_size)
+        bounds.append(bounds[-1] + count)
+
+    return bounds
+
+
+def _pack(boxes: np.ndarray, node_size: int) -> tuple:
+    """
+    Sort the feature boxes along a Hilbert curve and build the nodes above them.
+
+    Parameters:
+        boxes (np.ndarray): The (xmin, ymin, xmax, ymax) box of each feature, one row per feature.
+        node_size (int): The maximum number of children of a node.
+
+    Returns:
+        tuple: The box of every node and, for each node, the feature of a leaf or the first child of a parent.
+    """
+    items = len(boxes)
+    bounds = _level_bounds(items, node_size)
+    nodes = np.empty((bounds[-1], 4), dtype="<f8")
+    indices = np.empty(bounds[-1], dtype="<i8")
+
+    if not items:
+        return nodes, indices
+
+    low, high = boxes[:, :2].min(axis=0), boxes[:, 2:].max(axis=0)
+    size = np.where(high > low, high - low, 1.0)
+    centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+    cells = np.floor(_HILBERT_MAX * (centers - low) / size).astype(np.uint32)
+    order = np.argsort(_hilbert(cells[:, 0], cells[:, 1]), kind="stable")
+
+    nodes[:items] = boxes[order]
+    indices[:items] = order
+    start = 0
+
+    for end, parent in zip(bounds, bounds[1:]):
+        groups = np.arange(start, end, node_size)
+        children = nodes[start:end]
+        top = parent - len(groups)
+        nodes[top:parent, 0] = np.minimum.reduceat(children[:, 0], groups - start)
+        nodes[top:parent, 1] = np.minimum.reduceat(children[:, 1], groups - start)
+        nodes[top:parent, 2] = np.maximum.reduceat(children[:, 2], groups - start)
+        nodes[top:parent, 3] = np.maximum.reduceat(children[:, 3], groups - start)
+        indices[top:parent] = groups
+        start = end
+
+    return nodes, indices
+
+
+def _edges(content: bytes) -> tuple:
+    """
+    Get the segments of a PolyLine or Polygon record.
+
+    Parameters:
+        content (bytes): The record content, starting with the shape type.
+
+    Returns:
+        tuple: The start and end points of every segment, as two arrays with one (x, y) row per segment.
+    """
+    parts, count = struct.unpack_from("<2i", content, 36)
+    starts = np.frombuffer(content, "<i4", parts, 44)
+    points = np.frombuffer(content, "<f8", 2 * count, 44 + 4 * parts).reshape(-1, 2)
+    keep = np.ones(max(count - 1, 0), dtype=bool)
+    keep[starts[1:] - 1] = False
+    return points[:-1][keep], points[1:][keep]
+
+
+def _contains(start: np.ndarray, end: np.ndarray, x: float, y: float) -> bool:
+    """
+    Test whether a point is inside a polygon with the even-odd rule.
+
+    Parameters:
+        start (np.ndarray): The start point of each segment of every ring.
+        end (np.ndarray): The end point of each segment of every ring.
+        x (float): The longitude of the point.
+        y (float): The latitude of the point.
+
+    Returns:
+        bool: True if a horizontal ray from the point crosses the rings an odd number of times.
+    """
+    crosses = (start[:, 1] > y) != (end[:, 1] > y)
+    (x1, y1), (x2, y2) = start[crosses].T, end[crosses].T
+    return bool(np.count_nonzero(x < (x2 - x1) * (y - y1) / (y2 - y1) + x1) % 2)
+
+
+def _crosses(start: np.ndarray, end: np.ndarray, bbox: tuple) -> bool:
+    """
+    Test whether any segment touches a box.
+
+    Parameters:
+        start (np.ndarray): The start point of each segment.
+        end (np.ndarray): The end point of each segment.
+        bbox (tuple): The box as (xmin, ymin, xmax, ymax).
+
+    Returns:
+        bool: True if a segment overlaps the box and the corners of the box are not all on the same side of it.
+    """
+    xmin, ymin, xmax, ymax = bbox
+    (x1, y1), (x2, y2) = start.T, end.T
+    overlaps = (
+        (np.minimum(x1, x2) <= xmax)
+        & (np.maximum(x1, x2) >= xmin)
+        & (np.minimum(y1, y2) <= ymax)
+        & (np.maximum(y1, y2) >= ymin)
+    )
+    sides = np.array(
+        [
+            (x2 - x1) * (cy - y1) - (y2 - y1) * (cx - x1)
+            for cx, cy in ((xmin, ymin), (xmin, ymax), (xmax, ymin), (xmax, ymax))
+        ]
+    )
+    apart = (sides > 0).all(axis=0) | (sides < 0).all(axis=0)
+    return bool((overlaps & ~apart).any())
+
+
+def _intersects(content: bytes, bbox: tuple) -> bool:
+    """
+    Test whether the shape of a record intersects a box.
+
+    Parameters:
+        content (bytes): The record content, starting with the shape type.
+        bbox (tuple): The box as (xmin, ymin, xmax, ymax), whose bounding box is known to overlap the shape's.
+
+    Returns:
+        bool: True if the shape and the box share at least one point.
+    """
+    (shape_type,) = struct.unpack_from("<i", content)
+    xmin, ymin, xmax, ymax = shape_bbox(content)
+
+    if bbox[0] <= xmin and bbox[1] <= ymin and xmax <= bbox[2] and ymax <= bbox[3]:
+        return True
+
+    if shape_type % 10 == 8:
+        (count,) = struct.unpack_from("<i", content, 36)
+        points = np.frombuffer(content, "<f8", 2 * count, 40).reshape(-1, 2)
+        return bool(
+            (
+                (points[:, 0] >= bbox[0])
+                & (points[:, 1] >= bbox[1])
+                & (points[:, 0] <= bbox[2])
+                & (points[:, 1] <= bbox[3])
+            ).any()
+        )
+
+    start, end = _edges(content)
+
+    if _crosses(start, end, bbox):
+        return True
+
+    return shape_type % 10 == 5 and _contains(start, end, bbox[0], bbox[1])
+
+
+class SpatialIndex(MappedIndex):
+    """
+    Memory-mapped packed Hilbert R-tree over the features of a downloaded polygon.
+
+    The index file holds a header, the raw `.dbf` record and `.shp` content of each feature with a geometry, the
+    tree and JSON metadata. Opening it maps the file without reading it; `search` walks the tree from the root and
+    only the features it returns are read and decoded. In the header, the parameter is the node size, the items
+    are the indexed features and the count is the number of nodes.
+
+    Attributes:
+        path (Path): The index file.
+        node_size (int): The maximum number of children of a node.
+        meta (Dict): The layer, shape type, bounding box, fields, encoding and source file of the index.
+        fields (List[Field]): The columns of the attribute table.
+    """
+
+    _MAGIC = b"SICARIDX"
+    """First bytes of an index file."""
+
+    _VERSION = 1
+    """Version of the index file format, bumped on incompatible changes."""
+
+    def _map(self, node_size: int, items: int, nodes: int, tree: int):
+        """
+        Map the arrays of the tree.
+
+        Parameters:
+            node_size (int): The maximum number of children of a node.
+            items (int): The number of indexed features.
+            nodes (int): The number of nodes, leaves included.
+            tree (int): The position of the tree in the file.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the file is truncated.
+        """
+        self.node_size = node_size
+        self._items = items
+        self.fields = [Field(*field) for field in self.meta["fields"]]
+        self._bounds = _level_bounds(self._items, self.node_size)
+        self._nodes = np.frombuffer(self._mmap, "<f8", 4 * nodes, tree).reshape(-1, 4)
+        self._indices = np.frombuffer(self._mmap, "<i8", nodes, tree + 32 * nodes)
+        self._offsets = np.frombuffer(
+            self._mmap, "<i8", self._items + 1, tree + 40 * nodes
+        )
+
+    def __len__(self) -> int:
+        """
+        Count the indexed features.
+
+        Returns:
+            int: The number of features with a geometry.
+        """
+        return self._items
+
+    def search(self, bbox: tuple) -> List[int]:
+        """
+        Find the features whose bounding box intersects a box.
+
+        Parameters:
+            bbox (tuple): The box as (xmin, ymin, xmax, ymax), in the coordinates of the layer.
+
+        Returns:
+            List[int]: The sorted ids of the features, to pass to `feature`. Features whose bounding box only
+            intersects the box may not intersect it themselves.
+        """
+        xmin, ymin, xmax, ymax = bbox
+        found, stack = [], [len(self._nodes) - 1] if self._items else []
+
+        while stack:
+            node = stack.pop()
+            end = min(
+                node + self.node_size,
+                self._bounds[bisect.bisect_right(self._bounds, node)],
+            )
+            boxes = self._nodes[node:end]
+            hits = self._indices[node:end][
+                (boxes[:, 0] <= xmax)
+                & (boxes[:, 1] <= ymax)
+                & (boxes[:, 2] >= xmin)
+                & (boxes[:, 3] >= ymin)
+            ].tolist()
+            (found if node < self._items else stack).extend(hits)
+
+        return sorted(found)
+
+    def _record(self, item: int) -> tuple:
+        """
+        Read the raw record of a feature.
+
+        Parameters:
+            item (int): The id of the feature.
+
+        Returns:
+            tuple: The `.dbf` record and the `.shp` content of the feature.
+        """
+        start, end = self._offsets[item : item + 2].tolist()
+        middle = start + self.meta["record_length"]
+        return self._mmap[start:middle], self._mmap[middle:end]
+
+    def feature(self, item: int) -> Feature:
+        """
+        Read and decode a feature.
+
+        Parameters:
+            item (int): The id of the feature, as returned by `search`.
+
+        Returns:
+            Feature: The geometry and attributes of the feature.
+        """
+        return self._decode(*self._record(item))
+
+    def _decode(self, record: bytes, content: bytes) -> Feature:
+        """
+        Decode the raw record of a feature.
+
+        Parameters:
+            record (bytes): The `.dbf` record.
+            content (bytes): The `.shp` content.
+
+        Returns:
+            Feature: The geometry and attributes of the feature.
+        """
+        return Feature(
+            parse_shape(content),
+            parse_record(self.fields, record, self.meta["encoding"]),
+        )
+
+    def query_bbox(self, bbox: tuple) -> List[Feature]:
+        """
+        Find the features intersecting a box, such as the legal reserves of an area of interest.
+
+        Parameters:
+            bbox (tuple): The box as (xmin, ymin, xmax, ymax), in the coordinates of the layer.
+
+        Returns:
+            List[Feature]: The features sharing at least one point with the box, boundaries included.
+        """
+        records = (self._record(item) for item in self.search(bbox))
+        return [
+            self._decode(record, content)
+            for record, content in records
+            if _intersects(content, bbox)
+        ]
+
+    def query_point(self, x: float, y: float) -> List[Feature]:
+        """
+        Find the features containing a coordinate, such as the properties where a point lies.
+
+        Parameters:
+            x (float): The longitude, in the coordinates of the layer.
+            y (float): The latitude, in the coordinates of the layer.
+
+        Returns:
+            List[Feature]: The features containing the point or having it on their boundary.
+        """
+        return self.query_bbox((x, y, x, y))
+
+    def _unmap(self):
+        """
+        Drop the views of the tree, so the file can be closed.
+
+        Returns:
+            None
+        """
+        self._nodes = self._indices = self._offsets = None
+
+
+def index_path(source: Path | str, layer: str = None) -> Path:
+    """
+    Get the default path of the index of a downloaded polygon.
+
+    Parameters:
+        source (Path | str): The `.zip` file downloaded by `Sicar.download_state`.
+        layer (str, optional): The indexed layer when the archive has more than one.
+
+    Returns:
+        Path: `<source stem>.rtree`, or `<source stem>.<layer>.rtree`, next to the source.
+    """
+    source = Path(source)
+    name = source.stem if layer is None else f"{source.stem}.{layer}"
+    return source.with_name(f"{name}.rtree")
+
+
+def build_index(
+    source: Path | str,
+    path: Path | str = None,
+    layer: str = None,
+    node_size: int = 16,
+) -> SpatialIndex:
+    """
+    Build the spatial index of a downloaded polygon.
+
+    Parameters:
+        source (Path | str): The `.zip` file downloaded by `Sicar.download_state`.
+        path (Path | str, optional): The index file. Defaults to `index_path(source, layer)`.
+        layer (str, optional): The layer to index when the archive has more than one. Defaults to the first.
+        node_size (int, optional): The maximum number of children of a node. Defaults to 16.
+
+    Returns:
+        SpatialIndex: The new index, opened.
+
+    Raises:
+        InvalidShapefileException: If the downloaded file does not hold a valid shapefile.
+
+    Note:
+        The records are streamed from the zip file into the index, so only the bounding boxes, 40 bytes per
+        feature, are kept in memory. The index is written to a temporary file and moved into place, so readers
+        never see a partial index. Features without geometry are not indexed.
+    """
+    source = Path(source)
+    path = index_path(source, layer) if path is None else Path(path)
+    described = describe_source(source, layer=layer)
+
+    with write_index(path) as file, ShapefileReader(source, layer) as reader:
+        offsets, boxes = array("q"), array("d")
+
+        for _, record, content in reader.records():
+            bbox = shape_bbox(content)
+            if bbox is not None:
+                offsets.append(file.tell())
+                boxes.extend(bbox)
+                file.write(record)
+                file.write(content)
+
+        offsets.append(file.tell())
+        nodes, indices = _pack(
+            np.frombuffer(boxes, dtype="<f8").reshape(-1, 4), node_size
+        )
+
+        file.write(bytes(-file.tell() % 8))
+        tree = file.tell()
+        file.write(nodes.tobytes())
+        file.write(indices.tobytes())
+        file.write(np.asarray(offsets, dtype="<i8").tobytes())
+
+        write_meta(
+            file,
+            SpatialIndex._MAGIC,
+            SpatialIndex._VERSION,
+            {
+                "layer": reader.layer,
+                "shape_type": reader.shape_type,
+                "bbox": reader.bbox,
+                "fields": reader.fields,
+                "encoding": reader.encoding,
+                "record_length": reader.record_length,
+                "source": described,
+            },
+            node_size,
+            len(offsets) - 1,
+            len(nodes),
+            tree,
+        )
+
+    return SpatialIndex(path)
+
+
+def open_index(
+    source: Path | str,
+    path: Path | str = None,
+    layer: str = None,
+    node_size: int = 16,
+) -> SpatialIndex:
+    """
+    Open the spatial index of a downloaded polygon, building it when missing or outdated.
+
+    Parameters:
+        source (Path | str): The `.zip` file downloaded by `Sicar.download_state`.
+        path (Path | str, optional): The index file. Defaults to `index_path(source, layer)`.
+        layer (str, optional): The layer to index when the archive has more than one. Defaults to the first.
+        node_size (int, optional): The maximum number of children of a node of a new index. Defaults to 16.
+
+    Returns:
+        SpatialIndex: The index, opened.
+
+    Raises:
+        InvalidShapefileException: If the index must be built and the downloaded file does not hold a valid
+            shapefile.
+
+    Note:
+        An index is rebuilt when its file is invalid or when the size or modification time of the source changed,
+        for instance after `sync_state` downloaded a new release.
+    """
+    source = Path(source)
+    path = index_path(source, layer) if path is None else Path(path)
+
+    return open_or_build(
+        SpatialIndex,
+        path,
+        describe_source(source, layer=layer),
+        lambda: build_index(source, path, layer, node_size),
+    )
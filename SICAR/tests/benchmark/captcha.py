@@ -0,0 +1,74 @@
+import io
+import tempfile
+import timeit
+import unittest
+from pathlib import Path
+from PIL import Image
+import numpy as np
+import cv2
+
+from SICAR.drivers import Captcha
+
+try:
+    import matplotlib.image as mpimg
+except ImportError:
+    mpimg = None
+
+
+class BenchmarkCaptcha(Captcha):
+    def get_captcha(self, captcha):
+        return ""
+
+
+def legacy_png_to_jpg(captcha):
+    with tempfile.NamedTemporaryFile(suffix=".png") as png:
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as jpg:
+            captcha.save(png.name)
+            mpimg.imsave(
+                jpg.name,
+                mpimg.imread(png.name, 0),
+                cmap="gray",
+                vmin=0,
+                vmax=255,
+            )
+            return cv2.imread(jpg.name, -1)
+
+
+@unittest.skipIf(mpimg is None, "matplotlib is required for the legacy pipeline")
+class CaptchaPreprocessingBenchmark(unittest.TestCase):
+    number = 200
+
+    @classmethod
+    def setUpClass(self):
+        self._driver = BenchmarkCaptcha()
+        self._captchas = [
+            path.read_bytes()
+            for path in sorted(Path("SICAR/tests/integration/captchas").glob("*.png"))
+        ]
+
+    def images(self):
+        return [Image.open(io.BytesIO(raw)) for raw in self._captchas]
+
+    def test_output_matches_legacy_pipeline(self):
+        for raw, image in zip(self._captchas, self.images()):
+            expected = legacy_png_to_jpg(image)
+            np.testing.assert_array_equal(self._driver._png_to_jpg(raw), expected)
+            np.testing.assert_array_equal(self._driver._png_to_jpg(image), expected)
+
+    def test_latency(self):
+        images = self.images()
+        timings = {
+            "legacy (temp files)": lambda: [legacy_png_to_jpg(i) for i in images],
+            "in memory (Image)": lambda: [self._driver._png_to_jpg(i) for i in images],
+            "in memory (bytes)": lambda: [
+                self._driver._png_to_jpg(raw) for raw in self._captchas
+            ],
+        }
+
+        results = {}
+        for name, run in timings.items():
+            seconds = min(timeit.repeat(run, number=self.number // 10, repeat=3))
+            results[name] = seconds / (self.number // 10 * len(self._captchas))
+            print(f"\n{name:>20}: {results[name] * 1e6:8.1f} us/captcha")
+
+        self.assertLess(results["in memory (bytes)"], results["legacy (temp files)"])
@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import socket
+import tempfile
+import unittest
+import zipfile
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from SICAR import Sicar, State, Polygon
+
+SIZE = 64 * 1024 * 1024
+"""Size in bytes of the shapefile stored in the polygon served by the local server."""
+
+
+def write_syscalls() -> int:
+    """Write system calls made by this process so far (Linux only)."""
+    counters = dict(
+        line.split(": ") for line in Path("/proc/self/io").read_text().splitlines()
+    )
+    return int(counters["syscw"])
+
+
+def legacy_download(url: str, path: Path):
+    """The write path before chunk_size was honoured: one write per piece yielded by httpx."""
+    with httpx.Client() as client, client.stream("GET", url) as response:
+        with open(path, "wb") as fd:
+            for chunk in response.iter_bytes():
+                fd.write(chunk)
+
+
+@unittest.skipUnless(Path("/proc/self/io").exists(), "syscall counters need Linux")
+class DownloadThroughputBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self._served = tempfile.TemporaryDirectory()
+        with zipfile.ZipFile(Path(self._served.name, "MG_APPS.zip"), "w") as archive:
+            archive.writestr("APPS.shp", os.urandom(SIZE))
+        self._size = Path(self._served.name, "MG_APPS.zip").stat().st_size
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        self._server = subprocess.Popen(
+            [sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1"],
+            cwd=self._served.name,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._url = f"http://127.0.0.1:{port}/MG_APPS.zip"
+
+        for _ in range(50):
+            try:
+                httpx.head(self._url)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+    @classmethod
+    def tearDownClass(self):
+        self._server.terminate()
+        self._server.wait()
+        self._served.cleanup()
+
+    def measure(self, download) -> dict:
+        best = None
+
+        for _ in range(3):
+            with tempfile.TemporaryDirectory() as folder:
+                writes = write_syscalls()
+                start = time.perf_counter()
+                path = download(folder)
+                seconds = time.perf_counter() - start
+                writes = write_syscalls() - writes
+                self.assertEqual(path.stat().st_size, self._size)
+
+            result = {
+                "MB/s": self._size / seconds / 1e6,
+                "write syscalls": writes,
+            }
+            if best is None or result["MB/s"] > best["MB/s"]:
+                best = result
+
+        return best
+
+    def test_throughput(self):
+        def legacy(folder):
+            path = Path(folder) / "MG_APPS.zip"
+            legacy_download(self._url, path)
+            return path
+
+        def sicar(chunk_size):
+            def download(folder):
+                with patch.object(Sicar, "_initialize_cookies"):
+                    car = Sicar(listeners=[])
+                car._DOWNLOAD_BASE = self._url
+                return car._download_polygon(
+                    State.MG, Polygon.APPS, "ABCDE", folder, chunk_size=chunk_size
+                )
+
+            return download
+
+        results = {
+            "before": self.measure(legacy),
+            "chunk_size=64 KiB": self.measure(sicar(64 * 1024)),
+            "chunk_size=1 MiB": self.measure(sicar(1024 * 1024)),
+        }
+
+        for name, result in results.items():
+            print(
+                f"\n{name:>20}: {result['MB/s']:8.1f} MB/s, {result['write syscalls']:6d} write syscalls"
+            )
+
+        self.assertLess(
+            results["chunk_size=1 MiB"]["write syscalls"],
+            results["before"]["write syscalls"],
+        )
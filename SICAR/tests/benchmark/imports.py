@@ -0,0 +1,38 @@
+import subprocess
+import sys
+import unittest
+
+BUDGETS = {
+    "import SICAR": 0.05,
+    "from SICAR import State, Polygon": 0.05,
+    "from SICAR import Sicar": 0.75,
+}
+"""Cold start budget in seconds of each statement, measured in a new interpreter."""
+
+
+def cold_start(statement, repeat=5):
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)"
+    )
+    return min(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=True
+            ).stdout
+        )
+        for _ in range(repeat)
+    )
+
+
+class ImportTimeBenchmark(unittest.TestCase):
+    def test_cold_start_budget(self):
+        for statement, budget in BUDGETS.items():
+            with self.subTest(statement=statement):
+                seconds = cold_start(statement)
+                print(
+                    f"\n{statement:>35}: {seconds * 1e3:8.1f} ms (budget {budget * 1e3:.0f} ms)"
+                )
+                self.assertLess(seconds, budget)
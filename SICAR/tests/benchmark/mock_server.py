@@ -0,0 +1,61 @@
+import time
+import tempfile
+import unittest
+
+from SICAR import Sicar, State, Polygon
+from SICAR.retry import RetryPolicy
+from SICAR.mock_server import AnswerKey, Fault, MockSicarServer, zip_payload
+
+SIZE = 32 * 1024 * 1024
+"""Size in bytes of the polygon served by the mock server."""
+
+BANDWIDTH = 100e6
+"""Bandwidth cap of each download, in bytes per second."""
+
+
+class MockServerDownloadBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.payload = zip_payload(SIZE)
+
+    def measure(self, ranges: bool) -> dict:
+        with (
+            MockSicarServer(
+                payload=self.payload,
+                bandwidth=BANDWIDTH,
+                latency=0.02,
+                ranges=ranges,
+                faults=[Fault.DISCONNECT],
+                seed=0,
+            ) as server,
+            tempfile.TemporaryDirectory() as folder,
+        ):
+            car = Sicar(
+                driver=AnswerKey(miss_rate=0.3, seed=0),
+                base_url=server.base_url,
+                retry=RetryPolicy(base=0),
+                listeners=[],
+            )
+            start = time.perf_counter()
+            path = car.download_state(State.MG, Polygon.APPS, folder)
+            seconds = time.perf_counter() - start
+
+            self.assertEqual(path.read_bytes(), self.payload)
+            received = car.metrics.snapshot()["sicar_download_bytes_total"][0]["value"]
+
+        return {"seconds": seconds, "MB received": received / 1e6}
+
+    def test_resume_after_disconnect(self):
+        results = {
+            "restart": self.measure(ranges=False),
+            "resume": self.measure(ranges=True),
+        }
+
+        for name, result in results.items():
+            print(
+                f"\n{name:>10}: {result['seconds']:6.2f} s, {result['MB received']:6.1f} MB received"
+            )
+
+        self.assertLess(
+            results["resume"]["MB received"], results["restart"]["MB received"]
+        )
@@ -0,0 +1,40 @@
+import timeit
+import unittest
+from pathlib import Path
+
+from SICAR.release_dates import scan_release_dates, soup_release_dates
+
+
+class ReleaseDateParserBenchmark(unittest.TestCase):
+    number = 50
+
+    @classmethod
+    def setUpClass(self):
+        self._pages = [
+            path.read_bytes()
+            for path in sorted(Path("SICAR/tests/benchmark/pages").glob("*.html"))
+        ]
+
+    def test_output_matches_soup(self):
+        for page in self._pages:
+            self.assertEqual(scan_release_dates(page), soup_release_dates(page))
+
+    def test_latency(self):
+        parsers = {
+            "BeautifulSoup": soup_release_dates,
+            "scanner": scan_release_dates,
+        }
+
+        results = {}
+        for name, parse in parsers.items():
+            seconds = min(
+                timeit.repeat(
+                    lambda: [parse(page) for page in self._pages],
+                    number=self.number,
+                    repeat=3,
+                )
+            )
+            results[name] = seconds / (self.number * len(self._pages))
+            print(f"\n{name:>20}: {results[name] * 1e3:8.2f} ms/page")
+
+        self.assertLess(results["scanner"], results["BeautifulSoup"])
@@ -0,0 +1,65 @@
+import random
+import tempfile
+import time
+import unittest
+
+from SICAR.shapefile import read_features
+from SICAR.spatial_index import build_index, open_index
+from SICAR.tests.unit.shapefile import archive, dbf, shp, shp_record
+
+
+def square(x, y, size):
+    return [(x, y), (x, y + size), (x + size, y + size), (x + size, y), (x, y)]
+
+
+class SpatialIndexBenchmark(unittest.TestCase):
+    features = 50000
+    queries = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        random.seed(0)
+        cls.folder = tempfile.TemporaryDirectory()
+        squares = [
+            square(random.uniform(-74, -34), random.uniform(-34, 5), 0.02)
+            for _ in range(cls.features)
+        ]
+        cls.path = archive(
+            cls.folder.name,
+            {
+                "AREA_IMOVEL.shp": shp(5, [shp_record(5, [s]) for s in squares]),
+                "AREA_IMOVEL.dbf": dbf(
+                    [("cod_imovel", "C", 12, 0)],
+                    [[f"XX-{i}"] for i in range(cls.features)],
+                ),
+            },
+        )
+        cls.points = [
+            (random.uniform(-74, -34), random.uniform(-34, 5))
+            for _ in range(cls.queries)
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.folder.cleanup()
+
+    def test_point_queries(self):
+        start = time.perf_counter()
+        build_index(self.path).close()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanned = sum(1 for _ in read_features(self.path))
+        scan = time.perf_counter() - start
+
+        with open_index(self.path) as index:
+            start = time.perf_counter()
+            for x, y in self.points:
+                index.query_point(x, y)
+            query = (time.perf_counter() - start) / self.queries
+
+        print(f"\n{'build':>20}: {build * 1e3:8.1f} ms for {scanned} features")
+        print(f"{'full scan':>20}: {scan * 1e3:8.1f} ms/query")
+        print(f"{'indexed point query':>20}: {query * 1e3:8.3f} ms/query")
+
+        self.assertLess(query * 100, scan)
@@ -0,0 +1,53 @@
+import io
+import shutil
+import time
+import unittest
+from pathlib import Path
+from PIL import Image
+
+from SICAR.drivers import Tesseract, TesseractAPI
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+def has_tesserocr_eng():
+    return tesserocr is not None and "eng" in tesserocr.get_languages()[1]
+
+
+@unittest.skipUnless(shutil.which("tesseract"), "tesseract is not installed")
+@unittest.skipUnless(has_tesserocr_eng(), "tesserocr with 'eng' is not installed")
+class TesseractEngineBenchmark(unittest.TestCase):
+    rounds = 10
+
+    @classmethod
+    def setUpClass(self):
+        self._captchas = {
+            path.stem: path.read_bytes()
+            for path in sorted(Path("SICAR/tests/integration/captchas").glob("*.png"))
+        }
+
+    def captchas_per_second(self, driver):
+        driver.get_captcha(Image.open(io.BytesIO(next(iter(self._captchas.values())))))
+        start = time.perf_counter()
+        for _ in range(self.rounds):
+            for raw in self._captchas.values():
+                driver.get_captcha(Image.open(io.BytesIO(raw)))
+        return self.rounds * len(self._captchas) / (time.perf_counter() - start)
+
+    def test_same_answers(self):
+        subprocess, api = Tesseract(), TesseractAPI()
+        for raw in self._captchas.values():
+            self.assertEqual(
+                api.get_captcha(Image.open(io.BytesIO(raw))),
+                subprocess.get_captcha(Image.open(io.BytesIO(raw))),
+            )
+
+    def test_throughput(self):
+        subprocess = self.captchas_per_second(Tesseract())
+        api = self.captchas_per_second(TesseractAPI())
+        print(f"\n  pytesseract (subprocess): {subprocess:8.1f} captchas/s")
+        print(f"  tesserocr (in process):   {api:8.1f} captchas/s")
+        self.assertGreater(api, subprocess)
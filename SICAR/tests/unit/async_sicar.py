@@ -0,0 +1,510 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future
+import httpx
+from PIL import Image
+from pathlib import Path
+from datetime import date
+
+from SICAR import AsyncSicar, Sicar
+from SICAR.base import BaseSicar
+from SICAR.state import State
+from SICAR.cache import ReleaseDateCache
+from SICAR.retry import RetryPolicy, TokenBucket
+from SICAR.polygon import Polygon
+from SICAR.manifest import Manifest
+from SICAR.sinks import as_sink
+from SICAR.drivers import Captcha, OcrExecutor
+from SICAR.exceptions import (
+    FailedToDownloadCaptchaException,
+    FailedToDownloadPolygonException,
+    FailedToGetReleaseDateException,
+    PolygonNotValidException,
+    StateCodeNotValidException,
+)
+from SICAR.tests.unit.partial import ZIP
+
+
+class MockCaptcha(Captcha):
+    def get_captcha(self, captcha):
+        return "ABCDE"
+
+
+def captcha_png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class AsyncSicarTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stdout = io.StringIO()
+        sys.stdout = self.stdout
+        self.folder = tempfile.TemporaryDirectory()
+        self.requests = []
+        self.handler = self.default_handler
+        self.sleep = patch("asyncio.sleep", return_value=None)
+        self.sleep.start()
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.sleep.stop()
+        self.folder.cleanup()
+
+    def default_handler(self, request):
+        if request.url.path.endswith("ReCaptcha"):
+            return httpx.Response(200, content=captcha_png())
+        if request.url.path.endswith("downloadBase"):
+            return httpx.Response(
+                200,
+                headers={"Content-Type": "application/zip"},
+                content=ZIP,
+            )
+        if request.url.path.endswith("downloads"):
+            return httpx.Response(
+                200,
+                content=(
+                    b'<div class="listagem-estados">'
+                    b'<div class="data-disponibilizacao"><i>04/08/2024</i></div>'
+                    b'<button type="button" class="btn-abrir-modal-download-base-poligono"'
+                    b'data-estado="AC" data-nome-estado="Acre"></button>'
+                ),
+            )
+        return httpx.Response(200)
+
+    def new_session(self, headers=None):
+        def handler(request):
+            self.requests.append(request)
+            return self.handler(request)
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def sicar(self, **kwargs):
+        with patch.object(AsyncSicar, "_new_session", side_effect=self.new_session):
+            sicar = AsyncSicar(driver=MockCaptcha, **kwargs)
+        sicar._new_session = self.new_session
+        return sicar
+
+    async def test_context_manager_initializes_cookies(self):
+        async with self.sicar() as sicar:
+            self.assertFalse(sicar._session.is_closed)
+        self.assertEqual(
+            str(self.requests[0].url),
+            "https://consultapublica.car.gov.br/publico/imoveis/index",
+        )
+        self.assertTrue(sicar._session.is_closed)
+
+    async def test_new_session(self):
+        sicar = AsyncSicar(driver=MockCaptcha, headers={"Custom-Header": "Value"})
+        self.assertIsInstance(sicar._session, httpx.AsyncClient)
+        self.assertEqual(sicar._session.headers["Custom-Header"], "Value")
+        await sicar.aclose()
+
+    async def test_get_with_unsuccessful_response(self):
+        self.handler = lambda request: httpx.Response(404)
+        sicar = self.sicar()
+        with self.assertRaises(FailedToGetReleaseDateException):
+            await sicar.get_release_dates()
+
+    async def test_get_release_dates(self):
+        sicar = self.sicar()
+        self.assertEqual(await sicar.get_release_dates(), {State.AC: "04/08/2024"})
+        self.assertEqual(
+            await sicar.get_release_dates(as_date=True), {State.AC: date(2024, 8, 4)}
+        )
+
+    async def test_get_release_dates_cached(self):
+        sicar = self.sicar(release_dates=ReleaseDateCache(ttl=0))
+        self.assertEqual(await sicar.get_release_dates(), {State.AC: "04/08/2024"})
+
+        self.handler = lambda request: httpx.Response(304)
+        self.assertEqual(await sicar.get_release_dates(), {State.AC: "04/08/2024"})
+
+        sicar._release_dates.ttl = 60
+        self.assertEqual(await sicar.get_release_dates(), {State.AC: "04/08/2024"})
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_get_release_dates_unsolicited_not_modified(self):
+        responses = iter([httpx.Response(304)])
+        default = self.handler
+        self.handler = lambda request: next(responses, None) or default(request)
+        sicar = self.sicar(release_dates=ReleaseDateCache())
+
+        self.assertEqual(await sicar.get_release_dates(), {State.AC: "04/08/2024"})
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_get_release_dates_cached_failure(self):
+        self.handler = lambda request: httpx.Response(404)
+        sicar = self.sicar(release_dates=ReleaseDateCache())
+        with self.assertRaises(FailedToGetReleaseDateException):
+            await sicar.get_release_dates()
+
+    async def test_rate_limiter(self):
+        limiter = MagicMock(spec=TokenBucket)
+        limiter.reserve.side_effect = [0, 0.5]
+        sicar = self.sicar(limiter=limiter)
+
+        await sicar._get("https://example.com")
+        asyncio.sleep.assert_not_called()
+
+        await sicar._get("https://example.com")
+        asyncio.sleep.assert_called_once_with(0.5)
+
+    async def test_download_captcha_invalid_image(self):
+        self.handler = lambda request: httpx.Response(200, content=b"invalid")
+        sicar = self.sicar()
+        with self.assertRaises(FailedToDownloadCaptchaException):
+            await sicar._download_captcha()
+
+    @patch("SICAR.async_sicar.AsyncSicar._get")
+    async def test_download_captcha_failure(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=httpx.codes.NOT_FOUND)
+        sicar = self.sicar()
+        with self.assertRaises(FailedToDownloadCaptchaException):
+            await sicar._download_captcha()
+
+    async def test_solve_captcha_runs_off_the_event_loop(self):
+        sicar = self.sicar()
+        threads = []
+        sicar._driver.get_captcha = lambda captcha: threads.append(
+            threading.current_thread()
+        )
+        await sicar._solve_captcha(Image.new("RGB", (10, 10)))
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    async def test_solve_captcha_with_ocr_executor(self):
+        driver = MagicMock(spec=OcrExecutor)
+        driver.submit.return_value = Future()
+        driver.submit.return_value.set_result("ABCDE")
+        sicar = self.sicar()
+        sicar._driver = driver
+
+        captcha = Image.new("RGB", (10, 10))
+        self.assertEqual(await sicar._solve_captcha(captcha), "ABCDE")
+        driver.submit.assert_called_once_with(captcha)
+
+    async def test_download_state_success(self):
+        sicar = self.sicar()
+        path = await sicar.download_state(
+            "mg", "apps", folder=self.folder.name, debug=True
+        )
+        self.assertEqual(path, Path(self.folder.name) / "MG_APPS.zip")
+        self.assertEqual(path.read_bytes(), ZIP)
+        self.assertIn("ReCaptcha=ABCDE", str(self.requests[-1].url))
+
+    async def test_download_state_to_sink(self):
+        sicar = self.sicar()
+        buffer = io.BytesIO()
+
+        result = await sicar.download_state(
+            State.MG, Polygon.APPS, folder=self.folder.name, sink=buffer
+        )
+
+        self.assertIs(result, buffer)
+        self.assertEqual(buffer.getvalue(), ZIP)
+        self.assertEqual(os.listdir(self.folder.name), [])
+
+    async def test_download_state_uses_a_dedicated_session(self):
+        sicar = self.sicar()
+        await sicar.download_state(State.MG, Polygon.APPS, folder=self.folder.name)
+        self.assertEqual(self.requests[0].url.path, "/publico/imoveis/index")
+        self.assertEqual(len(sicar._session.cookies), 0)
+
+    async def test_download_state_invalid_captcha(self):
+        sicar = self.sicar()
+        sicar._driver.get_captcha = MagicMock(return_value="ABCD")
+        result = await sicar.download_state(
+            State.MG, Polygon.APPS, folder=self.folder.name, tries=3, debug=True
+        )
+        self.assertFalse(result)
+        self.assertEqual(sicar._driver.get_captcha.call_count, 3)
+        self.assertIn("Invalid captcha 'ABCD'", self.stdout.getvalue())
+
+    async def test_download_state_failed_polygon(self):
+        self.handler = lambda request: (
+            httpx.Response(200, content=captcha_png())
+            if request.url.path.endswith("ReCaptcha")
+            else httpx.Response(200, headers={"Content-Type": "text/html"})
+        )
+        sicar = self.sicar()
+        result = await sicar.download_state(
+            State.MG, Polygon.APPS, folder=self.folder.name, tries=2, debug=True
+        )
+        self.assertFalse(result)
+        self.assertIn("Failed to download polygon!", self.stdout.getvalue())
+
+    async def test_download_state_retries_captcha_errors(self):
+        def handler(request):
+            if request.url.path.endswith("ReCaptcha"):
+                raise httpx.ConnectError("down", request=request)
+            return httpx.Response(200)
+
+        self.handler = handler
+        sicar = self.sicar(retry=RetryPolicy(base=0))
+        result = await sicar.download_state(
+            State.MG, Polygon.APPS, folder=self.folder.name, tries=3
+        )
+        self.assertFalse(result)
+        self.assertEqual(
+            sum(request.url.path.endswith("ReCaptcha") for request in self.requests),
+            3,
+        )
+
+    async def test_download_state_unsupported_sink(self):
+        sicar = self.sicar()
+        with patch.object(
+            AsyncSicar, "_download_polygon", side_effect=io.UnsupportedOperation()
+        ) as mock_download_polygon:
+            result = await sicar.download_state(
+                State.MG, Polygon.APPS, sink=lambda chunk: None, tries=3
+            )
+
+        self.assertFalse(result)
+        mock_download_polygon.assert_called_once()
+
+    async def test_download_polygon_failed_response(self):
+        self.handler = lambda request: httpx.Response(404)
+        sicar = self.sicar()
+        with self.assertRaises(FailedToDownloadPolygonException):
+            await sicar._download_polygon(
+                State.MG, Polygon.APPS, "ABCDE", self.folder.name
+            )
+
+    async def test_download_polygon_network_error(self):
+        def handler(request):
+            raise httpx.ReadError("connection dropped")
+
+        self.handler = handler
+        sicar = self.sicar()
+        with self.assertRaises(FailedToDownloadPolygonException):
+            await sicar._download_polygon(
+                State.MG, Polygon.APPS, "ABCDE", self.folder.name
+            )
+
+    async def test_download_polygon_error_while_reading_body(self):
+        async def body():
+            yield ZIP[:3]
+            raise httpx.ReadError("connection dropped")
+
+        self.handler = lambda request: httpx.Response(
+            200,
+            headers={
+                "Content-Type": "application/zip",
+                "Content-Length": str(len(ZIP)),
+            },
+            content=body(),
+        )
+        sicar = self.sicar()
+        with self.assertRaises(FailedToDownloadPolygonException):
+            await sicar._download_polygon(
+                State.MG, Polygon.APPS, "ABCDE", self.folder.name
+            )
+
+        self.assertEqual(
+            (Path(self.folder.name) / "MG_APPS.zip.part").read_bytes(), ZIP[:3]
+        )
+
+    async def test_download_polygon_writes_off_the_event_loop(self):
+        sicar = self.sicar()
+        threads = set()
+
+        def callback(chunk):
+            threads.add(threading.get_ident())
+
+        self.assertTrue(
+            await sicar._download_polygon(
+                State.MG,
+                Polygon.APPS,
+                "ABCDE",
+                self.folder.name,
+                sink=as_sink(callback),
+            )
+        )
+        self.assertNotIn(threading.get_ident(), threads)
+
+    async def test_download_polygon_gathers_chunks_before_writing(self):
+        async def body():
+            for start in range(0, len(ZIP), 10):
+                yield ZIP[start : start + 10]
+
+        self.handler = lambda request: httpx.Response(
+            200,
+            headers={
+                "Content-Type": "application/zip",
+                "Content-Length": str(len(ZIP)),
+            },
+            content=body(),
+        )
+        sicar = self.sicar()
+        writes = []
+        to_thread = asyncio.to_thread
+
+        async def record(function, *args, **kwargs):
+            if function.__name__ == "write":
+                writes.append(len(b"".join(*args)))
+            return await to_thread(function, *args, **kwargs)
+
+        with patch("asyncio.to_thread", side_effect=record):
+            path = await sicar._download_polygon(
+                State.MG, Polygon.APPS, "ABCDE", self.folder.name, chunk_size=64
+            )
+
+        self.assertEqual(path.read_bytes(), ZIP)
+        self.assertEqual(writes, [70, 70, 20])
+
+    async def test_download_polygon_shorter_than_content_length(self):
+        self.handler = lambda request: httpx.Response(
+            200,
+            headers={"Content-Type": "application/zip", "Content-Length": "999"},
+            content=ZIP,
+        )
+        sicar = self.sicar()
+
+        with self.assertRaises(FailedToDownloadPolygonException):
+            await sicar._download_polygon(
+                State.MG, Polygon.APPS, "ABCDE", self.folder.name
+            )
+
+        self.assertFalse((Path(self.folder.name) / "MG_APPS.zip").exists())
+
+    async def test_download_polygon_resumes(self):
+        (Path(self.folder.name) / "MG_APPS.zip.part").write_bytes(ZIP[:3])
+        (Path(self.folder.name) / "MG_APPS.zip.part.json").write_text(
+            f'{{"total": {len(ZIP)}, "validator": null}}'
+        )
+        self.handler = lambda request: httpx.Response(
+            206,
+            headers={
+                "Content-Type": "application/zip",
+                "Content-Range": f"bytes 3-{len(ZIP) - 1}/{len(ZIP)}",
+            },
+            content=ZIP[3:],
+        )
+        sicar = self.sicar()
+
+        path = await sicar._download_polygon(
+            State.MG, Polygon.APPS, "ABCDE", self.folder.name
+        )
+
+        self.assertEqual(self.requests[-1].headers["Range"], "bytes=3-")
+        self.assertEqual(
+            (Path(self.folder.name) / "MG_APPS.zip.sha256").read_text(),
+            f"{hashlib.sha256(ZIP).hexdigest()}  MG_APPS.zip\n",
+        )
+        self.assertEqual(path.read_bytes(), ZIP)
+
+    async def test_download_state_invalid_codes(self):
+        sicar = self.sicar()
+        with self.assertRaises(StateCodeNotValidException):
+            await sicar.download_state("XX", Polygon.APPS, folder=self.folder.name)
+        with self.assertRaises(PolygonNotValidException):
+            await sicar.download_state(State.MG, "XX", folder=self.folder.name)
+
+    async def test_download_country_respects_concurrency(self):
+        sicar = self.sicar(concurrency=3)
+        running = 0
+        peak = 0
+
+        async def download_state(**kwargs):
+            nonlocal running, peak
+            async with sicar._semaphore:
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0)
+                running -= 1
+            return Path(f"{kwargs['state'].value}.zip")
+
+        sicar.download_state = download_state
+        result = await sicar.download_country(Polygon.APPS, folder=self.folder.name)
+
+        self.assertEqual(set(result), set(State))
+        self.assertEqual(result[State.MG], Path("MG.zip"))
+        self.assertLessEqual(peak, 3)
+
+    async def test_download_country_keeps_results_when_a_state_raises(self):
+        listener = MagicMock()
+        sicar = self.sicar(listeners=[listener])
+
+        async def download_state(**kwargs):
+            if kwargs["state"] == State.MG:
+                raise OSError("disk full")
+            return Path(f"{kwargs['state'].value}.zip")
+
+        sicar.download_state = download_state
+        result = await sicar.download_country(Polygon.APPS, folder=self.folder.name)
+
+        self.assertFalse(result[State.MG])
+        self.assertEqual(result[State.BA], Path("BA.zip"))
+        event = listener.call_args.args[0]
+        self.assertEqual((event.state, event.attempts), (State.MG, 0))
+        self.assertIsInstance(event.error, OSError)
+
+    async def test_sync_state(self):
+        sicar = self.sicar()
+        sicar.get_release_dates = AsyncMock(return_value={State.MG: "02/01/2025"})
+        path = Path(self.folder.name) / "MG_APPS.zip"
+
+        async def download_state(**kwargs):
+            path.write_bytes(ZIP)
+            return path
+
+        sicar.download_state = MagicMock(side_effect=download_state)
+
+        self.assertEqual(await sicar.sync_state("mg", "apps", self.folder.name), path)
+        self.assertEqual(
+            await sicar.sync_state(
+                State.MG, Polygon.APPS, self.folder.name, debug=True
+            ),
+            path,
+        )
+
+        sicar.download_state.assert_called_once()
+        self.assertIn("is up to date", self.stdout.getvalue())
+
+        sicar.download_state = MagicMock(
+            side_effect=lambda **kwargs: asyncio.sleep(0, False)
+        )
+        path.unlink()
+        self.assertFalse(
+            await sicar.sync_state(State.MG, Polygon.APPS, self.folder.name)
+        )
+
+    async def test_sync_country(self):
+        sicar = self.sicar()
+        folder = Path(self.folder.name)
+        (folder / "AC_APPS.zip").write_bytes(ZIP)
+        Manifest(folder).record(
+            State.AC, Polygon.APPS, "04/08/2024", folder / "AC_APPS.zip"
+        )
+
+        async def download_state(**kwargs):
+            if kwargs["state"] == State.SP:
+                return False
+            path = folder / f"{kwargs['state'].value}_APPS.zip"
+            path.write_bytes(ZIP)
+            return path
+
+        sicar.download_state = MagicMock(side_effect=download_state)
+        result = await sicar.sync_country("apps", folder, debug=True)
+
+        self.assertEqual(result[State.AC], folder / "AC_APPS.zip")
+        self.assertFalse(result[State.SP])
+        self.assertEqual(sicar.download_state.call_count, len(State) - 1)
+        self.assertIn("'APPS' for 'AC' is up to date", self.stdout.getvalue())
+        self.assertIsNone(Manifest(folder).get(State.SP, Polygon.APPS))
+        self.assertIsNotNone(Manifest(folder).get(State.MG, Polygon.APPS))
+
+    async def test_shares_only_the_base_with_sicar(self):
+        sicar = self.sicar()
+
+        self.assertIsInstance(sicar, BaseSicar)
+        self.assertNotIsInstance(sicar, Sicar)
+        self.assertFalse(hasattr(sicar, "session_pool"))
+        self.assertFalse(hasattr(sicar, "_download_state_prefetched"))
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+from SICAR.polygon import Polygon
+from SICAR.exceptions import InvalidShapefileException, InvalidIndexException
+from SICAR.attribute_index import (
+    AttributeIndex,
+    attribute_index_path,
+    build_attribute_index,
+    open_attribute_index,
+)
+from SICAR.tests.unit.shapefile import SQUARE, archive, dbf, shp, shp_record
+
+FIELDS = [("cod_imovel", "C", 12, 0), ("num_area", "N", 8, 2), ("data", "D", 8, 0)]
+
+ROWS = [
+    ["MG-001", "10.50", "20240131"],
+    ["MG-002", "1", "20240201"],
+    ["MG-001", "2.5", "20240301"],
+    ["MG-003", "3", "20240401"],
+]
+
+
+class AttributeIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = self.polygons(ROWS, deleted=(3,))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def polygons(self, rows, deleted=()):
+        return archive(
+            self.folder.name,
+            {
+                "AREA_IMOVEL.shp": shp(5, [shp_record(5, [SQUARE]) for _ in rows]),
+                "AREA_IMOVEL.dbf": dbf(FIELDS, rows, deleted),
+            },
+        )
+
+    def test_lookup(self):
+        with build_attribute_index(self.path) as index:
+            self.assertEqual(len(index), 3)
+            self.assertEqual(index.column, "cod_imovel")
+            self.assertEqual(
+                index.lookup("MG-001"),
+                [
+                    {
+                        "cod_imovel": "MG-001",
+                        "num_area": 10.5,
+                        "data": date(2024, 1, 31),
+                    },
+                    {
+                        "cod_imovel": "MG-001",
+                        "num_area": 2.5,
+                        "data": date(2024, 3, 1),
+                    },
+                ],
+            )
+            self.assertEqual(index.lookup("MG-002")[0]["num_area"], 1.0)
+            self.assertEqual(index.lookup("MG-003"), [])
+            self.assertEqual(index.lookup("MG-00"), [])
+            self.assertIn("MG-002", index)
+            self.assertNotIn("MG-004", index)
+
+    def test_other_column(self):
+        with build_attribute_index(self.path, "num_area") as index:
+            self.assertEqual(index.path, attribute_index_path(self.path, "num_area"))
+            self.assertEqual(index.lookup(2.5)[0]["cod_imovel"], "MG-001")
+            self.assertEqual(index.lookup("10.50")[0]["cod_imovel"], "MG-001")
+
+    def test_many_records(self):
+        rows = [[f"MG-{i}", str(i), "20240101"] for i in range(1000)]
+        path = self.polygons(rows)
+
+        with build_attribute_index(path) as index:
+            for i in range(1000):
+                self.assertEqual(index.lookup(f"MG-{i}")[0]["num_area"], i)
+
+    def test_empty_layer(self):
+        path = self.polygons([])
+
+        with build_attribute_index(path) as index:
+            self.assertEqual(len(index), 0)
+            self.assertEqual(index.lookup("MG-001"), [])
+
+    def test_unknown_column(self):
+        with self.assertRaises(InvalidShapefileException):
+            build_attribute_index(self.path, "unknown")
+
+        self.assertEqual(
+            [path.name for path in Path(self.folder.name).iterdir()],
+            ["MG_AREA_IMOVEL.zip"],
+        )
+
+    def test_attribute_index_path(self):
+        self.assertEqual(
+            attribute_index_path("temp/MG_AREA_IMOVEL.zip"),
+            Path("temp/MG_AREA_IMOVEL.cod_imovel.idx"),
+        )
+        self.assertEqual(
+            attribute_index_path("temp/MG_AREA_IMOVEL.zip", "num_area", "AREA_1"),
+            Path("temp/MG_AREA_IMOVEL.AREA_1.num_area.idx"),
+        )
+
+    def test_open_builds_once(self):
+        with patch(
+            "SICAR.attribute_index.build_attribute_index",
+            side_effect=build_attribute_index,
+        ) as mock_build:
+            open_attribute_index(self.path).close()
+            with open_attribute_index(self.path) as index:
+                self.assertEqual(len(index), 3)
+
+        mock_build.assert_called_once_with(
+            self.path, "cod_imovel", attribute_index_path(self.path), None
+        )
+
+    def test_open_rebuilds_outdated(self):
+        build_attribute_index(self.path).close()
+        self.polygons([["MG-004", "4", "20250101"]])
+        os.utime(self.path, ns=(0, 0))
+
+        with open_attribute_index(self.path) as index:
+            self.assertEqual(len(index), 1)
+            self.assertIn("MG-004", index)
+
+    def test_open_rebuilds_invalid(self):
+        attribute_index_path(self.path).write_bytes(b"not an index")
+
+        with open_attribute_index(self.path) as index:
+            self.assertIn("MG-001", index)
+
+    def test_invalid_index(self):
+        path = Path(self.folder.name) / "invalid.idx"
+
+        with self.assertRaises(FileNotFoundError):
+            AttributeIndex(path)
+
+        for content in [b"", b"not an index", b"SICARKEY" + bytes(56)]:
+            path.write_bytes(content)
+            with self.assertRaises(InvalidIndexException):
+                AttributeIndex(path)
+
+        build_attribute_index(self.path, path=path).close()
+        path.write_bytes(path.read_bytes()[:150])
+        with self.assertRaises(InvalidIndexException):
+            AttributeIndex(path)
+
+    @patch("SICAR.sicar.Sicar._initialize_cookies")
+    def test_sicar_attribute_index(self, mock_initialize_cookies):
+        from SICAR import Sicar
+
+        with Sicar().attribute_index(
+            "mg", Polygon.AREA_PROPERTY, self.folder.name
+        ) as index:
+            self.assertEqual(
+                index.path, Path(self.folder.name) / "MG_AREA_IMOVEL.cod_imovel.idx"
+            )
+            self.assertEqual(len(index.lookup("MG-001")), 2)
+
+    def test_async_sicar_attribute_index(self):
+        import asyncio
+        from SICAR import AsyncSicar
+
+        index = asyncio.run(
+            AsyncSicar(listeners=[]).attribute_index(
+                "mg", Polygon.AREA_PROPERTY, self.folder.name
+            )
+        )
+
+        with index:
+            self.assertEqual(len(index.lookup("MG-001")), 2)
@@ -0,0 +1,134 @@
+import json
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from SICAR.cache import ReleaseDateCache
+from SICAR.state import State
+
+
+class ReleaseDateCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name) / "cache" / "release_dates.json"
+        self.dates = {State.AC: "04/08/2024", State.MG: "05/08/2024"}
+        self.response = httpx.Response(
+            200,
+            headers={"ETag": '"abc"', "Last-Modified": "Mon, 05 Aug 2024 00:00:00 GMT"},
+        )
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_empty_cache(self):
+        cache = ReleaseDateCache()
+        self.assertIsNone(cache.get())
+        self.assertEqual(cache.headers(), {})
+
+    @patch("SICAR.cache.time.time")
+    def test_store_and_expire(self, mock_time):
+        cache = ReleaseDateCache(ttl=60)
+
+        mock_time.return_value = 1000
+        self.assertEqual(cache.store(self.dates, self.response), self.dates)
+
+        mock_time.return_value = 1059
+        self.assertEqual(cache.get(), self.dates)
+
+        mock_time.return_value = 1060
+        self.assertIsNone(cache.get())
+        self.assertEqual(
+            cache.headers(),
+            {
+                "If-None-Match": '"abc"',
+                "If-Modified-Since": "Mon, 05 Aug 2024 00:00:00 GMT",
+            },
+        )
+
+    @patch("SICAR.cache.time.time")
+    def test_revalidate(self, mock_time):
+        cache = ReleaseDateCache(ttl=60)
+
+        mock_time.return_value = 1000
+        cache.store(self.dates, httpx.Response(200))
+        self.assertEqual(cache.headers(), {})
+
+        mock_time.return_value = 2000
+        self.assertIsNone(cache.get())
+        self.assertEqual(cache.revalidate(), self.dates)
+        self.assertEqual(cache.get(), self.dates)
+
+    def test_revalidate_without_entry(self):
+        cache = ReleaseDateCache(path=self.path)
+        cache.store(self.dates, self.response)
+        cache._entry = None
+        self.path.unlink()
+
+        self.assertIsNone(cache.revalidate())
+        self.assertFalse(self.path.exists())
+
+    def test_concurrent_saves(self):
+        caches = [ReleaseDateCache(path=self.path) for _ in range(8)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(50):
+                list(
+                    executor.map(
+                        lambda cache: cache.store(self.dates, self.response), caches
+                    )
+                )
+
+        self.assertEqual(ReleaseDateCache(path=self.path).get(), self.dates)
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_failed_save_removes_temporary_file(self):
+        cache = ReleaseDateCache(path=self.path)
+
+        with (
+            patch("os.replace", side_effect=OSError()),
+            self.assertRaises(OSError),
+        ):
+            cache.store(self.dates, self.response)
+
+        self.assertEqual(list(self.path.parent.iterdir()), [])
+
+    def test_shared_file(self):
+        writer = ReleaseDateCache(path=self.path)
+        reader = ReleaseDateCache(path=self.path)
+
+        self.assertIsNone(reader.get())
+
+        writer.store(self.dates, self.response)
+
+        self.assertEqual(reader.get(), self.dates)
+        self.assertEqual(json.loads(self.path.read_text())["etag"], '"abc"')
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    @patch("SICAR.cache.time.time")
+    def test_shared_file_keeps_newest_entry(self, mock_time):
+        cache = ReleaseDateCache(ttl=60, path=self.path)
+
+        mock_time.return_value = 1000
+        cache.store(self.dates, self.response)
+
+        self.path.write_text(
+            json.dumps(
+                {
+                    "dates": {"AC": "01/01/2024"},
+                    "fetched_at": 900,
+                    "etag": None,
+                    "last_modified": None,
+                }
+            )
+        )
+
+        self.assertEqual(cache.get(), self.dates)
+
+    def test_unreadable_file(self):
+        self.path.parent.mkdir(parents=True)
+        self.path.write_text("not json")
+        self.assertIsNone(ReleaseDateCache(path=self.path).get())
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from SICAR.connections import ConnectionStats
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class ConnectionStatsTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_trace_events(self):
+        stats = ConnectionStats()
+        stats.trace("connection.connect_tcp.started", {})
+        stats.trace("connection.connect_tcp.complete", {})
+        stats.trace("connection.start_tls.complete", {})
+        stats.trace("http11.send_request_headers.complete", {})
+        self.assertEqual(
+            stats.snapshot(), {"requests": 0, "connections": 1, "tls_handshakes": 1}
+        )
+
+    def test_hook(self):
+        stats = ConnectionStats()
+        request = httpx.Request("GET", self.url)
+        stats.hook(request)
+        self.assertEqual(request.extensions["trace"], stats.trace)
+        self.assertEqual(stats.requests, 1)
+
+    def test_keep_alive_reuses_connection(self):
+        stats = ConnectionStats()
+        with httpx.Client(event_hooks={"request": [stats.hook]}) as client:
+            for _ in range(3):
+                client.get(self.url)
+        self.assertEqual(
+            stats.snapshot(), {"requests": 3, "connections": 1, "tls_handshakes": 0}
+        )
+
+    def test_connection_close_opens_new_connections(self):
+        stats = ConnectionStats()
+        with httpx.Client(
+            event_hooks={"request": [stats.hook]}, headers={"Connection": "close"}
+        ) as client:
+            for _ in range(3):
+                client.get(self.url)
+        self.assertEqual(stats.connections, 3)
+
+    def test_async_keep_alive_reuses_connection(self):
+        stats = ConnectionStats()
+
+        async def run():
+            async with httpx.AsyncClient(
+                event_hooks={"request": [stats.ahook]}
+            ) as client:
+                for _ in range(3):
+                    await client.get(self.url)
+            self.assertEqual(stats.requests, 3)
+            self.assertEqual(stats.connections, 1)
+
+        asyncio.run(run())
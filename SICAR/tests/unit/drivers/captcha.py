@@ -1,5 +1,6 @@
+import io
 import unittest
-from unittest.mock import MagicMock, patch, ANY, call
+from unittest.mock import MagicMock, patch, ANY
 from PIL import Image
 import numpy as np
 import cv2
@@ -20,50 +21,47 @@ class CaptchaTests(unittest.TestCase):
         captcha_image = MagicMock(spec=Image.Image)
         self.assertEqual(self.captcha.get_captcha(captcha_image), "ABCD1234")
 
-    def test_png_to_jpg(self):
-        captcha_image = MagicMock(spec=Image.Image)
+    def test_get_captcha_batch(self):
+        captcha_images = [MagicMock(spec=Image.Image), MagicMock(spec=Image.Image)]
+        self.assertEqual(
+            self.captcha.get_captcha_batch(captcha_images), ["ABCD1234", "ABCD1234"]
+        )
 
-        named_temp_png = MagicMock()
-        named_temp_png.__enter__.return_value.name = "temp.png"
-        named_temp_jpg = MagicMock()
-        named_temp_jpg.__enter__.return_value.name = "temp.jpg"
-
-        with (
-            patch(
-                "tempfile.NamedTemporaryFile",
-                side_effect=[
-                    named_temp_png,
-                    named_temp_jpg,
-                ],
-            ) as mock_tempfile,
-            patch("matplotlib.image.imread") as imread_mock,
-            patch("matplotlib.image.imsave") as imsave_mock,
-            patch("cv2.imread") as cv2_imread_mock,
-        ):
-            imread_mock.return_value = np.array([[0, 255], [255, 0]])
-            imsave_mock.return_value = None
-            cv2_imread_mock.return_value = np.array([[0, 255], [255, 0]])
+    def test_png_to_jpg(self):
+        captcha_image = Image.new("RGBA", (10, 10), (0, 0, 0, 0))
 
+        with patch("cv2.imencode", wraps=cv2.imencode) as imencode_mock:
             result = self.captcha._png_to_jpg(captcha_image)
 
-            captcha_image.save.assert_called_once_with("temp.png")
+        imencode_mock.assert_called_once_with(
+            ".jpg", ANY, [cv2.IMWRITE_JPEG_QUALITY, 75]
+        )
+        self.assertEqual(result.shape, (10, 10, 3))
+        np.testing.assert_array_equal(result, np.full((10, 10, 3), 255))
+
+    def test_png_to_jpg_flattens_alpha_on_white(self):
+        captcha_image = Image.new("RGBA", (8, 8), (0, 0, 0, 0))
+        captcha_image.paste((0, 0, 0, 255), (0, 0, 8, 4))
 
-            self.assertEqual(mock_tempfile.call_count, 2)
-            self.assertEqual(
-                mock_tempfile.call_args_list,
-                [call(suffix=".png", delete=False), call(suffix=".jpg", delete=False)],
-            )
-            imsave_mock.assert_called_once_with(
-                "temp.jpg",
-                ANY,  # np array is ambiguous
-                cmap="gray",
-                vmin=0,
-                vmax=255,
+        result = self.captcha._png_to_jpg(captcha_image)
+
+        self.assertLess(result[:3].max(), 16)
+        self.assertGreater(result[5:].min(), 239)
+
+    def test_png_to_jpg_from_bytes(self):
+        for mode in ["RGBA", "RGB", "L"]:
+            captcha_image = Image.new(mode, (16, 8))
+            buffer = io.BytesIO()
+            captcha_image.save(buffer, format="PNG")
+
+            np.testing.assert_array_equal(
+                self.captcha._png_to_jpg(buffer.getvalue()),
+                self.captcha._png_to_jpg(captcha_image),
             )
-            imread_mock.assert_called_once()
-            cv2_imread_mock.assert_called_once_with("temp.jpg", -1)
 
-            np.testing.assert_array_equal(result, np.array([[0, 255], [255, 0]]))
+    def test_png_to_jpg_from_invalid_bytes(self):
+        with self.assertRaises(ValueError):
+            self.captcha._png_to_jpg(b"invalid")
 
     def test_improve_image(self):
         image = np.random.randint(0, 256, size=(10, 10), dtype=np.uint8)
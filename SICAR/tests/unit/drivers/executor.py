@@ -0,0 +1,71 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+from PIL import Image
+
+from SICAR.drivers import Captcha, OcrExecutor
+from SICAR.drivers import executor
+
+
+class SizeCaptcha(Captcha):
+    def get_captcha(self, captcha):
+        return f"{captcha.size[0]}-{os.getpid()}"
+
+
+class ExecutorFunctionsTest(unittest.TestCase):
+    def tearDown(self):
+        executor._driver = None
+
+    def test_initialize_loads_driver(self):
+        executor._initialize(SizeCaptcha)
+        self.assertIsInstance(executor._driver, SizeCaptcha)
+
+    def test_solve(self):
+        executor._initialize(SizeCaptcha)
+        self.assertEqual(executor._solve(Image.new("RGB", (7, 1))), f"7-{os.getpid()}")
+
+    def test_solve_batch(self):
+        executor._driver = MagicMock()
+        executor._driver.get_captcha_batch.return_value = ["ABCDE"]
+        self.assertEqual(executor._solve_batch(["image"]), ["ABCDE"])
+
+
+class OcrExecutorTest(unittest.TestCase):
+    def test_get_captcha_runs_in_worker_process(self):
+        with OcrExecutor(SizeCaptcha, workers=2) as ocr:
+            size, pid = ocr.get_captcha(Image.new("RGB", (5, 1))).split("-")
+
+        self.assertEqual(size, "5")
+        self.assertNotEqual(int(pid), os.getpid())
+
+    def test_submit_returns_future(self):
+        with OcrExecutor(SizeCaptcha, workers=1) as ocr:
+            future = ocr.submit(Image.new("RGB", (3, 1)))
+            self.assertTrue(future.result().startswith("3-"))
+
+    def test_get_captcha_batch_keeps_order(self):
+        images = [Image.new("RGB", (width, 1)) for width in range(1, 8)]
+        with OcrExecutor(SizeCaptcha, workers=3) as ocr:
+            result = ocr.get_captcha_batch(images)
+
+        self.assertEqual(
+            [r.split("-")[0] for r in result], [str(w) for w in range(1, 8)]
+        )
+
+    def test_get_captcha_batch_chunks(self):
+        ocr = OcrExecutor(SizeCaptcha, workers=2)
+        ocr._pool = MagicMock()
+        ocr._pool.submit.side_effect = lambda function, chunk: MagicMock(
+            result=MagicMock(return_value=chunk)
+        )
+
+        self.assertEqual(ocr.get_captcha_batch([1, 2, 3, 4, 5]), [1, 2, 3, 4, 5])
+        self.assertEqual(
+            [c.args[1] for c in ocr._pool.submit.call_args_list], [[1, 2, 3], [4, 5]]
+        )
+        self.assertEqual(ocr.get_captcha_batch([]), [])
+
+    @patch("os.cpu_count", return_value=None)
+    def test_default_workers(self, cpu_count_mock):
+        with patch("SICAR.drivers.executor.ProcessPoolExecutor"):
+            self.assertEqual(OcrExecutor(SizeCaptcha)._workers, 1)
@@ -1,8 +1,18 @@
+import sys
+import types
 import unittest
 from PIL import Image
-from unittest.mock import patch, MagicMock
-from SICAR.drivers import Paddle
-import paddleocr
+from unittest.mock import patch, MagicMock, call
+
+try:
+    import paddleocr
+except ImportError:
+    # PaddleOCR is mocked in every test, so an empty module stands in for it when the extra is not installed.
+    paddleocr = types.ModuleType("paddleocr")
+    paddleocr.PaddleOCR = type("PaddleOCR", (), {})
+    sys.modules["paddleocr"] = paddleocr
+
+from SICAR.drivers.paddle import Paddle
 
 
 class PaddleTestCase(unittest.TestCase):
@@ -32,6 +42,36 @@ class PaddleTestCase(unittest.TestCase):
 
         self.assertEqual(result, re_mock.return_value)
 
+    @patch.object(paddleocr.PaddleOCR, "__init__", return_value=None)
+    @patch("cv2.cvtColor")
+    @patch("SICAR.drivers.paddle.Paddle._process_captcha")
+    def test_get_captcha_batch(self, process_captcha_mock, cvt_color_mock, paddle_mock):
+        ocr_result = [[("AB-C12", 0.99), ("XYZ98", 0.95)]]
+        captcha_images = [MagicMock(spec=Image.Image), MagicMock(spec=Image.Image)]
+
+        paddle = Paddle()
+        paddle.ocr.ocr = MagicMock(return_value=ocr_result)
+
+        result = paddle.get_captcha_batch(captcha_images)
+
+        process_captcha_mock.assert_has_calls(
+            [call(captcha_images[0]), call(captcha_images[1])]
+        )
+        paddle.ocr.ocr.assert_called_once_with(
+            [cvt_color_mock.return_value, cvt_color_mock.return_value],
+            det=False,
+            cls=False,
+        )
+        self.assertEqual(result, ["ABC12", "XYZ98"])
+
+    @patch.object(paddleocr.PaddleOCR, "__init__", return_value=None)
+    def test_get_captcha_batch_empty(self, paddle_mock):
+        paddle = Paddle()
+        paddle.ocr.ocr = MagicMock()
+
+        self.assertEqual(paddle.get_captcha_batch([]), [])
+        paddle.ocr.ocr.assert_not_called()
+
     @patch("paddleocr.PaddleOCR", side_effect=ImportError)
     def test_paddle_import_failure(self, paddle_mock):
         with self.assertRaises(ImportError):
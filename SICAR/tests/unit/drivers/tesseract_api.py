@@ -0,0 +1,55 @@
+import unittest
+import threading
+import numpy as np
+from PIL import Image
+from unittest.mock import patch, MagicMock
+from SICAR.drivers import TesseractAPI
+
+
+class TesseractAPITest(unittest.TestCase):
+    @patch("SICAR.drivers.tesseract_api.tesserocr")
+    @patch("SICAR.drivers.tesseract_api.TesseractAPI._process_captcha")
+    def test_get_captcha(self, process_captcha_mock, tesserocr_mock):
+        process_captcha_mock.return_value = np.zeros((10, 10), dtype=np.uint8)
+        api = tesserocr_mock.PyTessBaseAPI.return_value
+        api.GetUTF8Text.return_value = "AB-C1 2\n"
+        captcha_image = MagicMock(spec=Image.Image)
+        tesseract = TesseractAPI()
+
+        result = tesseract.get_captcha(captcha_image)
+
+        process_captcha_mock.assert_called_once_with(captcha_image)
+        tesserocr_mock.PyTessBaseAPI.assert_called_once_with(lang="eng", psm=7)
+        api.SetVariable.assert_called_once_with(
+            "tessedit_char_whitelist", tesseract._whitelist
+        )
+        api.SetImage.assert_called_once()
+        self.assertEqual(result, "ABC12")
+
+    @patch("SICAR.drivers.tesseract_api.tesserocr")
+    def test_api_is_reused_per_thread(self, tesserocr_mock):
+        tesserocr_mock.PyTessBaseAPI.side_effect = lambda **kwargs: MagicMock()
+        tesseract = TesseractAPI()
+
+        first = tesseract._api()
+        self.assertIs(tesseract._api(), first)
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(tesseract._api()))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(other[0], first)
+        self.assertEqual(tesserocr_mock.PyTessBaseAPI.call_count, 2)
+
+    @patch("SICAR.drivers.tesseract_api.tesserocr", None)
+    @patch("pytesseract.image_to_string", return_value="ABC12")
+    @patch("SICAR.drivers.tesseract.Tesseract._process_captcha")
+    def test_fallback_to_pytesseract(self, process_captcha_mock, pytesseract_mock):
+        tesseract = TesseractAPI()
+
+        self.assertEqual(tesseract.get_captcha(MagicMock(spec=Image.Image)), "ABC12")
+        pytesseract_mock.assert_called_once_with(
+            process_captcha_mock.return_value,
+            config=tesseract._custom_l_psm_config,
+        )
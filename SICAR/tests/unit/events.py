@@ -0,0 +1,157 @@
+import io
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from SICAR.state import State
+from SICAR.polygon import Polygon
+from SICAR.retry import Failure
+from SICAR.exceptions import FailedToDownloadPolygonException
+from SICAR.events import (
+    Events,
+    PrintListener,
+    TqdmListener,
+    AttemptStarted,
+    CaptchaSolved,
+    AttemptFailed,
+    DownloadStarted,
+    BytesReceived,
+    DownloadFailed,
+    UpToDate,
+)
+
+
+class EventsTestCase(unittest.TestCase):
+    def test_emit(self):
+        received = []
+        events = Events([received.append])
+        event = AttemptStarted(State.MG, Polygon.APPS, 1, 25)
+
+        events.emit(event)
+
+        self.assertTrue(events)
+        self.assertFalse(Events())
+        self.assertEqual(received, [event])
+
+    def test_with_listener(self):
+        first, second = MagicMock(), MagicMock()
+        events = Events([first], interval=1.0)
+
+        extended = events.with_listener(second)
+        extended.emit("event")
+
+        self.assertEqual(events.listeners, (first,))
+        self.assertEqual(extended.interval, 1.0)
+        first.assert_called_once_with("event")
+        second.assert_called_once_with("event")
+
+    @patch("SICAR.events.time.monotonic", side_effect=[0.0, 0.1, 0.6, 0.7])
+    def test_progress_is_throttled(self, mock_monotonic):
+        received = []
+        events = Events([received.append], interval=0.5)
+
+        progress = events.progress(State.MG, Polygon.APPS, total=100, offset=10)
+        for _ in range(3):
+            progress.update(30)
+        progress.close()
+
+        self.assertEqual(
+            received,
+            [
+                DownloadStarted(State.MG, Polygon.APPS, 100, 10),
+                BytesReceived(State.MG, Polygon.APPS, 70, 100),
+                BytesReceived(State.MG, Polygon.APPS, 100, 100),
+            ],
+        )
+
+    def test_progress_without_listeners(self):
+        progress = Events().progress(State.MG, Polygon.APPS, total=100, offset=0)
+
+        with patch("SICAR.events.time.monotonic") as mock_monotonic:
+            progress.update(40)
+            progress.update(60)
+            progress.close()
+
+        mock_monotonic.assert_not_called()
+        self.assertEqual(progress.received, 100)
+
+
+class PrintListenerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.stdout = io.StringIO()
+        sys.stdout = self.stdout
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_messages(self):
+        listener = PrintListener()
+
+        listener(AttemptStarted(State.MG, Polygon.APPS, 1, 25))
+        listener(CaptchaSolved(State.MG, Polygon.APPS, 1, 25, "ABCD", False))
+        listener(AttemptFailed(State.MG, Polygon.APPS, 1, 25, Failure.OTHER, None))
+        listener(CaptchaSolved(State.MG, Polygon.APPS, 2, 25, "ABCDE", True))
+        listener(
+            AttemptFailed(
+                State.MG,
+                Polygon.APPS,
+                2,
+                25,
+                Failure.SERVER,
+                FailedToDownloadPolygonException(),
+            )
+        )
+        listener(UpToDate(State.MG, Polygon.APPS, Path("MG_APPS.zip")))
+        listener(DownloadFailed(State.MG, Polygon.APPS, 25))
+        listener(DownloadFailed(State.MG, Polygon.APPS, 0, OSError("disk full")))
+
+        self.assertEqual(
+            self.stdout.getvalue().splitlines(),
+            [
+                "[25] - Invalid captcha 'ABCD' to request 'APPS' for 'MG'",
+                "[24] - Requesting 'APPS' for 'MG' with captcha 'ABCDE'",
+                "[24] - Failed to download polygon! When requesting 'APPS' for 'MG'",
+                "'APPS' for 'MG' is up to date",
+                "Stopped requesting 'APPS' for 'MG': OSError('disk full')",
+            ],
+        )
+
+
+class TqdmListenerTestCase(unittest.TestCase):
+    @patch("tqdm.tqdm")
+    def test_bar_follows_the_download(self, mock_tqdm):
+        bar = mock_tqdm.return_value
+        bar.n = 10
+        listener = TqdmListener(leave=False)
+
+        listener(DownloadStarted(State.MG, Polygon.APPS, 100, 10))
+        listener(BytesReceived(State.MG, Polygon.APPS, 60, 100))
+        bar.n = 60
+        listener(BytesReceived(State.MG, Polygon.APPS, 100, 100))
+        listener(BytesReceived(State.MG, Polygon.APPS, 100, 100))
+
+        mock_tqdm.assert_called_once_with(
+            total=100,
+            initial=10,
+            unit="iB",
+            unit_scale=True,
+            desc="Downloading polygon 'APPS' for state 'MG'",
+            leave=False,
+        )
+        self.assertEqual(
+            [call.args for call in bar.update.call_args_list], [(50,), (40,)]
+        )
+        bar.close.assert_called_once()
+
+    @patch("tqdm.tqdm")
+    def test_bar_closed_on_failure(self, mock_tqdm):
+        listener = TqdmListener()
+
+        listener(DownloadStarted(State.MG, Polygon.APPS, 100, 0))
+        listener(DownloadStarted(State.MG, Polygon.APPS, 100, 40))
+        listener(AttemptFailed(State.MG, Polygon.APPS, 1, 25, Failure.SERVER, None))
+        listener(DownloadFailed(State.MG, Polygon.APPS, 25))
+
+        self.assertEqual(mock_tqdm.call_count, 2)
+        self.assertEqual(mock_tqdm.return_value.close.call_count, 2)
@@ -1,4 +1,5 @@
 import unittest
+from pathlib import Path
 from SICAR.exceptions import (
     UrlNotOkException,
     PolygonNotValidException,
@@ -6,6 +7,8 @@ from SICAR.exceptions import (
     FailedToDownloadCaptchaException,
     FailedToDownloadPolygonException,
     FailedToGetReleaseDateException,
+    InvalidIndexException,
+    NoSessionAvailableException,
 )
 
 
@@ -15,6 +18,8 @@ class ExceptionTestCase(unittest.TestCase):
         with self.assertRaises(UrlNotOkException) as context:
             raise UrlNotOkException(url)
         self.assertEqual(str(context.exception), f"Oh no! Failed to access {url}!")
+        self.assertIsNone(context.exception.status_code)
+        self.assertEqual(UrlNotOkException(url, 503).status_code, 503)
 
     def test_state_code_not_valid_exception(self):
         state = "XYZ"
@@ -38,7 +43,25 @@ class ExceptionTestCase(unittest.TestCase):
             raise FailedToDownloadPolygonException()
         self.assertEqual(str(context.exception), "Failed to download polygon!")
 
+        error = FailedToDownloadPolygonException(200, "text/html")
+        self.assertEqual((error.status_code, error.content_type), (200, "text/html"))
+
     def test_failed_to_get_release_dates_exception(self):
         with self.assertRaises(FailedToGetReleaseDateException) as context:
             raise FailedToGetReleaseDateException()
         self.assertEqual(str(context.exception), "Failed to get release date!")
+
+    def test_invalid_index_exception(self):
+        path = Path("temp/MG_AREA_IMOVEL.rtree")
+        with self.assertRaises(InvalidIndexException) as context:
+            raise InvalidIndexException(path)
+        self.assertEqual(str(context.exception), f"Invalid index: {path}!")
+        self.assertEqual(context.exception.path, path)
+
+    def test_no_session_available_exception(self):
+        with self.assertRaises(NoSessionAvailableException) as context:
+            raise NoSessionAvailableException(1.5)
+        self.assertEqual(
+            str(context.exception), "No session available after 1.5 seconds!"
+        )
+        self.assertEqual(context.exception.timeout, 1.5)
@@ -0,0 +1,234 @@
+import json
+import struct
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from SICAR.state import State
+from SICAR.polygon import Polygon
+from SICAR.geoparquet import SIRGAS_2000, GeoParquetWriter, to_geoparquet, to_wkb
+from SICAR.tests.unit.shapefile import SQUARE, HOLE, archive, dbf, shp, shp_record
+
+FIELDS = [
+    ("cod_estado", "C", 2, 0),
+    ("municipio", "C", 20, 0),
+    ("cod_imovel", "C", 12, 0),
+    ("ind_status", "C", 2, 0),
+    ("num_area", "N", 8, 2),
+]
+
+ROWS = [
+    ["MG", "Belo Horizonte", "MG-001", "AT", "1.5"],
+    ["MG", "Uberaba", "MG-002", "PE", "2.5"],
+    ["MG", "Belo Horizonte", "MG-003", "AT", "3.5"],
+    ["MG", "", "MG-004", "CA", ""],
+]
+
+
+class GeoParquetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = archive(
+            self.folder.name,
+            {
+                "AREA_IMOVEL.shp": shp(
+                    5,
+                    [
+                        shp_record(5, [SQUARE, HOLE]),
+                        shp_record(5, [SQUARE]),
+                        shp_record(5, [SQUARE]),
+                        shp_record(0),
+                    ],
+                ),
+                "AREA_IMOVEL.dbf": dbf(FIELDS, ROWS),
+            },
+        )
+        self.destination = Path(self.folder.name) / "AREA_IMOVEL"
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_to_wkb(self):
+        self.assertIsNone(to_wkb(None))
+        self.assertEqual(
+            to_wkb({"type": "Point", "coordinates": (1.0, 2.0)}),
+            bytes.fromhex("0101000000000000000000f03f0000000000000040"),
+        )
+        self.assertEqual(
+            to_wkb({"type": "LineString", "coordinates": [(0.0, 0.0), (1.0, 1.0)]}),
+            struct.pack("<BII4d", 1, 2, 2, 0, 0, 1, 1),
+        )
+        self.assertEqual(
+            to_wkb({"type": "MultiPolygon", "coordinates": [[SQUARE[:4]]]}),
+            struct.pack("<BII", 1, 6, 1)
+            + struct.pack("<BIII8d", 1, 3, 1, 4, 0, 0, 0, 2, 2, 2, 2, 0),
+        )
+
+    def test_partitioned_dataset(self):
+        files = to_geoparquet(self.path, self.destination, state=State.MG)
+
+        self.assertEqual(
+            sorted(str(path.relative_to(self.destination)) for path in files),
+            [
+                "state=MG/municipio=Belo%20Horizonte/part-0.parquet",
+                "state=MG/municipio=Uberaba/part-0.parquet",
+                "state=MG/municipio=__HIVE_DEFAULT_PARTITION__/part-0.parquet",
+            ],
+        )
+
+        table = ds.dataset(self.destination, partitioning="hive").to_table(
+            columns=["cod_imovel", "num_area", "geometry"],
+            filter=ds.field("municipio") == "Belo Horizonte",
+        )
+        self.assertEqual(table.column("cod_imovel").to_pylist(), ["MG-001", "MG-003"])
+        self.assertEqual(table.column("num_area").to_pylist(), [1.5, 3.5])
+        self.assertEqual(
+            table.column("geometry")[0].as_py()[:9], struct.pack("<BII", 1, 3, 2)
+        )
+
+        schema = pq.read_schema(files[0])
+        self.assertEqual(
+            schema.names, ["cod_imovel", "ind_status", "num_area", "geometry"]
+        )
+        self.assertEqual(schema.field("cod_imovel").type, pa.string())
+        self.assertTrue(pa.types.is_dictionary(schema.field("ind_status").type))
+
+        geo = json.loads(schema.metadata[b"geo"])
+        self.assertEqual(geo["primary_column"], "geometry")
+        self.assertEqual(
+            geo["columns"]["geometry"],
+            {
+                "encoding": "WKB",
+                "geometry_types": ["Polygon", "MultiPolygon"],
+                "crs": SIRGAS_2000,
+            },
+        )
+
+        [empty] = [path for path in files if "HIVE" in str(path)]
+        self.assertEqual(pq.read_table(empty).column("geometry").to_pylist(), [None])
+
+    def test_state_from_attributes_and_rebuild(self):
+        stale = self.destination / "state=MG" / "municipio=Old" / "part-0.parquet"
+        stale.parent.mkdir(parents=True)
+        stale.write_bytes(b"")
+
+        to_geoparquet(self.path, self.destination, state=State.MG)
+        self.assertFalse(stale.exists())
+
+        files = to_geoparquet(
+            self.path, Path(self.folder.name) / "other", categorical=[]
+        )
+        self.assertEqual(len(files), 3)
+        self.assertEqual(pq.read_schema(files[0]).field("ind_status").type, pa.string())
+
+    def test_bounded_row_groups_and_open_files(self):
+        files = to_geoparquet(
+            self.path,
+            self.destination,
+            state=State.MG,
+            row_group_size=1,
+            max_open_files=1,
+        )
+
+        self.assertIn(
+            self.destination / "state=MG/municipio=Belo%20Horizonte/part-1.parquet",
+            files,
+        )
+        for path in files:
+            self.assertEqual(pq.ParquetFile(path).metadata.num_rows, 1)
+
+        [path] = to_geoparquet(
+            self.path, self.destination, state=State.MG, row_group_size=1
+        )[:1]
+        self.assertEqual(pq.ParquetFile(path).metadata.num_row_groups, 2)
+
+    def test_buffered_rows_are_bounded(self):
+        schema = pa.schema(
+            [pa.field("id", pa.int64()), pa.field("geometry", pa.binary())]
+        )
+        writer = GeoParquetWriter(
+            self.destination, schema, row_group_size=10, max_buffered_rows=2
+        )
+
+        for index in range(3):
+            writer.write(
+                (("state", "MG"), ("municipio", str(index % 2))),
+                {"id": index, "geometry": None},
+            )
+
+        self.assertEqual(writer._buffered, 1)
+        self.assertEqual(list(writer._buffers), [(("state", "MG"), ("municipio", "1"))])
+        files = writer.close()
+        self.assertEqual(sorted(pq.read_table(path).num_rows for path in files), [1, 2])
+
+    def test_layer_without_municipality(self):
+        path = archive(
+            self.folder.name,
+            {
+                "layer.shp": shp(1, [shp_record(1, point=(1.0, 2.0))]),
+                "layer.dbf": dbf(
+                    [("id", "N", 2, 0), ("data", "D", 8, 0), ("ativo", "L", 1, 0)],
+                    [["7", "20240131", "T"]],
+                ),
+            },
+            "point.zip",
+        )
+
+        [file] = to_geoparquet(path, self.destination, state=State.AC)
+
+        self.assertEqual(
+            pq.read_table(file).drop_columns("geometry").to_pylist(),
+            [{"id": 7, "data": date(2024, 1, 31), "ativo": True}],
+        )
+
+        self.assertEqual(file, self.destination / "state=AC" / "part-0.parquet")
+        geo = json.loads(pq.read_schema(file).metadata[b"geo"])
+        self.assertEqual(geo["columns"]["geometry"]["geometry_types"], ["Point"])
+
+    def test_integral_number_with_decimal_point(self):
+        path = archive(
+            self.folder.name,
+            {
+                "layer.shp": shp(1, [shp_record(1, point=(1.0, 2.0))] * 2),
+                "layer.dbf": dbf([("modulos", "N", 6, 0)], [["12.0"], ["3"]]),
+            },
+            "point.zip",
+        )
+
+        [file] = to_geoparquet(path, self.destination, state=State.AC)
+
+        table = pq.read_table(file)
+        self.assertEqual(table.schema.field("modulos").type, pa.int64())
+        self.assertEqual(table.column("modulos").to_pylist(), [12, 3])
+
+    @patch("SICAR.sicar.Sicar._initialize_cookies")
+    def test_sicar_to_geoparquet(self, mock_initialize_cookies):
+        from SICAR import Sicar
+
+        self.path.rename(Path(self.folder.name) / "MG_AREA_IMOVEL.zip")
+
+        files = Sicar().to_geoparquet("mg", Polygon.AREA_PROPERTY, self.folder.name)
+
+        self.assertEqual(len(files), 3)
+        self.assertTrue(all(self.destination in path.parents for path in files))
+
+    def test_async_sicar_to_geoparquet(self):
+        import asyncio
+        from SICAR import AsyncSicar
+
+        self.path.rename(Path(self.folder.name) / "MG_AREA_IMOVEL.zip")
+
+        files = asyncio.run(
+            AsyncSicar(listeners=[]).to_geoparquet(
+                "mg", Polygon.AREA_PROPERTY, self.folder.name
+            )
+        )
+
+        self.assertEqual(len(files), 3)
+        self.assertTrue(all(self.destination in path.parents for path in files))
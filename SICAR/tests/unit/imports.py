@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+import SICAR
+from SICAR import drivers
+
+HEAVY_MODULES = ["httpx", "bs4", "tqdm", "PIL", "cv2", "numpy", "paddleocr"]
+
+
+def loaded_modules(statement):
+    code = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+class LazyImportTestCase(unittest.TestCase):
+    def test_import_sicar_is_light(self):
+        modules = loaded_modules("import SICAR")
+        self.assertFalse(modules & set(HEAVY_MODULES))
+        self.assertNotIn("SICAR.sicar", modules)
+
+    def test_import_enums_is_light(self):
+        modules = loaded_modules("from SICAR import State, Polygon")
+        self.assertFalse(modules & set(HEAVY_MODULES))
+
+    def test_drivers_are_loaded_on_demand(self):
+        modules = loaded_modules("from SICAR import Sicar")
+        self.assertIn("cv2", modules)
+        self.assertNotIn("SICAR.drivers.tesseract_api", modules)
+        self.assertNotIn("SICAR.drivers.paddle", modules)
+        self.assertNotIn("bs4", modules)
+
+    def test_exports(self):
+        self.assertEqual(
+            SICAR.__all__,
+            ["Sicar", "AsyncSicar", "State", "Polygon", "ReleaseDateCache"],
+        )
+        self.assertTrue(set(SICAR.__all__) <= set(dir(SICAR)))
+        self.assertTrue(set(drivers.__all__) <= set(dir(drivers)))
+        self.assertIs(SICAR.State, SICAR.state.State)
+        self.assertIs(drivers.Captcha, drivers.captcha.Captcha)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            SICAR.Unknown
+        with self.assertRaises(AttributeError):
+            drivers.Unknown
+
+    def test_missing_optional_driver(self):
+        with (
+            patch.dict(sys.modules, {"paddleocr": None, "SICAR.drivers.paddle": None}),
+            patch.dict(vars(drivers)),
+        ):
+            vars(drivers).pop("Paddle", None)
+
+            self.assertFalse(drivers._available("Paddle"))
+            self.assertTrue(drivers._available("Captcha"))
+            self.assertFalse(hasattr(drivers, "Paddle"))
+
+            with self.assertRaisesRegex(AttributeError, r"SICAR\[paddle\]"):
+                drivers.Paddle
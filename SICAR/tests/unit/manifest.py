@@ -0,0 +1,137 @@
+import os
+import json
+import hashlib
+import tempfile
+import unittest
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from SICAR.manifest import Manifest
+from SICAR.state import State
+from SICAR.polygon import Polygon
+
+
+class ManifestTestCase(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name) / "MG_APPS.zip"
+        self.path.write_bytes(b"zipdata")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_empty_manifest(self):
+        manifest = Manifest(self.folder.name)
+        self.assertIsNone(manifest.get(State.MG, Polygon.APPS))
+        self.assertIsNone(manifest.current(State.MG, Polygon.APPS, "01/01/2025"))
+
+    def test_record(self):
+        entry = Manifest(self.folder.name).record(
+            State.MG, Polygon.APPS, "01/01/2025", self.path
+        )
+
+        self.assertEqual(entry["file"], "MG_APPS.zip")
+        self.assertEqual(entry["size"], 7)
+        self.assertEqual(entry["sha256"], hashlib.sha256(b"zipdata").hexdigest())
+
+        saved = json.loads((Path(self.folder.name) / "manifest.json").read_text())
+        self.assertEqual(saved["MG"]["APPS"], entry)
+        self.assertEqual(Manifest(self.folder.name).get(State.MG, Polygon.APPS), entry)
+
+    def test_record_uses_download_checksum(self):
+        checksum = Path(self.folder.name) / "MG_APPS.zip.sha256"
+        manifest = Manifest(self.folder.name)
+
+        checksum.write_text("streamed  MG_APPS.zip\n")
+        entry = manifest.record(State.MG, Polygon.APPS, "01/01/2025", self.path)
+        self.assertEqual(entry["sha256"], "streamed")
+
+        os.utime(checksum, ns=(0, 0))
+        entry = manifest.record(State.MG, Polygon.APPS, "01/01/2025", self.path)
+        self.assertEqual(entry["sha256"], hashlib.sha256(b"zipdata").hexdigest())
+
+        checksum.write_text("")
+        entry = manifest.record(State.MG, Polygon.APPS, "01/01/2025", self.path)
+        self.assertEqual(entry["sha256"], hashlib.sha256(b"zipdata").hexdigest())
+
+    def test_current(self):
+        Manifest(self.folder.name).record(
+            State.MG, Polygon.APPS, "01/01/2025", self.path
+        )
+        manifest = Manifest(self.folder.name)
+
+        self.assertEqual(
+            manifest.current(State.MG, Polygon.APPS, "01/01/2025"), self.path
+        )
+        self.assertIsNone(manifest.current(State.MG, Polygon.APPS, "02/01/2025"))
+        self.assertIsNone(manifest.current(State.MG, Polygon.APPS, None))
+        self.assertIsNone(manifest.current(State.BA, Polygon.APPS, "01/01/2025"))
+
+    def test_current_with_changed_file(self):
+        manifest = Manifest(self.folder.name)
+        manifest.record(State.MG, Polygon.APPS, "01/01/2025", self.path)
+
+        self.path.write_bytes(b"truncated")
+        self.assertIsNone(manifest.current(State.MG, Polygon.APPS, "01/01/2025"))
+
+        self.path.unlink()
+        self.assertIsNone(manifest.current(State.MG, Polygon.APPS, "01/01/2025"))
+
+    def test_corrupted_manifest(self):
+        (Path(self.folder.name) / "manifest.json").write_text("{")
+        self.assertIsNone(Manifest(self.folder.name).get(State.MG, Polygon.APPS))
+
+    def test_record_from_two_instances(self):
+        other = Path(self.folder.name) / "SP_APPS.zip"
+        other.write_bytes(b"spdata")
+        first, second = Manifest(self.folder.name), Manifest(self.folder.name)
+
+        first.record(State.MG, Polygon.APPS, "01/01/2025", self.path)
+        second.record(State.SP, Polygon.APPS, "02/01/2025", other)
+
+        manifest = Manifest(self.folder.name)
+        self.assertEqual(
+            manifest.current(State.MG, Polygon.APPS, "01/01/2025"), self.path
+        )
+        self.assertEqual(manifest.current(State.SP, Polygon.APPS, "02/01/2025"), other)
+        self.assertIs(first._lock, second._lock)
+
+    def test_concurrent_records(self):
+        states = list(State)[:8]
+        for state in states:
+            (Path(self.folder.name) / f"{state.value}_APPS.zip").write_bytes(b"zip")
+
+        threads = [
+            threading.Thread(
+                target=Manifest(self.folder.name).record,
+                args=(
+                    state,
+                    Polygon.APPS,
+                    "01/01/2025",
+                    Path(self.folder.name) / f"{state.value}_APPS.zip",
+                ),
+            )
+            for state in states
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        manifest = Manifest(self.folder.name)
+        for state in states:
+            self.assertIsNotNone(manifest.get(state, Polygon.APPS))
+        self.assertEqual(os.listdir(self.folder.name).count("manifest.json"), 1)
+        self.assertFalse(
+            [name for name in os.listdir(self.folder.name) if name.endswith(".tmp")]
+        )
+
+    def test_failed_save_removes_temporary_file(self):
+        manifest = Manifest(self.folder.name)
+
+        with patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                manifest.record(State.MG, Polygon.APPS, "01/01/2025", self.path)
+
+        self.assertEqual(os.listdir(self.folder.name), ["MG_APPS.zip"])
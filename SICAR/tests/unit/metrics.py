@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+
+from SICAR.metrics import Metrics
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_counters(self):
+        self.metrics.inc(
+            "sicar_captcha_submitted_total", driver="Tesseract", state="MG"
+        )
+        self.metrics.inc(
+            "sicar_captcha_submitted_total", 2, state="MG", driver="Tesseract"
+        )
+        self.metrics.inc("sicar_captcha_submitted_total", driver="Paddle", state="MG")
+
+        self.assertEqual(
+            self.metrics.snapshot(),
+            {
+                "sicar_captcha_submitted_total": [
+                    {"labels": {"driver": "Paddle", "state": "MG"}, "value": 1},
+                    {"labels": {"driver": "Tesseract", "state": "MG"}, "value": 3},
+                ]
+            },
+        )
+
+    def test_histograms(self):
+        for attempts in [1, 4, 100]:
+            self.metrics.observe("sicar_attempts_per_success", attempts, state="MG")
+
+        [sample] = self.metrics.snapshot()["sicar_attempts_per_success"]
+
+        self.assertEqual(sample["count"], 3)
+        self.assertEqual(sample["sum"], 105)
+        self.assertEqual(
+            sample["buckets"],
+            {
+                "1": 1,
+                "2": 1,
+                "3": 1,
+                "5": 2,
+                "10": 2,
+                "15": 2,
+                "25": 2,
+                "50": 2,
+                "+Inf": 3,
+            },
+        )
+
+    @patch("SICAR.metrics.time.perf_counter", side_effect=[10.0, 10.2])
+    def test_timer_records_failures(self, mock_perf_counter):
+        with self.assertRaises(ValueError):
+            with self.metrics.timer("sicar_ocr_seconds", state="MG"):
+                raise ValueError()
+
+        [sample] = self.metrics.snapshot()["sicar_ocr_seconds"]
+        self.assertAlmostEqual(sample["sum"], 0.2)
+        self.assertEqual(sample["buckets"]["0.1"], 0)
+        self.assertEqual(sample["buckets"]["0.25"], 1)
+
+    def test_prometheus(self):
+        self.metrics.inc("sicar_downloads_total", result="success", state='M"G')
+        self.metrics.inc("custom_total")
+        self.metrics.observe("sicar_ocr_seconds", 0.02, driver="Tesseract")
+
+        lines = self.metrics.prometheus().splitlines()
+
+        self.assertEqual(lines[:2], ["# TYPE custom_total counter", "custom_total 1"])
+        self.assertIn("# TYPE sicar_ocr_seconds histogram", lines)
+        self.assertIn('sicar_ocr_seconds_bucket{driver="Tesseract",le="0.01"} 0', lines)
+        self.assertIn(
+            'sicar_ocr_seconds_bucket{driver="Tesseract",le="0.025"} 1', lines
+        )
+        self.assertIn('sicar_ocr_seconds_bucket{driver="Tesseract",le="+Inf"} 1', lines)
+        self.assertIn('sicar_ocr_seconds_sum{driver="Tesseract"} 0.02', lines)
+        self.assertIn('sicar_ocr_seconds_count{driver="Tesseract"} 1', lines)
+        self.assertIn(
+            "# HELP sicar_downloads_total Finished downloads by result.", lines
+        )
+        self.assertIn('sicar_downloads_total{result="success",state="M\\"G"} 1', lines)
@@ -0,0 +1,303 @@
+import io
+import time
+import zipfile
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import httpx
+from PIL import Image
+
+from SICAR import Sicar, AsyncSicar, State, Polygon, ReleaseDateCache
+from SICAR.retry import RetryPolicy
+from SICAR.mock_server import AnswerKey, Fault, MockSicarServer, zip_payload
+
+PAYLOAD = zip_payload(256 * 1024)
+
+
+class MockSicarServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockSicarServer(payload=PAYLOAD, seed=0).start()
+        self.client = httpx.Client(base_url=self.server.base_url)
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        self.folder.cleanup()
+
+    def captcha(self) -> str:
+        response = self.client.get("/municipios/ReCaptcha", params={"id": 1})
+        self.assertEqual(response.headers["Content-Type"], "image/png")
+        return AnswerKey().get_captcha(Image.open(io.BytesIO(response.content)))
+
+    def download(self, captcha: str = None, state="MG", headers=None):
+        return self.client.get(
+            "/estados/downloadBase",
+            params={
+                "idEstado": state,
+                "tipoBase": "APPS",
+                "ReCaptcha": self.captcha() if captcha is None else captcha,
+            },
+            headers=headers,
+        )
+
+    def test_context_manager(self):
+        with MockSicarServer(port=0) as server:
+            self.assertTrue(server.base_url.startswith("http://127.0.0.1:"))
+            self.assertNotEqual(server.port, 0)
+            self.assertEqual(
+                httpx.get(f"{server.base_url}/imoveis/index").status_code, 200
+            )
+
+        with self.assertRaises(httpx.ConnectError):
+            httpx.get(f"{server.base_url}/imoveis/index")
+
+    def test_zip_payload(self):
+        with zipfile.ZipFile(io.BytesIO(PAYLOAD)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.getinfo("polygon.bin").file_size, 256 * 1024)
+
+        self.assertEqual(zip_payload(16), zip_payload(16))
+        self.assertNotEqual(zip_payload(16), zip_payload(16, seed=1))
+
+    def test_answer_key(self):
+        image = Image.new("RGB", (10, 10))
+        image.info["captcha"] = "AbC12"
+
+        self.assertEqual(AnswerKey().get_captcha(image), "AbC12")
+        self.assertEqual(AnswerKey(miss_rate=1).get_captcha(image), "AbC1")
+        self.assertEqual(AnswerKey().get_captcha(Image.new("RGB", (10, 10))), "")
+
+    def test_session_cookie(self):
+        self.assertEqual(self.client.get("/municipios/ReCaptcha").status_code, 403)
+        self.assertEqual(self.download("ABCDE").status_code, 403)
+
+        response = self.client.get("/imoveis/index")
+        self.assertEqual(response.headers["Content-Type"], "text/html")
+        self.assertIn("JSESSIONID", response.cookies)
+        self.assertNotIn("set-cookie", self.client.get("/imoveis/index").headers)
+
+        self.assertEqual(len(self.captcha()), 5)
+        self.assertEqual(self.server.requests["index"], 2)
+
+    def test_session_lifetime(self):
+        self.server.session_lifetime = 0.05
+        self.client.get("/imoveis/index")
+        self.assertEqual(len(self.captcha()), 5)
+
+        time.sleep(0.1)
+        self.assertEqual(self.client.get("/municipios/ReCaptcha").status_code, 403)
+
+        self.client.get("/imoveis/index")
+        self.server.expire_sessions()
+        self.assertEqual(self.client.get("/municipios/ReCaptcha").status_code, 403)
+
+    def test_download(self):
+        self.client.get("/imoveis/index")
+        response = self.download()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Type"], "application/zip")
+        self.assertEqual(response.content, PAYLOAD)
+        self.assertEqual(
+            response.headers["Content-Disposition"],
+            'attachment; filename="MG_APPS.zip"',
+        )
+
+    def test_captcha_is_checked_and_consumed(self):
+        self.client.get("/imoveis/index")
+        captcha = self.captcha()
+
+        rejected = self.download(captcha.swapcase())
+        self.assertEqual(rejected.status_code, 200)
+        self.assertTrue(rejected.headers["Content-Type"].startswith("application/json"))
+        self.assertEqual(
+            self.download(captcha).headers["Content-Type"][:16], "application/json"
+        )
+
+        first, second = self.captcha(), self.captcha()
+        self.assertEqual(
+            self.download(first).headers["Content-Type"][:16], "application/json"
+        )
+        self.assertEqual(
+            self.download(second).headers["Content-Type"][:16], "application/json"
+        )
+        self.assertEqual(self.download().content, PAYLOAD)
+
+    def test_unknown_resources(self):
+        self.client.get("/imoveis/index")
+
+        self.assertEqual(self.download(state="XX").status_code, 404)
+        self.assertEqual(self.client.get("/unknown").status_code, 404)
+        self.assertNotIn("unknown", self.server.requests)
+
+    def test_callable_payload(self):
+        self.server.payload = (
+            lambda state, polygon: f"{state.value}_{polygon.value}".encode()
+        )
+        self.client.get("/imoveis/index")
+
+        self.assertEqual(self.download(state="BA").content, b"BA_APPS")
+
+    def test_range(self):
+        self.client.get("/imoveis/index")
+        etag = self.download().headers["ETag"]
+
+        response = self.download(headers={"Range": "bytes=1000-", "If-Range": etag})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, PAYLOAD[1000:])
+        self.assertEqual(
+            response.headers["Content-Range"],
+            f"bytes 1000-{len(PAYLOAD) - 1}/{len(PAYLOAD)}",
+        )
+
+        for headers in [
+            {"Range": "bytes=1000-", "If-Range": '"changed"'},
+            {"Range": f"bytes={len(PAYLOAD)}-"},
+            {"Range": "bytes=0-10"},
+        ]:
+            with self.subTest(headers=headers):
+                response = self.download(headers=headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, PAYLOAD)
+
+        self.server.ranges = False
+        self.assertEqual(
+            self.download(headers={"Range": "bytes=1000-"}).status_code, 200
+        )
+
+    def test_faults(self):
+        self.server.faults = [Fault.SERVER_ERROR, None, Fault.CORRUPT, Fault.DISCONNECT]
+        self.client.get("/imoveis/index")
+
+        self.assertEqual(self.download("wrong").status_code, 200)
+        self.assertEqual(self.server.faults[0], Fault.SERVER_ERROR)
+
+        response = self.download()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Content-Type"], "text/html")
+        self.assertEqual(self.download().content, PAYLOAD)
+
+        corrupted = self.download().content
+        self.assertEqual(len(corrupted), len(PAYLOAD))
+        self.assertEqual(sum(a != b for a, b in zip(corrupted, PAYLOAD)), 1)
+
+        with self.assertRaises(httpx.RemoteProtocolError):
+            self.download()
+
+        self.assertEqual(self.server.faults, [])
+
+    def test_fault_rate(self):
+        self.server.fault_rate = 1
+        self.client.get("/imoveis/index")
+
+        statuses = set()
+        for _ in range(10):
+            try:
+                statuses.add(self.download().status_code)
+            except httpx.RemoteProtocolError:
+                statuses.add("disconnect")
+
+        self.assertIn(503, statuses)
+
+    def test_latency_and_bandwidth(self):
+        self.client.get("/imoveis/index")
+        captcha = self.captcha()
+        self.server.latency = 0.05
+        self.server.bandwidth = len(PAYLOAD) / 0.2
+
+        start = time.monotonic()
+        self.assertEqual(self.download(captcha).content, PAYLOAD)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_release_dates(self):
+        self.server.release_dates = {State.MG: "05/06/2025", "BA": "04/06/2025"}
+        response = self.client.get("/estados/downloads")
+
+        self.assertEqual(
+            Sicar._parse_release_dates(None, response.content),
+            {State.MG: "05/06/2025", State.BA: "04/06/2025"},
+        )
+
+        etag = response.headers["ETag"]
+        response = self.client.get(
+            "/estados/downloads", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        self.server.release_dates[State.MG] = "06/06/2025"
+        response = self.client.get(
+            "/estados/downloads", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_handle_error(self):
+        with patch("socketserver.BaseServer.handle_error") as mock_handle_error:
+            for error in [ConnectionResetError(), ValueError()]:
+                try:
+                    raise error
+                except Exception:
+                    self.server._server.handle_error(None, None)
+
+        mock_handle_error.assert_called_once_with(None, None)
+
+    def test_sicar(self):
+        self.server.faults = [Fault.DISCONNECT, Fault.CORRUPT]
+        car = Sicar(
+            driver=AnswerKey(miss_rate=0.5, seed=0),
+            base_url=self.server.base_url,
+            release_dates=ReleaseDateCache(ttl=0),
+            retry=RetryPolicy(base=0),
+            listeners=[],
+        )
+
+        self.assertEqual(car._INDEX, f"{self.server.base_url}/imoveis/index")
+        self.assertEqual(car.get_release_dates()[State.SP], "01/01/2025")
+        self.assertEqual(car.get_release_dates()[State.SP], "01/01/2025")
+
+        path = car.download_state(State.MG, Polygon.APPS, self.folder.name)
+
+        self.assertEqual(path.read_bytes(), PAYLOAD)
+        self.assertEqual(self.server.faults, [])
+        self.assertEqual(self.server.requests["release_dates"], 2)
+
+    def test_session_pool_replaces_expired_session(self):
+        self.server.session_lifetime = 0.5
+        car = Sicar(
+            driver=AnswerKey(),
+            base_url=self.server.base_url,
+            retry=RetryPolicy(base=0),
+            listeners=[],
+        )
+
+        with car.session_pool(size=1) as pool:
+            self.assertTrue(
+                pool.download_state(State.MG, Polygon.APPS, self.folder.name)
+            )
+            time.sleep(0.6)
+
+            self.assertFalse(
+                pool.download_state(State.BA, Polygon.APPS, self.folder.name, tries=2)
+            )
+            path = pool.download_state(State.BA, Polygon.APPS, self.folder.name)
+
+        self.assertEqual(path.read_bytes(), PAYLOAD)
+        self.assertEqual(self.server.requests["index"], 3)
+        self.assertEqual(
+            car.metrics.snapshot()["sicar_sessions_recycled_total"],
+            [{"labels": {"reason": "error"}, "value": 1}],
+        )
+
+    def test_async_sicar(self):
+        import asyncio
+
+        async def download():
+            async with AsyncSicar(
+                driver=AnswerKey(), base_url=self.server.base_url, listeners=[]
+            ) as car:
+                return await car.download_state(
+                    State.MG, Polygon.APPS, self.folder.name
+                )
+
+        self.assertEqual(asyncio.run(download()).read_bytes(), PAYLOAD)
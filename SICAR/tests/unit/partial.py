@@ -0,0 +1,221 @@
+import io
+import json
+import hashlib
+import tempfile
+import zipfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import httpx
+
+from SICAR.partial import PartialDownload
+from SICAR.exceptions import FailedToDownloadPolygonException
+
+
+def zip_bytes(content=b"0123456789" * 4):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        archive.writestr("MG_APPS.shp", content)
+    return buffer.getvalue()
+
+
+ZIP = zip_bytes()
+
+
+class PartialDownloadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.download = PartialDownload(Path(self.folder.name) / "MG_APPS.zip")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def response(self, status_code, headers):
+        return MagicMock(status_code=status_code, headers=headers)
+
+    def test_paths(self):
+        self.assertEqual(self.download.part.name, "MG_APPS.zip.part")
+        self.assertEqual(self.download.meta.name, "MG_APPS.zip.part.json")
+        self.assertEqual(self.download.checksum.name, "MG_APPS.zip.sha256")
+
+    def test_nothing_to_resume(self):
+        self.assertEqual(self.download.offset, 0)
+        self.assertEqual(self.download.headers(), {})
+
+    def test_part_without_meta_is_not_resumed(self):
+        self.download.part.write_bytes(b"data")
+        self.assertEqual(self.download.offset, 0)
+
+    def test_unreadable_meta_is_not_resumed(self):
+        self.download.part.write_bytes(b"data")
+        self.download.meta.write_text("{")
+        self.assertEqual(self.download.offset, 0)
+
+    def test_open_full_response_writes_meta(self):
+        response = self.response(
+            httpx.codes.OK, {"Content-Length": "10", "Last-Modified": "yesterday"}
+        )
+
+        with self.download.open(response) as fd:
+            fd.write(b"01234")
+
+        self.assertEqual(self.download.total, 10)
+        self.assertEqual(
+            json.loads(self.download.meta.read_text()),
+            {"total": 10, "validator": "yesterday"},
+        )
+        self.assertEqual(self.download.offset, 5)
+        self.assertEqual(
+            self.download.headers(), {"Range": "bytes=5-", "If-Range": "yesterday"}
+        )
+
+    def test_headers_without_validator(self):
+        with self.download.open(
+            self.response(httpx.codes.OK, {"Content-Length": "10"})
+        ) as fd:
+            fd.write(b"01234")
+
+        self.assertEqual(self.download.headers(), {"Range": "bytes=5-"})
+
+    def test_open_full_response_restarts(self):
+        self.download.part.write_bytes(b"stale")
+        self.download.meta.write_text(json.dumps({"total": 10, "validator": None}))
+
+        with self.download.open(
+            self.response(httpx.codes.OK, {"Content-Length": str(len(ZIP))})
+        ) as fd:
+            self.assertEqual(self.download.digest().digest(), hashlib.sha256().digest())
+            fd.write(ZIP)
+
+        self.assertEqual(self.download.finish().read_bytes(), ZIP)
+        self.assertFalse(self.download.meta.exists())
+        self.assertFalse(self.download.checksum.exists())
+
+    def test_open_partial_response_appends(self):
+        self.download.part.write_bytes(ZIP[:5])
+        self.download.meta.write_text(
+            json.dumps({"total": len(ZIP), "validator": None})
+        )
+        response = self.response(
+            httpx.codes.PARTIAL_CONTENT,
+            {"Content-Range": f"bytes 5-{len(ZIP) - 1}/{len(ZIP)}"},
+        )
+
+        with self.download.open(response) as fd:
+            self.assertEqual(
+                self.download.digest().hexdigest(),
+                hashlib.sha256(ZIP[:5]).hexdigest(),
+            )
+            fd.write(ZIP[5:])
+
+        self.assertEqual(self.download.finish().read_bytes(), ZIP)
+
+    def test_finish_records_checksum(self):
+        self.download.checksum.write_text("stale")
+
+        with self.download.open(
+            self.response(httpx.codes.OK, {"Content-Length": str(len(ZIP))})
+        ) as fd:
+            fd.write(ZIP)
+
+        self.download.sha256 = hashlib.sha256(ZIP).hexdigest()
+
+        self.assertEqual(self.download.finish(), self.download.path)
+        self.assertEqual(
+            self.download.checksum.read_text(),
+            f"{hashlib.sha256(ZIP).hexdigest()}  MG_APPS.zip\n",
+        )
+
+    def test_finish_corrupted_download(self):
+        corrupted = ZIP.replace(b"0123456789", b"9876543210", 1)
+
+        for content in [corrupted, ZIP[:-22] + bytes(22), b"not a zip file"]:
+            with self.download.open(
+                self.response(httpx.codes.OK, {"Content-Length": str(len(content))})
+            ) as fd:
+                fd.write(content)
+
+            with self.assertRaises(FailedToDownloadPolygonException):
+                self.download.finish()
+
+            self.assertFalse(self.download.part.exists())
+            self.assertFalse(self.download.meta.exists())
+            self.assertFalse(self.download.path.exists())
+
+    def test_open_partial_response_with_wrong_range(self):
+        self.download.part.write_bytes(b"01234")
+        self.download.meta.write_text(json.dumps({"total": 10, "validator": None}))
+
+        for content_range in ["bytes 0-9/10", "bytes 5-9/*", ""]:
+            response = self.response(
+                httpx.codes.PARTIAL_CONTENT, {"Content-Range": content_range}
+            )
+            with self.assertRaises(FailedToDownloadPolygonException):
+                self.download.open(response)
+
+    def test_finish_incomplete_download(self):
+        with self.download.open(
+            self.response(httpx.codes.OK, {"Content-Length": "10"})
+        ) as fd:
+            fd.write(b"01234")
+
+        with self.assertRaises(FailedToDownloadPolygonException):
+            self.download.finish()
+
+        self.assertTrue(self.download.part.exists())
+        self.assertFalse(self.download.path.exists())
+
+    def test_open_preallocates_and_truncates(self):
+        response = self.response(httpx.codes.OK, {"Content-Length": "10"})
+
+        with self.download.open(response, buffer_size=4) as fd:
+            self.assertEqual(self.download.part.stat().st_size, 10)
+            self.assertTrue(json.loads(self.download.meta.read_text())["preallocated"])
+            fd.write(b"012")
+            fd.write(b"34")
+
+        self.assertEqual(self.download.part.read_bytes(), b"01234")
+        self.assertNotIn("preallocated", json.loads(self.download.meta.read_text()))
+        self.assertEqual(self.download.offset, 5)
+
+    def test_interrupted_write_keeps_offset(self):
+        response = self.response(httpx.codes.OK, {"Content-Length": "10"})
+
+        with self.assertRaises(httpx.ReadError):
+            with self.download.open(response) as fd:
+                fd.write(b"0123")
+                raise httpx.ReadError("connection dropped")
+
+        self.assertEqual(self.download.offset, 4)
+
+    def test_preallocated_part_left_by_a_crash_is_not_resumed(self):
+        self.download.part.write_bytes(b"0123\0\0\0\0\0\0")
+        self.download.meta.write_text(
+            json.dumps({"total": 10, "validator": None, "preallocated": True})
+        )
+
+        self.assertEqual(self.download.offset, 0)
+        self.assertEqual(self.download.headers(), {})
+
+    def test_preallocation_not_supported(self):
+        response = self.response(httpx.codes.OK, {"Content-Length": "10"})
+
+        with patch("os.posix_fallocate", side_effect=OSError()):
+            with self.download.open(response) as fd:
+                self.assertEqual(self.download.part.stat().st_size, 0)
+                self.assertNotIn(
+                    "preallocated", json.loads(self.download.meta.read_text())
+                )
+                fd.write(b"01234")
+
+        self.assertEqual(self.download.offset, 5)
+
+    def test_empty_download_is_not_preallocated(self):
+        response = self.response(httpx.codes.OK, {"Content-Length": "0"})
+
+        with patch("os.posix_fallocate") as mock_fallocate:
+            with self.download.open(response):
+                pass
+
+        mock_fallocate.assert_not_called()
+        self.assertEqual(self.download.part.read_bytes(), b"")
@@ -22,3 +22,20 @@ class UrlTestCase(unittest.TestCase):
             Url._RECAPTCHA,
             "https://consultapublica.car.gov.br/publico/municipios/ReCaptcha",
         )
+
+    def test_set_base(self):
+        url = Url()
+        url._set_base("http://127.0.0.1:8080/publico/")
+
+        self.assertEqual(url._BASE, "http://127.0.0.1:8080/publico")
+        self.assertEqual(url._INDEX, "http://127.0.0.1:8080/publico/imoveis/index")
+        self.assertEqual(
+            url._DOWNLOAD_BASE, "http://127.0.0.1:8080/publico/estados/downloadBase"
+        )
+        self.assertEqual(
+            url._RECAPTCHA, "http://127.0.0.1:8080/publico/municipios/ReCaptcha"
+        )
+        self.assertEqual(
+            url._RELEASE_DATE, "http://127.0.0.1:8080/publico/estados/downloads"
+        )
+        self.assertEqual(Url._BASE, "https://consultapublica.car.gov.br/publico")
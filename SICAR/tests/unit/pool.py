@@ -0,0 +1,159 @@
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import httpx
+
+from SICAR.pool import SessionPool
+from SICAR.metrics import Metrics
+from SICAR.exceptions import UrlNotOkException, NoSessionAvailableException
+
+
+class MockSicar:
+    def __init__(self):
+        self.workers = []
+        self.metrics = Metrics()
+
+    def _worker(self):
+        worker = MagicMock()
+        self.workers.append(worker)
+        return worker
+
+
+class SessionPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.sicar = MockSicar()
+
+    def recycled(self):
+        return {
+            entry["labels"]["reason"]: entry["value"]
+            for entry in self.sicar.metrics.snapshot().get(
+                "sicar_sessions_recycled_total", []
+            )
+        }
+
+    def test_sessions_are_created_lazily(self):
+        pool = SessionPool(self.sicar, size=3)
+        self.assertEqual(self.sicar.workers, [])
+        self.assertEqual(pool.stats(), {"leased": 0, "idle": 0, "free": 3})
+
+        with pool.lease() as worker:
+            self.assertEqual(self.sicar.workers, [worker])
+            self.assertEqual(pool.stats(), {"leased": 1, "idle": 0, "free": 2})
+
+        with pool.lease() as again:
+            self.assertIs(again, worker)
+
+        self.assertEqual(pool.stats(), {"leased": 0, "idle": 1, "free": 2})
+        self.assertEqual(
+            self.sicar.metrics.snapshot()["sicar_sessions_created_total"],
+            [{"labels": {}, "value": 1}],
+        )
+
+    def test_concurrent_leases_get_separate_sessions(self):
+        pool = SessionPool(self.sicar, size=2)
+        first = pool.acquire()
+        second = pool.acquire()
+
+        self.assertIsNot(first, second)
+        with self.assertRaises(NoSessionAvailableException):
+            pool.acquire(timeout=0.05)
+
+        released = threading.Timer(0.05, pool.release, [first])
+        released.start()
+        self.assertIs(pool.acquire(timeout=5), first)
+        released.join()
+
+    def test_recycles_idle_sessions(self):
+        pool = SessionPool(self.sicar, size=1, max_idle=60)
+
+        with patch("time.monotonic", return_value=100.0):
+            pool.release(pool.acquire())
+
+        with patch("time.monotonic", return_value=200.0):
+            worker = pool.acquire()
+
+        self.assertIsNot(worker, self.sicar.workers[0])
+        self.sicar.workers[0]._session.close.assert_called_once()
+        self.assertEqual(self.recycled(), {"idle": 1})
+
+    def test_recycles_expired_cookies(self):
+        pool = SessionPool(self.sicar, size=1)
+        worker = pool.acquire()
+        worker._session.cookies.jar = [MagicMock(**{"is_expired.return_value": True})]
+        pool.release(worker)
+
+        self.assertIsNot(pool.acquire(), worker)
+        self.assertEqual(self.recycled(), {"cookies": 1})
+
+    def test_recycles_after_max_uses(self):
+        pool = SessionPool(self.sicar, size=1, max_uses=2)
+
+        for _ in range(5):
+            with pool.lease():
+                pass
+
+        self.assertEqual(len(self.sicar.workers), 3)
+        self.assertEqual(self.recycled(), {"uses": 2})
+
+    def test_lease_replaces_session_after_connection_error(self):
+        pool = SessionPool(self.sicar, size=1)
+
+        for error in [httpx.ConnectError("down"), UrlNotOkException("url", 500)]:
+            with self.assertRaises(type(error)):
+                with pool.lease():
+                    raise error
+
+        with self.assertRaises(ValueError):
+            with pool.lease():
+                raise ValueError()
+
+        with pool.lease() as worker:
+            self.assertIs(worker, self.sicar.workers[2])
+
+        self.assertEqual(self.recycled(), {"error": 2})
+
+    def test_download_state_replaces_session_after_failure(self):
+        pool = SessionPool(self.sicar, size=1)
+
+        with pool.lease() as worker:
+            worker.download_state.side_effect = [Path("MG.zip"), False]
+
+        self.assertEqual(pool.download_state("MG", folder="temp"), Path("MG.zip"))
+        self.assertFalse(pool.download_state("BA", folder="temp"))
+        worker.download_state.assert_called_with("BA", folder="temp")
+
+        with pool.lease() as replacement:
+            self.assertIsNot(replacement, worker)
+            replacement.download_state.side_effect = ValueError()
+
+        with self.assertRaises(ValueError):
+            pool.download_state("SP")
+
+        self.assertEqual(len(self.sicar.workers), 2)
+        self.assertEqual(self.recycled(), {"error": 2})
+        self.assertEqual(pool.stats(), {"leased": 0, "idle": 0, "free": 1})
+
+    def test_failed_creation_frees_the_slot(self):
+        pool = SessionPool(self.sicar, size=1)
+
+        with patch.object(
+            self.sicar, "_worker", side_effect=httpx.ConnectError("down")
+        ):
+            with self.assertRaises(httpx.ConnectError):
+                pool.acquire(timeout=0)
+
+        self.assertEqual(pool.stats(), {"leased": 0, "idle": 0, "free": 1})
+        pool.acquire(timeout=0)
+
+    def test_close(self):
+        with SessionPool(self.sicar, size=3) as pool:
+            leased = pool.acquire()
+            pool.release(pool.acquire())
+
+        self.sicar.workers[1]._session.close.assert_called_once()
+        leased._session.close.assert_not_called()
+        self.assertEqual(pool.stats(), {"leased": 1, "idle": 0, "free": 2})
+
+        pool.release(leased)
+        self.assertEqual(pool.stats(), {"leased": 0, "idle": 1, "free": 2})
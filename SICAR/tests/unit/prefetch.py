@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import MagicMock, patch, call
+import httpx
+
+from SICAR.prefetch import Candidate, CaptchaPrefetcher
+from SICAR.metrics import Metrics
+from SICAR.state import State
+from SICAR.exceptions import (
+    UrlNotOkException,
+    FailedToDownloadCaptchaException,
+)
+
+
+class MockSicar:
+    def __init__(self, captchas):
+        self.captchas = iter(captchas)
+        self.workers = []
+        self._driver = MagicMock()
+        self.metrics = Metrics()
+        self._driver.get_captcha_batch.side_effect = lambda images: [
+            next(self.captchas) for _ in images
+        ]
+
+    def _worker(self):
+        worker = MagicMock()
+        self.workers.append(worker)
+        return worker
+
+
+class CaptchaPrefetcherTestCase(unittest.TestCase):
+    def test_get_returns_solved_captchas(self):
+        sicar = MockSicar(["ABCDE", "FGHIJ"])
+        with CaptchaPrefetcher(sicar, size=2) as prefetcher:
+            captchas = {prefetcher.get(timeout=5).captcha for _ in range(2)}
+
+        self.assertEqual(captchas, {"ABCDE", "FGHIJ"})
+        self.assertEqual(len(sicar.workers), 2)
+        for worker in sicar.workers:
+            worker._session.close.assert_called_once()
+
+    def test_metrics(self):
+        sicar = MockSicar(["bad", "ABCDE"])
+        with CaptchaPrefetcher(sicar, size=1, state=State.MG) as prefetcher:
+            prefetcher.get(timeout=5)
+
+        snapshot = sicar.metrics.snapshot()
+        labels = {"driver": "MagicMock", "state": "MG"}
+        self.assertEqual(
+            snapshot["sicar_ocr_output_length_total"],
+            [
+                {"labels": {**labels, "length": "3"}, "value": 1},
+                {"labels": {**labels, "length": "5"}, "value": 1},
+            ],
+        )
+        self.assertEqual(snapshot["sicar_ocr_seconds"][0]["count"], 2)
+        self.assertEqual(snapshot["sicar_captcha_download_seconds"][0]["count"], 2)
+
+    def test_one_captcha_per_session(self):
+        sicar = MockSicar(["ABCDE", "FGHIJ", "KLMNO"])
+        with CaptchaPrefetcher(sicar, size=1) as prefetcher:
+            candidate = prefetcher.get(timeout=5)
+            with self.assertRaises(FailedToDownloadCaptchaException):
+                prefetcher.get(timeout=0.2)
+
+            prefetcher.release(candidate)
+            following = prefetcher.get(timeout=5)
+
+        self.assertIs(following.sicar, candidate.sicar)
+        self.assertEqual(following.captcha, "FGHIJ")
+
+    def test_captchas_are_solved_in_batches(self):
+        sicar = MockSicar(["ABCDE", "FGHIJ", "KLMNO"])
+        prefetcher = CaptchaPrefetcher(sicar, size=3)
+        prefetcher._stop.is_set = MagicMock(side_effect=[False, True])
+
+        prefetcher._produce()
+
+        sicar._driver.get_captcha_batch.assert_called_once_with(
+            [worker._download_captcha.return_value for worker in sicar.workers]
+        )
+        self.assertEqual(prefetcher._candidates.qsize(), 3)
+
+    def test_invalid_captchas_are_skipped(self):
+        sicar = MockSicar(["ABC", "ABCDEFG", "ABCDE"])
+        with CaptchaPrefetcher(sicar, size=1) as prefetcher:
+            self.assertEqual(prefetcher.get(timeout=5).captcha, "ABCDE")
+
+    @patch("threading.Event.wait")
+    def test_failed_downloads_are_retried(self, mock_wait):
+        sicar = MockSicar(["ABCDE"])
+        errors = iter(
+            [
+                UrlNotOkException("url"),
+                FailedToDownloadCaptchaException(),
+                httpx.ConnectError("error"),
+            ]
+        )
+
+        def download_captcha():
+            error = next(errors, None)
+            if error:
+                raise error
+
+        with patch.object(MockSicar, "_worker") as mock_worker:
+            mock_worker.return_value._download_captcha.side_effect = download_captcha
+            with CaptchaPrefetcher(sicar, size=1) as prefetcher:
+                self.assertEqual(prefetcher.get(timeout=5).captcha, "ABCDE")
+
+        self.assertEqual(mock_wait.call_args_list.count(call(1)), 3)
+        mock_worker.assert_called_once()
+
+    def test_expired_candidates_are_dropped(self):
+        prefetcher = CaptchaPrefetcher(MockSicar([]), size=1, lifetime=10)
+        expired = Candidate("old", "ABCDE", 0)
+        fresh = Candidate("new", "FGHIJ", 100)
+        prefetcher._candidates.put(expired)
+        prefetcher._candidates.put(fresh)
+        prefetcher._idle.get()
+
+        with patch("time.monotonic", return_value=105):
+            self.assertEqual(prefetcher.get(timeout=1), fresh)
+
+        self.assertEqual(prefetcher._idle.get_nowait(), "old")
+
+    def test_producer_error_fails_get_right_away(self):
+        sicar = MockSicar([])
+        sicar._driver.get_captcha_batch.side_effect = ValueError("driver crashed")
+
+        with CaptchaPrefetcher(sicar, size=1, lifetime=30) as prefetcher:
+            for _ in range(2):
+                with self.assertRaises(FailedToDownloadCaptchaException) as context:
+                    prefetcher.get(timeout=5)
+                self.assertIsInstance(context.exception.__cause__, ValueError)
+
+        self.assertFalse(prefetcher._thread.is_alive())
+
+    def test_get_timeout(self):
+        prefetcher = CaptchaPrefetcher(MockSicar([]), size=1)
+        with self.assertRaises(FailedToDownloadCaptchaException):
+            prefetcher.get(timeout=0)
@@ -0,0 +1,62 @@
+import unittest
+from datetime import date
+from pathlib import Path
+
+from SICAR.release_dates import scan_release_dates, soup_release_dates, to_dates
+from SICAR.state import State
+
+
+class ReleaseDatesTestCase(unittest.TestCase):
+    def assertParsersEqual(self, page, expected):
+        self.assertEqual(scan_release_dates(page), expected)
+        self.assertEqual(soup_release_dates(page), expected)
+
+    def test_fixture_page(self):
+        page = Path("SICAR/tests/benchmark/pages/release_dates.html").read_bytes()
+        release_dates = scan_release_dates(page)
+
+        self.assertEqual(list(release_dates), list(State))
+        self.assertEqual(release_dates, soup_release_dates(page))
+
+    def test_attributes_without_spaces(self):
+        self.assertParsersEqual(
+            b'<div class="listagem-estados">'
+            b'<div class="data-disponibilizacao"><i>04/08/2024</i></div>'
+            b'<button type="button" class="btn-abrir-modal-download-base-poligono"'
+            b'data-estado="AC" data-nome-estado="Acre"></button>',
+            {State.AC: "04/08/2024"},
+        )
+
+    def test_text_and_quotes(self):
+        self.assertParsersEqual(
+            b"<div class='row listagem-estados'>"
+            b"<div class='col'><div class='x data-disponibilizacao'>\n"
+            b"  <i class='fa fa-calendar'></i> <b>05/06/2025</b>&nbsp;\n</div></div>"
+            b"<button class='btn btn-abrir-modal-download-base-poligono' data-estado='S&#80;'>"
+            b"</button></div>",
+            {State.SP: "05/06/2025"},
+        )
+
+    def test_incomplete_blocks(self):
+        self.assertParsersEqual(
+            b'<div class="listagem-estados-titulo"></div>'
+            b'<div class="listagem-estados">'
+            b'<div class="data-disponibilizacao">01/01/2025</div>'
+            b'<button class="btn">Voltar</button></div>'
+            b'<div class="listagem-estados">'
+            b'<div class="data-disponibilizacao"> </div>'
+            b'<button class="btn-abrir-modal-download-base-poligono" data-estado="MG">'
+            b"</button></div>"
+            b'<div class="listagem-estados">'
+            b'<div class="data-disponibilizacao">01/01/2025</div>'
+            b'<button class="btn-abrir-modal-download-base-poligono" data-estado="XX">'
+            b"</button></div>",
+            {},
+        )
+
+    def test_to_dates(self):
+        self.assertEqual(
+            to_dates({State.AC: "04/08/2024"}), {State.AC: date(2024, 8, 4)}
+        )
+        with self.assertRaises(ValueError):
+            to_dates({State.AC: "2024-08-04"})
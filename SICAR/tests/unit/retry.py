@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from SICAR.retry import Failure, RetryPolicy, TokenBucket
+from SICAR.exceptions import (
+    UrlNotOkException,
+    FailedToDownloadCaptchaException,
+    FailedToDownloadPolygonException,
+)
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(base=1, cap=10)
+
+    def test_classify(self):
+        timeout = FailedToDownloadPolygonException()
+        timeout.__cause__ = httpx.ReadTimeout("timeout")
+
+        cases = [
+            (FailedToDownloadPolygonException(503), Failure.SERVER),
+            (FailedToDownloadPolygonException(200, "text/html"), Failure.SERVER),
+            (UrlNotOkException("url", 500), Failure.SERVER),
+            (timeout, Failure.SERVER),
+            (httpx.ConnectError("down"), Failure.SERVER),
+            (UrlNotOkException("url", 404), Failure.OTHER),
+            (FailedToDownloadPolygonException(200, "application/json"), Failure.OTHER),
+            (FailedToDownloadPolygonException(), Failure.OTHER),
+            (FailedToDownloadCaptchaException(), Failure.OTHER),
+        ]
+
+        for error, failure in cases:
+            with self.subTest(error=error):
+                self.assertEqual(self.policy.classify(error), failure)
+
+    def test_no_delay_after_invalid_captcha(self):
+        self.assertEqual(self.policy.delay(Failure.INVALID_CAPTCHA, 3), 0)
+
+    @patch("SICAR.retry.random.uniform", side_effect=lambda low, high: high)
+    def test_exponential_backoff(self, mock_uniform):
+        delays = [self.policy.delay(Failure.SERVER, n) for n in range(1, 7)]
+        self.assertEqual(delays, [1, 2, 4, 8, 10, 10])
+
+    @patch("SICAR.retry.random.random", return_value=0.25)
+    def test_other_delay(self, mock_random):
+        self.assertEqual(self.policy.delay(Failure.OTHER, 1), 0.5)
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    @patch("SICAR.retry.time.monotonic")
+    def test_reserve(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        bucket = TokenBucket(rate=2, burst=2)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0.5)
+        self.assertEqual(bucket.reserve(), 1.0)
+
+        mock_monotonic.return_value = 102
+        self.assertEqual(bucket.reserve(), 0)
+
+        mock_monotonic.return_value = 1000
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0.5])
+
+    @patch("SICAR.retry.time.sleep")
+    @patch("SICAR.retry.time.monotonic", return_value=0)
+    def test_acquire(self, mock_monotonic, mock_sleep):
+        bucket = TokenBucket(rate=4)
+
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+
+        bucket.acquire()
+        mock_sleep.assert_called_once_with(0.25)
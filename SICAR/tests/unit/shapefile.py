@@ -0,0 +1,323 @@
+import io
+import struct
+import tempfile
+import unittest
+import zipfile
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+from SICAR.shapefile import Feature, Field, ShapefileReader, read_features
+from SICAR.exceptions import InvalidShapefileException
+
+FIELDS = [("cod_imovel", "C", 12, 0), ("num_area", "N", 8, 2), ("data", "D", 8, 0)]
+
+SQUARE = [(0.0, 0.0), (0.0, 2.0), (2.0, 2.0), (2.0, 0.0), (0.0, 0.0)]
+HOLE = [(0.5, 0.5), (1.5, 0.5), (1.5, 1.5), (0.5, 1.5), (0.5, 0.5)]
+OTHER = [(5.0, 5.0), (5.0, 6.0), (6.0, 6.0), (5.0, 5.0)]
+
+
+def shp_record(shape_type, parts=None, point=None):
+    if shape_type == 0:
+        return struct.pack("<i", 0)
+    if point is not None:
+        return struct.pack("<i2d", shape_type, *point)
+
+    points = [point for part in parts for point in part]
+    starts, start = [], 0
+    for part in parts:
+        starts.append(start)
+        start += len(part)
+
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    bbox = (min(xs), min(ys), max(xs), max(ys))
+
+    if shape_type == 8:
+        return struct.pack(
+            f"<i4di{2 * len(points)}d",
+            shape_type,
+            *bbox,
+            len(points),
+            *[value for point in points for value in point],
+        )
+
+    return struct.pack(
+        f"<i4d2i{len(parts)}i{2 * len(points)}d",
+        shape_type,
+        *bbox,
+        len(parts),
+        len(points),
+        *starts,
+        *[value for point in points for value in point],
+    )
+
+
+def shp(shape_type, records):
+    body = b"".join(
+        struct.pack(">ii", number, len(content) // 2) + content
+        for number, content in enumerate(records, 1)
+    )
+    header = struct.pack(">i20xi", 9994, (100 + len(body)) // 2)
+    header += struct.pack("<2i4d32x", 1000, shape_type, 0, 0, 6, 6)
+    return header + body
+
+
+def dbf(fields, rows, deleted=(), padding=0):
+    record_length = 1 + sum(length for _, _, length, _ in fields)
+    header_length = 32 + 32 * len(fields) + 1 + padding
+    header = struct.pack("<B3xIHH20x", 3, len(rows), header_length, record_length)
+    for name, kind, length, decimals in fields:
+        header += struct.pack(
+            "<11sc4xBB14x", name.encode(), kind.encode(), length, decimals
+        )
+    header += b"\r" + b"\0" * padding
+
+    body = b""
+    for index, row in enumerate(rows):
+        body += b"*" if index in deleted else b" "
+        for (_, kind, length, _), value in zip(fields, row):
+            raw = value if isinstance(value, bytes) else str(value).encode("utf-8")
+            body += raw.rjust(length) if kind in "NF" else raw.ljust(length)
+
+    return header + body + b"\x1a"
+
+
+def archive(folder, members, name="MG_AREA_IMOVEL.zip"):
+    path = Path(folder) / name
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for member, content in members.items():
+            zf.writestr(member, content)
+    return path
+
+
+class ShapefileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def polygons(self, **members):
+        return archive(
+            self.folder.name,
+            {
+                "AREA_IMOVEL_1.shp": shp(
+                    5,
+                    [
+                        shp_record(5, [SQUARE, HOLE]),
+                        shp_record(5, [SQUARE, OTHER]),
+                        shp_record(0),
+                    ],
+                ),
+                "AREA_IMOVEL_1.shx": b"",
+                "AREA_IMOVEL_1.dbf": dbf(
+                    FIELDS,
+                    [
+                        ["MG-001", "10.50", "20240131"],
+                        ["MG-002", "", "00000000"],
+                        ["MG-ção", "3", "        "],
+                    ],
+                ),
+                **members,
+            },
+        )
+
+    def test_read_polygons(self):
+        features = list(read_features(self.polygons()))
+
+        self.assertEqual(
+            features[0],
+            Feature(
+                {"type": "Polygon", "coordinates": [SQUARE, HOLE]},
+                {"cod_imovel": "MG-001", "num_area": 10.5, "data": date(2024, 1, 31)},
+            ),
+        )
+        self.assertEqual(
+            features[1].geometry,
+            {"type": "MultiPolygon", "coordinates": [[SQUARE], [OTHER]]},
+        )
+        self.assertEqual(
+            features[1].properties,
+            {"cod_imovel": "MG-002", "num_area": None, "data": None},
+        )
+        self.assertIsNone(features[2].geometry)
+        self.assertEqual(features[2].properties["cod_imovel"], "MG-ção")
+        self.assertEqual(features[2].properties["num_area"], 3.0)
+        self.assertEqual(
+            features[0].__geo_interface__,
+            {
+                "type": "Feature",
+                "geometry": features[0].geometry,
+                "properties": features[0].properties,
+            },
+        )
+
+    @patch("SICAR.sicar.Sicar._initialize_cookies")
+    def test_sicar_read_features(self, mock_initialize_cookies):
+        from SICAR import Sicar
+
+        self.polygons()
+
+        features = Sicar().read_features("mg", "AREA_IMOVEL", self.folder.name)
+
+        self.assertEqual(
+            [feature.properties["cod_imovel"] for feature in features],
+            ["MG-001", "MG-002", "MG-ção"],
+        )
+
+    def test_async_sicar_read_features(self):
+        import asyncio
+        from SICAR import AsyncSicar
+
+        self.polygons()
+
+        async def read():
+            features = AsyncSicar(listeners=[]).read_features(
+                "mg", "AREA_IMOVEL", self.folder.name, batch_size=2
+            )
+            return [feature.properties["cod_imovel"] async for feature in features]
+
+        self.assertEqual(asyncio.run(read()), ["MG-001", "MG-002", "MG-ção"])
+
+    def test_reader_headers(self):
+        with ShapefileReader(self.polygons()) as reader:
+            self.assertEqual(reader.layer, "AREA_IMOVEL_1")
+            self.assertEqual(reader.shape_type, 5)
+            self.assertEqual(reader.bbox, (0, 0, 6, 6))
+            self.assertEqual(reader.length, 3)
+            self.assertEqual(reader.encoding, "utf-8")
+            self.assertEqual(
+                reader.fields,
+                [
+                    Field("cod_imovel", "C", 12, 0),
+                    Field("num_area", "N", 8, 2),
+                    Field("data", "D", 8, 0),
+                ],
+            )
+
+    def test_streams_without_extracting(self):
+        with patch.object(zipfile.ZipFile, "extract") as mock_extract:
+            with patch.object(zipfile.ZipFile, "extractall") as mock_extractall:
+                features = read_features(self.polygons())
+                next(features)
+                features.close()
+
+        mock_extract.assert_not_called()
+        mock_extractall.assert_not_called()
+
+    def test_encoding_from_cpg(self):
+        path = archive(
+            self.folder.name,
+            {
+                "layer.shp": shp(1, [shp_record(1, point=(1.0, 2.0))]),
+                "layer.dbf": dbf(
+                    [("nome", "C", 6, 0)], [["ção".encode("cp1252")]], padding=263
+                ),
+                "layer.cpg": b"1252\n",
+            },
+        )
+
+        [feature] = read_features(path)
+
+        self.assertEqual(feature.geometry, {"type": "Point", "coordinates": (1.0, 2.0)})
+        self.assertEqual(feature.properties, {"nome": "ção"})
+        self.assertEqual(ShapefileReader._encoding(b"UTF-8"), "utf-8")
+        self.assertEqual(ShapefileReader._encoding(b"unknown"), "utf-8")
+
+    def test_other_shapes_and_values(self):
+        line = [(0.0, 0.0), (1.0, 1.0)]
+        fields = [("ativo", "L", 1, 0), ("pontos", "N", 4, 0), ("tipo", "X", 2, 0)]
+        path = archive(
+            self.folder.name,
+            {
+                "layer.shp": shp(
+                    3,
+                    [
+                        shp_record(3, [line]),
+                        shp_record(3, [line, line]),
+                        shp_record(8, [line]),
+                        shp_record(5, [SQUARE]),
+                    ],
+                ),
+                "layer.dbf": dbf(
+                    fields,
+                    [
+                        ["T", "12", "ab"],
+                        ["N", "", "cd"],
+                        ["?", "1.9", "ef"],
+                        ["Y", "2", "gh"],
+                    ],
+                    deleted={3},
+                ),
+            },
+        )
+
+        features = list(read_features(path))
+
+        self.assertEqual(
+            [feature.geometry for feature in features],
+            [
+                {"type": "LineString", "coordinates": line},
+                {"type": "MultiLineString", "coordinates": [line, line]},
+                {"type": "MultiPoint", "coordinates": line},
+            ],
+        )
+        self.assertEqual(
+            [feature.properties for feature in features],
+            [
+                {"ativo": True, "pontos": 12, "tipo": "ab"},
+                {"ativo": False, "pontos": None, "tipo": "cd"},
+                {"ativo": None, "pontos": 1, "tipo": "ef"},
+            ],
+        )
+
+    def test_select_layer(self):
+        path = archive(
+            self.folder.name,
+            {
+                "a/first.shp": shp(1, [shp_record(1, point=(1.0, 1.0))]),
+                "a/first.dbf": dbf([("id", "N", 2, 0)], [["1"]]),
+                "b/second.shp": shp(1, [shp_record(1, point=(2.0, 2.0))]),
+                "b/second.dbf": dbf([("id", "N", 2, 0)], [["2"]]),
+            },
+        )
+
+        [feature] = read_features(path, layer="second")
+        self.assertEqual(feature.properties, {"id": 2})
+
+        [feature] = read_features(path, layer="a/first")
+        self.assertEqual(feature.properties, {"id": 1})
+
+    def test_invalid_archives(self):
+        cases = {
+            "no layer": {"readme.txt": b""},
+            "no dbf": {"layer.shp": shp(1, [])},
+            "short shp": {"layer.shp": b"\0" * 10, "layer.dbf": dbf([], [])},
+            "not shp": {"layer.shp": b"\0" * 100, "layer.dbf": dbf([], [])},
+            "short dbf": {"layer.shp": shp(1, []), "layer.dbf": b"\3"},
+        }
+
+        for name, members in cases.items():
+            with self.subTest(name), self.assertRaises(InvalidShapefileException):
+                ShapefileReader(archive(self.folder.name, members, f"{name}.zip"))
+
+        with self.assertRaises(InvalidShapefileException):
+            read_features(self.polygons(), layer="missing").__next__()
+
+    def test_truncated_and_unsupported_records(self):
+        record = shp_record(1, point=(1.0, 1.0))
+        rows = dbf([("id", "N", 2, 0)], [["1"], ["2"]])
+        cases = {
+            "missing record": shp(1, [record]),
+            "short record": shp(1, [record, record])[:-4],
+            "multipatch": shp(31, [struct.pack("<i", 31), record]),
+        }
+
+        for name, content in cases.items():
+            path = archive(
+                self.folder.name,
+                {"layer.shp": content, "layer.dbf": rows},
+                f"{name}.zip",
+            )
+            with self.subTest(name), self.assertRaises(InvalidShapefileException):
+                list(read_features(path))
@@ -1,17 +1,27 @@
 import unittest
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import ANY, MagicMock, patch, call
 import random
 import io
 import httpx
 from PIL import Image
 from pathlib import Path, PosixPath
+import os
 import sys
 import ssl
+import hashlib
+import tempfile
+from datetime import date
 
 from SICAR import Sicar
 from SICAR.state import State
 from SICAR.polygon import Polygon
-from SICAR.drivers import Captcha
+from SICAR.drivers import Captcha, OcrExecutor
+from SICAR.manifest import Manifest
+from SICAR.cache import ReleaseDateCache
+from SICAR.retry import Failure, RetryPolicy, TokenBucket
+from SICAR.events import Events, DownloadStarted, BytesReceived, DownloadFailed
+from SICAR.sinks import CallbackSink
+from SICAR.tests.unit.partial import ZIP
 from SICAR.exceptions import (
     PolygonNotValidException,
     UrlNotOkException,
@@ -21,6 +31,8 @@ from SICAR.exceptions import (
     FailedToGetReleaseDateException,
 )
 
+CHUNK1, CHUNK2 = ZIP[:6], ZIP[6:]
+
 
 class MockCaptcha(Captcha):
     def get_captcha(self, captcha):
@@ -48,6 +60,11 @@ class SicarTestCase(unittest.TestCase):
         )
         self.mock_initialize_cookies.start()
 
+    def test_driver_instance(self):
+        driver = MockCaptcha()
+        sicar = Sicar(driver=driver)
+        self.assertIs(sicar._driver, driver)
+
     def test_ocr_driver_integration(self):
         sicar = Sicar(driver=self.mocked_captcha)
         captcha_image = Image.new("RGB", (10, 10))
@@ -60,6 +77,34 @@ class SicarTestCase(unittest.TestCase):
         context.set_ciphers("RSA+AESGCM:RSA+AES:!aNULL:!MD5:!DSS")
         mock_session.assert_called_once()
 
+    @patch("httpx.Client")
+    def test_create_session_with_keep_alive(self, mock_session):
+        limits = httpx.Limits(max_connections=2, keepalive_expiry=5)
+        sicar = Sicar(driver=self.mocked_captcha, limits=limits, http2=True)
+        mock_session.assert_called_once_with(
+            verify=Sicar._ssl_context(),
+            limits=limits,
+            http2=True,
+            event_hooks={"request": [sicar._connections.hook]},
+        )
+
+    def test_ssl_context_is_shared(self):
+        sicar = Sicar(driver=self.mocked_captcha)
+        self.assertIs(sicar._ssl_context(), Sicar._ssl_context())
+        self.assertIs(
+            sicar._session._transport._pool._ssl_context, Sicar._ssl_context()
+        )
+        self.assertIs(sicar._limits, Sicar._LIMITS)
+
+    def test_connection_stats(self):
+        sicar = Sicar(driver=self.mocked_captcha)
+        worker = sicar._worker()
+        self.assertIs(worker._connections, sicar._connections)
+        self.assertEqual(
+            sicar.connection_stats(),
+            {"requests": 0, "connections": 0, "tls_handshakes": 0},
+        )
+
     @patch("httpx.Client")
     def test_create_session_with_custom_headers(self, mock_session):
         sicar = Sicar(driver=self.mocked_captcha, headers={"Custom-Header": "Value"})
@@ -76,7 +121,6 @@ class SicarTestCase(unittest.TestCase):
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
                 "Accept-Encoding": "gzip, deflate, br",
-                "Connection": "close",
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
             }
         )
@@ -139,41 +183,256 @@ class SicarTestCase(unittest.TestCase):
 
         sicar._get.assert_called_once()
 
-    @patch("builtins.open", new_callable=MagicMock)
-    @patch.object(Path, "__init__", return_value=None)
-    @patch("tqdm.tqdm", side_effect=lambda *args, **kwargs: MagicMock())
-    def test_download_polygon_success(self, mock_tqdm, mock_path, mock_open):
+    def test_download_polygon_success(self):
         state = State.MG
         polygon = Polygon.APPS
         captcha = "abc123"
-        folder = "polygons"
         response_mock = MagicMock()
         response_mock.status_code = httpx.codes.OK
         response_mock.headers = {
             "Content-Type": "application/zip",
-            "Content-Length": 4096,
+            "Content-Length": len(ZIP),
         }
 
         response_mock.iter_bytes = lambda: (
-            (yield b"chunk1"),
-            (yield b"chunk2"),
+            (yield CHUNK1),
+            (yield CHUNK2),
         )
 
-        with patch.object(httpx.Client, "stream") as stream_mock:
+        with (
+            tempfile.TemporaryDirectory() as folder,
+            patch.object(httpx.Client, "stream") as stream_mock,
+        ):
             stream_mock.return_value.__enter__.return_value = response_mock
             sicar = Sicar(driver=self.mocked_captcha)
             result = sicar._download_polygon(state, polygon, captcha, folder)
 
-        stream_mock.assert_called_once_with(
-            "GET",
-            r"https://consultapublica.car.gov.br/publico/estados/downloadBase?idEstado=MG&tipoBase=APPS&ReCaptcha=abc123",
+            stream_mock.assert_called_once_with(
+                "GET",
+                r"https://consultapublica.car.gov.br/publico/estados/downloadBase?idEstado=MG&tipoBase=APPS&ReCaptcha=abc123",
+                headers={},
+            )
+            self.assertEqual(
+                result, Path(folder) / f"{state.value}_{polygon.value}.zip"
+            )
+            self.assertEqual(result.read_bytes(), ZIP)
+            self.assertEqual(
+                sorted(os.listdir(folder)), [result.name, f"{result.name}.sha256"]
+            )
+            self.assertEqual(
+                (Path(folder) / "MG_APPS.zip.sha256").read_text(),
+                f"{hashlib.sha256(ZIP).hexdigest()}  MG_APPS.zip\n",
+            )
+
+            snapshot = sicar.metrics.snapshot()
+            labels = {"driver": "MockCaptcha", "state": "MG"}
+            self.assertEqual(
+                snapshot["sicar_captcha_accepted_total"],
+                [{"labels": labels, "value": 1}],
+            )
+            self.assertEqual(
+                snapshot["sicar_download_bytes_total"],
+                [{"labels": labels, "value": len(ZIP)}],
+            )
+
+    def test_download_polygon_shorter_than_content_length(self):
+        response_mock = MagicMock(status_code=httpx.codes.OK)
+        response_mock.headers = {
+            "Content-Type": "application/zip",
+            "Content-Length": len(ZIP) + 1,
+        }
+        response_mock.iter_bytes = lambda: iter([ZIP])
+
+        with (
+            tempfile.TemporaryDirectory() as folder,
+            patch.object(httpx.Client, "stream") as stream_mock,
+        ):
+            stream_mock.return_value.__enter__.return_value = response_mock
+            sicar = Sicar(driver=self.mocked_captcha)
+
+            with self.assertRaises(FailedToDownloadPolygonException):
+                sicar._download_polygon(State.MG, Polygon.APPS, "abc12", folder)
+
+            self.assertFalse((Path(folder) / "MG_APPS.zip").exists())
+
+    def test_download_polygon_resumes_interrupted_download(self):
+        def stream(method, url, headers):
+            response = MagicMock()
+            if "Range" not in headers:
+                response.status_code = httpx.codes.OK
+                response.headers = {
+                    "Content-Type": "application/zip",
+                    "Content-Length": len(ZIP),
+                    "ETag": '"v1"',
+                }
+
+                def iter_bytes():
+                    yield CHUNK1
+                    raise httpx.ReadError("connection dropped")
+
+            else:
+                self.assertEqual(headers, {"Range": "bytes=6-", "If-Range": '"v1"'})
+                response.status_code = httpx.codes.PARTIAL_CONTENT
+                response.headers = {
+                    "Content-Type": "application/zip",
+                    "Content-Length": len(ZIP) - 6,
+                    "Content-Range": f"bytes 6-{len(ZIP) - 1}/{len(ZIP)}",
+                }
+
+                def iter_bytes():
+                    yield CHUNK2
+
+            response.iter_bytes = iter_bytes
+            context = MagicMock()
+            context.__enter__.return_value = response
+            return context
+
+        with (
+            tempfile.TemporaryDirectory() as folder,
+            patch.object(httpx.Client, "stream", side_effect=stream),
+        ):
+            sicar = Sicar(driver=self.mocked_captcha)
+
+            with self.assertRaises(FailedToDownloadPolygonException):
+                sicar._download_polygon(State.MG, Polygon.APPS, "abc12", folder)
+            self.assertEqual((Path(folder) / "MG_APPS.zip.part").read_bytes(), CHUNK1)
+
+            received = []
+            sicar._events = Events([received.append])
+            result = sicar._download_polygon(State.MG, Polygon.APPS, "def34", folder)
+
+            self.assertEqual(result.read_bytes(), ZIP)
+            self.assertEqual(
+                received,
+                [
+                    DownloadStarted(State.MG, Polygon.APPS, len(ZIP), 6),
+                    BytesReceived(State.MG, Polygon.APPS, len(ZIP), len(ZIP)),
+                ],
+            )
+            self.assertEqual(
+                sorted(os.listdir(folder)), ["MG_APPS.zip", "MG_APPS.zip.sha256"]
+            )
+            self.assertEqual(
+                (Path(folder) / "MG_APPS.zip.sha256").read_text(),
+                f"{hashlib.sha256(ZIP).hexdigest()}  MG_APPS.zip\n",
+            )
+
+    @patch("time.sleep", return_value=None)
+    def test_download_state_to_sink_restarts_after_failure(self, mock_sleep):
+        def stream(method, url, headers):
+            self.assertEqual(headers, {})
+            response = MagicMock(status_code=httpx.codes.OK)
+            response.headers = {
+                "Content-Type": "application/zip",
+                "Content-Length": len(ZIP),
+            }
+
+            def iter_bytes():
+                yield CHUNK1
+                if stream.calls == 1:
+                    raise httpx.ReadError("connection dropped")
+                yield CHUNK2
+
+            stream.calls += 1
+            response.iter_bytes = iter_bytes
+            context = MagicMock()
+            context.__enter__.return_value = response
+            return context
+
+        stream.calls = 0
+        buffer = io.BytesIO(b"header")
+        buffer.seek(6)
+
+        with (
+            tempfile.TemporaryDirectory() as folder,
+            patch.object(httpx.Client, "stream", side_effect=stream),
+        ):
+            sicar = Sicar(driver=self.mocked_captcha, listeners=[])
+            sicar._download_captcha = MagicMock(return_value=Image.Image)
+            sicar._driver.get_captcha = MagicMock(return_value="ABCDE")
+
+            result = sicar.download_state(
+                State.MG, Polygon.APPS, Path(folder) / "unused", sink=buffer
+            )
+
+            self.assertIs(result, buffer)
+            self.assertEqual(buffer.getvalue(), b"header" + ZIP)
+            self.assertEqual(stream.calls, 2)
+            self.assertEqual(os.listdir(folder), [])
+
+    @patch("time.sleep", return_value=None)
+    def test_download_state_to_callable_stops_after_failure(self, mock_sleep):
+        def stream(method, url, headers):
+            response = MagicMock(status_code=httpx.codes.OK)
+            response.headers = {
+                "Content-Type": "application/zip",
+                "Content-Length": len(ZIP),
+            }
+
+            def iter_bytes():
+                yield CHUNK1
+                raise httpx.ReadError("connection dropped")
+
+            response.iter_bytes = iter_bytes
+            context = MagicMock()
+            context.__enter__.return_value = response
+            return context
+
+        chunks, received = [], []
+
+        with patch.object(httpx.Client, "stream", side_effect=stream) as mock_stream:
+            sicar = Sicar(driver=self.mocked_captcha, listeners=[received.append])
+            sicar._download_captcha = MagicMock(return_value=Image.Image)
+            sicar._driver.get_captcha = MagicMock(return_value="ABCDE")
+
+            result = sicar.download_state(
+                State.MG, Polygon.APPS, sink=chunks.append, debug=True
+            )
+
+        self.assertFalse(result)
+        self.assertEqual(chunks, [CHUNK1])
+        self.assertEqual(mock_stream.call_count, 2)
+        self.assertIsInstance(received[-1], DownloadFailed)
+        self.assertEqual(received[-1].attempts, 2)
+        self.assertIsInstance(received[-1].error, io.UnsupportedOperation)
+        self.assertIn(
+            "Stopped requesting 'APPS' for 'MG': UnsupportedOperation",
+            self.stdout.getvalue(),
         )
-        mock_path.assert_called_once_with(f"{folder}/{state}_{polygon.value}")
-        mock_open.assert_called_once_with(
-            PosixPath(f"{folder}/{state}_{polygon.value}.zip"), "wb"
+
+    @patch("pathlib.Path.mkdir")
+    @patch("SICAR.sicar.CaptchaPrefetcher")
+    def test_download_state_with_prefetch_unsupported_sink(
+        self, mock_prefetcher, mock_mkdir
+    ):
+        sicar = Sicar(driver=self.mocked_captcha, listeners=[])
+        prefetcher = mock_prefetcher.return_value.__enter__.return_value
+        candidate = prefetcher.get.return_value
+        candidate.sicar._download_polygon.side_effect = io.UnsupportedOperation()
+
+        self.assertFalse(
+            sicar.download_state(
+                State.MG, Polygon.APPS, prefetch=1, sink=lambda chunk: None
+            )
         )
-        mock_open.return_value.__enter__.return_value.write.assert_called()
-        self.assertEqual(result, PosixPath(f"{folder}/{state}_{polygon.value}.zip"))
+        candidate.sicar._download_polygon.assert_called_once()
+        prefetcher.release.assert_called_once_with(candidate)
+
+    @patch("pathlib.Path.mkdir")
+    @patch("SICAR.sicar.CaptchaPrefetcher")
+    def test_download_state_with_prefetch_to_sink(self, mock_prefetcher, mock_mkdir):
+        sicar = Sicar(driver=self.mocked_captcha)
+        prefetcher = mock_prefetcher.return_value.__enter__.return_value
+        candidate = MagicMock(captcha="ABCDE")
+        prefetcher.get.return_value = candidate
+        chunks = []
+
+        sicar.download_state(State.MG, Polygon.APPS, prefetch=1, sink=chunks.append)
+
+        mock_mkdir.assert_not_called()
+        sink = candidate.sicar._download_polygon.call_args.kwargs["sink"]
+        self.assertIsInstance(sink, CallbackSink)
+        self.assertEqual(sink.callback, chunks.append)
 
     def test_download_polygon_failed_response(self):
         with patch.object(httpx.Client, "stream") as stream_mock:
@@ -183,7 +442,7 @@ class SicarTestCase(unittest.TestCase):
 
             sicar = Sicar(driver=self.mocked_captcha)
 
-            with self.assertRaises(FailedToDownloadPolygonException):
+            with self.assertRaises(FailedToDownloadPolygonException) as context:
                 sicar._download_polygon(
                     state=State.MG,
                     polygon=Polygon.APPS,
@@ -192,6 +451,8 @@ class SicarTestCase(unittest.TestCase):
                     chunk_size=1024,
                 )
 
+            self.assertEqual(context.exception.status_code, httpx.codes.NOT_FOUND)
+
     def test_download_polygon_fails_on_html_response(self):
         state = State.MG
         polygon = Polygon.APPS
@@ -206,9 +467,11 @@ class SicarTestCase(unittest.TestCase):
 
             sicar = Sicar(driver=self.mocked_captcha)
 
-            with self.assertRaises(FailedToDownloadPolygonException):
+            with self.assertRaises(FailedToDownloadPolygonException) as context:
                 sicar._download_polygon(state, polygon, captcha, folder, chunk_size)
 
+            self.assertEqual(context.exception.content_type, "text/html")
+
     @patch("pathlib.Path.mkdir")
     def test_download_state_valid_captcha(self, mock_mkdir):
         state = State.MG
@@ -242,6 +505,8 @@ class SicarTestCase(unittest.TestCase):
             captcha="ABCDE",
             folder=folder,
             chunk_size=chunk_size,
+            events=sicar._events,
+            sink=None,
         )
 
         self.assertIsInstance(result, Path)
@@ -326,6 +591,221 @@ class SicarTestCase(unittest.TestCase):
             State.MG, Polygon.APPS, "temp", 25, chunk_size=1024, debug=True
         )
 
+    @patch("pathlib.Path.mkdir")
+    def test_download_state_events(self, mock_mkdir):
+        received = []
+        sicar = Sicar(driver=self.mocked_captcha, listeners=[received.append])
+        sicar._download_captcha = MagicMock(return_value=Image.Image)
+        sicar._driver.get_captcha = MagicMock(side_effect=["ABCD", "ABCDE"])
+        sicar._download_polygon = MagicMock(return_value=Path("polygon.zip"))
+
+        sicar.download_state(State.MG, Polygon.APPS, "temp", tries=3)
+
+        self.assertEqual(
+            [type(event).__name__ for event in received],
+            [
+                "AttemptStarted",
+                "CaptchaSolved",
+                "AttemptFailed",
+                "AttemptStarted",
+                "CaptchaSolved",
+                "DownloadFinished",
+            ],
+        )
+        self.assertEqual(received[2].failure, Failure.INVALID_CAPTCHA)
+        self.assertEqual(received[-1].attempts, 2)
+        self.assertEqual(self.stdout.getvalue(), "")
+
+    @patch("pathlib.Path.mkdir")
+    @patch("SICAR.sicar.CaptchaPrefetcher")
+    def test_download_state_with_prefetch(self, mock_prefetcher, mock_mkdir):
+        sicar = Sicar(driver=self.mocked_captcha)
+        prefetcher = mock_prefetcher.return_value.__enter__.return_value
+        first, second = MagicMock(captcha="ABCDE"), MagicMock(captcha="FGHIJ")
+        prefetcher.get.side_effect = [first, second]
+        first.sicar._download_polygon.side_effect = FailedToDownloadPolygonException()
+        second.sicar._download_polygon.return_value = Path("polygon.zip")
+
+        result = sicar.download_state(
+            State.MG, Polygon.APPS, "temp", 25, debug=True, prefetch=2
+        )
+
+        mock_prefetcher.assert_called_once_with(
+            sicar, size=2, lifetime=60.0, state=State.MG
+        )
+        second.sicar._download_polygon.assert_called_once_with(
+            state=State.MG,
+            polygon=Polygon.APPS,
+            captcha="FGHIJ",
+            folder="temp",
+            chunk_size=1024 * 1024,
+            events=ANY,
+            sink=None,
+        )
+        prefetcher.release.assert_has_calls([call(first), call(second)])
+        self.assertEqual(result, Path("polygon.zip"))
+
+    @patch("pathlib.Path.mkdir")
+    @patch("time.sleep", return_value=None)
+    def test_download_state_metrics(self, mock_sleep, mock_mkdir):
+        sicar = Sicar(driver=self.mocked_captcha)
+        sicar._download_captcha = MagicMock(return_value=Image.Image)
+        sicar._driver.get_captcha = MagicMock(
+            side_effect=["bad", "ABCDE", "FGHIJ", "bad"]
+        )
+        sicar._download_polygon = MagicMock(
+            side_effect=[FailedToDownloadPolygonException(), Path("polygon.zip")]
+        )
+
+        sicar.download_state(State.MG, Polygon.APPS, "temp", 3)
+        sicar.download_state(State.MG, Polygon.APPS, "temp", 1)
+
+        snapshot = sicar.metrics.snapshot()
+        labels = {"driver": "MockCaptcha", "state": "MG"}
+        self.assertEqual(
+            snapshot["sicar_captcha_submitted_total"], [{"labels": labels, "value": 2}]
+        )
+        self.assertEqual(
+            snapshot["sicar_downloads_total"],
+            [
+                {"labels": {**labels, "result": "failure"}, "value": 1},
+                {"labels": {**labels, "result": "success"}, "value": 1},
+            ],
+        )
+        self.assertEqual(snapshot["sicar_attempts_per_success"][0]["sum"], 3)
+        self.assertEqual(snapshot["sicar_ocr_seconds"][0]["count"], 4)
+        self.assertEqual(snapshot["sicar_captcha_download_seconds"][0]["count"], 4)
+
+    @patch("pathlib.Path.mkdir")
+    @patch("SICAR.drivers.executor.ProcessPoolExecutor")
+    def test_download_state_metrics_through_executor(self, mock_pool, mock_mkdir):
+        sicar = Sicar(driver=OcrExecutor(MockCaptcha, workers=1))
+        sicar._download_captcha = MagicMock(return_value=Image.Image)
+        mock_pool.return_value.submit.return_value.result.return_value = "ABCDE"
+        sicar._download_polygon = MagicMock(return_value=Path("polygon.zip"))
+
+        sicar.download_state(State.MG, Polygon.APPS, "temp", 1)
+
+        self.assertEqual(
+            sicar.metrics.snapshot()["sicar_captcha_submitted_total"],
+            [{"labels": {"driver": "MockCaptcha", "state": "MG"}, "value": 1}],
+        )
+
+    @patch("pathlib.Path.mkdir")
+    @patch("time.sleep", return_value=None)
+    def test_download_state_retry_delays(self, mock_sleep, mock_mkdir):
+        retry = MagicMock(wraps=RetryPolicy())
+        retry.delay = MagicMock(return_value=0.5)
+        sicar = Sicar(driver=self.mocked_captcha, retry=retry)
+        sicar._download_captcha = MagicMock(return_value=Image.Image)
+        sicar._driver.get_captcha = MagicMock(
+            side_effect=["bad", "bad", "ABCDE", "ABCDE", "FGHIJ", "KLMNO"]
+        )
+        sicar._download_polygon = MagicMock(
+            side_effect=[
+                FailedToDownloadPolygonException(503),
+                FailedToDownloadPolygonException(200, "text/html"),
+                FailedToDownloadPolygonException(),
+                FailedToDownloadPolygonException(503),
+            ]
+        )
+
+        result = sicar.download_state(State.MG, Polygon.APPS, "temp", 6)
+
+        self.assertFalse(result)
+        retry.delay.assert_has_calls(
+            [
+                call(Failure.INVALID_CAPTCHA, 1),
+                call(Failure.INVALID_CAPTCHA, 2),
+                call(Failure.SERVER, 1),
+                call(Failure.SERVER, 2),
+                call(Failure.OTHER, 1),
+            ]
+        )
+        self.assertEqual(mock_sleep.call_count, 5)
+
+    @patch("pathlib.Path.mkdir")
+    @patch("time.sleep", return_value=None)
+    def test_download_state_retries_captcha_errors(self, mock_sleep, mock_mkdir):
+        def unavailable(request):
+            return httpx.Response(503)
+
+        def unreachable(request):
+            raise httpx.ConnectError("down", request=request)
+
+        for response in [unavailable, unreachable]:
+            with self.subTest(response=response):
+                mock_sleep.reset_mock()
+                retry = MagicMock(wraps=RetryPolicy())
+                retry.delay = MagicMock(return_value=0.5)
+                sicar = Sicar(driver=self.mocked_captcha, retry=retry, listeners=[])
+                sicar._session = httpx.Client(transport=httpx.MockTransport(response))
+
+                result = sicar.download_state(State.MG, Polygon.APPS, "temp", 3)
+
+                self.assertFalse(result)
+                retry.delay.assert_has_calls(
+                    [call(Failure.SERVER, 1), call(Failure.SERVER, 2)]
+                )
+                self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch("pathlib.Path.mkdir")
+    @patch("time.sleep", return_value=None)
+    @patch("SICAR.sicar.CaptchaPrefetcher")
+    def test_download_state_with_prefetch_url_error(
+        self, mock_prefetcher, mock_sleep, mock_mkdir
+    ):
+        sicar = Sicar(driver=self.mocked_captcha)
+        prefetcher = mock_prefetcher.return_value.__enter__.return_value
+        prefetcher.get.return_value.sicar._download_polygon.side_effect = (
+            UrlNotOkException("url", 503)
+        )
+
+        result = sicar.download_state(State.MG, Polygon.APPS, "temp", 3, prefetch=1)
+
+        self.assertFalse(result)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch("pathlib.Path.mkdir")
+    @patch("time.sleep", return_value=None)
+    @patch("SICAR.sicar.CaptchaPrefetcher")
+    def test_download_state_with_prefetch_backoff(
+        self, mock_prefetcher, mock_sleep, mock_mkdir
+    ):
+        sicar = Sicar(driver=self.mocked_captcha)
+        prefetcher = mock_prefetcher.return_value.__enter__.return_value
+        prefetcher.get.return_value.sicar._download_polygon.side_effect = (
+            FailedToDownloadPolygonException(502)
+        )
+
+        result = sicar.download_state(State.MG, Polygon.APPS, "temp", 3, prefetch=1)
+
+        self.assertFalse(result)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_get_with_rate_limiter(self):
+        limiter = MagicMock(spec=TokenBucket)
+        sicar = Sicar(driver=self.mocked_captcha, limiter=limiter)
+        sicar._session.get = MagicMock(return_value=MagicMock(status_code=503))
+
+        with self.assertRaises(UrlNotOkException) as context:
+            sicar._get("https://example.com")
+
+        limiter.acquire.assert_called_once()
+        self.assertEqual(context.exception.status_code, 503)
+
+    @patch("pathlib.Path.mkdir")
+    @patch("SICAR.sicar.CaptchaPrefetcher")
+    def test_download_state_with_prefetch_fails(self, mock_prefetcher, mock_mkdir):
+        sicar = Sicar(driver=self.mocked_captcha)
+        prefetcher = mock_prefetcher.return_value.__enter__.return_value
+        prefetcher.get.side_effect = FailedToDownloadCaptchaException()
+
+        result = sicar.download_state(State.MG, Polygon.APPS, "temp", 3, prefetch=1)
+
+        self.assertEqual(prefetcher.get.call_count, 3)
+        self.assertFalse(result)
+
     def test_download_state_invalid_state_code(self):
         sicar = Sicar(driver=self.mocked_captcha)
         with self.assertRaises(StateCodeNotValidException):
@@ -375,6 +855,170 @@ class SicarTestCase(unittest.TestCase):
         mock_mkdir.assert_has_calls(expected_calls["path"])
         mock_download_state.assert_has_calls(expected_calls["download_state"])
 
+    @patch("SICAR.sicar.Sicar.download_state")
+    @patch("pathlib.Path.mkdir")
+    def test_download_country_returns_result(self, mock_mkdir, mock_download_state):
+        sicar = Sicar(driver=self.mocked_captcha)
+        mock_download_state.side_effect = lambda state, **kwargs: (
+            False if state == State.MG else Path(f"{state.value}.zip")
+        )
+
+        result = sicar.download_country(Polygon.APPS, "brazil")
+
+        self.assertEqual(list(result), list(State))
+        self.assertFalse(result[State.MG])
+        self.assertEqual(result["BA"], Path("BA.zip"))
+
+    @patch("pathlib.Path.mkdir")
+    def test_download_country_keeps_results_when_a_state_raises(self, mock_mkdir):
+        def download_state(worker, state, **kwargs):
+            if state == State.MG:
+                raise OSError("disk full")
+            return Path(f"{state.value}.zip")
+
+        for workers in [1, 4]:
+            with self.subTest(workers=workers):
+                listener = MagicMock()
+                sicar = Sicar(driver=self.mocked_captcha, listeners=[listener])
+
+                with patch.object(Sicar, "download_state", download_state):
+                    result = sicar.download_country(
+                        Polygon.APPS, "brazil", workers=workers
+                    )
+
+                self.assertEqual(list(result), list(State))
+                self.assertFalse(result[State.MG])
+                self.assertEqual(result[State.BA], Path("BA.zip"))
+
+                event = listener.call_args.args[0]
+                self.assertIsInstance(event, DownloadFailed)
+                self.assertEqual((event.state, event.attempts), (State.MG, 0))
+                self.assertIsInstance(event.error, OSError)
+
+    @patch("pathlib.Path.mkdir")
+    def test_download_country_with_workers(self, mock_mkdir):
+        sicar = Sicar(driver=self.mocked_captcha)
+        workers = []
+
+        def download_state(worker, state, **kwargs):
+            workers.append(worker)
+            return Path(f"{state.value}.zip")
+
+        with (
+            patch.object(Sicar, "download_state", download_state),
+            patch.object(httpx.Client, "close") as mock_close,
+        ):
+            result = sicar.download_country(Polygon.APPS, "brazil", workers=4)
+
+        self.assertEqual(result, {state: Path(f"{state.value}.zip") for state in State})
+        self.assertNotIn(sicar, workers)
+        self.assertLessEqual(len(set(workers)), 4)
+        self.assertEqual(
+            len({id(worker._session) for worker in workers}), len(set(workers))
+        )
+        self.assertEqual(mock_close.call_count, len(set(workers)))
+
+    def test_sync_state_downloads_new_release(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "MG_APPS.zip"
+            sicar = Sicar(driver=self.mocked_captcha)
+            sicar.get_release_dates = MagicMock(return_value={State.MG: "02/01/2025"})
+
+            def download_state(**kwargs):
+                path.write_bytes(b"zipdata")
+                return path
+
+            sicar.download_state = MagicMock(side_effect=download_state)
+
+            self.assertEqual(sicar.sync_state("mg", "apps", folder), path)
+            self.assertEqual(
+                sicar.sync_state(State.MG, Polygon.APPS, folder, debug=True), path
+            )
+
+            sicar.download_state.assert_called_once_with(
+                state=State.MG,
+                polygon=Polygon.APPS,
+                folder=folder,
+                tries=25,
+                debug=False,
+                chunk_size=1024 * 1024,
+            )
+            self.assertIn("is up to date", self.stdout.getvalue())
+
+    def test_sync_state_failed_download(self):
+        with tempfile.TemporaryDirectory() as folder:
+            sicar = Sicar(driver=self.mocked_captcha)
+            sicar.get_release_dates = MagicMock(return_value={})
+            sicar.download_state = MagicMock(return_value=False)
+
+            self.assertFalse(sicar.sync_state(State.MG, Polygon.APPS, folder))
+            self.assertFalse((Path(folder) / "manifest.json").exists())
+
+    def test_sync_country_downloads_only_stale_states(self):
+        with tempfile.TemporaryDirectory() as folder:
+            manifest = Manifest(folder)
+            for state in [State.MG, State.BA]:
+                path = Path(folder) / f"{state.value}_APPS.zip"
+                path.write_bytes(b"zipdata")
+                manifest.record(state, Polygon.APPS, "01/01/2025", path)
+
+            sicar = Sicar(driver=self.mocked_captcha)
+            sicar.get_release_dates = MagicMock(
+                return_value={state: "01/01/2025" for state in State}
+                | {State.BA: "02/01/2025"}
+            )
+
+            def download_states(states, *args):
+                for state in states:
+                    (Path(folder) / f"{state.value}_APPS.zip").write_bytes(b"new")
+                return {
+                    state: state != State.SP
+                    and Path(folder) / f"{state.value}_APPS.zip"
+                    for state in states
+                }
+
+            sicar._download_states = MagicMock(side_effect=download_states)
+
+            result = sicar.sync_country("apps", folder, debug=True)
+
+            stale = sicar._download_states.call_args.args[0]
+            self.assertNotIn(State.MG, stale)
+            self.assertIn(State.BA, stale)
+            self.assertEqual(len(stale), len(State) - 1)
+            self.assertEqual(result[State.MG], Path(folder) / "MG_APPS.zip")
+            self.assertFalse(result[State.SP])
+            self.assertEqual(
+                Manifest(folder).get(State.BA, Polygon.APPS)["release_date"],
+                "02/01/2025",
+            )
+            self.assertIsNone(Manifest(folder).get(State.SP, Polygon.APPS))
+
+    def test_worker(self):
+        sicar = Sicar(driver=self.mocked_captcha, headers={"Custom-Header": "Value"})
+        Sicar._initialize_cookies.reset_mock()
+
+        worker = sicar._worker()
+
+        self.assertIsNot(worker._session, sicar._session)
+        self.assertIs(worker._driver, sicar._driver)
+        self.assertEqual(worker._session.headers["Custom-Header"], "Value")
+        Sicar._initialize_cookies.assert_called_once()
+
+    def test_session_pool(self):
+        sicar = Sicar(driver=self.mocked_captcha)
+        Sicar._initialize_cookies.reset_mock()
+
+        with sicar.session_pool(size=2, max_idle=30, max_uses=5) as pool:
+            self.assertEqual((pool.size, pool._max_idle, pool._max_uses), (2, 30, 5))
+            Sicar._initialize_cookies.assert_not_called()
+
+            with pool.lease() as first, pool.lease() as second:
+                self.assertIsNot(first._session, second._session)
+                self.assertIsNot(first._session, sicar._session)
+                self.assertIs(first._driver, sicar._driver)
+
+        self.assertEqual(Sicar._initialize_cookies.call_count, 2)
+
     def test_get_release_dates_success(self):
         html_content = (
             b'<div class="listagem-estados">'
@@ -395,6 +1039,93 @@ class SicarTestCase(unittest.TestCase):
 
         self.assertEqual(update_dates, {State.AC: "04/08/2024"})
 
+    def test_get_release_dates_as_date(self):
+        sicar = Sicar(driver=self.mocked_captcha)
+        sicar._fetch_release_dates = MagicMock(return_value={State.AC: "04/08/2024"})
+
+        self.assertEqual(
+            sicar.get_release_dates(as_date=True), {State.AC: date(2024, 8, 4)}
+        )
+
+    @patch("SICAR.base.soup_release_dates")
+    @patch("SICAR.base.scan_release_dates")
+    def test_parse_release_dates_fallback(self, mock_scan, mock_soup):
+        sicar = Sicar(driver=self.mocked_captcha)
+
+        mock_scan.return_value = {State.AC: "04/08/2024"}
+        self.assertEqual(sicar._parse_release_dates(b"page"), {State.AC: "04/08/2024"})
+        mock_soup.assert_not_called()
+
+        mock_scan.return_value = {}
+        mock_soup.return_value = {State.MG: "05/08/2024"}
+        self.assertEqual(sicar._parse_release_dates(b"page"), {State.MG: "05/08/2024"})
+        mock_soup.assert_called_once_with(b"page")
+
+    def test_get_release_dates_cached(self):
+        html_content = (
+            b'<div class="listagem-estados">'
+            b'<div class="data-disponibilizacao"><i>04/08/2024</i></div>'
+            b'<button type="button" class="btn-abrir-modal-download-base-poligono"'
+            b'data-estado="AC" data-nome-estado="Acre"></button>'
+        )
+        cache = ReleaseDateCache(ttl=60)
+        sicar = Sicar(driver=self.mocked_captcha, release_dates=cache)
+        sicar._get = MagicMock(
+            return_value=httpx.Response(
+                200, content=html_content, headers={"ETag": '"abc"'}
+            )
+        )
+
+        self.assertEqual(sicar.get_release_dates(), {State.AC: "04/08/2024"})
+        self.assertEqual(sicar.get_release_dates(), {State.AC: "04/08/2024"})
+
+        sicar._get.assert_called_once_with(
+            "https://consultapublica.car.gov.br/publico/estados/downloads",
+            headers={},
+        )
+
+        cache.ttl = 0
+        sicar._get.return_value = httpx.Response(304)
+
+        self.assertEqual(sicar.get_release_dates(), {State.AC: "04/08/2024"})
+        sicar._get.assert_called_with(
+            "https://consultapublica.car.gov.br/publico/estados/downloads",
+            headers={"If-None-Match": '"abc"'},
+        )
+
+    def test_get_release_dates_unsolicited_not_modified(self):
+        html_content = b"""
+            <div class="listagem-estados">
+                <div class="data-disponibilizacao"><i>04/08/2024</i></div>
+                <button type="button" class="btn-abrir-modal-download-base-poligono"
+                data-estado="AC" data-nome-estado="Acre"></button>
+            </div>
+        """
+        sicar = Sicar(driver=self.mocked_captcha, release_dates=ReleaseDateCache())
+        sicar._get = MagicMock(
+            side_effect=[httpx.Response(304), httpx.Response(200, content=html_content)]
+        )
+
+        self.assertEqual(sicar.get_release_dates(), {State.AC: "04/08/2024"})
+        self.assertEqual(
+            sicar._get.call_args_list,
+            [
+                call(
+                    "https://consultapublica.car.gov.br/publico/estados/downloads",
+                    headers={},
+                ),
+                call("https://consultapublica.car.gov.br/publico/estados/downloads"),
+            ],
+        )
+
+    def test_get_release_dates_cached_failure(self):
+        sicar = Sicar(driver=self.mocked_captcha, release_dates=ReleaseDateCache())
+        sicar._session.get = MagicMock(
+            return_value=MagicMock(status_code=httpx.codes.NOT_FOUND)
+        )
+        with self.assertRaises(FailedToGetReleaseDateException):
+            sicar.get_release_dates()
+
     def test_get_release_dates_failure(self):
         sicar = Sicar(driver=self.mocked_captcha)
         sicar._session.get = MagicMock(
@@ -0,0 +1,166 @@
+import io
+import hashlib
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from SICAR.sinks import Sink, StreamSink, CallbackSink, as_sink, verify_zip
+from SICAR.partial import PartialDownload
+from SICAR.exceptions import FailedToDownloadPolygonException
+from SICAR.tests.unit.partial import ZIP
+
+
+class SinksTestCase(unittest.TestCase):
+    def response(self, content_length):
+        return MagicMock(headers={"Content-Length": str(content_length)})
+
+    def test_as_sink(self):
+        buffer = io.BytesIO()
+        partial = PartialDownload("MG_APPS.zip")
+
+        self.assertIs(as_sink(partial), partial)
+        self.assertIs(as_sink(buffer).stream, buffer)
+        self.assertIsInstance(as_sink(print), CallbackSink)
+
+        with self.assertRaises(TypeError):
+            as_sink("MG_APPS.zip")
+
+    def test_stream_sink(self):
+        buffer = io.BytesIO()
+        sink = StreamSink(buffer)
+
+        self.assertEqual(sink.headers(), {})
+        self.assertEqual(sink.digest().digest(), hashlib.sha256().digest())
+
+        with sink.open(self.response(len(ZIP)), buffer_size=4) as writer:
+            writer.write(ZIP[:3])
+            writer.write(ZIP[3:])
+
+        self.assertEqual(sink.total, len(ZIP))
+        self.assertIs(sink.finish(), buffer)
+        self.assertEqual(buffer.getvalue(), ZIP)
+        self.assertEqual(buffer.tell(), len(ZIP))
+
+    def test_stream_sink_verifies_readable_streams(self):
+        sink = StreamSink(io.BytesIO())
+
+        with sink.open(self.response(6)) as writer:
+            writer.write(b"no zip")
+
+        with self.assertRaises(FailedToDownloadPolygonException):
+            sink.finish()
+
+        with tempfile.TemporaryDirectory() as folder:
+            with open(Path(folder) / "MG_APPS.zip", "wb") as stream:
+                sink = StreamSink(stream)
+                with sink.open(self.response(6)) as writer:
+                    writer.write(b"no zip")
+
+                self.assertIs(sink.finish(), stream)
+
+    def test_stream_sink_rewinds_failed_attempt(self):
+        buffer = io.BytesIO(b"keep")
+        buffer.seek(4)
+        sink = StreamSink(buffer)
+
+        with self.assertRaises(ValueError):
+            with sink.open(self.response(6)) as writer:
+                writer.write(b"bro")
+                raise ValueError()
+
+        with self.assertRaises(FailedToDownloadPolygonException):
+            sink.finish()
+
+        with sink.open(self.response(len(ZIP))) as writer:
+            writer.write(ZIP)
+
+        sink.finish()
+        self.assertEqual(buffer.getvalue(), b"keep" + ZIP)
+
+    def test_non_seekable_stream_is_not_restarted(self):
+        stream = MagicMock()
+        stream.seekable.return_value = False
+        sink = StreamSink(stream)
+
+        with sink.open(self.response(6)) as writer:
+            writer.write(b"bro")
+
+        with self.assertRaises(io.UnsupportedOperation):
+            sink.open(self.response(6))
+
+    def test_write_only_stream(self):
+        class Writer:
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, chunk):
+                self.chunks.append(bytes(chunk))
+
+        stream = Writer()
+        sink = as_sink(stream)
+        self.assertIsInstance(sink, StreamSink)
+
+        with sink.open(self.response(len(ZIP)), buffer_size=4) as writer:
+            writer.write(ZIP)
+
+        self.assertIs(sink.finish(), stream)
+        self.assertEqual(b"".join(stream.chunks), ZIP)
+
+        with self.assertRaises(io.UnsupportedOperation):
+            sink.open(self.response(len(ZIP)))
+
+    def test_callback_sink_coalesces_chunks(self):
+        chunks = []
+        sink = CallbackSink(chunks.append)
+
+        with sink.open(self.response(10), buffer_size=4) as writer:
+            for byte in b"0123456789":
+                writer.write(bytes([byte]))
+
+        self.assertTrue(sink.finish())
+        self.assertEqual(chunks, [b"0123", b"4567", b"89"])
+
+        with self.assertRaises(io.UnsupportedOperation):
+            sink.open(self.response(10))
+
+    def test_callback_sink_does_not_verify_zip(self):
+        sink = CallbackSink(MagicMock())
+
+        with sink.open(self.response(6)) as writer:
+            writer.write(b"no zip")
+
+        self.assertTrue(sink.finish())
+
+    def test_failed_attempt_without_bytes_is_restarted(self):
+        sink = CallbackSink(MagicMock())
+
+        with sink.open(self.response(10)):
+            pass
+
+        with sink.open(self.response(3)) as writer:
+            writer.write(b"abc")
+
+        self.assertTrue(sink.finish())
+
+    def test_sink_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Sink()
+
+    def test_verify_zip(self):
+        verify_zip(io.BytesIO(ZIP))
+
+        deflated = io.BytesIO()
+        with zipfile.ZipFile(deflated, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("MG_APPS.shp", b"0123456789" * 100)
+        start = deflated.getvalue().index(b"MG_APPS.shp") + len("MG_APPS.shp")
+
+        for content in [
+            ZIP.replace(b"0123456789", b"9876543210", 1),
+            ZIP[:-22],
+            deflated.getvalue()[:start] + bytes(8) + deflated.getvalue()[start + 8 :],
+            b"",
+        ]:
+            with self.assertRaises(FailedToDownloadPolygonException):
+                verify_zip(io.BytesIO(content))
@@ -0,0 +1,270 @@
+import os
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from SICAR.polygon import Polygon
+from SICAR.exceptions import InvalidShapefileException, InvalidIndexException
+from SICAR.spatial_index import (
+    SpatialIndex,
+    _hilbert,
+    build_index,
+    index_path,
+    open_index,
+)
+from SICAR.tests.unit.shapefile import (
+    HOLE,
+    OTHER,
+    SQUARE,
+    archive,
+    dbf,
+    shp,
+    shp_record,
+)
+
+FIELDS = [("cod_imovel", "C", 12, 0)]
+
+
+def square(x, y, size):
+    return [(x, y), (x, y + size), (x + size, y + size), (x + size, y), (x, y)]
+
+
+class SpatialIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = archive(
+            self.folder.name,
+            {
+                "AREA_IMOVEL.shp": shp(
+                    5,
+                    [
+                        shp_record(5, [SQUARE, HOLE]),
+                        shp_record(0),
+                        shp_record(5, [SQUARE, OTHER]),
+                    ],
+                ),
+                "AREA_IMOVEL.dbf": dbf(FIELDS, [["MG-001"], ["MG-002"], ["MG-003"]]),
+            },
+        )
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def codes(self, features):
+        return [feature.properties["cod_imovel"] for feature in features]
+
+    def test_query_point(self):
+        with build_index(self.path) as index:
+            self.assertEqual(len(index), 2)
+            self.assertEqual(
+                self.codes(index.query_point(0.25, 0.25)), ["MG-001", "MG-003"]
+            )
+            self.assertEqual(self.codes(index.query_point(1.0, 1.0)), ["MG-003"])
+            self.assertEqual(
+                self.codes(index.query_point(0.0, 1.0)), ["MG-001", "MG-003"]
+            )
+            self.assertEqual(self.codes(index.query_point(5.2, 5.5)), ["MG-003"])
+            self.assertEqual(index.query_point(5.8, 5.2), [])
+            self.assertEqual(index.query_point(3.0, 3.0), [])
+
+            [feature] = index.query_point(5.2, 5.5)
+            self.assertEqual(
+                feature.geometry,
+                {"type": "MultiPolygon", "coordinates": [[SQUARE], [OTHER]]},
+            )
+
+    def test_query_bbox(self):
+        with build_index(self.path) as index:
+            self.assertEqual(
+                self.codes(index.query_bbox((0.8, 0.8, 1.2, 1.2))), ["MG-003"]
+            )
+            self.assertEqual(
+                self.codes(index.query_bbox((1.2, 1.2, 1.7, 1.7))),
+                ["MG-001", "MG-003"],
+            )
+            self.assertEqual(
+                self.codes(index.query_bbox((-1.0, -1.0, 10.0, 10.0))),
+                ["MG-001", "MG-003"],
+            )
+            self.assertEqual(index.query_bbox((5.7, 5.0, 5.9, 5.3)), [])
+            self.assertEqual(index.search((5.7, 5.0, 5.9, 5.3)), [1])
+            self.assertEqual(index.feature(0).properties["cod_imovel"], "MG-001")
+
+    def test_other_shapes(self):
+        path = archive(
+            self.folder.name,
+            {
+                "layer.shp": shp(
+                    3,
+                    [
+                        shp_record(3, [[(0.0, 0.0), (2.0, 2.0)]]),
+                        shp_record(8, [[(0.0, 0.0), (2.0, 2.0)]]),
+                        shp_record(1, point=(4.0, 4.0)),
+                    ],
+                ),
+                "layer.dbf": dbf(FIELDS, [["line"], ["points"], ["point"]]),
+            },
+            "layers.zip",
+        )
+
+        with build_index(path) as index:
+            self.assertEqual(index.query_bbox((1.5, 0.0, 2.0, 0.5)), [])
+            self.assertEqual(
+                self.codes(index.query_bbox((0.9, 0.9, 1.1, 1.1))), ["line"]
+            )
+            self.assertEqual(
+                self.codes(index.query_bbox((1.9, 1.9, 3.0, 3.0))),
+                ["line", "points"],
+            )
+            self.assertEqual(self.codes(index.query_point(1.0, 1.0)), ["line"])
+            self.assertEqual(self.codes(index.query_point(4.0, 4.0)), ["point"])
+
+    def test_matches_brute_force(self):
+        random.seed(42)
+        squares = [
+            square(random.uniform(-70, -40), random.uniform(-30, 5), random.random())
+            for _ in range(700)
+        ]
+        path = archive(
+            self.folder.name,
+            {
+                "layer.shp": shp(5, [shp_record(5, [ring]) for ring in squares]),
+                "layer.dbf": dbf(FIELDS, [[str(i)] for i in range(len(squares))]),
+            },
+            "many.zip",
+        )
+
+        with build_index(path, node_size=4) as index:
+            for _ in range(50):
+                x, y = random.uniform(-70, -40), random.uniform(-30, 5)
+                bbox = (x, y, x + 2, y + 2)
+                expected = [
+                    str(i)
+                    for i, ring in enumerate(squares)
+                    if ring[0][0] <= bbox[2]
+                    and ring[2][0] >= bbox[0]
+                    and ring[0][1] <= bbox[3]
+                    and ring[2][1] >= bbox[1]
+                ]
+
+                self.assertEqual(index.search(bbox), [int(i) for i in expected])
+                self.assertEqual(self.codes(index.query_bbox(bbox)), expected)
+
+    def test_hilbert(self):
+        self.assertEqual(
+            _hilbert(
+                np.array([0, 1, 1, 0], dtype=np.uint32),
+                np.array([0, 0, 1, 1], dtype=np.uint32),
+            ).tolist(),
+            [0, 1, 2, 3],
+        )
+
+    def test_empty_layer(self):
+        path = archive(
+            self.folder.name,
+            {
+                "layer.shp": shp(5, [shp_record(0)]),
+                "layer.dbf": dbf(FIELDS, [["none"]]),
+            },
+            "empty.zip",
+        )
+
+        with build_index(path) as index:
+            self.assertEqual(len(index), 0)
+            self.assertEqual(index.search((-180, -90, 180, 90)), [])
+
+    def test_index_path(self):
+        self.assertEqual(
+            index_path("temp/MG_AREA_IMOVEL.zip"), Path("temp/MG_AREA_IMOVEL.rtree")
+        )
+        self.assertEqual(
+            index_path("temp/MG_AREA_IMOVEL.zip", "AREA_IMOVEL_1"),
+            Path("temp/MG_AREA_IMOVEL.AREA_IMOVEL_1.rtree"),
+        )
+
+    def test_open_index_builds_once(self):
+        with patch(
+            "SICAR.spatial_index.build_index", side_effect=build_index
+        ) as mock_build:
+            with open_index(self.path) as index:
+                self.assertEqual(index.path, index_path(self.path))
+            with open_index(self.path) as index:
+                self.assertEqual(len(index), 2)
+
+        mock_build.assert_called_once_with(self.path, index_path(self.path), None, 16)
+
+    def test_open_index_rebuilds_outdated(self):
+        build_index(self.path).close()
+        archive(
+            self.folder.name,
+            {
+                "AREA_IMOVEL.shp": shp(5, [shp_record(5, [OTHER])]),
+                "AREA_IMOVEL.dbf": dbf(FIELDS, [["MG-004"]]),
+            },
+        )
+        os.utime(self.path, ns=(0, 0))
+
+        with open_index(self.path) as index:
+            self.assertEqual(self.codes(index.query_point(5.2, 5.5)), ["MG-004"])
+
+    def test_open_index_rebuilds_invalid(self):
+        index_path(self.path).write_bytes(b"not an index")
+
+        with open_index(self.path) as index:
+            self.assertEqual(len(index), 2)
+
+    def test_invalid_index(self):
+        path = Path(self.folder.name) / "invalid.rtree"
+
+        with self.assertRaises(FileNotFoundError):
+            SpatialIndex(path)
+
+        for content in [b"", b"not an index", b"SICARIDX" + bytes(56)]:
+            path.write_bytes(content)
+            with self.assertRaises(InvalidIndexException):
+                SpatialIndex(path)
+
+        build_index(self.path, path).close()
+        path.write_bytes(path.read_bytes()[:200])
+        with self.assertRaises(InvalidIndexException):
+            SpatialIndex(path)
+
+    def test_failed_build_leaves_no_file(self):
+        path = archive(self.folder.name, {"layer.dbf": b""}, "invalid.zip")
+
+        with self.assertRaises(InvalidShapefileException):
+            build_index(path)
+
+        self.assertEqual(
+            sorted(path.name for path in Path(self.folder.name).iterdir()),
+            ["MG_AREA_IMOVEL.zip", "invalid.zip"],
+        )
+
+    @patch("SICAR.sicar.Sicar._initialize_cookies")
+    def test_sicar_spatial_index(self, mock_initialize_cookies):
+        from SICAR import Sicar
+
+        with Sicar().spatial_index(
+            "mg", Polygon.AREA_PROPERTY, self.folder.name
+        ) as index:
+            self.assertEqual(
+                index.path, Path(self.folder.name) / "MG_AREA_IMOVEL.rtree"
+            )
+            self.assertEqual(self.codes(index.query_point(1.0, 1.0)), ["MG-003"])
+
+    def test_async_sicar_spatial_index(self):
+        import asyncio
+        from SICAR import AsyncSicar
+
+        index = asyncio.run(
+            AsyncSicar(listeners=[]).spatial_index(
+                "mg", Polygon.AREA_PROPERTY, self.folder.name
+            )
+        )
+
+        with index:
+            self.assertEqual(self.codes(index.query_point(1.0, 1.0)), ["MG-003"])
@@ -22,6 +22,7 @@ class Url:
         _INDEX (str): URL for the index of properties.
         _DOWNLOAD_BASE (str): URL for downloading polygon files related to states.
         _RECAPTCHA (str): URL for CAPTCHA-related resources.
+        _RELEASE_DATE (str): URL for the page listing the release date of each state.
     """
 
     _BASE = "https://consultapublica.car.gov.br/publico"
@@ -29,3 +30,22 @@ class Url:
     _DOWNLOAD_BASE = f"{_BASE}/estados/downloadBase"
     _RECAPTCHA = f"{_BASE}/municipios/ReCaptcha"
     _RELEASE_DATE = f"{_BASE}/estados/downloads"
+
+    def _set_base(self, base: str):
+        """
+        Point this instance to another deployment of the SICAR system, such as a `MockSicarServer`.
+
+        Parameters:
+            base (str): The base URL replacing `_BASE`, e.g. `http://127.0.0.1:8080/publico`.
+
+        Returns:
+            None
+
+        Note:
+            Only this instance is changed. The paths of every resource are kept and appended to the new base.
+        """
+        for name in ["_INDEX", "_DOWNLOAD_BASE", "_RECAPTCHA", "_RELEASE_DATE"]:
+            path = getattr(Url, name).removeprefix(Url._BASE)
+            setattr(self, name, f"{base.rstrip('/')}{path}")
+
+        self._BASE = base.rstrip("/")